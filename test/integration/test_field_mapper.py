@@ -1,3 +1,5 @@
+import asyncio
+
 from tracardi.context import ServerContext, Context
 from tracardi.domain.event_metadata import EventMetadata
 
@@ -11,7 +13,7 @@ def test_field_mapper():
     with ServerContext(Context(production=False)):
         fm = FieldMapper()
         fm.batch = 1
-        is_added = fm.add_field_mappings('event',
+        is_added = asyncio.run(fm.add_field_mappings('event',
                                          [
                                              Event(id="1", name="ev1", type="ev1", properties={"a": 1}, source=Entity(id="1"),
                                                    metadata=EventMetadata(time=EventTime())),
@@ -19,9 +21,9 @@ def test_field_mapper():
                                                    metadata=EventMetadata(time=EventTime())),
                                              Event(id="3", name="ev3", type="ev3", properties={"c": 1}, source=Entity(id="1"),
                                                    metadata=EventMetadata(time=EventTime())),
-                                         ])
-        data = fm.get_field_mapping('event')
-        fm.save_cache()
+                                         ]))
+        data = asyncio.run(fm.get_field_mapping('event'))
+        asyncio.run(fm.save_cache())
         assert 'properties.a' in data
         assert 'properties.b' in data
         assert 'properties.c' in data
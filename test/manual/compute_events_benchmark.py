@@ -0,0 +1,122 @@
+"""
+CPU benchmark of event and profile conversions in compute_events for a payload of 20 events and a large
+profile: every event and the profile recreated from dicts (old) vs only fields changed by mappings
+validated again (tracked). Mapping is the same in both: one compiled event to profile mapping schema,
+field timestamps and an event trait.
+
+Run: python test/manual/compute_events_benchmark.py [rounds]
+"""
+
+import asyncio
+import sys
+from copy import deepcopy
+from time import process_time
+
+from dotty_dict import dotty
+
+from tracardi.context import ServerContext, Context
+from tracardi.domain.entity import Entity
+from tracardi.domain.event import Event, EventSession
+from tracardi.domain.event_metadata import EventMetadata
+from tracardi.domain.event_to_profile import EventToProfile, EventToProfileMap
+from tracardi.domain.flat_model import FlatModel
+from tracardi.domain.named_entity import NamedEntity
+from tracardi.domain.profile import Profile, FlatProfile
+from tracardi.domain.ref_value import RefValue
+from tracardi.domain.session import Session
+from tracardi.domain.time import EventTime
+from tracardi.service.change_monitoring.field_change_logger import FieldChangeLogger
+from tracardi.service.tracking.event_data_computation import _to_event, _remove_empty_dicts
+from tracardi.service.tracking.event_to_profile_plan import compile_event_to_profile
+from tracardi.service.tracking.profile_data_computation import map_event_to_profile
+
+events_per_payload = 20
+
+plans = [compile_event_to_profile(EventToProfile(
+    id="1",
+    name="Purchase",
+    event_type=NamedEntity(id="custom-purchase", name="Custom purchase"),
+    enabled=True,
+    event_to_profile=[
+        EventToProfileMap(event=RefValue(ref=True, value="properties.email"),
+                          profile=RefValue(ref=True, value="data.contact.email.main"), op="equals"),
+        EventToProfileMap(event=RefValue(ref=True, value="properties.product"),
+                          profile=RefValue(ref=True, value="traits.last_product"), op="equals"),
+    ]
+))]
+
+
+def _profile():
+    profile = Profile(id="1", traits={f"trait-{i}": {"value": i, "tags": ["a", "b", "c"]} for i in range(200)},
+                      interests={f"interest-{i}": i for i in range(50)})
+    profile.data.pii.firstname = "John"
+    profile.data.pii.lastname = "Doe"
+    profile.data.preferences.brands = [f"brand-{i}" for i in range(20)]
+    profile.metadata.fields = {f"traits.trait-{i}": ["2024-01-01T00:00:00", None] for i in range(200)}
+    return profile
+
+
+def _events():
+    return [Event(id=str(i), type='custom-purchase', metadata=EventMetadata(time=EventTime()),
+                  session=EventSession(id='1'), source=Entity(id='source'),
+                  properties={"email": "john@example.com", "product": f"product-{i}", "value": i},
+                  context={"page": {"url": "http://localhost", "title": "Shop"}})
+            for i in range(events_per_payload)]
+
+
+def _to_dict(flat):
+    # Copy of wrapped data. Upstream dotty-dict to_dict is a json round trip that fails on datetimes.
+    return deepcopy(flat._data)
+
+
+async def _map(flat_event, flat_profile, session):
+    flat_event['traits.product'] = flat_event['properties.product']
+    flat_profile, _ = await map_event_to_profile(plans, flat_event, flat_profile, session, FieldChangeLogger())
+    flat_profile.set_metadata_fields_timestamps(FieldChangeLogger().merge(flat_profile.log))
+
+
+async def legacy(profile, events, session):
+    flat_profile = FlatProfile(profile.model_dump())
+    result = []
+    for event in events:
+        flat_event = dotty(event.model_dump(exclude_unset=True))
+        await _map(flat_event, flat_profile, session)
+        event_dict = _to_dict(flat_event)
+        _remove_empty_dicts(event_dict)
+        result.append(Event(**event_dict))
+    return Profile(**_to_dict(flat_profile)), result
+
+
+async def tracked(profile, events, session):
+    flat_profile = FlatProfile(profile.model_dump())
+    result = []
+    for event in events:
+        flat_event = FlatModel(event.model_dump(exclude_unset=True))
+        await _map(flat_event, flat_profile, session)
+        result.append(_to_event(flat_event, event))
+    return flat_profile.to_profile(profile), result
+
+
+async def measure(name, compute, rounds):
+    session = Session.new()
+    payloads = [(_profile(), _events()) for _ in range(rounds)]
+    start = process_time()
+    results = [await compute(profile, events, session) for profile, events in payloads]
+    took = process_time() - start
+    print(f"{name:9} {took:8.3f}s cpu  {took / (rounds * events_per_payload) * 1000000:10.1f}us/event")
+    profile, events = results[-1]
+    # Metadata holds times of computation
+    exclude = {'metadata'}
+    return profile.model_dump(exclude=exclude), [event.model_dump(exclude=exclude) for event in events]
+
+
+async def main(rounds):
+    print(f"{events_per_payload} events per payload, {rounds} payloads")
+    expected = await measure("legacy", legacy, rounds)
+    result = await measure("tracked", tracked, rounds)
+    assert result == expected
+
+
+if __name__ == "__main__":
+    with ServerContext(Context(production=False)):
+        asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50))
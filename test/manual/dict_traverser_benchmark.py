@@ -0,0 +1,89 @@
+"""
+Micro-benchmark of DictTraverser.reshape: reshape that walks the template and writes through Dotty on
+every call (old) vs compiled reshape template executed on plain dicts. Templates come from
+test/unit/test_dict_traverser.py.
+
+Run: python test/manual/dict_traverser_benchmark.py [rounds]
+"""
+
+import sys
+from time import perf_counter
+
+from dotty_dict import Dotty
+
+from tracardi.service.notation.dict_traverser import DictTraverser
+from tracardi.service.notation.dot_accessor import DotAccessor
+
+cases = [
+    ({"x": {"a": "session@a", "b": {"x": [1, 2, "profile@b"]}, "c": [111, 222, "profile@a"], "d": {"q": {"z": 11, "e": 22}}}},
+     dict(profile={"a": 1, "b": [1, 2]}, session={"a": 2})),
+    ({"x": {"a": "session@...", "c": [111, "profile@b", "profile@a"], "d": {"not-exists": "profile@a", "exists": "profile@b"}}},
+     dict(profile={"b": [1, 2]}, event={})),
+    ({"x": {"a?": "session@...", "c": [111, "profile@b", "profile@a"], "d?": {"not-exists": "profile@a", "exists": "profile@b"}}},
+     dict(profile={"b": [1, 2]}, event={})),
+    ({"source.id": "6fe7dbfe-4da4-48a8-becd", "a": {"b\\∞v": 1}},
+     dict(profile={"b": [1, 2]}, event={})),
+    ({"a": "event@properties.a", "b": ["event@properties.b", {"c": "event@properties.c"}], "d": [], "e": {"f": "profile@b"}},
+     dict(profile={"b": [1, 2]}, event={"properties": {"a": "a", "b": 1.5, "c": True}})),
+]
+
+
+class LegacyDictTraverser(DictTraverser):
+    # Reshape as it was before compiled templates.
+
+    def reshape(self, reshape_template):
+        out_dot = Dotty({}, self.separator, esc_char='\\', no_list=False)
+        for key, value, path in self.traverse(reshape_template):
+            if key is not None:
+                path = path[:-len(key) - 1]
+
+            optional = False
+            if len(key) > 0 and key[-1] == '?':
+                key = key[:-1]
+                optional = True
+
+            if len(path) > 0 and path[-1] == '?':
+                path = path[:-1]
+                optional = True
+
+            value = self._get_value(value, optional)
+
+            if value is None and self.include_none is False:
+                continue
+
+            in_key = f"{path}{self.separator}{key}"
+            if not value:
+                if not optional:
+                    out_dot[in_key] = value
+            else:
+                out_dot[in_key] = value
+
+        result = out_dot.to_dict()
+        return result['root'] if 'root' in result else {}
+
+
+def run(traverser_class, rounds):
+    results = []
+    for _ in range(rounds):
+        results = []
+        for template, data in cases:
+            traverser = traverser_class(DotAccessor(**data), default=None)
+            results.append(traverser.reshape(template))
+    return results
+
+
+def measure(name, traverser_class, rounds):
+    start = perf_counter()
+    result = run(traverser_class, rounds)
+    took = perf_counter() - start
+    print(f"{name:9} {took:8.3f}s  {took / (rounds * len(cases)) * 1000000:10.1f}us/reshape")
+    return result
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    print(f"{len(cases)} templates, {rounds} rounds")
+    expected = measure("legacy", LegacyDictTraverser, rounds)
+    result = measure("compiled", DictTraverser, rounds)
+    assert result == expected, (result, expected)
@@ -0,0 +1,78 @@
+"""
+Micro-benchmark of DotAccessor over large fake profiles: eager conversion of all namespaces (old) vs
+lazy DotAccessor that reads scalar values directly from the pydantic models.
+
+Run: python test/manual/dot_accessor_benchmark.py [rounds] [traits]
+"""
+
+import sys
+from time import perf_counter
+
+from dotty_dict import dotty
+
+from tracardi.domain.profile import Profile
+from tracardi.domain.session import Session, SessionContext, SessionMetadata
+from tracardi.service.fake_data_maker.generate_profile_data import generate_profile_data
+from tracardi.service.notation.dot_accessor import DotAccessor
+
+paths = [
+    "profile@id",
+    "profile@data.pii.firstname",
+    "profile@data.job.company.name",
+    "profile@traits.trait-10.value",
+    "profile@traits.trait-10.tags.1",
+    "session@id",
+    "session@context.browser.name",
+]
+
+
+def make_profile(traits: int) -> Profile:
+    return Profile(
+        id="profile-1",
+        data=generate_profile_data(),
+        traits={f"trait-{i}": {"value": i, "name": f"Trait {i}", "tags": ["a", "b", "c"]} for i in range(traits)}
+    )
+
+
+def make_session() -> Session:
+    return Session(
+        id="session-1",
+        metadata=SessionMetadata(),
+        context=SessionContext({"browser": {"name": "Chrome", "version": "120"}})
+    )
+
+
+def eager(profile, session):
+    # What DotAccessor did before: both objects dumped on construction.
+    storage = {
+        "profile@": dotty(profile.model_dump(mode="json")),
+        "session@": dotty(session.model_dump(mode="json"))
+    }
+    return [storage[path[:path.index('@') + 1]][path[path.index('@') + 1:]] for path in paths]
+
+
+def lazy(profile, session):
+    dot = DotAccessor(profile, session)
+    return [dot[path] for path in paths]
+
+
+def measure(name, func, rounds, *args):
+    start = perf_counter()
+    for _ in range(rounds):
+        result = func(*args)
+    took = perf_counter() - start
+    print(f"{name:8} {took:8.3f}s  {took / rounds * 1000000:10.1f}us/accessor")
+    return result
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    traits = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    profile = make_profile(traits)
+    session = make_session()
+
+    print(f"{len(paths)} reads per accessor, profile with {traits} traits, {rounds} rounds")
+    expected = measure("eager", eager, rounds, profile, session)
+    result = measure("lazy", lazy, rounds, profile, session)
+    assert result == expected, (result, expected)
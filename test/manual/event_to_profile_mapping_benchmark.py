@@ -0,0 +1,125 @@
+"""
+Micro-benchmark of custom event to profile mapping: schemas evaluated as loaded, with Event and Profile
+models rebuilt from flat data for every condition (old), vs schemas compiled to plans once and evaluated
+directly on the flat event and flat profile. Each schema has a condition and three copied fields.
+
+Run: python test/manual/event_to_profile_mapping_benchmark.py [rounds]
+"""
+
+import asyncio
+import sys
+from copy import deepcopy
+from time import perf_counter
+
+from dotty_dict import dotty
+
+from tracardi.context import ServerContext, Context
+from tracardi.domain.entity import Entity
+from tracardi.domain.event import Event, EventSession
+from tracardi.domain.event_metadata import EventMetadata
+from tracardi.domain.event_to_profile import EventToProfile, EventToProfileMap
+from tracardi.domain.named_entity import NamedEntity
+from tracardi.domain.operations import APPEND, EQUALS_IF_NOT_EXISTS
+from tracardi.domain.profile import Profile, FlatProfile
+from tracardi.domain.ref_value import RefValue
+from tracardi.domain.session import Session
+from tracardi.domain.time import EventTime
+from tracardi.process_engine.tql.condition import Condition
+from tracardi.service.change_monitoring.field_change_logger import FieldChangeLogger
+from tracardi.service.notation.dot_accessor import DotAccessor
+from tracardi.service.tracking.event_to_profile_plan import compile_event_to_profile
+from tracardi.service.tracking.profile_data_computation import map_event_to_profile
+
+schema_counts = (1, 10, 50)
+
+
+def _schema(number):
+    return EventToProfile(
+        id=str(number),
+        name=f"Mapping {number}",
+        event_type=NamedEntity(id="custom-purchase", name="Custom purchase"),
+        enabled=True,
+        config={"condition": f'event@properties.value > {number % 5} and profile@data.pii.firstname exists'},
+        event_to_profile=[
+            EventToProfileMap(event=RefValue(ref=True, value="properties.email"),
+                              profile=RefValue(ref=True, value="data.contact.email.main"), op="equals"),
+            EventToProfileMap(event=RefValue(ref=True, value="properties.product"),
+                              profile=RefValue(ref=True, value=f"traits.products.p{number}"), op="append"),
+            EventToProfileMap(event=RefValue(ref=True, value="properties.value"),
+                              profile=RefValue(ref=True, value=f"traits.value.v{number}"),
+                              op="equals_if_not_exists"),
+        ]
+    )
+
+
+def _flat_event():
+    event = Event(id="1", type='custom-purchase', name='Custom purchase', metadata=EventMetadata(time=EventTime()),
+                  session=EventSession(id='1'), source=Entity(id='source'),
+                  properties={"email": "john@example.com", "product": "book", "value": 10})
+    return dotty(event.model_dump(exclude_unset=True))
+
+
+def _flat_profile():
+    profile = Profile(id="1")
+    profile.data.pii.firstname = "John"
+    return FlatProfile(profile.model_dump())
+
+
+def _to_dict(flat):
+    # Copy of wrapped data. Upstream dotty-dict to_dict is a json round trip that fails on datetimes.
+    return deepcopy(flat._data)
+
+
+async def legacy_map(schemas, flat_event, flat_profile, session):
+    # Custom mapping as it was before compiled plans.
+    for schema in schemas:
+        if 'condition' in schema.config:
+            dot = DotAccessor(event=Event(**_to_dict(flat_event)), profile=Profile(**_to_dict(flat_profile)),
+                              session=session)
+            if await Condition().evaluate(schema.config['condition'], dot) is False:
+                continue
+        for event_ref, profile_ref, operation in schema.items():
+            if not flat_event[event_ref]:
+                continue
+            if operation == APPEND:
+                if profile_ref not in flat_profile:
+                    flat_profile[profile_ref] = [flat_event[event_ref]]
+                else:
+                    flat_profile[profile_ref].append(flat_event[event_ref])
+            elif operation == EQUALS_IF_NOT_EXISTS:
+                if profile_ref not in flat_profile or flat_profile[profile_ref] is None:
+                    flat_profile[profile_ref] = flat_event[event_ref]
+            else:
+                flat_profile[profile_ref] = flat_event[event_ref]
+    return flat_profile
+
+
+async def compiled_map(plans, flat_event, flat_profile, session):
+    flat_profile, _ = await map_event_to_profile(plans, flat_event, flat_profile, session, FieldChangeLogger())
+    return flat_profile
+
+
+async def measure(name, mapper, schemas, rounds):
+    session = Session.new()
+    result = None
+    start = perf_counter()
+    for _ in range(rounds):
+        result = await mapper(schemas, _flat_event(), _flat_profile(), session)
+    took = perf_counter() - start
+    print(f"  {name:9} {took:8.3f}s  {took / rounds * 1000000:10.1f}us/event")
+    return result['traits']
+
+
+async def main(rounds):
+    for count in schema_counts:
+        schemas = [_schema(number) for number in range(count)]
+        plans = [compile_event_to_profile(schema) for schema in schemas]
+        print(f"{count} mapping schemas, {rounds} events")
+        expected = await measure("legacy", legacy_map, schemas, rounds)
+        result = await measure("compiled", compiled_map, plans, rounds)
+        assert result == expected, (result, expected)
+
+
+if __name__ == "__main__":
+    with ServerContext(Context(production=False)):
+        asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
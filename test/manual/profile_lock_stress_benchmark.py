@@ -0,0 +1,87 @@
+"""
+Stress benchmark of the profile lock: N concurrent coroutines lock one profile id, do some work and release.
+
+Compares the polling lock (Lock + 50ms sleep, non-atomic check-then-set) with AsyncLock (atomic SET NX PX
+with fencing token, released with compare-and-delete, waiters woken by pub/sub). Reports total time,
+wait latency and the number of overlapping critical sections (mutual exclusion violations).
+
+Needs redis at REDIS_HOST/REDIS_PORT (default localhost:6379).
+
+Run: python test/manual/profile_lock_stress_benchmark.py [coroutines] [work_ms]
+"""
+
+import asyncio
+import statistics
+import sys
+from time import perf_counter
+from uuid import uuid4
+
+from tracardi.context import ServerContext, Context
+from tracardi.service.storage.redis.collections import Collection
+from tracardi.service.storage.redis.driver.async_redis_client import AsyncRedisClient
+from tracardi.service.storage.redis.driver.redis_client import RedisClient
+from tracardi.service.tracking.locking import Lock, AsyncLock, AsyncGlobalMutexLock
+
+
+class CriticalSection:
+
+    def __init__(self, work: float):
+        self.work = work
+        self.inside = 0
+        self.violations = 0
+        self.waits = []
+
+    async def run(self, requested: float):
+        self.waits.append(perf_counter() - requested)
+        self.inside += 1
+        if self.inside > 1:
+            self.violations += 1
+        await asyncio.sleep(self.work)
+        self.inside -= 1
+
+
+async def polling_lock(key: str, name: str, section: CriticalSection):
+    # Former AsyncGlobalMutexLock behaviour: check, sleep 50ms, then set.
+    lock = Lock(RedisClient(), key, default_lock_ttl=3)
+    requested = perf_counter()
+    while lock.is_locked():
+        await asyncio.sleep(0.05)
+    lock.lock(name)
+    try:
+        await section.run(requested)
+    finally:
+        lock.unlock()
+
+
+async def async_lock(key: str, name: str, section: CriticalSection):
+    lock = AsyncLock(AsyncRedisClient(), key, default_lock_ttl=3)
+    requested = perf_counter()
+    async with AsyncGlobalMutexLock(lock, name, break_after_time=60):
+        await section.run(requested)
+
+
+async def run(title: str, worker, coroutines: int, work: float):
+    key = Lock.get_key(Collection.lock_tracker, "profile", str(uuid4()))
+    section = CriticalSection(work)
+
+    start = perf_counter()
+    await asyncio.gather(*[worker(key, f"worker-{i}", section) for i in range(coroutines)])
+    duration = perf_counter() - start
+
+    waits = sorted(section.waits)
+    print(f"{title}: {coroutines} lock holders in {duration:.3f}s "
+          f"(ideal {coroutines * work:.3f}s), overhead per hand-over "
+          f"{(duration - coroutines * work) / coroutines * 1000:.2f}ms")
+    print(f"  wait: mean {statistics.mean(waits) * 1000:.1f}ms, max {waits[-1] * 1000:.1f}ms, "
+          f"mutual exclusion violations: {section.violations}")
+
+
+async def main(coroutines: int, work: float):
+    with ServerContext(Context(production=False)):
+        await run("Polling lock", polling_lock, coroutines, work)
+        await run("AsyncLock   ", async_lock, coroutines, work)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+                     float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.005))
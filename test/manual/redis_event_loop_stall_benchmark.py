@@ -0,0 +1,84 @@
+"""
+Event-loop stall benchmark: blocking RedisClient vs AsyncRedisClient under concurrent load.
+
+Simulates the redis part of the /track hot path (profile and session cache read, throttle counter,
+profile and session cache write) for many concurrent requests. A monitor coroutine measures how late
+the event loop wakes it up (loop lag), which is the time other requests are stalled.
+
+Needs redis at REDIS_HOST (default localhost).
+
+Run: python test/manual/redis_event_loop_stall_benchmark.py [concurrent_requests] [rounds]
+"""
+
+import asyncio
+import statistics
+import sys
+from time import perf_counter
+from uuid import uuid4
+
+import msgpack
+
+from tracardi.context import ServerContext, Context
+from tracardi.service.storage.redis.driver.async_redis_client import AsyncRedisClient
+from tracardi.service.storage.redis.driver.redis_client import RedisClient
+
+payload = msgpack.packb(({"production": False, "tenant": None}, {"id": "1", "traits": {"a": 1}}, None, {}))
+
+
+async def monitor(lags: list, stop: asyncio.Event, interval: float = 0.001):
+    while not stop.is_set():
+        start = perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(perf_counter() - start - interval)
+
+
+async def blocking_request(redis: RedisClient, key: str):
+    redis.exists(f"profile:{key}")
+    redis.get(f"profile:{key}")
+    redis.get(f"session:{key}")
+    redis.incr(f"throttle:{key}")
+    redis.set(f"profile:{key}", payload, ex=60)
+    redis.set(f"session:{key}", payload, ex=60)
+
+
+async def async_request(redis: AsyncRedisClient, key: str):
+    await redis.exists(f"profile:{key}")
+    await redis.get(f"profile:{key}")
+    await redis.get(f"session:{key}")
+    await redis.incr(f"throttle:{key}")
+    async with redis.pipeline() as pipe:
+        pipe.set(f"profile:{key}", payload, ex=60).set(f"session:{key}", payload, ex=60)
+        await pipe.execute()
+
+
+async def run(name: str, request, redis, concurrency: int, rounds: int):
+    lags = []
+    stop = asyncio.Event()
+    monitor_task = asyncio.create_task(monitor(lags, stop))
+
+    start = perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*[request(redis, str(uuid4())) for _ in range(concurrency)])
+    duration = perf_counter() - start
+
+    stop.set()
+    await monitor_task
+
+    requests = concurrency * rounds
+    lags = sorted(lags)
+    print(f"{name}: {requests} requests in {duration:.3f}s ({requests / duration:.0f} req/s)")
+    if lags:
+        print(f"  loop lag: mean {statistics.mean(lags) * 1000:.2f}ms, "
+              f"p99 {lags[int(len(lags) * 0.99) - 1] * 1000:.2f}ms, max {lags[-1] * 1000:.2f}ms, "
+              f"total stall {sum(lags):.3f}s, samples {len(lags)}")
+
+
+async def main(concurrency: int, rounds: int):
+    with ServerContext(Context(production=False)):
+        await run("Blocking RedisClient", blocking_request, RedisClient(), concurrency, rounds)
+        await run("AsyncRedisClient   ", async_request, AsyncRedisClient(), concurrency, rounds)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+                     int(sys.argv[2]) if len(sys.argv) > 2 else 20))
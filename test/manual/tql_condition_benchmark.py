@@ -0,0 +1,84 @@
+"""
+Micro-benchmark of TQL condition evaluation: parse-per-call (old) vs cached parse tree (Condition.evaluate).
+Expressions are taken from test/unit/test_tql.py.
+
+Run: python test/manual/tql_condition_benchmark.py [rounds]
+"""
+
+import ast
+import asyncio
+import os
+import sys
+from time import perf_counter
+
+from lark.exceptions import LarkError
+
+from tracardi.domain.profile import Profile
+from tracardi.process_engine.tql.condition import Condition
+from tracardi.process_engine.tql.parser import Parser
+from tracardi.process_engine.tql.transformer.expr_transformer import ExprTransformer
+from tracardi.service.notation.dot_accessor import DotAccessor
+
+_test_file = os.path.join(os.path.dirname(__file__), '..', 'unit', 'test_tql.py')
+
+
+def load_expressions():
+    with open(_test_file) as f:
+        tree = ast.parse(f.read())
+
+    expressions = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and getattr(node.func, 'attr', getattr(node.func, 'id', None)) == 'parse':
+            if node.args and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str):
+                expressions.append(node.args[0].value)
+    return expressions
+
+
+payload = {
+    "a": {
+        "b": 1, "c": [1, 2, 3, "4"], "d": {"aa": 1}, "e": "test", 'f': 1, 'g': True, 'h': None,
+        'i': "2021-01-10", 'j': [], 'k': {}, 'l': "", 'm': 1650976227, 'text': 'Hello world'
+    }
+}
+
+
+def evaluate_old(parser, expression, dot):
+    tree = parser.parse(expression)
+    return ExprTransformer(dot=dot).transform(tree)
+
+
+async def main(rounds: int):
+    dot = DotAccessor(profile=Profile(id="1"), payload=payload)
+    parser = Parser(Parser.read('grammar/uql_expr.lark'), start='expr')
+    condition = Condition()
+
+    expressions = []
+    for expression in load_expressions():
+        try:
+            evaluate_old(parser, expression, dot)
+            expressions.append(expression)
+        except (LarkError, ValueError, TypeError):
+            # Tests that expect errors are skipped
+            pass
+
+    start = perf_counter()
+    for _ in range(rounds):
+        for expression in expressions:
+            evaluate_old(parser, expression, dot)
+    old_time = perf_counter() - start
+
+    start = perf_counter()
+    for _ in range(rounds):
+        for expression in expressions:
+            await condition.evaluate(expression, dot)
+    new_time = perf_counter() - start
+
+    calls = rounds * len(expressions)
+    print(f"Expressions: {len(expressions)}, rounds: {rounds}, evaluations: {calls}")
+    print(f"Old (parse per call): {old_time:.3f}s, {old_time / calls * 1e6:.1f}us per evaluation")
+    print(f"New (cached tree):    {new_time:.3f}s, {new_time / calls * 1e6:.1f}us per evaluation")
+    print(f"Speed-up: {old_time / new_time:.1f}x, cache: {condition.cache_info()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20))
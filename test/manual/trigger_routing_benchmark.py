@@ -0,0 +1,129 @@
+"""
+Micro-benchmark of workflow trigger routing with 10k enabled triggers: query per event type (old,
+WorkflowTriggerService.load_rule) vs in-memory routing table (trigger_routing_table).
+MySQL is simulated with a fixed query latency, so the numbers show the cost of routing itself and the
+number of queries each approach sends.
+
+Run: python test/manual/trigger_routing_benchmark.py [events] [triggers]
+"""
+
+import asyncio
+import sys
+from time import perf_counter
+from unittest.mock import patch
+
+from tracardi.config import memory_cache
+from tracardi.context import ServerContext, Context
+from tracardi.domain.entity import Entity
+from tracardi.domain.event import Event, EventSession
+from tracardi.domain.event_metadata import EventMetadata
+from tracardi.domain.time import EventTime
+from tracardi.service.cache.trigger import trigger_routing_table
+from tracardi.service.storage.mysql.mapping.workflow_trigger_mapping import map_to_workflow_trigger_rule
+from tracardi.service.storage.mysql.schema.table import WorkflowTriggerTable
+from tracardi.service.storage.mysql.service.workflow_trigger_service import WorkflowTriggerService
+from tracardi.service.storage.mysql.utils.select_result import SelectResult
+
+query_latency = 0.002
+sources = 100
+
+
+class BenchmarkTriggerService(WorkflowTriggerService):
+
+    def __init__(self, triggers: int):
+        super().__init__()
+        self.queries = 0
+        self.rows = [
+            WorkflowTriggerTable(id=str(i), name=f"Trigger {i}", flow_id=f"flow-{i}", flow_name="Flow",
+                                 source_id=f"source-{i % sources}", source_name="Source",
+                                 event_type_id=f"event-{i // sources}", event_type_name="Event", enabled=True)
+            for i in range(triggers)
+        ]
+        self.index = {}
+        for row in self.rows:
+            self.index.setdefault((row.event_type_id, row.source_id), []).append(row)
+
+    async def load_rule(self, event_type_id, source_id):
+        self.queries += 1
+        await asyncio.sleep(query_latency)
+        return SelectResult(self.index.get((event_type_id, source_id), []))
+
+    async def load_enabled(self):
+        self.queries += 1
+        await asyncio.sleep(query_latency)
+        return SelectResult(self.rows)
+
+
+def make_events(count: int, event_types: int):
+    return [Event(id=str(i), type=f"event-{i % event_types}", name='Event', metadata=EventMetadata(time=EventTime()),
+                  session=EventSession(id='1'), source=Entity(id='source-1'), properties={})
+            for i in range(count)]
+
+
+async def old_routing(wts, source, events):
+    for event in events:
+        records = await wts.load_rule(event.type, source.id)
+        list(records.map_to_objects(map_to_workflow_trigger_rule))
+
+
+async def new_routing(wts, source, events):
+    for event in events:
+        (await trigger_routing_table.get_routes(wts)).get(source.id, event.type)
+
+
+async def loop_stall(func, *args) -> float:
+    # Longest time the event loop could not run other tasks (includes garbage collector pauses)
+    stall = 0
+    running = True
+
+    async def tick():
+        nonlocal stall
+        while running:
+            start = perf_counter()
+            await asyncio.sleep(0)
+            stall = max(stall, perf_counter() - start)
+
+    ticker = asyncio.create_task(tick())
+    await func(*args)
+    running = False
+    await ticker
+    return stall
+
+
+async def measure(name, func, wts, source, events):
+    # Warm up, then measure
+    wts.queries = 0
+    await func(wts, source, events)
+    warm_up_queries = wts.queries
+    start = perf_counter()
+    await func(wts, source, events)
+    took = perf_counter() - start
+    print(f"{name:14} {took / len(events) * 1000000:8.2f}us/event  queries: {warm_up_queries}")
+
+
+async def main(events_count: int, triggers: int):
+    event_types = triggers // sources
+    events = make_events(events_count, event_types)
+    source = Entity(id='source-1')
+
+    with ServerContext(Context(production=True)), \
+            patch.object(memory_cache, "config_cache_invalidation", False):
+
+        # Services are singletons
+        wts = BenchmarkTriggerService(triggers)
+        start = perf_counter()
+        stall = await loop_stall(trigger_routing_table.get_routes, wts)
+        print(f"{triggers} triggers, routing table built in {(perf_counter() - start) * 1000:.1f}ms, "
+              f"max event loop stall {stall * 1000:.1f}ms")
+        trigger_routing_table.invalidate()
+
+        print(f"{events_count} events, {event_types} event types, simulated query latency {query_latency * 1000}ms")
+        await measure("per query", old_routing, wts, source, events)
+        await measure("routing table", new_routing, wts, source, events)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    ))
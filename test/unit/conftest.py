@@ -0,0 +1,101 @@
+import pytest
+
+
+class MockRedis:
+    """
+    In-memory AsyncRedisClient. State is kept per instance, so each test starts with empty storage. Patch
+    AsyncRedisClient with the instance, calling it returns the instance.
+    """
+
+    def __init__(self):
+        self.data = {}
+
+    def __call__(self):
+        return self
+
+    def pipeline(self):
+        return MockPipeline(self)
+
+    async def get(self, name):
+        return self.data.get(name, None)
+
+    async def mget(self, names):
+        return [self.data.get(name, None) for name in names]
+
+    async def hget(self, name, key):
+        return self.data.get(name, {}).get(key, None)
+
+    async def hdel(self, name, *keys):
+        for key in keys:
+            self.data.get(name, {}).pop(key, None)
+
+    async def smembers(self, name):
+        return set(self.data.get(name, set()))
+
+    async def zremrangebyscore(self, name, min, max):
+        members = self.data.get(name, {})
+        for member, score in list(members.items()):
+            if min <= score <= max:
+                del members[member]
+
+
+class MockPipeline:
+
+    def __init__(self, redis: MockRedis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def _add(self, command):
+        self.commands.append(command)
+        return self
+
+    def set(self, name, value, ex=None, nx=False):
+        if nx:
+            return self._add(lambda: self.redis.data.setdefault(name, value))
+        return self._add(lambda: self.redis.data.update({name: value}))
+
+    def delete(self, name):
+        return self._add(lambda: self.redis.data.pop(name, None))
+
+    def expire(self, name, time):
+        return self._add(lambda: name in self.redis.data)
+
+    def hset(self, name, key, value):
+        return self._add(lambda: self.redis.data.setdefault(name, {}).update({key: value}))
+
+    def hincrby(self, name, key, amount=1):
+        def _incr():
+            counters = self.redis.data.setdefault(name, {})
+            counters[key] = counters.get(key, 0) + amount
+            return counters[key]
+
+        return self._add(_incr)
+
+    def hgetall(self, name):
+        return self._add(lambda: dict(self.redis.data.get(name, {})))
+
+    def sadd(self, name, *values):
+        return self._add(lambda: self.redis.data.setdefault(name, set()).update(values))
+
+    def srem(self, name, *values):
+        return self._add(lambda: self.redis.data.setdefault(name, set()).difference_update(values))
+
+    def zadd(self, name, mapping):
+        return self._add(lambda: self.redis.data.setdefault(name, {}).update(mapping))
+
+    def zscore(self, name, value):
+        return self._add(lambda: self.redis.data.get(name, {}).get(value, None))
+
+    async def execute(self):
+        return [command() for command in self.commands]
+
+
+@pytest.fixture
+def redis() -> MockRedis:
+    return MockRedis()
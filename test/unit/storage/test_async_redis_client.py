@@ -0,0 +1,79 @@
+import asyncio
+import threading
+
+from tracardi.context import ServerContext, Context
+from tracardi.service.storage.redis.driver.async_redis_client import AsyncRedisClient
+
+
+def test_async_redis_client_pipeline_is_tenant_aware():
+    async def main():
+        context = Context(production=False, tenant="tenant-1")
+        with ServerContext(context):
+            # Commands are only queued, no connection is opened until execute.
+            async with AsyncRedisClient().pipeline() as pipe:
+                pipe.get("key-1").set("key-2", b"value", ex=10).exists("key-3")
+
+                assert len(pipe) == 3
+                commands = [args for args, _ in pipe._pipeline.command_stack]
+                assert commands[0] == ("GET", f"{context.tenant}:key-1")
+                assert commands[1][0:3] == ("SET", f"{context.tenant}:key-2", b"value")
+                assert commands[2] == ("EXISTS", f"{context.tenant}:key-3")
+
+            assert len(pipe) == 0
+
+    asyncio.run(main())
+
+
+def test_async_redis_client_is_bound_to_event_loop():
+    redis = AsyncRedisClient()
+
+    async def get_client():
+        return redis.client
+
+    async def main():
+        return await get_client(), await get_client()
+
+    client_1, client_2 = asyncio.run(main())
+    client_3, _ = asyncio.run(main())
+
+    assert client_1 is client_2
+    assert client_1 is not client_3
+
+
+def test_async_redis_client_of_other_event_loop_is_closed():
+    redis = AsyncRedisClient()
+    closed = []
+
+    async def get_client():
+        client = redis.client
+
+        async def aclose(close_connection_pool=None):
+            closed.append((client, close_connection_pool, asyncio.get_running_loop()))
+
+        client.aclose = aclose
+        return client
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    try:
+        client_1 = asyncio.run_coroutine_threadsafe(get_client(), loop).result()
+
+        async def main():
+            client = await get_client()
+            # Client of the loop that still runs is closed in that loop
+            for _ in range(100):
+                if closed:
+                    break
+                await asyncio.sleep(0.01)
+            assert closed == [(client_1, True, loop)]
+
+            await redis.close()
+            assert closed[1][0:2] == (client, True)
+            assert redis._client is None
+
+        asyncio.run(main())
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
@@ -1,4 +1,4 @@
-from time import sleep
+import asyncio
 from uuid import uuid4
 
 from tracardi.context import ServerContext, Context
@@ -12,37 +12,40 @@ class MockRedis:
         self.data = {}
         self._ttl = {}
 
-    def incr(self, key):
+    async def incr(self, key):
         if key not in self.data:
             self.data[key] = 0
         self.data[key] += 1
         return self.data[key]
 
-    def expire(self, key, ttl):
+    async def expire(self, key, ttl):
         self._ttl[key] = ttl
 
-    def ttl(self, key):
+    async def ttl(self, key):
         if key not in self._ttl:
             return 0
         return self._ttl[key]
 
 
 def test_should_limit_calls():
-    with ServerContext(Context(production=False)):
+    async def main():
+        with ServerContext(Context(production=False)):
 
-        with patch("tracardi.service.throttle.RedisClient",
-                   return_value=MockRedis()) as mock_redis_client:
+            with patch("tracardi.service.throttle.AsyncRedisClient",
+                       return_value=MockRedis()) as mock_redis_client:
 
-            limit = 3
-            limiter = Limiter(limit=limit, ttl=10)
-            key = str(uuid4())
-            passes = 0
-            while True:
-                block, ttl = limiter.limit(key)
+                limit = 3
+                limiter = Limiter(limit=limit, ttl=10)
+                key = str(uuid4())
+                passes = 0
+                while True:
+                    block, ttl = await limiter.limit(key)
 
-                if block is False:
-                    break
-                passes += 1
-                sleep(0.5)
+                    if block is False:
+                        break
+                    passes += 1
+                    await asyncio.sleep(0.5)
 
-            assert passes == limit
+                assert passes == limit
+
+    asyncio.run(main())
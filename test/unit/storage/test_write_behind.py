@@ -0,0 +1,180 @@
+import asyncio
+from unittest.mock import patch
+
+from tracardi.domain.storage_record import StorageRecord
+from tracardi.domain.value_object.bulk_insert_result import BulkInsertResult
+from tracardi.service import shutdown
+from tracardi.service.shutdown import close_all
+from tracardi.service.storage.elastic.write_behind import WriteBehindBuffer, flush_at_exit
+
+
+class MockElasticClient:
+
+    def __init__(self, fail: int = 0, delay: float = 0, rejected=(), overloaded=()):
+        self.fail = fail
+        self.delay = delay
+        self.rejected = set(rejected)
+        self.overloaded = set(overloaded)
+        self.bulks = []
+
+    async def insert(self, index, records, repeats: int = 3, raise_on_error: bool = True) -> BulkInsertResult:
+        assert raise_on_error is False
+        await asyncio.sleep(self.delay)
+        ids = [record.pop('_id') for record in records]
+        if self.fail > 0:
+            self.fail -= 1
+            return BulkInsertResult(saved=0, errors=["Failed"], ids=ids, index=index)
+
+        errors = []
+        saved = []
+        for _id, record in zip(ids, records):
+            if _id in self.rejected:
+                errors.append({"index": {"_id": _id, "status": 400, "error": {"type": "mapper_parsing_exception"}}})
+            elif _id in self.overloaded:
+                self.overloaded.discard(_id)
+                errors.append({"index": {"_id": _id, "status": 429, "error": {"type": "es_rejected_execution"}}})
+            else:
+                saved.append(record)
+        self.bulks.append((index, saved))
+        return BulkInsertResult(saved=len(saved), errors=errors, ids=ids, index=index)
+
+
+def _records(*ids, version=1):
+    return [StorageRecord(_id=id, id=id, version=version) for id in ids]
+
+
+def test_records_are_flushed_in_batches_per_index():
+    async def main():
+        client = MockElasticClient()
+        buffer = WriteBehindBuffer(batch_size=2, flush_interval=60, max_size=100, client=client)
+
+        await buffer.add("index-1", _records("1", "2", "3"))
+        await buffer.add("index-2", _records("4"))
+        assert len(buffer) == 4
+
+        # Full batch wakes up the background flush
+        await asyncio.sleep(0.01)
+        assert len(buffer) == 0
+        assert sorted((index, len(records)) for index, records in client.bulks) == \
+               [("index-1", 1), ("index-1", 2), ("index-2", 1)]
+
+        metrics = buffer.metrics
+        assert metrics.flushes == 3
+        assert metrics.flushed_records == 4
+        assert metrics.queue_depth == 0
+
+        await buffer.close()
+
+    asyncio.run(main())
+
+
+def test_records_are_flushed_after_interval_and_newer_version_wins():
+    async def main():
+        client = MockElasticClient()
+        buffer = WriteBehindBuffer(batch_size=10, flush_interval=0.05, max_size=100, client=client)
+
+        await buffer.add("index", _records("1", "2"))
+        await buffer.add("index", _records("1", version=2))
+        assert len(buffer) == 2
+
+        await asyncio.sleep(0.01)
+        assert client.bulks == []
+
+        await asyncio.sleep(0.1)
+        assert len(client.bulks) == 1
+        index, records = client.bulks[0]
+        assert {record['id']: record['version'] for record in records} == {"1": 2, "2": 1}
+
+        await buffer.close()
+
+    asyncio.run(main())
+
+
+def test_full_buffer_applies_backpressure():
+    async def main():
+        client = MockElasticClient(delay=0.02)
+        buffer = WriteBehindBuffer(batch_size=2, flush_interval=60, max_size=4, client=client)
+
+        await buffer.add("index", _records(*[str(i) for i in range(10)]))
+        assert len(buffer) <= 4
+        assert buffer.metrics.backpressure_waits > 0
+
+        await buffer.close()
+        assert sum(len(records) for _, records in client.bulks) == 10
+
+    asyncio.run(main())
+
+
+def test_failed_batches_are_retried_and_dropped_after_max_retries():
+    async def main():
+        client = MockElasticClient(fail=1)
+        buffer = WriteBehindBuffer(batch_size=10, flush_interval=60, max_size=100, max_retries=2, client=client)
+
+        await buffer.add("index", _records("1", "2"))
+        await buffer.close()
+
+        # Second attempt succeeded, _id is kept for retry
+        assert len(client.bulks) == 1
+        assert buffer.metrics.failed_records == 2
+        assert buffer.metrics.flushed_records == 2
+
+        client.fail = 2
+        await buffer.add("index", _records("3"))
+        await buffer.close()
+
+        assert buffer.metrics.dropped_records == 1
+        assert len(buffer) == 0
+
+    asyncio.run(main())
+
+
+def test_only_failed_records_of_batch_are_retried():
+    async def main():
+        client = MockElasticClient(rejected={"2"}, overloaded={"3"})
+        buffer = WriteBehindBuffer(batch_size=10, flush_interval=60, max_size=100, max_retries=3, client=client)
+
+        await buffer.add("index", _records("1", "2", "3", "4"))
+        await buffer.close()
+
+        # Rejected record is dropped at once, overloaded one is sent again alone
+        assert [[record['id'] for record in records] for _, records in client.bulks] == [["1", "4"], ["3"]]
+        metrics = buffer.metrics
+        assert metrics.flushed_records == 3
+        assert metrics.failed_records == 2
+        assert metrics.dropped_records == 1
+        assert len(buffer) == 0
+
+    asyncio.run(main())
+
+
+def test_queued_records_are_flushed_on_shutdown():
+    client = MockElasticClient()
+    buffer = WriteBehindBuffer(batch_size=10, flush_interval=60, max_size=100, client=client)
+
+    async def main():
+        await buffer.add("index-1", _records("1", "2"))
+        assert len(buffer) == 2
+        with patch.object(shutdown, "write_behind_buffer", buffer):
+            await close_all()
+
+    asyncio.run(main())
+
+    assert client.bulks == [("index-1", [{"id": "1", "version": 1}, {"id": "2", "version": 1}])]
+    assert len(buffer) == 0
+
+
+def test_records_left_when_event_loop_ended_are_flushed_at_exit():
+    client = MockElasticClient()
+    buffer = WriteBehindBuffer(batch_size=10, flush_interval=60, max_size=100, client=client)
+
+    async def main():
+        await buffer.add("index-1", _records("1"))
+
+    # Loop ends without close, records are saved in a new loop
+    asyncio.run(main())
+    assert len(buffer) == 1
+
+    flush_at_exit(buffer)
+
+    assert client.bulks == [("index-1", [{"id": "1", "version": 1}])]
+    assert len(buffer) == 0
@@ -0,0 +1,77 @@
+import asyncio
+
+from tracardi.service.tracking.locking import _LocalLockQueue, _decode_lock_value, GlobalMutexLock, Lock
+
+
+def test_local_lock_queue_serves_waiters_in_order():
+    async def main():
+        queue = _LocalLockQueue()
+        order = []
+
+        async def worker(i):
+            assert await queue.acquire("key", timeout=1)
+            order.append(i)
+            await asyncio.sleep(0.01)
+            queue.release("key")
+
+        await asyncio.gather(*[worker(i) for i in range(5)])
+
+        assert order == [0, 1, 2, 3, 4]
+        assert not queue.is_locked("key")
+        assert queue._locks == {}
+
+    asyncio.run(main())
+
+
+def test_local_lock_queue_timeout():
+    async def main():
+        queue = _LocalLockQueue()
+        assert await queue.acquire("key", timeout=1)
+        assert queue.is_locked("key")
+        assert await queue.acquire("key", timeout=0.01) is False
+        queue.release("key")
+        assert queue._locks == {}
+
+    asyncio.run(main())
+
+
+def test_lock_value_decoding():
+    assert _decode_lock_value(b"12:1700000000.5:worker:1") == (12, 1700000000.5, "worker:1")
+    assert _decode_lock_value(None) is None
+
+
+class SyncRedis:
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, name):
+        return self.data.get(name, None)
+
+    def set(self, name, value, ex=None):
+        self.data[name] = value
+
+    def exists(self, name):
+        return int(name in self.data)
+
+    def delete(self, name):
+        self.data.pop(name, None)
+
+
+def test_sync_mutex_locks_and_unlocks():
+    redis = SyncRedis()
+    lock = Lock(redis, "key", 5)
+
+    with GlobalMutexLock(lock, "first") as locked:
+        assert locked.is_locked()
+        assert locked.get_locked_inside() == "first"
+
+    assert not lock.is_locked()
+
+    # Lock held by other mutex is broken after break time
+    Lock(redis, "key", 5).lock("other")
+    with GlobalMutexLock(Lock(redis, "key", 5), "second", break_after_time=0.1) as locked:
+        assert locked.is_broke()
+        assert locked.get_locked_inside() == "other"
+
+    assert not lock.is_locked()
@@ -0,0 +1,140 @@
+import asyncio
+from unittest.mock import patch
+
+from tracardi.context import ServerContext, Context
+from tracardi.domain.entity import Entity, PrimaryEntity
+from tracardi.domain.event_source import EventSource
+from tracardi.domain.named_entity import NamedEntity
+from tracardi.domain.payload.event_payload import EventPayload
+from tracardi.domain.payload.tracker_payload import TrackerPayload
+from tracardi.domain.profile import Profile
+from tracardi.domain.session import Session
+from tracardi.service.change_monitoring.field_change_logger import FieldChangeLogger
+from tracardi.service.tracker_config import TrackerConfig
+from tracardi.service.tracking import batch_tracker
+from tracardi.service.tracking.batch_tracker import group_tracker_payloads, os_batch_tracker, TrackerBatchItem
+from tracardi.service.tracking.cache.session_cache import load_session_cache, get_session_cache_key
+
+
+class _Event:
+
+    def __init__(self, id):
+        self.id = id
+
+    @staticmethod
+    def has_meta_data():
+        return False
+
+
+def _payload(profile_id=None, session_id=None, events=1) -> TrackerPayload:
+    return TrackerPayload(
+        source=Entity(id="source"),
+        session=Entity(id=session_id) if session_id else None,
+        profile=PrimaryEntity(id=profile_id) if profile_id else None,
+        context={},
+        request={},
+        properties={},
+        events=[EventPayload(type="page-view", properties={}) for _ in range(events)],
+        options={}
+    )
+
+
+def test_payloads_are_grouped_by_profile_and_session():
+    payloads = [
+        _payload("p1", "s1"),
+        _payload("p2", "s2"),
+        _payload(None, "s1"),
+        _payload("p3", "s3"),
+        _payload("p2", "s4"),
+        _payload("p3", "s2"),  # Joins group of p2 and group of p3
+        _payload(),
+        _payload(),
+    ]
+
+    assert group_tracker_payloads(payloads) == [[0, 2], [1, 3, 4, 5], [6], [7]]
+
+
+def _track(payloads):
+    saved = {}
+    calls = []
+
+    async def compute(field_change_logger, source, tracker_payload, tracker_config, prefetch=True):
+        assert prefetch is False
+        session_id = tracker_payload.session.id
+        # Next payload of the group gets session computed by the previous one
+        session = await load_session_cache(session_id, Context(production=True))
+        if session is None:
+            session = Session(id=session_id, metadata={"time": {}})
+            session.operation.new = True
+        calls.append(session_id)
+        session.properties["hits"] = session.properties.get("hits", 0) + 1
+        if tracker_payload.properties.get("fail"):
+            # Fails after the session was changed
+            raise ValueError("Failed")
+        profile = Profile(id=tracker_payload.profile.id)
+        return profile, session, [_Event(f"event-{session_id}-{len(calls)}")], tracker_payload
+
+    async def finish(field_change_logger, source, tracker_payload, profile, session, events):
+        return {"session": {"id": session.id}, "hits": session.properties["hits"], "errors": []}
+
+    async def prefetch(ids, context):
+        # Nothing in cache
+        batch_tracker.set_prefetched({get_session_cache_key(session_id, context): None for _, session_id in ids})
+
+    async def save_profile(profiles, context):
+        saved.setdefault("profiles", []).extend(profiles)
+
+    async def save_session(sessions, context):
+        saved.setdefault("sessions", []).extend(sessions)
+
+    async def save_events(events):
+        saved.setdefault("events", []).extend(events)
+
+    async def main():
+        source = EventSource(id="source", type=["rest"], name="test", bridge=NamedEntity(id="api", name="API"))
+        config = TrackerConfig(ip="0.0.0.0", allowed_bridges=["rest"])
+        items = [TrackerBatchItem(FieldChangeLogger(), source, payload, config) for payload in payloads]
+
+        with ServerContext(Context(production=True)), \
+                patch.object(batch_tracker, "compute_tracker_payload", compute), \
+                patch.object(batch_tracker, "finish_tracker_payload", finish), \
+                patch.object(batch_tracker, "prefetch_tracker_cache_many", prefetch), \
+                patch.object(batch_tracker.mutation_profile_db, "save_profile", save_profile), \
+                patch.object(batch_tracker, "save_session", save_session), \
+                patch.object(batch_tracker, "save_events_in_db", save_events):
+            return await os_batch_tracker(items, 0)
+
+    return asyncio.run(main()), saved
+
+
+def test_batch_is_computed_per_group_and_saved_in_bulk():
+    payloads = [_payload("p1", "s1"), _payload("p2", "s2"), _payload("p1", "s1"), _payload("p3", "s3"),
+                _payload("p3", "s3", events=0)]
+    payloads[3].properties["fail"] = True
+
+    results, saved = _track(payloads)
+
+    # Responses in order of payloads
+    assert [result["session"]["id"] if result else None for result in results] == \
+           ["s1", "s2", "s1", "s3", None]
+    # Each payload is finished with its own result
+    assert results[0]["hits"] == 1 and results[2]["hits"] == 2
+    assert results[3]["errors"] == ["Failed"]
+
+    # Bulk save per entity type and index, profile and session of the same group once
+    assert sorted(session.id for session in saved["sessions"]) == ["s1", "s2"]
+    assert len(saved["events"]) == 3
+    assert sorted(profile.id for profile in saved["profiles"]) == ["p1", "p2"]
+
+
+def test_failed_payload_does_not_lose_changes_of_its_group():
+    payloads = [_payload("p1", "s1"), _payload("p1", "s1"), _payload("p1", "s1")]
+    payloads[1].properties["fail"] = True
+
+    results, saved = _track(payloads)
+
+    assert results[1]["errors"] == ["Failed"]
+    # Third payload gets the session computed by the first one, not changed by the failed one
+    assert results[0]["hits"] == 1 and results[2]["hits"] == 2
+    assert [session.properties["hits"] for session in saved["sessions"]] == [2]
+    assert len(saved["events"]) == 2
@@ -0,0 +1,163 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
+from tracardi.context import ServerContext, Context
+from tracardi.domain.destination import Destination, DestinationConfig
+from tracardi.domain.entity import Entity
+from tracardi.domain.event import Event, EventSession
+from tracardi.domain.event_metadata import EventMetadata
+from tracardi.domain.named_entity import NamedEntity
+from tracardi.domain.profile import Profile
+from tracardi.domain.resource import Resource
+from tracardi.domain.time import EventTime
+from tracardi.process_engine.destination.destination_interface import DestinationInterface
+from tracardi.process_engine.destination.http_session_pool import HttpSessionPool
+from tracardi.service.destination import dispatchers, utils
+from tracardi.service.destination.dispatchers import event_destination_dispatch, DestinationLimiter
+from tracardi.service import shutdown
+
+
+class MockConnector(DestinationInterface):
+    instances = 0
+    running = 0
+    max_running = 0
+    dispatched = []
+
+    def __init__(self, debug, resource, destination):
+        super().__init__(debug, resource, destination)
+        MockConnector.instances += 1
+
+    async def _run(self, data):
+        MockConnector.running += 1
+        MockConnector.max_running = max(MockConnector.max_running, MockConnector.running)
+        await asyncio.sleep(0.01)
+        MockConnector.running -= 1
+        MockConnector.dispatched.append((self.destination.id, data))
+
+    async def dispatch_event(self, data, profile, session, event, metadata=None):
+        await self._run(data)
+
+
+class MockBatchConnector(MockConnector):
+
+    def get_batch_size(self) -> int:
+        return 2
+
+    async def dispatch_events(self, batch, profile, session, metadata=None):
+        await self._run([data for data, _ in batch])
+
+
+def _destination(id, class_name, condition=""):
+    return Destination(
+        id=id,
+        name=id,
+        destination=DestinationConfig(package=f"{__name__}.{class_name}"),
+        enabled=True,
+        mapping={"event": "event@id"},
+        condition=condition,
+        resource=Entity(id="resource"),
+        source=NamedEntity(id="source", name="Source")
+    )
+
+
+def _event(id):
+    return Event(id=id, type='page-view', name='Page view', metadata=EventMetadata(time=EventTime()),
+                 session=EventSession(id='1'), source=Entity(id='source'), properties={})
+
+
+def test_events_are_reshaped_once_and_dispatched_concurrently():
+    async def main():
+        MockConnector.instances = 0
+        MockConnector.max_running = 0
+        MockConnector.dispatched = []
+
+        destinations = [
+            _destination("single", "MockConnector"),
+            _destination("batch", "MockBatchConnector"),
+            _destination("skipped", "MockConnector", condition="event@id == \"none\""),
+        ]
+
+        async def load_event_destinations(event_type, source_id):
+            return destinations
+
+        async def load_resource_via_cache(resource_id):
+            return Resource(id=resource_id, name="Resource", type="test")
+
+        events = [_event(str(i)) for i in range(5)]
+        with ServerContext(Context(production=True)), \
+                patch.object(dispatchers, "load_event_destinations", load_event_destinations), \
+                patch.object(utils, "load_resource_via_cache", load_resource_via_cache), \
+                patch.object(dispatchers, "destination_limiter", DestinationLimiter(limit=3)):
+            await event_destination_dispatch(Profile(id="1"), None, events, debug=False)
+
+        # One instance per destination, not per event
+        assert MockConnector.instances == 2
+
+        single = sorted(data["event"] for id, data in MockConnector.dispatched if id == "single")
+        assert single == ["0", "1", "2", "3", "4"]
+
+        batches = [data for id, data in MockConnector.dispatched if id == "batch"]
+        assert sorted(len(batch) for batch in batches) == [1, 2, 2]
+
+        # Limited to 3 concurrent dispatches per destination, both destinations run in parallel
+        assert 3 < MockConnector.max_running <= 6
+
+    asyncio.run(main())
+
+
+def test_http_sessions_are_reused_per_resource():
+    async def main():
+        pool = HttpSessionPool(limit=5)
+        session = pool.get("resource-1")
+        assert pool.get("resource-1") is session
+        assert pool.get("resource-2") is not session
+        assert len(pool) == 2
+
+        await pool.close()
+        assert session.closed
+        assert len(pool) == 0
+
+    asyncio.run(main())
+
+
+def test_http_sessions_of_other_event_loop_are_closed():
+    pool = HttpSessionPool(limit=5)
+
+    async def get():
+        return pool.get("resource-1")
+
+    # Loop of other thread still runs, sessions are closed in it
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    try:
+        session_1 = asyncio.run_coroutine_threadsafe(get(), loop).result()
+
+        async def main():
+            session = await get()
+            for _ in range(100):
+                if session_1.closed:
+                    break
+                await asyncio.sleep(0.01)
+            return session
+
+        session_2 = asyncio.run(main())
+        assert session_1.closed
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    # Loop ended, its sessions are released
+    session_3 = asyncio.run(get())
+    assert session_2.closed
+    assert not session_3.closed
+
+    async def close():
+        with patch.object(shutdown, "http_session_pool", pool):
+            await shutdown.close_all()
+
+    asyncio.run(close())
+    assert session_3.closed
+    assert len(pool) == 0
@@ -1,4 +1,4 @@
-from tracardi.service.notation.dict_traverser import DictTraverser
+from tracardi.service.notation.dict_traverser import DictTraverser, compile_reshape_template
 from tracardi.service.notation.dot_accessor import DotAccessor
 
 
@@ -209,3 +209,27 @@ def test_with_embedded_object_path():
     t = DictTraverser(dot)
     r = t.reshape(query)
     assert r == {'source.id': '6fe7dbfe-4da4-48a8-becd', 'a': {'b∞v': 1}}
+
+
+def test_reshape_template_is_compiled_once():
+    template = {"a?": "profile@a", "b": ["profile@b", 1], "c": {"d?": {"e": "profile@a"}}}
+    compiled = compile_reshape_template(template)
+
+    assert compile_reshape_template({"a?": "profile@a", "b": ["profile@b", 1], "c": {"d?": {"e": "profile@a"}}}) is compiled
+    assert [(i.path, i.source, i.optional, i.constant) for i in compiled.instructions] == [
+        (('root', 'a'), "profile@a", True, False),
+        (('root', 'b', 0), "profile@b", False, False),
+        (('root', 'b', 1), 1, False, True),
+        (('root', 'c', 'd', 'e'), "profile@a", True, False)
+    ]
+
+
+def test_reshaped_data_is_copied():
+    data = {"b": [1, {"c": 2}]}
+    dot = DotAccessor(profile=data)
+    result = DictTraverser(dot).reshape({"x": "profile@b", "y": [None, "profile@b.1.c"], "z": {"2": "profile@b.0"}})
+
+    # Digit keys are list indices
+    assert result == {"x": [1, {"c": 2}], "y": [None, 2], "z": [None, None, 1]}
+    result['x'][1]['c'] = 3
+    assert data == {"b": [1, {"c": 2}]}
@@ -1,3 +1,4 @@
+from tracardi.domain.profile import Profile
 from tracardi.service.notation.dot_accessor import DotAccessor
 
 
@@ -164,4 +165,37 @@ def test_ampersand():
     )
 
     assert dot['profile@@a'] == '1'
-    assert dot['profile@b.@a'] == 1
\ No newline at end of file
+    assert dot['profile@b.@a'] == 1
+
+def test_dot_accessor_reads_models_lazily():
+    profile = Profile(id="1", traits={"a": {"b": 1}, "list": [{"c": "x"}]})
+    dot = DotAccessor(profile=profile, session={"id": "s"})
+
+    assert dot["profile@id"] == "1"
+    assert dot["profile@traits.a.b"] == 1
+    assert dot["profile@traits.list.0.c"] == "x"
+    assert not dot.is_materialized("profile")
+
+    # Non scalar values are read from materialized data
+    assert dot["profile@traits.a"] == {"b": 1}
+    assert dot.is_materialized("profile")
+
+    try:
+        dot["profile@traits.missing"]
+        assert False
+    except KeyError:
+        assert True
+
+
+def test_dot_accessor_writes_materialize_and_set_storage_invalidates():
+    dot = DotAccessor(profile=Profile(id="1", traits={"a": 1}))
+
+    dot["profile@traits.a"] = 2
+    assert dot.is_materialized("profile")
+    assert dot["profile@traits.a"] == 2
+    assert dot.profile["traits"]["a"] == 2
+
+    dot.set_storage("profile", Profile(id="2", traits={"a": 3}))
+    assert not dot.is_materialized("profile")
+    assert dot["profile@traits.a"] == 3
+    assert dot["profile@id"] == "2"
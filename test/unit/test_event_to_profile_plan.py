@@ -0,0 +1,90 @@
+import asyncio
+
+from dotty_dict import dotty
+
+from tracardi.context import ServerContext, Context
+from tracardi.domain.entity import Entity
+from tracardi.domain.event import Event, EventSession
+from tracardi.domain.event_metadata import EventMetadata
+from tracardi.domain.event_to_profile import EventToProfile, EventToProfileMap
+from tracardi.domain.named_entity import NamedEntity
+from tracardi.domain.profile import Profile, FlatProfile
+from tracardi.domain.ref_value import RefValue
+from tracardi.domain.session import Session
+from tracardi.domain.time import EventTime
+from tracardi.service.change_monitoring.field_change_logger import FieldChangeLogger
+from tracardi.service.tracking.event_to_profile_plan import compile_event_to_profile
+from tracardi.service.tracking.profile_data_computation import map_event_to_profile
+
+
+def _schema(name, mapping, condition=None):
+    return EventToProfile(
+        id=name,
+        name=name,
+        event_type=NamedEntity(id="custom-purchase", name="Custom purchase"),
+        enabled=True,
+        config={"condition": condition} if condition else {},
+        event_to_profile=[
+            EventToProfileMap(event=RefValue(ref=True, value=event_ref), profile=RefValue(ref=True, value=profile_ref),
+                              op=op)
+            for event_ref, profile_ref, op in mapping
+        ]
+    )
+
+
+def _flat_event():
+    event = Event(id="1", type='custom-purchase', name='Custom purchase', metadata=EventMetadata(time=EventTime()),
+                  session=EventSession(id='1'), source=Entity(id='source'),
+                  properties={"email": "john@example.com", "product": "book", "value": 10, "empty": ""})
+    return dotty(event.model_dump(exclude_unset=True))
+
+
+def test_schema_is_compiled_once():
+    schema = _schema("a", [
+        ("properties.email", "data.contact.email.main", "equals"),
+        ("properties.product", "unknown.product", "equals"),
+        ("properties.product", "data.preferences.other", "append"),
+    ], condition='event@properties.value > 5')
+
+    plan = compile_event_to_profile(schema)
+
+    assert plan.condition_tree is not None
+    assert plan.condition_error is None
+    # Field outside of allowed profile fields is dropped when compiled.
+    assert [(event_ref, profile_ref) for event_ref, profile_ref, _ in plan.fields] == [
+        ("properties.email", "data.contact.email.main"),
+        ("properties.product", "data.preferences.other")
+    ]
+
+    assert compile_event_to_profile(_schema("b", [], condition="event@properties.value >")).condition_error \
+           is not None
+
+
+def test_event_is_mapped_to_flat_profile_with_compiled_plans():
+    async def main():
+        with ServerContext(Context(production=False)):
+            plans = [compile_event_to_profile(schema) for schema in [
+                _schema("email", [("properties.email", "data.contact.email.main", "equals")]),
+                # Condition reads data copied by previous schema
+                _schema("product", [("properties.product", "data.preferences.other", "append"),
+                                    ("properties.empty", "traits.empty", "equals")],
+                        condition='profile@data.contact.email.main == "john@example.com"'),
+                _schema("not-met", [("properties.value", "traits.value", "equals")],
+                        condition='event@properties.value > 100'),
+                _schema("invalid-condition", [("properties.value", "traits.invalid", "equals")],
+                        condition='event@properties.value >'),
+                _schema("if-not-exists", [("properties.value", "traits.value", "equals_if_not_exists")]),
+            ]]
+
+            flat_profile = FlatProfile(Profile(id="1").model_dump())
+            flat_profile, _ = await map_event_to_profile(plans, _flat_event(), flat_profile,
+                                                         Session.new(), FieldChangeLogger())
+
+            assert flat_profile['data.contact.email.main'] == "john@example.com"
+            assert flat_profile['data.preferences.other'] == ["book"]
+            assert flat_profile['traits.value'] == 10
+            assert 'traits.empty' not in flat_profile
+            assert 'traits.invalid' not in flat_profile
+            assert flat_profile['operation.update'] is True
+
+    asyncio.run(main())
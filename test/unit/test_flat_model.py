@@ -0,0 +1,73 @@
+import pytest
+from pydantic import ValidationError
+
+from tracardi.context import ServerContext, Context
+from tracardi.domain.entity import Entity
+from tracardi.domain.event import Event, EventSession
+from tracardi.domain.event_metadata import EventMetadata
+from tracardi.domain.flat_model import FlatModel
+from tracardi.domain.profile import Profile, FlatProfile
+from tracardi.domain.time import EventTime
+from tracardi.service.tracking.event_data_computation import _to_event
+
+
+def test_changed_fields_are_recorded():
+    flat = FlatModel({"a": {"b": 1, "c": [1]}, "d": 1, "e": {"f": 1}, "g": 1})
+
+    assert flat['a.b'] == 1
+    assert flat.changed_fields == set()
+
+    # List may be changed in place
+    flat['a.c'].append(2)
+    flat['d'] = 2
+    del flat['e.f']
+    assert flat.changed_fields == {'a', 'd', 'e'}
+    assert flat.changed_data() == {"a": {"b": 1, "c": [1, 2]}, "d": 2, "e": {}}
+    assert flat.is_tracked()
+
+    flat.update({"g": 2})
+    assert not flat.is_tracked()
+
+
+def test_profile_is_updated_with_changed_fields_only():
+    profile = Profile(id="1", traits={"a": 1})
+    profile.data.pii.firstname = "John"
+
+    flat_profile = FlatProfile(profile.model_dump())
+    flat_profile['data.contact.email.main'] = "john@example.com"
+    flat_profile['ids'].append("2")
+    flat_profile['traits.b'] = 2
+
+    new_profile = flat_profile.to_profile(profile)
+
+    assert new_profile is not profile
+    assert new_profile.data.contact.email.main == "john@example.com"
+    assert new_profile.data.pii.firstname == "John"
+    assert new_profile.ids == ["1", "2"]
+    assert new_profile.traits == {"a": 1, "b": 2}
+    # Not changed fields are not validated again
+    assert new_profile.stats is profile.stats
+    assert new_profile.metadata is profile.metadata
+    assert profile.data.contact.email.main is None
+
+    flat_profile = FlatProfile(profile.model_dump())
+    flat_profile['stats.visits'] = "not a number"
+    with pytest.raises(ValidationError):
+        flat_profile.to_profile(profile)
+
+
+def test_event_is_updated_with_changed_fields_only():
+    with ServerContext(Context(production=False)):
+        event = Event(id="1", type='page-view', metadata=EventMetadata(time=EventTime()),
+                      session=EventSession(id='1'), source=Entity(id='source'), properties={"a": 1})
+
+        flat_event = FlatModel(event.model_dump(exclude_unset=True))
+        flat_event['traits.a'] = flat_event['properties.a']
+        flat_event['context.empty'] = {}
+        flat_event['journey.state'] = "awareness"
+
+        new_event = _to_event(flat_event, event)
+        assert new_event.traits == {"a": 1}
+        assert new_event.context == {}
+        assert new_event.journey.state == "awareness"
+        assert new_event.metadata is event.metadata
@@ -0,0 +1,138 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from tracardi.context import ServerContext, Context, get_context
+from tracardi.domain.flow import Flow, FlowRecord
+from tracardi.process_engine.action.v1.end_action import EndAction
+from tracardi.process_engine.action.v1.flow.start.start_action import StartAction
+from tracardi.service.decorators.function_memory_cache import invalidate_cache
+from tracardi.service.wf.service.builders import action
+from tracardi.service.wf.service.flow_cache import CompiledFlowCache
+
+
+def _flow_record(timestamp: datetime) -> FlowRecord:
+    start = action(StartAction)
+    start.data.start = True
+    end = action(EndAction)
+
+    flow = Flow.build("Test flow", id="flow-1")
+    flow += start('payload') >> end('payload')
+
+    return FlowRecord(
+        id=flow.id,
+        name=flow.name,
+        type=flow.type,
+        timestamp=timestamp,
+        draft=flow.model_dump(mode='json')
+    )
+
+
+def test_compiled_flow_cache_hits_and_invalidation():
+    async def main():
+        with ServerContext(Context(production=True)):
+            timestamp = datetime.now()
+            calls = []
+
+            async def loader(flow_id):
+                calls.append(flow_id)
+                return _flow_record(timestamp)
+
+            cache = CompiledFlowCache(ttl=60, max_size=10)
+
+            flow_1 = await cache.load_flow("flow-1", loader)
+            flow_2 = await cache.load_flow("flow-1", loader)
+
+            assert len(calls) == 1
+            assert flow_1 is not flow_2
+            assert flow_1.get_change_log() is not flow_2.get_change_log()
+
+            dag_1 = cache.make_execution_dag(flow_1, scheduled_node_id=None, debug=False)
+            dag_2 = cache.make_execution_dag(flow_2, scheduled_node_id=None, debug=True)
+
+            assert [node.id for node in dag_1.graph] == [node.id for node in dag_2.graph]
+            assert dag_1.graph[0] is not dag_2.graph[0]
+            assert dag_1.graph[0].graph is dag_2.graph[0].graph
+            assert dag_2.debug is True
+
+            stats = cache.get_stats()
+            assert stats['hits'] == 1
+            assert stats['misses'] == 1
+            assert stats['compilations'] == 1
+
+            cache.invalidate("flow-1")
+            await cache.load_flow("flow-1", loader)
+
+            assert len(calls) == 2
+            assert cache.get_stats()['invalidations'] == 1
+
+    asyncio.run(main())
+
+
+def test_compiled_flow_cache_revalidation():
+    async def main():
+        with ServerContext(Context(production=True)):
+            versions = [datetime.now()]
+
+            async def loader(flow_id):
+                return _flow_record(versions[-1])
+
+            cache = CompiledFlowCache(ttl=0, max_size=10)
+
+            flow = await cache.load_flow("flow-1", loader)
+            await cache.load_flow("flow-1", loader)
+            assert cache.get_stats()['misses'] == 1
+
+            versions.append(versions[-1] + timedelta(seconds=1))
+            new_flow = await cache.load_flow("flow-1", loader)
+            assert cache.get_stats()['misses'] == 2
+            assert new_flow.timestamp != flow.timestamp
+
+            # Stale flow version is compiled but not cached
+            cache.make_execution_dag(flow, scheduled_node_id=None, debug=False)
+            cache.make_execution_dag(flow, scheduled_node_id=None, debug=False)
+            assert cache.get_stats()['compilations'] == 2
+
+    asyncio.run(main())
+
+
+def test_compiled_flow_cache_is_tenant_aware():
+    async def main():
+        async def loader(flow_id):
+            return _flow_record(datetime.now())
+
+        cache = CompiledFlowCache(ttl=60, max_size=1)
+
+        with ServerContext(Context(production=True)):
+            await cache.load_flow("flow-1", loader)
+        with ServerContext(Context(production=False)):
+            await cache.load_flow("flow-1", loader)
+
+        stats = cache.get_stats()
+        assert stats['misses'] == 2
+        assert stats['evictions'] == 1
+        assert len(cache) == 1
+
+    asyncio.run(main())
+
+
+def test_compiled_flow_cache_is_invalidated_by_workflow_table_change():
+    async def main():
+        async def loader(flow_id):
+            return _flow_record(datetime.now())
+
+        cache = CompiledFlowCache(ttl=60, max_size=10)
+
+        with ServerContext(Context(production=True)):
+            await cache.load_flow("flow-1", loader)
+            await cache.load_flow("flow-2", loader)
+            tenant = get_context().tenant
+
+        # Workflows of other tenant changed
+        invalidate_cache(('workflow',), "other-tenant")
+        assert len(cache) == 2
+
+        invalidate_cache(('workflow',), tenant)
+        assert len(cache) == 0
+        assert cache.get_stats()['invalidations'] == 2
+
+    asyncio.run(main())
@@ -1,9 +1,22 @@
 import asyncio
+import json
+from unittest.mock import patch
 
+from tracardi.config import memory_cache
 from tracardi.context import ServerContext, Context, get_context
-from tracardi.service.decorators.function_memory_cache import cache_for, cache, async_cache_for, delete_cache, has_cache
+from tracardi.service.decorators.function_memory_cache import cache_for, cache, async_cache_for, delete_cache, \
+    has_cache, publish_cache_invalidation, _invalidation_listener
 import time
 
+loads = []
+
+
+@async_cache_for(0.2, stale_ttl=10, tables=('resource',))
+async def z(a):
+    loads.append(a)
+    await asyncio.sleep(0.05)
+    return len(loads)
+
 
 @cache_for(0.5, max_size=2, allow_null_values=False)
 def x(a):
@@ -98,3 +111,63 @@ def test_multi_tenant():
         assert not has_cache(x, 1)
         with ServerContext(Context(production=False)):
             assert has_cache(x, 1)
+
+
+def test_concurrent_misses_load_once_and_stale_value_is_refreshed_in_background():
+    async def main():
+        loads.clear()
+        with ServerContext(Context(production=True)), \
+                patch.object(memory_cache, "config_cache_invalidation", False):
+            assert await asyncio.gather(*[z(1) for _ in range(10)]) == [1] * 10
+            assert loads == [1]
+
+            # Stale value is returned and reloaded in background
+            await asyncio.sleep(0.3)
+            assert await z(1) == 1
+            assert await z(1) == 1
+            await asyncio.sleep(0.1)
+            assert loads == [1, 1]
+            assert await z(1) == 2
+
+    asyncio.run(main())
+
+
+def test_cache_is_invalidated_by_table_change():
+    async def main():
+        with patch.object(memory_cache, "config_cache_invalidation", False), \
+                ServerContext(Context(production=True)):
+            await publish_cache_invalidation('resource')
+            loads.clear()
+
+            assert await z(1) == 1
+            assert await z(1) == 1
+            await publish_cache_invalidation('resource')
+            assert await z(1) == 2
+
+            await publish_cache_invalidation('destination')
+            assert await z(1) == 2
+
+            # Message from other process, other tenant is not affected
+            _invalidation_listener.receive(json.dumps({"origin": "other", "tenant": "other-tenant",
+                                                       "tables": ["resource"]}))
+            assert await z(1) == 2
+
+            _invalidation_listener.receive(json.dumps({"origin": "other", "tenant": get_context().tenant,
+                                                       "tables": ["resource"]}))
+            assert await z(1) == 3
+
+    asyncio.run(main())
+
+
+def test_cache_is_bounded_with_lru_eviction():
+    with ServerContext(Context(production=True)):
+        fnc_str = f"{get_context().__hash__()}:unit.test_function_memory_cache:x"
+
+        x(10)
+        x(11)
+        x(10)  # 11 is least recently used now
+        x(12)
+
+        assert len(cache[fnc_str].memory_buffer) == 2
+        assert has_cache(x, 10)
+        assert not has_cache(x, 11)
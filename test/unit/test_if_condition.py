@@ -33,3 +33,18 @@ def test_if_condition_for_spaces():
         assert result is False
 
     asyncio.run(main())
+
+
+def test_if_condition_parse_cache():
+    async def main():
+        condition = Condition()
+        condition.cache_clear()
+
+        assert await condition.evaluate("payload@A.a == 1", DotAccessor(payload={"A": {"a": 1}})) is True
+        assert await condition.evaluate("payload@A.a == 1", DotAccessor(payload={"A": {"a": 2}})) is False
+
+        cache_info = condition.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 1
+
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+import asyncio
+import json
+import threading
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+from tracardi.worker.misc.json_data import to_json_data, default_none_serializable_data
+from tracardi.worker.service.import_dispatcher import ImportDispatcher
+
+
+class MockImporter:
+
+    def __init__(self, batches, total):
+        self._batches = batches
+        self.total = total
+        self.closed = False
+        self.threads = set()
+
+    def batches(self, credentials):
+        try:
+            for batch in self._batches:
+                self.threads.add(threading.current_thread())
+                yield batch, self.total
+        finally:
+            self.closed = True
+
+
+def test_records_are_sent_in_batches():
+    async def main():
+        sent = []
+
+        async def send(session, url, record):
+            sent.append((url, record))
+            return record['id'] != 3
+
+        importer = MockImporter([[{"id": 1}, {"id": 2}], [{"id": 3}]], total=3)
+        dispatcher = ImportDispatcher(None, importer, "/collect/type/source", progress_interval=0)
+
+        with patch.object(ImportDispatcher, "_send", staticmethod(send)):
+            progress = [item async for item in dispatcher.run("http://localhost:8686/")]
+
+        assert sent == [("http://localhost:8686/collect/type/source", {"id": id}) for id in (1, 2, 3)]
+        assert progress == [(2 / 3 * 100, 1), (100, 2)]
+        assert importer.closed
+        assert threading.current_thread() not in importer.threads
+
+    asyncio.run(main())
+
+
+def test_progress_is_throttled():
+    async def main():
+        async def send(session, url, record):
+            return True
+
+        importer = MockImporter([[{"id": n}] for n in range(100)], total=100)
+        dispatcher = ImportDispatcher(None, importer, "/collect/type/source", progress_interval=3600)
+
+        with patch.object(ImportDispatcher, "_send", staticmethod(send)):
+            assert [item async for item in dispatcher.run("http://localhost:8686")] == []
+
+    asyncio.run(main())
+
+
+def test_records_are_converted_as_json():
+    record = {"a": datetime(2024, 1, 1), "b": {1}, "c": Decimal(1), "d": (1, [2, {3: None, True: 1}]), "e": b"x"}
+    assert to_json_data(record) == json.loads(json.dumps(record, default=default_none_serializable_data))
@@ -0,0 +1,57 @@
+import asyncio
+from unittest.mock import patch
+
+from tracardi.domain.profile import Profile
+from tracardi.domain.storage_record import RecordMetadata, StorageRecord
+from tracardi.service.storage.driver.elastic import profile as profile_db
+from tracardi.service.storage.elastic import index_locator as locator_module
+from tracardi.service.storage.elastic.index_locator import IndexLocator
+
+
+def _record(id, index):
+    record = StorageRecord(id=id)
+    record.set_meta_data(RecordMetadata(id=id, index=index))
+    return record
+
+
+def test_profiles_are_loaded_from_located_index(redis):
+    async def main():
+        locator = IndexLocator(('profile',), buckets=4)
+        stored = {("1", "profile-2024-1"): _record("1", "profile-2024-1")}
+        searches = []
+
+        async def load_from_index(profile_id, index):
+            return stored.get((profile_id, index), None)
+
+        async def search_by_id(profile_id):
+            searches.append(profile_id)
+            return next((record for (id, _), record in stored.items() if id == profile_id), None)
+
+        profile = Profile(id="1")
+        profile.set_meta_data(RecordMetadata(id="1", index="profile-2024-1"))
+
+        with patch.object(locator_module, "AsyncRedisClient", redis), \
+                patch.object(profile_db, "index_locator", locator), \
+                patch.object(profile_db, "load_from_index", load_from_index), \
+                patch.object(profile_db, "_search_by_id", search_by_id):
+
+            # Saved profile is located without search
+            await locator.record('profile', [profile, Profile(id="no-metadata")])
+            assert (await profile_db.load_by_id("1")).get_meta_data().index == "profile-2024-1"
+            assert searches == []
+
+            # Stale location falls back to search and is repaired
+            del stored[("1", "profile-2024-1")]
+            stored[("1", "profile-2024-2")] = _record("1", "profile-2024-2")
+            assert (await profile_db.load_by_id("1")).get_meta_data().index == "profile-2024-2"
+            assert searches == ["1"]
+            assert await locator.locate('profile', "1") == "profile-2024-2"
+
+            # Unknown profile
+            assert await profile_db.load_by_id("2") is None
+
+        metrics = locator.metrics['profile']
+        assert (metrics.hits, metrics.misses, metrics.stale) == (3, 1, 1)
+        assert metrics.hit_rate() == 0.75
+
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+import asyncio
+from unittest.mock import patch
+
+from tracardi.context import ServerContext, Context, get_context
+from tracardi.service import latency
+from tracardi.service.latency import LatencyHistogram, StageLatency, stage, trace_request, timed
+
+
+def test_histogram_quantiles():
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000)
+
+    assert histogram.count == 1000
+    assert histogram.max == 1
+    # Buckets are precise to 1/32 of the value
+    assert abs(histogram.quantile(0.5) - 0.5) <= 0.5 / 32
+    assert abs(histogram.quantile(0.99) - 0.99) <= 0.99 / 32
+    assert histogram.quantile(1) == 1
+    assert LatencyHistogram().quantile(0.5) == 0
+
+
+def test_stages_are_recorded_per_tenant_and_source():
+    stage_latency = StageLatency(enabled=True, slow_request_threshold=0, slow_request_samples=10)
+
+    @timed("storage")
+    async def save():
+        await asyncio.sleep(0)
+
+    async def main():
+        with trace_request("source-1"):
+            with stage("compute_data"):
+                pass
+            await save()
+
+    with patch.object(latency, 'stage_latency', stage_latency):
+        with ServerContext(Context(production=False)):
+            tenant = get_context().tenant
+            asyncio.run(main())
+
+    stats = {item['stage']: item for item in stage_latency.stats()}
+    assert set(stats) == {"request", "compute_data", "storage"}
+    assert stats['storage']['tenant'] == tenant
+    assert stats['storage']['source'] == "source-1"
+    assert stats['storage']['count'] == 1
+    # Trees are kept only for slow request sampling
+    assert not stage_latency.slow_requests
+
+    exported = stage_latency.export_prometheus()
+    assert f'tracardi_stage_latency_seconds_count{{stage="storage",tenant="{tenant}",source="source-1"}} 1' in exported
+    assert f'stage="request",tenant="{tenant}",source="source-1",quantile="0.99"' in exported
+
+
+def test_slow_requests_are_sampled():
+    stage_latency = StageLatency(enabled=True, slow_request_threshold=1, slow_request_samples=1)
+
+    async def main():
+        with trace_request("source-1"):
+            with stage("destination.profile", label="WebHookConnector"):
+                await asyncio.sleep(0.002)
+
+    with patch.object(latency, 'stage_latency', stage_latency):
+        with ServerContext(Context(production=False)):
+            asyncio.run(main())
+            asyncio.run(main())
+
+    assert len(stage_latency.slow_requests) == 1
+    span = stage_latency.slow_requests[0]['span']
+    assert span['name'] == "request"
+    assert span['children'][0]['name'] == "destination.profile"
+    assert span['children'][0]['label'] == "WebHookConnector"
+    assert span['children'][0]['duration'] >= 0.002
+
+
+def test_nothing_is_recorded_when_disabled():
+    stage_latency = StageLatency(enabled=False, slow_request_threshold=1, slow_request_samples=1)
+
+    with patch.object(latency, 'stage_latency', stage_latency):
+        with ServerContext(Context(production=False)):
+            with trace_request("source-1"):
+                with stage("compute_data"):
+                    pass
+        # Stage outside of traced request
+        with stage("compute_data"):
+            pass
+
+    assert stage_latency.histograms == {}
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+from contextlib import ExitStack
+from unittest.mock import patch
+
+from tracardi.context import ServerContext, Context, get_context
+from tracardi.exceptions import log_handler as log_handler_module
+from tracardi.exceptions.log_handler import StackInfoLogger
+from tracardi.exceptions.storage.elastic import ElasticLogHandler
+from tracardi.service import logger_manager
+
+
+def _logger(handler: ElasticLogHandler, name: str = "test") -> StackInfoLogger:
+    logger = StackInfoLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    return logger
+
+
+def test_buffer_is_bounded_and_repeats_are_counted():
+    handler = ElasticLogHandler(max_size=3, dedup_window=60)
+    logger = _logger(handler)
+    context = Context(production=False)
+
+    with ServerContext(context):
+        for _ in range(5):
+            logger.info("repeated")
+        for i in range(4):
+            logger.warning(f"message {i}")
+
+    assert len(handler) == 3
+    assert handler.deduplicated == 4
+    assert handler.buffers[context].dropped == {"WARNING": 2}
+
+    batch = handler.pop_batch(context, 2)
+    assert [log['message'] for log in batch] == [
+        "Log buffer was full, 2 logs were dropped (WARNING: 2).",
+        "repeated (repeated 4 times)"
+    ]
+    assert [log['message'] for log in handler.pop_batch(context, 2)] == ["message 0", "message 1"]
+    assert not handler.has_logs()
+
+    # Repeated log is buffered again after the first one was taken from the buffer
+    with ServerContext(context):
+        logger.info("repeated")
+    assert [log['message'] for log in handler.pop_batch(context, 10)] == ["repeated"]
+
+
+def test_stack_is_captured_for_first_of_repeated_errors():
+    handler = ElasticLogHandler(max_size=10, dedup_window=60)
+    logger = _logger(handler, "stack")
+    context = Context(production=False)
+
+    with ServerContext(context), patch.object(log_handler_module, 'log_handler', handler):
+        logger.error("error")
+        logger.error("error")
+        logger.error("other error")
+
+    logs = handler.pop_batch(context, 10)
+    assert [log['message'] for log in logs] == ["error (repeated 1 times)", "other error"]
+    assert all(log['stack_info'] for log in logs)
+    # Caller of error is logged, not the logger
+    assert logs[0]['file'] == "test_log_handler.py"
+
+
+def _patch_saving(handler: ElasticLogHandler, save, batch_size: int = 500):
+    async def is_on():
+        return True
+
+    async def has_logs_index(context):
+        return True
+
+    return patch.object(logger_manager, 'log_handler', handler), \
+        patch.object(logger_manager, 'is_save_logs_on', is_on), \
+        patch.object(logger_manager.installation_status, 'has_logs_index', has_logs_index), \
+        patch.object(logger_manager.log_db, 'save', save), \
+        patch.object(logger_manager.tracardi, 'log_save_batch_size', batch_size), \
+        patch.object(logger_manager.License, 'has_license', lambda: False)
+
+
+def test_logs_are_saved_in_bounded_batches():
+    handler = ElasticLogHandler(max_size=10, dedup_window=60)
+    logger = _logger(handler, "batches")
+    with ServerContext(Context(production=False)):
+        for i in range(5):
+            logger.info(f"message {i}")
+
+    saved = []
+
+    async def save(logs):
+        saved.append([log['message'] for log in logs])
+
+    with ExitStack() as stack:
+        for patcher in _patch_saving(handler, save, batch_size=2):
+            stack.enter_context(patcher)
+        assert asyncio.run(logger_manager.save_logs()) is True
+
+    assert saved == [["message 0", "message 1"], ["message 2", "message 3"], ["message 4"]]
+    assert not handler.has_logs()
+
+
+def test_logs_are_saved_in_context_they_were_logged_in():
+    handler = ElasticLogHandler(max_size=10, dedup_window=60)
+    logger = _logger(handler, "contexts")
+    test, production = Context(production=False), Context(production=True)
+
+    # Logs without context can not be saved and do not wait in the buffer
+    logger.info("no context")
+    with ServerContext(test):
+        logger.info("test 1")
+        with ServerContext(production):
+            logger.info("production 1")
+        logger.info("test 2")
+
+    assert handler.without_context == 1
+    assert len(handler) == 3
+
+    saved = []
+
+    async def save(logs):
+        saved.append((get_context().production, [log['message'] for log in logs]))
+
+    with ExitStack() as stack:
+        for patcher in _patch_saving(handler, save):
+            stack.enter_context(patcher)
+        asyncio.run(logger_manager.save_logs())
+
+    assert saved == [(False, ["test 1", "test 2"]), (True, ["production 1"])]
+    assert not handler.has_logs()
+
+
+def test_log_saver_stops_after_failed_save():
+    handler = ElasticLogHandler(max_size=10, dedup_window=60)
+    logger = _logger(handler, "saver")
+    saves = []
+
+    async def save(logs):
+        saves.append(logs)
+        raise ConnectionError("Elastic is down.")
+
+    async def main():
+        saver = logger_manager.LogSaver(interval=0.01)
+        handler.on_log = saver.schedule
+        with ServerContext(Context(production=False)):
+            logger.info("message 1")
+            logger.info("message 2")
+        await asyncio.wait_for(saver._task, 1)
+
+    with ExitStack() as stack:
+        for patcher in _patch_saving(handler, save, batch_size=1):
+            stack.enter_context(patcher)
+        asyncio.run(main())
+
+    # Saver does not retry, remaining logs wait for the next log to schedule it
+    assert len(saves) == 1
+    assert len(handler) == 1
@@ -0,0 +1,96 @@
+import asyncio
+from unittest.mock import patch
+
+from tracardi.context import ServerContext, Context
+from tracardi.service.merging import merge_executor as executor_module
+from tracardi.service.merging.merge_executor import MergeExecutor
+from tracardi.service.storage.elastic import profile_alias as alias_module
+from tracardi.service.storage.elastic.profile_alias import ProfileAliasTable
+
+
+class MockRawDb:
+
+    def __init__(self, conflicts=None):
+        self.updates = []
+        self.checks = 0
+        # Version conflicts reported by tasks, by task id
+        self.conflicts = conflicts or {}
+
+    async def start_profile_ids_update(self, index, old_profile_ids, merged_profile_id, slices='auto'):
+        self.updates.append((index, sorted(old_profile_ids), merged_profile_id))
+        return f"task-{len(self.updates)}"
+
+    async def get_task(self, task_id):
+        self.checks += 1
+        return {"completed": self.checks > 2, "response": {"updated": 1, "failures": [],
+                                                            "version_conflicts": self.conflicts.get(task_id, 0)}}
+
+
+def test_duplicates_are_moved_with_one_task_per_index(redis):
+    async def main():
+        raw_db = MockRawDb()
+        table = ProfileAliasTable()
+        executor = MergeExecutor(('event', 'session'), slices='auto', check_interval=0, alias_ttl=60)
+
+        with ServerContext(Context(production=False)), \
+                patch.object(alias_module, "AsyncRedisClient", redis), \
+                patch.object(executor_module, "profile_alias_table", table), \
+                patch.object(executor_module, "raw_db", raw_db):
+
+            # Profile "x" was merged into "b" before and its events are still moving
+            await table.add("b", ["x"], ttl=60)
+
+            task_ids = await executor.move("a", ["a", "b", "c", "c"])
+
+            assert task_ids == ["task-1", "task-2"]
+            assert raw_db.updates == [('event', ['b', 'c', 'x'], 'a'), ('session', ['b', 'c', 'x'], 'a')]
+
+            # Reads of duplicates are redirected until tasks end
+            assert await table.resolve("x") == "a"
+            assert await table.resolve("a") == "a"
+            assert await table.profile_id_query("a") == {"terms": {"profile.id": ["a", "b", "c", "x"]}}
+
+            await executor.join()
+
+            assert await table.resolve("c") == "c"
+            assert await table.profile_id_query("a") == {"term": {"profile.id": "a"}}
+            # Alias of other merge is kept
+            assert await table.aliases("b") == ["x"]
+
+    asyncio.run(main())
+
+
+def test_nothing_is_moved_without_duplicates():
+    async def main():
+        raw_db = MockRawDb()
+        executor = MergeExecutor(('event', 'session'), slices='auto', check_interval=0, alias_ttl=60)
+        with patch.object(executor_module, "raw_db", raw_db):
+            assert await executor.move("a", ["a"]) == []
+        assert raw_db.updates == []
+
+    asyncio.run(main())
+
+
+def test_documents_skipped_on_version_conflicts_are_moved_again(redis):
+    async def main():
+        # Event task skips a document written while it ran, session task keeps conflicting
+        raw_db = MockRawDb(conflicts={"task-1": 1, "task-2": 2, "task-4": 1, "task-5": 1})
+        table = ProfileAliasTable()
+        executor = MergeExecutor(('event', 'session'), slices='auto', check_interval=0, alias_ttl=60,
+                                 conflict_retries=2)
+
+        with ServerContext(Context(production=False)), \
+                patch.object(alias_module, "AsyncRedisClient", redis), \
+                patch.object(executor_module, "profile_alias_table", table), \
+                patch.object(executor_module, "raw_db", raw_db):
+
+            assert await executor.move("a", ["b"]) == ["task-1", "task-2"]
+            await executor.join()
+
+            assert [(index, task) for task, (index, _, _) in enumerate(raw_db.updates, 1)] == [
+                ('event', 1), ('session', 2), ('event', 3), ('session', 4), ('session', 5)
+            ]
+            # Session documents were not all moved, reads of duplicate are still redirected
+            assert await table.resolve("b") == "a"
+
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import patch
+
+from tracardi.context import ServerContext, Context
+from tracardi.domain.entity import Entity
+from tracardi.domain.event import Event, EventSession
+from tracardi.domain.event_metadata import EventMetadata
+from tracardi.domain.flow import Flow, FlowRecord
+from tracardi.domain.profile import Profile
+from tracardi.domain.session import Session
+from tracardi.domain.time import EventTime
+from tracardi.process_engine.action.v1.end_action import EndAction
+from tracardi.process_engine.action.v1.flow.start.start_action import StartAction
+from tracardi.service.wf.domain import graph_invoker
+from tracardi.service.wf.domain.flow_history import FlowHistory
+from tracardi.service.wf.domain.work_flow import WorkFlow
+from tracardi.service.wf.service import node_profiler as node_profiler_module
+from tracardi.service.wf.service.builders import action
+from tracardi.service.wf.service.flow_cache import CompiledFlowCache
+from tracardi.service.wf.service.node_profiler import NodeProfiler
+
+
+def _flow_record() -> FlowRecord:
+    start = action(StartAction)
+    start.data.start = True
+    end = action(EndAction)
+
+    flow = Flow.build("Test flow", id="flow-1")
+    flow += start('payload') >> end('payload')
+
+    return FlowRecord(
+        id=flow.id,
+        name=flow.name,
+        type=flow.type,
+        timestamp=datetime.now(),
+        draft=flow.model_dump(mode='json')
+    )
+
+
+def _event(debug: bool = False) -> Event:
+    event = Event(id="1", type='page-view', metadata=EventMetadata(time=EventTime()),
+                  session=EventSession(id='1'), source=Entity(id='source'))
+    event.metadata.debug = debug
+    return event
+
+
+def test_node_time_is_aggregated_per_flow_and_node(redis):
+    profiler = NodeProfiler(enabled=True, sample_rate=100, flush_interval=60, ttl=60)
+
+    async def loader(flow_id):
+        return _flow_record()
+
+    async def main():
+        with ServerContext(Context(production=False)):
+            flow = await CompiledFlowCache(ttl=60, max_size=10).load_flow("flow-1", loader)
+            for debug in (False, False, True):
+                await WorkFlow(FlowHistory(history=[])).invoke(flow, _event(debug), Profile(id="1"), Session.new(),
+                                                                [], debug=False)
+
+            await profiler.flush()
+            assert profiler._stats == {}
+
+            assert await profiler.load_flows() == ["flow-1"]
+            return await profiler.load("flow-1")
+
+    with patch.object(graph_invoker, 'node_profiler', profiler), \
+            patch.object(node_profiler_module, 'AsyncRedisClient', redis):
+        nodes = asyncio.run(main())
+
+    # Debug run is not profiled
+    assert [(node.plugin, node.calls, node.errors) for node in nodes] == [("EndAction", 2, 0)]
+    assert nodes[0].flow_id == "flow-1"
+    assert 0 < nodes[0].quantiles["0.5"] <= nodes[0].max_time
+
+
+def test_profiles_are_merged_in_storage(redis):
+    profiler = NodeProfiler(enabled=True, sample_rate=100, flush_interval=60, ttl=60)
+
+    async def main():
+        with ServerContext(Context(production=True)):
+            for _ in range(2):
+                stats = profiler.sample("flow-1")
+                for ms in range(1, 101):
+                    stats.record("node-1", "WebHookAction", ms / 1000, error=ms > 90)
+                stats.record("node-2", "EndAction", 0.001, error=False)
+                await profiler.flush()
+            return await profiler.load("flow-1")
+
+    with patch.object(node_profiler_module, 'AsyncRedisClient', redis):
+        nodes = asyncio.run(main())
+
+    webhook, end = nodes
+    assert (webhook.node_id, webhook.calls, webhook.errors, webhook.error_rate) == ("node-1", 200, 20, 0.1)
+    assert abs(webhook.avg_time - 0.0505) < 0.0001
+    assert abs(webhook.quantiles["0.99"] - 0.099) <= 0.099 / 32
+    assert webhook.max_time >= 0.1
+    assert (end.node_id, end.calls) == ("node-2", 2)
+
+
+def test_sampling():
+    assert NodeProfiler(enabled=False, sample_rate=100, flush_interval=60, ttl=60).sample("flow-1") is None
+    with ServerContext(Context(production=False)):
+        assert NodeProfiler(enabled=True, sample_rate=0, flush_interval=60, ttl=60).sample("flow-1") is None
+        assert NodeProfiler(enabled=True, sample_rate=100, flush_interval=60, ttl=60).sample("flow-1") is not None
@@ -0,0 +1,80 @@
+import asyncio
+
+from tracardi.service.plugin.domain.result import Result
+from tracardi.service.plugin.runner import ActionRunner
+from tracardi.service.wf.domain.node import Node
+from tracardi.service.wf.service.life_cycle import plugin as life_cycle
+from tracardi.service.wf.service.plugin_pool import PluginPool
+
+
+class ReusablePlugin(ActionRunner):
+    reusable = True
+    set_ups = 0
+    closed = 0
+
+    async def set_up(self, init):
+        ReusablePlugin.set_ups += 1
+        self.client = object()
+
+    async def run(self, payload: dict, in_edge=None):
+        return Result(port="payload", value=payload)
+
+    async def close(self):
+        ReusablePlugin.closed += 1
+
+
+def _node() -> Node:
+    return Node(id="node-1", className="ReusablePlugin", module=__name__)
+
+
+def _set_context(node: Node, event):
+    return life_cycle.set_context(node, event, None, None, None, None, {}, {}, [], None, None, False)
+
+
+def test_reusable_plugin_is_set_up_once_and_context_is_swapped():
+    async def main():
+        ReusablePlugin.set_ups = 0
+        ReusablePlugin.closed = 0
+        pool = PluginPool()
+
+        node_1 = _node()
+        node_1.object = await life_cycle.create_instance(node_1, pool)
+        _set_context(node_1, "event-1")
+        await life_cycle.execute(node_1, {"payload": {}}, pool)
+
+        assert len(pool) == 1
+        assert PluginPool.is_pooled(node_1.object)
+
+        node_2 = _node()
+        node_2.object = await life_cycle.create_instance(node_2, pool)
+        assert node_2.object is not node_1.object
+        assert node_2.object.client is node_1.object.client
+        assert node_2.object.event is None
+
+        _set_context(node_2, "event-2")
+        await life_cycle.execute(node_2, {"payload": {}}, pool)
+
+        assert ReusablePlugin.set_ups == 1
+        assert node_1.object.event == "event-1"
+        assert node_2.object.event == "event-2"
+
+        await pool.close()
+        assert ReusablePlugin.closed == 1
+        assert len(pool) == 0
+
+    asyncio.run(main())
+
+
+def test_plugins_are_not_pooled_without_pool():
+    async def main():
+        ReusablePlugin.set_ups = 0
+        for _ in range(2):
+            node = _node()
+            node.object = await life_cycle.create_instance(node)
+            _set_context(node, "event")
+            await life_cycle.execute(node, {"payload": {}})
+            assert not PluginPool.is_pooled(node.object)
+
+        assert ReusablePlugin.set_ups == 2
+
+    asyncio.run(main())
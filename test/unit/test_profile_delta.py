@@ -0,0 +1,114 @@
+import asyncio
+from unittest.mock import patch
+
+from pydantic_core import to_jsonable_python
+
+from tracardi.domain.profile import Profile
+from tracardi.domain.storage_record import RecordMetadata
+from tracardi.domain.value_object.bulk_insert_result import BulkInsertResult
+from tracardi.service.change_monitoring.field_change_logger import FieldChangeLogger
+from tracardi.service.change_monitoring.profile_delta import get_profile_changes
+from tracardi.service.storage.driver.elastic import profile as profile_db
+
+
+def _apply(document: dict, changes: list):
+    # Same as apply_profile_changes_script
+    for change in changes:
+        node = document
+        path = change['path']
+        for key in path[:-1]:
+            if not isinstance(node.get(key, None), dict):
+                if 'value' not in change:
+                    break
+                node[key] = {}
+            node = node[key]
+        else:
+            if 'value' in change:
+                node[path[-1]] = change['value']
+            else:
+                node.pop(path[-1], None)
+    return document
+
+
+def _stored_profile():
+    profile = Profile(id="1", traits={"a": {"b": 1, "c": 2}, "list": [1, 2], "removed": 1})
+    profile.set_meta_data(RecordMetadata(id="1", index="profile-index"))
+    return profile
+
+
+def test_changes_describe_profile_changes():
+    profile = _stored_profile()
+    stored = to_jsonable_python(profile.model_dump(exclude={"operation": ...}))
+
+    logger = FieldChangeLogger()
+    profile.traits['a']['b'] = 10
+    logger.log('traits.a.b', 1)
+    profile.traits['list'].append(3)
+    logger.log('traits.list.2', None)
+    del profile.traits['removed']
+    logger.log('traits.removed', 1)
+    profile.data.pii.firstname = "John"
+    logger.log('data.pii.firstname', None)
+    profile.metadata.fields['traits.a.b'] = [1, 1]
+
+    profile.mark_for_update()
+    changes = get_profile_changes(profile, logger)
+
+    paths = [change['path'] for change in changes]
+    assert ['traits', 'list'] in paths
+    assert ['metadata', 'fields', 'traits.a.b'] in paths
+    assert ['traits'] not in paths
+
+    current = to_jsonable_python(profile.model_dump(exclude={"operation": ...}))
+    assert _apply(stored, changes) == current
+
+
+def test_new_and_merged_profiles_are_saved_whole():
+    logger = FieldChangeLogger()
+    logger.log('traits.a', None)
+
+    profile = _stored_profile()
+    profile.set_new()
+    assert get_profile_changes(profile, logger) is None
+
+    profile = _stored_profile()
+    assert get_profile_changes(profile, FieldChangeLogger()) is None
+
+    profile.set_merge_key(['data.contact.email.main'])
+    assert get_profile_changes(profile, logger) is None
+
+
+def test_failed_partial_updates_fall_back_to_full_save():
+    async def main():
+        saved = []
+
+        class MockStorage:
+            async def update_bulk(self, index, updates):
+                return BulkInsertResult(
+                    saved=1,
+                    errors=[{"update": {"_id": "2", "status": 404}}],
+                    ids=[id for id, _ in updates],
+                    index=index
+                )
+
+        async def save(profiles, refresh_after_save=False):
+            saved.extend(profile.id for profile in profiles)
+            return BulkInsertResult(saved=len(profiles), ids=[profile.id for profile in profiles])
+
+        logger = FieldChangeLogger()
+        logger.log('traits.a', None)
+
+        updated = _stored_profile()
+        missing = _stored_profile()
+        missing.id = "2"
+        new = Profile(id="3")
+        new.set_new()
+
+        with patch.object(profile_db, "storage_manager", lambda index: MockStorage()), \
+                patch.object(profile_db, "save", save):
+            result = await profile_db.save_changes([(updated, logger), (missing, logger), (new, logger)])
+
+        assert sorted(saved) == ["2", "3"]
+        assert sorted(result.ids) == ["1", "2", "3"]
+
+    asyncio.run(main())
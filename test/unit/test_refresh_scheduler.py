@@ -0,0 +1,55 @@
+import asyncio
+from unittest.mock import patch
+
+from tracardi.context import ServerContext, Context
+from tracardi.domain.profile import Profile
+from tracardi.domain.storage_record import RecordMetadata
+from tracardi.service.storage.elastic import refresh_scheduler as scheduler_module
+from tracardi.service.storage.elastic.refresh_scheduler import IndexRefreshScheduler
+
+
+class MockElastic:
+
+    def __init__(self):
+        self.refreshed = []
+
+    async def refresh(self, index):
+        self.refreshed.append(index)
+
+
+def test_concurrent_refreshes_are_coalesced():
+    async def main():
+        elastic = MockElastic()
+        scheduler = IndexRefreshScheduler(interval=0.01, coalesce_time=0.01)
+        with patch.object(scheduler_module.ElasticClient, "instance", lambda: elastic):
+            await asyncio.gather(*[scheduler.refresh("index-1") for _ in range(10)], scheduler.refresh("index-2"))
+            assert sorted(elastic.refreshed) == ["index-1", "index-2"]
+
+            # Refresh requested after the previous one started is not skipped
+            await scheduler.refresh("index-1")
+            assert elastic.refreshed.count("index-1") == 2
+
+    asyncio.run(main())
+
+
+def test_saved_profiles_are_readable_until_index_is_refreshed(redis):
+    async def main():
+        elastic = MockElastic()
+        scheduler = IndexRefreshScheduler(interval=0.05, coalesce_time=0)
+
+        profile = Profile(id="1")
+        profile.set_meta_data(RecordMetadata(id="1", index="profile-index"))
+
+        with ServerContext(Context(production=True)), \
+                patch.object(scheduler_module.ElasticClient, "instance", lambda: elastic), \
+                patch.object(scheduler_module, "AsyncRedisClient", redis):
+            await scheduler.mark_saved([profile, Profile(id="2")])
+            assert await scheduler.find_dirty_index("1") == "profile-index"
+            assert await scheduler.find_dirty_index("2") is None
+
+            # Dirty index is refreshed in background and marks are removed
+            await asyncio.sleep(0.2)
+            assert elastic.refreshed == ["profile-index"]
+            assert await scheduler.find_dirty_index("1") is None
+
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+import asyncio
+from datetime import datetime, timezone, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from tracardi.context import ServerContext, Context
+from tracardi.domain.time_range_query import DatetimeRangePayload, DatePayload, DatetimePayload
+from tracardi.service.storage.elastic import rollup as rollup_module
+from tracardi.service.storage.elastic.driver import persistence_service
+from tracardi.service.storage.elastic.driver.persistence_service import SqlSearchQueryEngine
+from tracardi.service.storage.elastic.rollup import TimeRollup
+
+
+now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) - timedelta(hours=1)
+
+
+def _events():
+    return [
+        (now + timedelta(seconds=10), {"type": "page-view", "source": "web"}),
+        (now + timedelta(seconds=70), {"type": "page-view", "source": "web"}),
+        (now + timedelta(minutes=5), {"type": "Purchase", "source": "api"}),
+        (now + timedelta(minutes=5, seconds=1), {"type": "page-view", "source": None}),
+    ]
+
+
+def test_histogram_is_summed_from_minute_counters(redis):
+    async def main():
+        rollup = TimeRollup(enabled=True, minute_ttl=3600 * 2, hour_ttl=3600 * 24)
+
+        with ServerContext(Context(production=False)), patch.object(rollup_module, "AsyncRedisClient", redis):
+            redis.data[rollup._start_key('event')] = str(int(now.timestamp()) - 60)
+            await rollup.record('event', _events())
+
+            histogram = await rollup.histogram('event', now, now + timedelta(minutes=9), 3 * 60)
+
+            await rollup.record('event', [(datetime.now(timezone.utc) - timedelta(seconds=1), {})])
+            assert await rollup.count_last('event', 300) == 1
+
+        assert [date for date, _ in histogram] == [now + timedelta(minutes=minutes) for minutes in (0, 3, 6, 9)]
+        assert [counters.get('count', 0) for _, counters in histogram] == [2, 2, 0, 0]
+        assert histogram[1][1] == {"count": 2, "type:Purchase": 1, "type:page-view": 1, "source:api": 1}
+
+    asyncio.run(main())
+
+
+def test_rollup_does_not_answer_before_it_started(redis):
+    async def main():
+        rollup = TimeRollup(enabled=True, minute_ttl=3600 * 2, hour_ttl=3600 * 24)
+
+        with ServerContext(Context(production=False)), patch.object(rollup_module, "AsyncRedisClient", redis):
+            await rollup.record('event', _events())
+
+            assert await rollup.histogram('event', now, now + timedelta(minutes=9), 3 * 60) is None
+            # Interval shorter than minute
+            assert await rollup.histogram('event', now, now + timedelta(minutes=9), 30) is None
+            assert await rollup.count_last('event', 300) is None
+
+    asyncio.run(main())
+
+
+def test_histogram_query_is_served_from_rollup(redis):
+    async def main():
+        rollup = TimeRollup(enabled=True, minute_ttl=3600 * 2, hour_ttl=3600 * 24)
+
+        async def query(es_query):
+            raise AssertionError("Raw index queried.")
+
+        engine = SqlSearchQueryEngine(SimpleNamespace(storage=SimpleNamespace(index_key='event'), query=query))
+        naive_now = now.replace(tzinfo=None)
+        range_query = DatetimeRangePayload(
+            minDate=DatePayload(absolute=DatetimePayload.build(naive_now)),
+            maxDate=DatePayload(absolute=DatetimePayload.build(naive_now + timedelta(minutes=30)))
+        )
+
+        with ServerContext(Context(production=False)), patch.object(rollup_module, "AsyncRedisClient", redis), \
+                patch.object(persistence_service, "time_rollup", rollup):
+            redis.data[rollup._start_key('event')] = str(int(now.timestamp()) - 60)
+            await rollup.record('event', _events())
+
+            result = await engine.histogram(range_query.model_copy(deep=True))
+            assert result.total == 4
+            assert result.buckets == ['count']
+            assert [row["count"] for row in result.result][:6] == [1, 1, 0, 0, 0, 2]
+            assert result.result[0] == {"date": naive_now.strftime("%H:%M"), "interval": "+1m", "count": 1,
+                                        "speed": "1.000/m"}
+
+            result = await engine.histogram(range_query.model_copy(deep=True), group_by='type')
+            assert result.buckets == ['page-view', 'purchase']
+            assert result.result[5]['page-view'] == 1 and result.result[5]['purchase'] == 1
+
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+import asyncio
+
+from tracardi.context import ServerContext, Context
+from tracardi.domain.entity import Entity
+from tracardi.domain.profile import Profile
+from tracardi.domain.session import Session
+from tracardi.service.tracking.cache.prefetch import set_prefetched, pop_prefetched, forget_prefetched
+from tracardi.service.tracking.cache.profile_cache import load_profile_cache, get_profile_cache_key
+from tracardi.service.tracking.cache.session_cache import load_session_cache, get_session_cache_key
+
+
+def _cached(entity, exclude_defaults: bool):
+    return (
+        {"production": True, "tenant": None},
+        entity.model_dump(mode="json", exclude_defaults=exclude_defaults, exclude={"operation": ...}),
+        None,
+        {"index": "index", "id": entity.id}
+    )
+
+
+def test_prefetched_values_are_used_once():
+    set_prefetched({"key-1": "value", "key-2": None})
+
+    assert pop_prefetched("key-1") == (True, "value")
+    assert pop_prefetched("key-1") == (False, None)
+    assert pop_prefetched("key-2") == (True, None)
+
+    set_prefetched({"key-3": "value"})
+    forget_prefetched("key-3")
+    assert pop_prefetched("key-3") == (False, None)
+
+
+def test_profile_and_session_are_loaded_from_prefetched_values():
+    async def main():
+        context = Context(production=True)
+        with ServerContext(context):
+            profile = Profile(id="a1", traits={"a": 1})
+            session = Session(id="b1", profile=Entity(id=profile.id), metadata={"time": {}})
+
+            # No redis call is made for prefetched values
+            set_prefetched({
+                get_profile_cache_key(profile.id, context): _cached(profile, exclude_defaults=True),
+                get_session_cache_key(session.id, context): _cached(session, exclude_defaults=False),
+                get_profile_cache_key("a2", context): None
+            })
+
+            cached_profile = await load_profile_cache(profile.id, context)
+            cached_session = await load_session_cache(session.id, context)
+
+            assert cached_profile.model_dump(exclude={"operation"}) == profile.model_dump(exclude={"operation"})
+            assert cached_profile.get_meta_data().index == "index"
+            assert cached_session.model_dump(exclude={"operation"}) == session.model_dump(exclude={"operation"})
+            assert await load_profile_cache("a2", context) is None
+
+    asyncio.run(main())
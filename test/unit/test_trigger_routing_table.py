@@ -0,0 +1,91 @@
+import asyncio
+from unittest.mock import patch
+
+from tracardi.config import memory_cache
+from tracardi.context import ServerContext, Context
+from tracardi.service.cache import trigger
+from tracardi.service.cache.trigger import TriggerRoutingTable
+from tracardi.service.decorators.function_memory_cache import publish_cache_invalidation
+from tracardi.service.storage.mysql.schema.table import WorkflowTriggerTable
+from tracardi.service.storage.mysql.utils.select_result import SelectResult
+
+
+class MockTriggerService:
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.loads = 0
+
+    async def load_enabled(self):
+        self.loads += 1
+        await asyncio.sleep(0.01)
+        return SelectResult([
+            WorkflowTriggerTable(id=id, name=id, flow_id="flow", flow_name="Flow", source_id=source_id,
+                                 source_name=source_id, event_type_id=event_type, event_type_name=event_type,
+                                 enabled=True)
+            for id, source_id, event_type in self.rules
+        ])
+
+
+def test_routes_are_loaded_once_and_looked_up_without_io():
+    async def main():
+        wts = MockTriggerService([("1", "source-1", "page-view"), ("2", "source-1", "page-view"),
+                                  ("3", "source-2", "purchase")])
+        table = TriggerRoutingTable(ttl=60)
+
+        with ServerContext(Context(production=True)), \
+                patch.object(memory_cache, "config_cache_invalidation", False):
+            routes = await asyncio.gather(*[table.get_routes(wts) for _ in range(10)])
+            assert wts.loads == 1
+            assert all(item is routes[0] for item in routes)
+
+            assert [rule.id for rule in routes[0].get("source-1", "page-view")] == ["1", "2"]
+            assert [rule.id for rule in routes[0].get("source-2", "purchase")] == ["3"]
+            assert routes[0].get("source-2", "page-view") == []
+
+            assert await table.get_routes(wts) is routes[0]
+            assert wts.loads == 1
+
+    asyncio.run(main())
+
+
+def test_routes_are_rebuilt_when_version_changes_or_table_is_invalidated():
+    async def main():
+        wts = MockTriggerService([("1", "source-1", "page-view")])
+        table = TriggerRoutingTable(ttl=0)
+        version = 1
+
+        async def load_table_version(table_name):
+            return version
+
+        with ServerContext(Context(production=True)), \
+                patch.object(memory_cache, "config_cache_invalidation", False), \
+                patch.object(trigger, "load_table_version", load_table_version), \
+                patch.object(trigger, "trigger_routing_table", table):
+
+            snapshot = await table.get_routes(wts)
+
+            # Version did not change, snapshot is kept
+            assert await table.get_routes(wts) is snapshot
+            await asyncio.sleep(0.02)
+            assert await table.get_routes(wts) is snapshot
+            assert wts.loads == 1
+
+            # New version, stale snapshot is returned until the new one is ready
+            version = 2
+            wts.rules.append(("2", "source-1", "page-view"))
+            assert await table.get_routes(wts) is snapshot
+            await asyncio.sleep(0.02)
+            snapshot = await table.get_routes(wts)
+            assert [rule.id for rule in snapshot.get("source-1", "page-view")] == ["1", "2"]
+            assert wts.loads == 2
+
+            # Trigger table changed in this process
+            table.ttl = 60
+            wts.rules.pop()
+            await publish_cache_invalidation('workflow_trigger')
+            snapshot = await table.get_routes(wts)
+            assert [rule.id for rule in snapshot.get("source-1", "page-view")] == ["1"]
+            assert wts.loads == 3
+
+    asyncio.run(main())
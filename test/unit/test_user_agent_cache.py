@@ -0,0 +1,51 @@
+import asyncio
+
+from tracardi.service.cache.user_agent import UserAgentCache, ParseCache
+
+chrome = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'
+iphone = 'Mozilla/5.0 (iPhone; CPU iPhone OS 16_5 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) ' \
+         'Version/16.5 Mobile/15E148 Safari/604.1'
+
+
+def test_user_agents_are_parsed_once():
+    cache = UserAgentCache(max_size=10)
+
+    user_agent = cache.parse(chrome)
+    assert user_agent.browser.family == 'Chrome'
+    assert cache.parse(chrome) is user_agent
+    assert cache.parse(iphone).is_mobile
+
+    stats = cache.user_agents.stats
+    assert (stats.size, stats.hits, stats.misses) == (2, 1, 2)
+    assert stats.hit_rate() == 1 / 3
+
+
+def test_devices_are_detected_once():
+    async def main():
+        cache = UserAgentCache(max_size=10)
+        device = await cache.detect_device_async(iphone)
+        assert device.is_mobile()
+        assert await cache.detect_device_async(iphone) is device
+        assert cache.detect_device(iphone) is device
+        assert cache.devices.stats.hits == 2
+
+    asyncio.run(main())
+
+
+def test_cache_is_bounded():
+    calls = []
+
+    def parser(value):
+        calls.append(value)
+        return value.upper()
+
+    cache = ParseCache(parser, max_size=2)
+    assert cache("a") == "A"
+    cache("b")
+    cache("a")
+    cache("c")  # "b" is least recently used
+
+    assert len(cache) == 2
+    assert "a" in cache and "b" not in cache
+    cache("b")
+    assert calls == ["a", "b", "c", "b"]
@@ -30,6 +30,18 @@ class MemoryCacheConfig:
         self.profile_destination_cache_ttl = get_env_as_int('PROFILE_DESTINATION_CACHE_TTL', 5)
         self.data_compliance_cache_ttl = get_env_as_int('DATA_COMPLIANCE_CACHE_TTL', 5)
         self.trigger_rule_cache_ttl = get_env_as_int('TRIGGER_RULE_CACHE_TTL', 15)
+        self.workflow_cache_ttl = get_env_as_int('WORKFLOW_CACHE_TTL', 15)
+        self.workflow_cache_max_size = get_env_as_int('WORKFLOW_CACHE_MAX_SIZE', 500)
+        self.condition_cache_max_size = get_env_as_int('CONDITION_CACHE_MAX_SIZE', 2048)
+        # Configuration cache: seconds after ttl when stale value is served while it is reloaded in background,
+        # and invalidation of cached configuration via redis pub/sub when mysql table is changed.
+        self.config_cache_stale_ttl = get_env_as_int('CONFIG_CACHE_STALE_TTL', 60)
+        self.config_cache_invalidation = get_env_as_bool('CONFIG_CACHE_INVALIDATION', 'yes')
+        # Parsed user agents. If shared, new user agents are counted in redis and the most frequent ones
+        # are parsed by a new process on start (warm up).
+        self.user_agent_cache_size = get_env_as_int('USER_AGENT_CACHE_SIZE', 10000)
+        self.user_agent_cache_shared = get_env_as_bool('USER_AGENT_CACHE_SHARED', 'no')
+        self.user_agent_cache_warm_up_size = get_env_as_int('USER_AGENT_CACHE_WARM_UP_SIZE', 1000)
 
 
 class MysqlConfig:
@@ -133,6 +145,18 @@ class ElasticConfig:
         self.http_auth_password = self.env.get('ELASTIC_HTTP_AUTH_PASSWORD', None)
         self.scheme = self.env.get('ELASTIC_SCHEME', 'http')
         self.query_timeout = get_env_as_int('ELASTIC_QUERY_TIMEOUT', 12)
+        # Indices with saved documents are refreshed every refresh_interval (ms). Refreshes requested
+        # within refresh_coalesce_time (ms) are sent to elastic as one.
+        self.refresh_interval = get_env_as_int('ELASTIC_REFRESH_INTERVAL', 1000)
+        self.refresh_coalesce_time = get_env_as_int('ELASTIC_REFRESH_COALESCE_TIME', 50)
+        # Physical index of saved profiles and sessions is kept in redis, so they are loaded with GET
+        # instead of search across all indices.
+        self.index_locator = get_env_as_bool('ELASTIC_INDEX_LOCATOR', 'yes')
+        # Per minute and per hour counters of tracked events and sessions kept in redis for histograms.
+        # Minute and hour counters expire after rollup_minute_ttl and rollup_hour_ttl (s).
+        self.rollup = get_env_as_bool('ELASTIC_ROLLUP', 'yes')
+        self.rollup_minute_ttl = get_env_as_int('ELASTIC_ROLLUP_MINUTE_TTL', 2 * 24 * 60 * 60)
+        self.rollup_hour_ttl = get_env_as_int('ELASTIC_ROLLUP_HOUR_TTL', 400 * 24 * 60 * 60)
         self.logging_level = _get_logging_level(
             env['ELASTIC_LOGGING_LEVEL']) if 'ELASTIC_LOGGING_LEVEL' in env else logging.ERROR
 
@@ -168,6 +192,7 @@ class RedisConfig:
         self.port = get_env_as_int('REDIS_PORT', 6379)
         self.redis_host = env.get('REDIS_HOST', 'redis://localhost:6379')
         self.redis_password = env.get('REDIS_PASSWORD', None)
+        self.max_connections = get_env_as_int('REDIS_MAX_CONNECTIONS', 20)
 
         if self.host.startswith("redis://"):
             self.host = self.host[8:]
@@ -208,8 +233,15 @@ class TracardiConfig(metaclass=Singleton):
         _production = (env['PRODUCTION'].lower() == 'yes') if 'PRODUCTION' in env else False
         self.track_debug = env.get('TRACK_DEBUG', 'no').lower() == 'yes'
         self.save_logs = get_env_as_bool('SAVE_LOGS', 'yes')
+        # Logs are saved in background in batches of max size, interval (ms) after the first buffered log.
+        self.log_save_batch_size = get_env_as_int('LOG_SAVE_BATCH_SIZE', 500)
+        self.log_save_interval = get_env_as_int('LOG_SAVE_INTERVAL', 5000)
         self.enable_event_destinations = get_env_as_bool('ENABLE_EVENT_DESTINATIONS', 'no')
         self.enable_profile_destinations = get_env_as_bool('ENABLE_PROFILE_DESTINATIONS', 'no')
+        # Max number of concurrent dispatches to one destination
+        self.destination_concurrency = get_env_as_int('DESTINATION_CONCURRENCY', 10)
+        # Max number of open connections in the HTTP connection pool of one resource
+        self.destination_connection_pool_size = get_env_as_int('DESTINATION_CONNECTION_POOL_SIZE', 20)
         self.enable_workflow = get_env_as_bool('ENABLE_WORKFLOW', 'yes')
         self.enable_event_validation = get_env_as_bool('ENABLE_EVENT_VALIDATION', 'yes')
         self.enable_event_reshaping = get_env_as_bool('ENABLE_EVENT_RESHAPING', 'yes')
@@ -221,6 +253,36 @@ class TracardiConfig(metaclass=Singleton):
         self.disallow_bot_traffic = get_env_as_bool('DISALLOW_BOT_TRAFFIC', 'yes')
         self.keep_profile_in_cache_for = get_env_as_int('KEEP_PROFILE_IN_CACHE_FOR', 60 * 60)
         self.keep_session_in_cache_for = get_env_as_int('KEEP_SESSION_IN_CACHE_FOR', 30 * 60)
+        # Complete entities are bigger in cache but are loaded faster (defaults do not need to be rebuilt).
+        self.cache_complete_entities = get_env_as_bool('CACHE_COMPLETE_ENTITIES', 'no')
+        # Write-behind: tracked profiles, sessions and events are saved in cache at once and queued for
+        # bulk save in elastic. Flush when batch is full or after interval (ms). Queue is bounded by max size.
+        self.write_behind = get_env_as_bool('WRITE_BEHIND', 'no')
+        self.write_behind_batch_size = get_env_as_int('WRITE_BEHIND_BATCH_SIZE', 500)
+        self.write_behind_flush_interval = get_env_as_int('WRITE_BEHIND_FLUSH_INTERVAL', 1000)
+        self.write_behind_max_size = get_env_as_int('WRITE_BEHIND_MAX_SIZE', 10000)
+        self.write_behind_max_retries = get_env_as_int('WRITE_BEHIND_MAX_RETRIES', 3)
+        # Delta save: only fields logged as changed are sent to elastic (partial update). New and merged
+        # profiles are saved as a whole. Enable only if all profile changes are logged.
+        self.profile_delta_save = get_env_as_bool('PROFILE_DELTA_SAVE', 'no')
+        # Events and sessions of merged profiles are moved by elastic tasks in background. Reads of duplicate
+        # profile ids are redirected to merged profile until the task ends, but not longer than alias ttl (s).
+        # Documents skipped by the task because they changed while it ran are moved again, max conflict retries.
+        self.merge_task_slices = env.get('MERGE_TASK_SLICES', 'auto')
+        self.merge_task_check_interval = get_env_as_int('MERGE_TASK_CHECK_INTERVAL', 1000)
+        self.merge_alias_ttl = get_env_as_int('MERGE_ALIAS_TTL', 24 * 60 * 60)
+        self.merge_task_conflict_retries = get_env_as_int('MERGE_TASK_CONFLICT_RETRIES', 3)
+        # Latency histograms of collector stages per tenant and source. Requests slower than the threshold
+        # (ms, 0 is off) are logged with their stage tree and the last samples are kept for export.
+        self.latency_metrics = get_env_as_bool('LATENCY_METRICS', 'no')
+        self.slow_request_threshold = get_env_as_int('SLOW_REQUEST_THRESHOLD', 0)
+        self.slow_request_samples = get_env_as_int('SLOW_REQUEST_SAMPLES', 100)
+        # Time, errors and calls of workflow nodes per flow, node and plugin. Sample rate is % of workflow runs,
+        # stats are added to redis every flush interval (ms) and kept for ttl (s).
+        self.node_profiler = get_env_as_bool('NODE_PROFILER', 'yes')
+        self.node_profiler_sample_rate = get_env_as_int('NODE_PROFILER_SAMPLE_RATE', 100)
+        self.node_profiler_flush_interval = get_env_as_int('NODE_PROFILER_FLUSH_INTERVAL', 10000)
+        self.node_profiler_ttl = get_env_as_int('NODE_PROFILER_TTL', 7 * 24 * 60 * 60)
 
         self.skip_errors_on_profile_mapping = get_env_as_bool('SKIP_ERRORS_ON_PROFILE_MAPPING', 'no')
 
@@ -0,0 +1,91 @@
+from typing import Optional, Set
+
+from dotty_dict import Dotty
+from pydantic import BaseModel
+
+# Dotty may cache __getitem__ by hash of str of whole data, that costs more than the lookup itself.
+_dotty_getitem = getattr(Dotty.__getitem__, '__wrapped__', Dotty.__getitem__)
+
+
+class FlatModel(Dotty):
+    """
+    Dotty of a model dump that records which top level fields were changed. A field is changed when a path
+    in it is set, deleted or popped, or when a list or dict in it is read, as it may be changed in place.
+
+    Model is updated with changed fields only, see `update_model`. If data was accessed in a way that can
+    not be tracked (wrapped dict methods, `to_dict`) `is_tracked` is False and model must be created from
+    the whole data.
+    """
+
+    def __init__(self, dictionary, *args, **kwargs):
+        super().__init__(dictionary, *args, **kwargs)
+        self.changed_fields: Set[str] = set()
+        self._untracked = False
+
+    def _change(self, key):
+        self.changed_fields.add(self._split(key)[0])
+
+    def __getattr__(self, item):
+        # Methods of wrapped dict, e.g. update or items, can change any field.
+        self.__dict__['_untracked'] = True
+        return super().__getattr__(item)
+
+    def __getitem__(self, item):
+        value = _dotty_getitem(self, item)
+        if isinstance(value, (dict, list)):
+            self._change(item)
+        return value
+
+    def __setitem__(self, key, value):
+        self._change(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._change(key)
+        super().__delitem__(key)
+
+    def pop(self, key, default=None):
+        self._change(key)
+        return super().pop(key, default)
+
+    def setdefault(self, key, default=None):
+        self._change(key)
+        return super().setdefault(key, default)
+
+    def to_dict(self):
+        self._untracked = True
+        return super().to_dict()
+
+    def is_tracked(self) -> bool:
+        return not self._untracked
+
+    def changed_data(self) -> dict:
+        """
+        Returns changed top level fields that exist in data.
+        """
+        return {field: self._data[field] for field in self.changed_fields if field in self._data}
+
+    def update_model(self, model: BaseModel, data: Optional[dict] = None) -> BaseModel:
+        """
+        Returns model with changed fields validated from data, by default from `changed_data`. Changed fields
+        that are not in data are reset to defaults. Other fields are not validated again. Model is copied if
+        any field changed.
+        """
+        model_fields = type(model).model_fields
+        fields = [field for field in self.changed_fields if field in model_fields]
+        if not fields:
+            return model
+
+        if data is None:
+            data = self.changed_data()
+
+        model = model.model_copy()
+        validator = type(model).__pydantic_validator__
+        for field in fields:
+            if field in data:
+                value = data[field]
+            else:
+                value = model_fields[field].get_default(call_default_factory=True)
+            validator.validate_assignment(model, field, value)
+
+        return model
@@ -13,7 +13,7 @@ from uuid import uuid4
 
 from dotty_dict import dotty
 from pydantic import PrivateAttr, BaseModel
-from user_agents import parse
+from tracardi.service.cache.user_agent import user_agent_cache
 
 from tracardi.config import tracardi
 from .. import ExtraInfo
@@ -115,7 +115,7 @@ class TrackerPayload(BaseModel):
         if self._user_agent is None:
             try:
                 user_agent = self.request['headers']['user-agent']
-                self._user_agent = parse(user_agent)
+                self._user_agent = user_agent_cache.parse(user_agent)
             except Exception:
                 pass
 
@@ -354,7 +354,7 @@ class TrackerPayload(BaseModel):
     def is_cde(self) -> bool:
         return self.get_referer_data('source') is not None and self.has_referred_profile()
 
-    @async_cache_for(30, use_context=True)
+    @async_cache_for(30, use_context=True, tables=('identification_point',))
     async def list_identification_points(self):
         return list(await self.get_identification_points())
 
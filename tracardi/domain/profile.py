@@ -2,11 +2,11 @@ import uuid
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Set
 
-from dotty_dict import Dotty
 from pydantic import BaseModel, PrivateAttr
 from dateutil import parser
 
 from .entity import PrimaryEntity
+from .flat_model import FlatModel
 from .metadata import ProfileMetadata
 from .profile_data import ProfileData, FIELD_TO_PROPERTY_MAPPING, \
     FLAT_PROFILE_MAPPING, PREFIX_IDENTIFIER_ID, PREFIX_IDENTIFIER_PK
@@ -327,7 +327,7 @@ class Profile(PrimaryEntity):
         return profile
 
 
-class FlatProfile(Dotty):
+class FlatProfile(FlatModel):
 
     def __init__(self, dictionary, *args, **kwargs):
         super().__init__(dictionary)
@@ -431,3 +431,16 @@ class FlatProfile(Dotty):
 
     def update_changed_fields(self, changed_fields):
         self['metadata.fields'] = changed_fields
+
+    def to_profile(self, profile: Profile) -> Profile:
+        """
+        Returns profile with the changes of this flat profile. Profile is this flat profile's source, only its changed
+        fields are validated.
+        """
+        if not self.is_tracked():
+            return Profile(**self.to_dict())
+
+        profile = self.update_model(profile)
+        if 'ids' in self.changed_fields or 'id' in self.changed_fields:
+            profile._add_id_to_ids()
+        return profile
@@ -1,8 +1,9 @@
 from datetime import datetime
 
 import asyncio
+from collections import OrderedDict
 from time import time
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -14,16 +15,23 @@ from tracardi.service.utils.date import seconds_to_minutes_seconds
 class CacheItem(BaseModel):
     data: Any = None
     ttl: float = 60
+    refresh: Optional[float] = None
 
     def __init__(self, **data: Any):
         if 'ttl' in data:
             data['ttl'] = time() + float(data['ttl'])
+        if data.get('refresh', None) is not None:
+            data['refresh'] = time() + float(data['refresh'])
 
         super().__init__(**data)
 
     def expired(self):
         return time() > self.ttl
 
+    def needs_refresh(self):
+        # Item is still valid but stale. It can be served while it is reloaded.
+        return self.refresh is not None and time() > self.refresh
+
 
 class MemoryCache:
     """
@@ -41,14 +49,12 @@ class MemoryCache:
     moment they are accessed. If an item's expiration timestamp is past the current time, it is considered expired
     and is automatically removed from the cache.
 
-    To prevent the cache from indefinitely growing, a max_pool limit is set, indicating the maximum number of items
-    the cache should ideally hold. When adding an item causes the cache to exceed this limit, the cache is purged
-    of expired items. However, this mechanism does not guarantee that the cache size will be immediately reduced to
-    below max_pool if all items within are still valid; it only removes those that have expired.
+    The cache is bounded by max_pool. When adding an item fills the cache up to this limit, the cache is purged
+    of expired items and then the least recently used items are evicted until it fits.
     """
 
     def __init__(self, name: str, max_pool=1000, allow_null_values=False, use_context: bool = True):
-        self.memory_buffer: Dict[str, CacheItem] = {}
+        self.memory_buffer: Dict[str, CacheItem] = OrderedDict()
         self.name = name
         self.max_pool = max_pool
         self.counter = 0
@@ -88,6 +94,7 @@ class MemoryCache:
             if cache_item.expired():
                 del self.memory_buffer[item]
                 raise ExpiredException("MemoryCache item expired")
+            self.memory_buffer.move_to_end(item)
             return cache_item
         return None
 
@@ -96,9 +103,12 @@ class MemoryCache:
         if not isinstance(value, CacheItem):
             raise ValueError("MemoryCache item must be CacheItem type.")
         self.memory_buffer[key] = value
+        self.memory_buffer.move_to_end(key)
         self.counter += 1
-        if self.counter > self.max_pool:
+        if len(self.memory_buffer) >= self.max_pool:
             self.purge()
+            while len(self.memory_buffer) > self.max_pool:
+                self.memory_buffer.popitem(last=False)
 
     def __delitem__(self, key):
         key = self._get_contextualized_key(key)
@@ -113,6 +123,9 @@ class MemoryCache:
         for key in keys:
             del self[key]
 
+    def clear(self):
+        self.memory_buffer.clear()
+
     def purge(self):
         for key, value in self.memory_buffer.copy().items():
             if value.expired():
@@ -1,25 +1,33 @@
 import os
+import sys
 
 import logging
 
 from tracardi.exceptions.storage.elastic import ElasticLogHandler
 from tracardi.service.logging.formater import CustomFormatter
 from tracardi.service.logging.tools import _get_logging_level
+from tracardi.service.utils.environment import get_env_as_int
 
 _env = os.environ
 _logging_level = _get_logging_level(_env['LOGGING_LEVEL']) if 'LOGGING_LEVEL' in _env else logging.WARNING
 
 
 class StackInfoLogger(logging.Logger):
+
+    def _stack_kwargs(self, level, msg, kwargs):
+        # Stack is captured only for the first of repeated errors, they are deduplicated by log handler anyway.
+        if self.isEnabledFor(level):
+            kwargs.setdefault('stack_info', not log_handler.is_repeated(self.name, level, msg))
+            kwargs.setdefault('exc_info', sys.exc_info()[0] is not None)
+        # Log the caller of error, not this logger
+        kwargs.setdefault('stacklevel', 2)
+        return kwargs
+
     def error(self, msg, *args, **kwargs):
-        kwargs['stack_info'] = True
-        kwargs['exc_info'] = True
-        super().error(msg, *args, **kwargs)
+        super().error(msg, *args, **self._stack_kwargs(logging.ERROR, msg, kwargs))
 
     def critical(self, msg, *args, **kwargs):
-        kwargs['stack_info'] = True
-        kwargs['exc_info'] = True
-        super().error(msg, *args, **kwargs)
+        super().error(msg, *args, **self._stack_kwargs(logging.ERROR, msg, kwargs))
 
 
 logging.setLoggerClass(StackInfoLogger)
@@ -60,4 +68,8 @@ def get_installation_logger(name, level=None):
     return logger
 
 
-log_handler = ElasticLogHandler()
+# Logs waiting for save are kept in a buffer of max size, logs repeated within dedup window (s) are counted only.
+log_handler = ElasticLogHandler(
+    max_size=get_env_as_int('LOG_BUFFER_SIZE', 10000),
+    dedup_window=get_env_as_int('LOG_DEDUP_WINDOW', 10)
+)
@@ -1,22 +1,122 @@
+import os
+import sys
+from collections import Counter, deque
+from typing import Callable, Deque, Dict, Hashable, List, Optional
+
 from tracardi.service.utils.date import now_in_utc
 from logging import Handler, LogRecord
 from time import time
 
 
+class _BufferedLog:
+    __slots__ = ('key', 'log', 'time', 'repeats')
+
+    def __init__(self, key: tuple, log: dict, time: float):
+        self.key = key
+        self.log = log
+        self.time = time
+        self.repeats = 0
+
+
+class _LogBuffer:
+    # Logs of one context waiting for save.
+
+    __slots__ = ('collection', 'recent', 'dropped')
+
+    def __init__(self):
+        self.collection: Deque[_BufferedLog] = deque()
+        self.recent: Dict[tuple, _BufferedLog] = {}
+        self.dropped = Counter()
+
+    def has_logs(self) -> bool:
+        return bool(self.collection) or bool(self.dropped)
+
+
+def _current_context() -> Optional[Hashable]:
+    # tracardi.context depends on config, which sets up logging, so it can not be imported here. Context can not
+    # be set before the module is loaded.
+    get_context = getattr(sys.modules.get('tracardi.context', None), 'get_context', None)
+    if get_context is None:
+        return None
+    try:
+        return get_context().get_user_less_context_copy()
+    except ValueError:
+        return None
+
+
 class ElasticLogHandler(Handler):
+    """
+    Collects logs for tracardi-log index in buffers per context (mode and tenant), so logs are saved in the
+    context they were logged in. Logs without context can not be saved and are only counted.
+
+    Buffers hold at most max size logs. When they are full new logs are dropped and counted per level. Log
+    repeated within dedup window (same logger, level and message) is not buffered again, it is counted on
+    the first one, which is saved with the number of repeats.
 
-    def __init__(self, level=0, collection=None):
+    Logs are taken from the buffer in bounded batches, see `pop_batch`. `on_log` is called after a log is
+    buffered, e.g. to schedule saving.
+    """
+
+    def __init__(self, level=0, max_size: int = 10000, dedup_window: float = 10):
         super().__init__(level)
-        if collection is None:
-            collection = []
-        self.collection = collection
+        self.max_size = max_size
+        self.dedup_window = dedup_window
+        self.buffers: Dict[Hashable, _LogBuffer] = {}
+        self.size = 0
+        self.deduplicated = 0
+        self.without_context = 0
         self.last_save = time()
+        self.on_log: Optional[Callable[[], None]] = None
+
+    def __len__(self):
+        return self.size
 
     def _get(self, record, value, default_value):
         return record.__dict__.get(value, default_value)
 
+    @staticmethod
+    def _key(name: str, level: int, message) -> tuple:
+        return name, level, str(message)
+
+    def _recent_log(self, buffer: Optional[_LogBuffer], key: tuple, now: float) -> Optional[_BufferedLog]:
+        if buffer is None:
+            return None
+        buffered = buffer.recent.get(key, None)
+        if buffered is not None and now - buffered.time <= self.dedup_window:
+            return buffered
+        return None
+
+    def is_repeated(self, name: str, level: int, message) -> bool:
+        """
+        Returns True if the same log is buffered in current context within dedup window.
+        """
+        context = _current_context()
+        if context is None:
+            return False
+        return self._recent_log(self.buffers.get(context, None), self._key(name, level, message), time()) is not None
+
     def emit(self, record: LogRecord):
 
+        context = _current_context()
+        if context is None:
+            self.without_context += 1
+            return
+
+        buffer = self.buffers.get(context, None)
+        key = self._key(record.name, record.levelno, record.msg)
+        buffered = self._recent_log(buffer, key, record.created)
+        if buffered is not None:
+            buffered.repeats += 1
+            self.deduplicated += 1
+            return
+
+        if buffer is None:
+            buffer = self.buffers[context] = _LogBuffer()
+
+        if self.size >= self.max_size:
+            buffer.dropped[record.levelname] += 1
+            return
+
         log = {  # Maps to tracardi-log index
             "date": now_in_utc(),
             "message": record.msg,
@@ -36,12 +136,80 @@ class ElasticLogHandler(Handler):
             "user_id": self._get(record, "user_id", None),
         }
 
-        self.collection.append(log)
+        buffered = _BufferedLog(key, log, record.created)
+        buffer.collection.append(buffered)
+        buffer.recent[key] = buffered
+        self.size += 1
 
-    def has_logs(self):
-        return isinstance(self.collection, list)
+        if self.on_log is not None:
+            self.on_log()
 
-    def reset(self):
-        self.collection = []
-        self.last_save = time()
+    def _dropped_log(self, dropped: Counter) -> dict:
+        total = sum(dropped.values())
+        dropped = ", ".join(f"{level}: {count}" for level, count in sorted(dropped.items()))
+        return {
+            "date": now_in_utc(),
+            "message": f"Log buffer was full, {total} logs were dropped ({dropped}).",
+            "logger": __name__,
+            "file": os.path.basename(__file__),
+            "line": 0,
+            "level": "WARNING",
+            "stack_info": None,
+            "module": __name__,
+            "class_name": type(self).__name__,
+            "origin": "root"
+        }
 
+    def contexts(self) -> List[Hashable]:
+        """
+        Returns contexts that have logs to save.
+        """
+        return [context for context, buffer in self.buffers.items() if buffer.has_logs()]
+
+    def pop_batch(self, context: Hashable, size: int) -> List[dict]:
+        """
+        Removes and returns at most size logs of the context from the buffer, oldest first. Number of dropped
+        logs is reported as a warning log.
+        """
+        buffer = self.buffers.get(context, None)
+        if buffer is None:
+            return []
+
+        batch = []
+        if buffer.dropped:
+            batch.append(self._dropped_log(buffer.dropped))
+            buffer.dropped.clear()
+
+        while buffer.collection and len(batch) < size:
+            buffered = buffer.collection.popleft()
+            self.size -= 1
+            if buffer.recent.get(buffered.key, None) is buffered:
+                del buffer.recent[buffered.key]
+            log = buffered.log
+            if buffered.repeats:
+                log['message'] = f"{log['message']} (repeated {buffered.repeats} times)"
+            batch.append(log)
+
+        if not buffer.has_logs():
+            del self.buffers[context]
+
+        return batch
+
+    def has_logs(self, context: Optional[Hashable] = None) -> bool:
+        if context is not None:
+            buffer = self.buffers.get(context, None)
+            return buffer is not None and buffer.has_logs()
+        return any(buffer.has_logs() for buffer in self.buffers.values())
+
+    def reset(self, context: Optional[Hashable] = None):
+        """
+        Removes logs of the context or all logs.
+        """
+        if context is None:
+            self.buffers.clear()
+            self.size = 0
+        else:
+            buffer = self.buffers.pop(context, None)
+            if buffer is not None:
+                self.size -= len(buffer.collection)
+        self.last_save = time()
@@ -1,7 +1,5 @@
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from device_detector import DeviceDetector
 from pydantic import field_validator
+from tracardi.service.cache.user_agent import user_agent_cache
 from tracardi.service.plugin.domain.register import Plugin, Spec, MetaData, Form, FormGroup, FormField, FormComponent, \
     Documentation, PortDoc
 from tracardi.service.plugin.domain.result import Result
@@ -35,10 +33,9 @@ class DetectClientAgentAction(ActionRunner):
     async def set_up(self, init):
         self.config = validate(init)
 
-    def detect_device(self, ua):
+    async def detect_device(self, ua):
         try:
-            detector = DeviceDetector(ua, skip_bot_detection=False)
-            return detector.parse()
+            return await user_agent_cache.detect_device_async(ua)
         except Exception as e:
             self.console.error(str(e))
             return {}
@@ -52,9 +49,7 @@ class DetectClientAgentAction(ActionRunner):
             dot = self._get_dot_accessor(payload)
             ua = dot[self.config.agent]
 
-            with ThreadPoolExecutor(max_workers=10) as pool:
-                loop = asyncio.get_event_loop()
-                device = await loop.run_in_executor(pool, self.detect_device, ua)  # type: DeviceDetector
+            device = await self.detect_device(ua)
 
             response = {
                 'status': {
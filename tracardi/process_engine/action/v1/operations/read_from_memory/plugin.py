@@ -23,6 +23,7 @@ class ReadFromMemoryAction(ActionRunner):
 
     client: Union[RedisClient, Any]
     config: Config
+    reusable = True
 
     async def set_up(self, init):
         self.config = validate(init)
@@ -41,6 +42,12 @@ class ReadFromMemoryAction(ActionRunner):
             )
             self.client = redis.from_url(uri)
 
+    async def close(self):
+        # Shared RedisClient must not be closed. Only the resource client is closed.
+        client = getattr(self, 'client', None)
+        if client is not None and not isinstance(client, RedisClient):
+            client.close()
+
     async def run(self, payload: dict, in_edge=None) -> Result:
         try:
             dot = self._get_dot_accessor(payload)
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple, Any
 
 from tracardi.domain.destination import Destination
 from tracardi.domain.event import Event
@@ -22,5 +22,17 @@ class DestinationInterface:
                              metadata=None):
         pass
 
+    def get_batch_size(self) -> int:
+        """
+        Max number of events sent in one dispatch_events call. Connectors whose API accepts arrays of
+        events return more than 1 and override dispatch_events.
+        """
+        return 1
+
+    async def dispatch_events(self, batch: List[Tuple[Any, Event]], profile: Optional[Profile],
+                              session: Optional[Session], metadata=None):
+        for data, event in batch:
+            await self.dispatch_event(data, profile, session, event, metadata)
+
     def _get_credentials(self):
         return self.resource.credentials.test if self.debug else self.resource.credentials.production
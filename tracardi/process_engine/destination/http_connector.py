@@ -3,7 +3,7 @@ import json
 from json import JSONDecodeError
 
 import aiohttp
-from typing import Optional, List
+from typing import Optional, List, Tuple, Any
 
 from aiohttp import ClientConnectorError, BasicAuth, ContentTypeError
 from pydantic import BaseModel
@@ -14,6 +14,7 @@ from tracardi.exceptions.log_handler import get_logger
 from tracardi.process_engine.tql.utils.dictonary import flatten
 from tracardi.process_engine.action.v1.connectors.api_call.model.configuration import Method
 from .destination_interface import DestinationInterface
+from .http_session_pool import http_session_pool
 from ...domain.event import Event
 
 logger = get_logger(__name__)
@@ -34,6 +35,8 @@ class HttpConfiguration(BaseModel):
     headers: Optional[dict] = {}
     cookies: Optional[dict] = {}
     ssl_check: bool = True
+    # Number of events sent in one request as an array in `data`. Works only for methods with body.
+    batch_size: int = 1
 
     @staticmethod
     def _convert_params(param):
@@ -73,14 +76,15 @@ class HttpConnector(DestinationInterface):
                     "{} values must be strings, `{}` given for {} `{}`".format(label, type(value), label.lower(),
                                                                                name))
 
+    def _get_configuration(self) -> HttpConfiguration:
+        return HttpConfiguration(**self.destination.destination.init)
+
     async def _dispatch(self, data, changed_fields):
         try:
             credentials = self.resource.credentials.test if self.debug is True else self.resource.credentials.production
             credentials = HttpCredentials(**credentials)
 
-            init = self.destination.destination.init
-
-            config = HttpConfiguration(**init)
+            config = self._get_configuration()
 
             self._validate_key_value(config.headers, "Header")
             self._validate_key_value(config.cookies, "Cookie")
@@ -88,41 +92,44 @@ class HttpConnector(DestinationInterface):
             timeout = aiohttp.ClientTimeout(total=config.timeout)
             url = str(credentials.url)
 
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                params = config.get_params({
-                    "data": data,
-                    "changes": changed_fields
-                })
-
-                async with session.request(
-                        method=config.method,
-                        url=url,
-                        headers=config.headers,
-                        cookies=config.cookies,
-                        ssl=config.ssl_check,
-                        auth=BasicAuth(credentials.username,
-                                       credentials.password) if credentials.has_basic_auth() else None,
-                        **params
-                ) as response:
-
-                    try:
-                        content = await response.json(content_type=None)
-
-                    except JSONDecodeError:
-                        content = await response.text()
-
-                    except ContentTypeError:
-                        content = await response.json(content_type='text/html')
-
-                    result = {
-                        "status": response.status,
-                        "content": content,
-                        "cookies": response.cookies
-                    }
+            # Connections to the resource are pooled and reused between dispatches
+            session = http_session_pool.get(self.resource.id)
+
+            params = config.get_params({
+                "data": data,
+                "changes": changed_fields
+            })
+
+            async with session.request(
+                    method=config.method,
+                    url=url,
+                    headers=config.headers,
+                    cookies=config.cookies,
+                    ssl=config.ssl_check,
+                    timeout=timeout,
+                    auth=BasicAuth(credentials.username,
+                                   credentials.password) if credentials.has_basic_auth() else None,
+                    **params
+            ) as response:
+
+                try:
+                    content = await response.json(content_type=None)
+
+                except JSONDecodeError:
+                    content = await response.text()
+
+                except ContentTypeError:
+                    content = await response.json(content_type='text/html')
+
+                result = {
+                    "status": response.status,
+                    "content": content,
+                    "cookies": response.cookies
+                }
 
-                    logger.debug(f"Destination response from {url}, response: {result}")
+                logger.debug(f"Destination response from {url}, response: {result}")
 
-                    # todo log
+                # todo log
 
         except ClientConnectorError as e:
             logger.error(str(e), e, exc_info=True)
@@ -139,3 +146,13 @@ class HttpConnector(DestinationInterface):
     async def dispatch_event(self, data, profile: Optional[Profile], session: Optional[Session], event: Event,
                              metadata=None):
         await self._dispatch(data, [])
+
+    def get_batch_size(self) -> int:
+        config = self._get_configuration()
+        if config.method.lower() == 'get':
+            return 1
+        return max(1, config.batch_size)
+
+    async def dispatch_events(self, batch: List[Tuple[Any, Event]], profile: Optional[Profile],
+                              session: Optional[Session], metadata=None):
+        await self._dispatch([data for data, _ in batch], [])
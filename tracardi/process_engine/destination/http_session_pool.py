@@ -0,0 +1,66 @@
+import asyncio
+from typing import Dict, Optional
+
+import aiohttp
+
+from tracardi.config import tracardi
+from tracardi.service.utils.loop import close_in_loop
+
+
+class HttpSessionPool:
+    """
+    Keeps one aiohttp ClientSession (and its connection pool) per resource, so connections to the same
+    remote host are reused between dispatches. Sessions are bound to the event loop that opened them,
+    a new set of sessions is opened if the pool is used from a different event loop and the old ones are
+    closed. Call close on shutdown (see tracardi.service.shutdown.close_all).
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def get(self, key: str) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._release()
+            self._loop = loop
+
+        session = self._sessions.get(key, None)
+        if session is None or session.closed:
+            # Cookies are sent per request, responses must not share them through the session cookie jar.
+            session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.limit),
+                                            cookie_jar=aiohttp.DummyCookieJar())
+            self._sessions[key] = session
+        return session
+
+    def _release(self):
+        # Sessions of other event loop are closed in that loop.
+        sessions = list(self._sessions.values())
+        self._sessions = {}
+        if not sessions or self._loop is None:
+            return
+
+        async def _close():
+            await asyncio.gather(*[session.close() for session in sessions])
+
+        if not close_in_loop(_close, self._loop):
+            # Loop ended, its connections can not be closed anymore. Sessions are detached so they are not
+            # reported as unclosed.
+            for session in sessions:
+                session.detach()
+
+    async def close(self):
+        if self._loop is not asyncio.get_running_loop():
+            self._release()
+        else:
+            sessions = list(self._sessions.values())
+            self._sessions = {}
+            await asyncio.gather(*[session.close() for session in sessions])
+        self._loop = None
+
+
+http_session_pool = HttpSessionPool(limit=tracardi.destination_connection_pool_size)
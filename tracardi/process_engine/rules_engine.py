@@ -25,8 +25,7 @@ from ..domain.session import Session
 from ..domain.rule import Rule
 from ..exceptions.exception_service import get_traceback
 from ..exceptions.log_handler import get_logger
-from ..service.storage.mysql.mapping.workflow_mapping import map_to_workflow_record
-from ..service.storage.mysql.service.workflow_service import WorkflowService
+from ..service.cache.workflow import load_flow_via_cache
 from ..service.utils.getters import get_entity_id
 
 logger = get_logger(__name__)
@@ -119,14 +118,11 @@ class RulesEngine:
 
                     # Loads flow for given rule
 
-                    ws = WorkflowService()
-                    flow_record = (await ws.load_by_id(rule.flow.id)).map_to_object(map_to_workflow_record)
+                    flow: Flow = await load_flow_via_cache(rule.flow.id)
 
-                    if not flow_record:
+                    if not flow:
                         raise ValueError("Could not find flow `{}`".format(rule.flow.id))
 
-                    flow: Flow = Flow.from_workflow_record(flow_record)
-
                 except Exception as e:
                     logger.error(str(e), e,
                                  extra=ExtraInfo.build(
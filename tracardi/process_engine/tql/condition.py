@@ -1,5 +1,7 @@
 import asyncio
+from functools import lru_cache
 
+from tracardi.config import memory_cache
 from tracardi.service.singleton import Singleton
 from tracardi.service.notation.dot_accessor import DotAccessor
 
@@ -11,13 +13,20 @@ class Condition(metaclass=Singleton):
 
     def __init__(self):
         self.parser = Parser(Parser.read('grammar/uql_expr.lark'), start='expr')
+        # Parsed trees are not mutated by ExprTransformer so they can be shared between evaluations.
+        # Conditions that fail to parse are not cached.
+        self._parse = lru_cache(maxsize=memory_cache.condition_cache_max_size)(self.parser.parse)
 
     def parse(self, condition):
-        return self.parser.parse(condition)
+        return self._parse(condition)
+
+    def cache_info(self):
+        return self._parse.cache_info()
+
+    def cache_clear(self):
+        self._parse.cache_clear()
 
     async def evaluate(self, condition, dot: DotAccessor):
-        # todo cache tree
         tree = self.parse(condition)
         await asyncio.sleep(0)
         return ExprTransformer(dot=dot).transform(tree)
-
@@ -17,12 +17,8 @@ class PostponeCache:
         return self.redis.hexists(self.hash, profile_id)
 
     def get(self, profile_id) -> bool:
-
-        if not self.exists(profile_id):
-            self.redis.hset(self.hash, profile_id, '1')
-            return False
-
-        return True
+        # Sets the flag only if it does not exist. One round trip.
+        return not self.redis.hsetnx(self.hash, profile_id, '1')
 
     def set(self, profile_id):
         self.redis.hset(self.hash, profile_id, '1')
@@ -43,9 +39,8 @@ class InstanceCache:
 
     def get_instance(self, profile_id, instance_id) -> Optional[str]:
 
-        if not self.exists(profile_id):
+        if self.redis.hsetnx(self.hash, profile_id, instance_id):
             logger.info(f"Create instance {instance_id} for profile {profile_id}")
-            self.redis.hset(self.hash, profile_id, instance_id)
             return None
 
         value_bson = self.redis.hget(self.hash, profile_id)
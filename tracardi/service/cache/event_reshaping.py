@@ -1,12 +1,13 @@
 from typing import List, Optional
 
+from tracardi.config import memory_cache
 from tracardi.domain.event_reshaping_schema import EventReshapingSchema
 from tracardi.service.storage.mysql.mapping.event_reshaping_mapping import map_to_event_reshaping
 from tracardi.service.storage.mysql.service.event_reshaping_service import EventReshapingService
 from tracardi.service.decorators.function_memory_cache import async_cache_for
 
 
-@async_cache_for(5)
+@async_cache_for(5, stale_ttl=memory_cache.config_cache_stale_ttl, tables=('event_reshaping',))
 async def load_and_convert_reshaping(event_type) -> Optional[List[EventReshapingSchema]]:
     ers = EventReshapingService()
     reshape_schemas = await ers.load_by_event_type(event_type)
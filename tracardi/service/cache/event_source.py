@@ -5,6 +5,7 @@ from tracardi.domain.event_source import EventSource
 from tracardi.service.decorators.function_memory_cache import async_cache_for
 from tracardi.service.storage.mysql.interface import event_source_dao
 
-@async_cache_for(memory_cache.source_ttl)
+@async_cache_for(memory_cache.source_ttl, stale_ttl=memory_cache.config_cache_stale_ttl,
+                 tables=('event_source',))
 async def load_event_source_via_cache(source_id) -> Optional[EventSource]:
     return await event_source_dao.load_event_source_by_id(source_id)
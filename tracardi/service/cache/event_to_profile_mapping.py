@@ -5,11 +5,20 @@ from tracardi.domain.event_to_profile import EventToProfile
 from tracardi.service.storage.mysql.mapping.event_to_profile_mapping import map_to_event_to_profile
 from tracardi.service.storage.mysql.service.event_to_profile_service import EventToProfileMappingService
 from tracardi.service.decorators.function_memory_cache import async_cache_for
+from tracardi.service.tracking.event_to_profile_plan import EventToProfilePlan, compile_event_to_profile
 
-@async_cache_for(memory_cache.event_to_profile_coping_ttl)
+@async_cache_for(memory_cache.event_to_profile_coping_ttl, stale_ttl=memory_cache.config_cache_stale_ttl,
+                 tables=('event_to_profile_mapping',))
 async def load_event_to_profile(event_type_id: str) -> List[EventToProfile]:
     etpms = EventToProfileMappingService()
     records = await etpms.load_by_type(event_type_id, enabled_only=True)
     if not records.exists():
         return []
-    return list(records.map_to_objects(map_to_event_to_profile))
\ No newline at end of file
+    return list(records.map_to_objects(map_to_event_to_profile))
+
+
+@async_cache_for(memory_cache.event_to_profile_coping_ttl, stale_ttl=memory_cache.config_cache_stale_ttl,
+                 tables=('event_to_profile_mapping',))
+async def load_event_to_profile_plans(event_type_id: str) -> List[EventToProfilePlan]:
+    # Schemas are compiled once per load, not per event.
+    return [compile_event_to_profile(schema) for schema in await load_event_to_profile(event_type_id)]
@@ -1,11 +1,137 @@
-from typing import List
+import asyncio
+from time import time
+from typing import List, Dict, Tuple, Optional, Set
 
 from tracardi.config import memory_cache
+from tracardi.context import get_context
 from tracardi.domain.rule import Rule
-from tracardi.service.decorators.function_memory_cache import async_cache_for
+from tracardi.exceptions.log_handler import get_logger
+from tracardi.service.decorators.function_memory_cache import on_cache_invalidation, listen_for_cache_invalidation, \
+    load_table_version
 from tracardi.service.storage.mysql.mapping.workflow_trigger_mapping import map_to_workflow_trigger_rule
 
-@async_cache_for(memory_cache.trigger_rule_cache_ttl)
-async def load_trigger_rule(wts, event_type: str, source_id: str) -> List[Rule]:
-    records = await wts.load_rule(event_type, source_id)
-    return list(records.map_to_objects(map_to_workflow_trigger_rule))
\ No newline at end of file
+logger = get_logger(__name__)
+
+_trigger_table = 'workflow_trigger'
+
+
+class TriggerRoutes:
+    """
+    Immutable snapshot of all enabled workflow triggers of one tenant and mode, indexed by
+    (source id, event type).
+    """
+
+    def __init__(self, tenant: str, version: Optional[int], rules: List[Rule]):
+        self.tenant = tenant
+        self.version = version
+        self.checked = time()
+        self.size = len(rules)
+        self._routes: Dict[Tuple[str, str], List[Rule]] = {}
+        for rule in rules:
+            if rule.source is None or rule.event_type is None:
+                continue
+            self._routes.setdefault((rule.source.id, rule.event_type.id), []).append(rule)
+
+    def get(self, source_id: str, event_type: str) -> List[Rule]:
+        return self._routes.get((source_id, event_type), [])
+
+    def needs_check(self, ttl: float) -> bool:
+        return time() - self.checked > ttl
+
+
+class TriggerRoutingTable:
+    """
+    Process-wide routing table of workflow triggers. All enabled triggers of the tenant are loaded at once
+    and events are routed with dict lookups, without I/O.
+
+    Each snapshot is versioned with the change counter of the trigger table. Every `ttl` seconds the
+    counter is checked in the background and the snapshot is rebuilt and swapped only if the version
+    changed. Change of the trigger table drops the tenant's snapshots at once (cache invalidation), so
+    the next event loads the new rules.
+    """
+
+    def __init__(self, ttl: float = memory_cache.trigger_rule_cache_ttl, build_chunk_size: int = 200):
+        self.ttl = ttl
+        self.build_chunk_size = build_chunk_size
+        self._snapshots: Dict[Tuple[bool, str], TriggerRoutes] = {}
+        self._loading: Dict[Tuple[bool, str], asyncio.Task] = {}
+        self._refreshing: Set[asyncio.Task] = set()
+        on_cache_invalidation((_trigger_table,), self.invalidate)
+
+    async def _build(self, key: Tuple[bool, str], wts, snapshot: Optional[TriggerRoutes]) -> TriggerRoutes:
+        version = await load_table_version(_trigger_table)
+        if snapshot is not None and version is not None and version == snapshot.version:
+            snapshot.checked = time()
+            return snapshot
+
+        records = await wts.load_enabled()
+        rules = []
+        for number, rule in enumerate(records.map_to_objects(map_to_workflow_trigger_rule), 1):
+            rules.append(rule)
+            if number % self.build_chunk_size == 0:
+                # Mapping of large trigger sets must not stall the event loop
+                await asyncio.sleep(0)
+        new_snapshot = TriggerRoutes(get_context().tenant, version, rules)
+
+        # Snapshot dropped while loading is outdated
+        if self._loading.get(key, None) is asyncio.current_task():
+            self._snapshots[key] = new_snapshot
+        logger.debug(f"Trigger routing table rebuilt with {new_snapshot.size} rules, version {version}.")
+        return new_snapshot
+
+    def _load(self, key: Tuple[bool, str], wts, snapshot: Optional[TriggerRoutes]) -> asyncio.Task:
+        loop = asyncio.get_running_loop()
+        task = self._loading.get(key, None)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return task
+
+        task = loop.create_task(self._build(key, wts, snapshot))
+        task.add_done_callback(lambda t: self._forget(key, t))
+        self._loading[key] = task
+        return task
+
+    def _forget(self, key: Tuple[bool, str], task: asyncio.Task):
+        if self._loading.get(key, None) is task:
+            del self._loading[key]
+
+    def _log_refresh_error(self, task: asyncio.Task):
+        self._refreshing.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Could not refresh trigger routing table. Details: {repr(task.exception())}")
+
+    async def get_routes(self, wts) -> TriggerRoutes:
+        """
+        Returns routing snapshot for current context. Loader (WorkflowTriggerService) is used only when
+        the snapshot is missing or its version changed.
+        """
+
+        listen_for_cache_invalidation()
+
+        context = get_context()
+        key = (context.production, context.tenant)
+        snapshot = self._snapshots.get(key, None)
+
+        if snapshot is None:
+            return await asyncio.shield(self._load(key, wts, None))
+
+        if snapshot.needs_check(self.ttl):
+            # Stale snapshot is used until the new one is ready
+            task = self._load(key, wts, snapshot)
+            if task not in self._refreshing:
+                self._refreshing.add(task)
+                task.add_done_callback(self._log_refresh_error)
+
+        return snapshot
+
+    def invalidate(self, tenant: Optional[str] = None):
+        for key, snapshot in list(self._snapshots.items()):
+            if tenant is None or snapshot.tenant == tenant:
+                del self._snapshots[key]
+        # Loads in progress may read old rules, their results are not stored.
+        self._loading.clear()
+
+    def __len__(self):
+        return len(self._snapshots)
+
+
+trigger_routing_table = TriggerRoutingTable()
@@ -0,0 +1,173 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Callable, Generic, Optional, TypeVar, List
+
+from device_detector import DeviceDetector
+from pydantic import BaseModel
+from user_agents import parse
+from user_agents.parsers import UserAgent
+
+from tracardi.config import memory_cache
+from tracardi.exceptions.log_handler import get_logger
+from tracardi.service.storage.redis.collections import Collection
+from tracardi.service.storage.redis.driver.async_redis_client import AsyncRedisClient
+
+logger = get_logger(__name__)
+
+T = TypeVar('T')
+
+
+class ParseCacheStats(BaseModel):
+    size: int = 0
+    hits: int = 0
+    misses: int = 0
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
+
+
+class ParseCache(Generic[T]):
+    """
+    Thread-safe LRU cache of parsed strings. Parsing runs outside the lock, so concurrent misses of
+    the same string may parse it twice. Errors are not cached.
+    """
+
+    def __init__(self, parser: Callable[[str], T], max_size: int):
+        self._parser = parser
+        self._max_size = max_size
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = ParseCacheStats()
+
+    def get(self, value: str) -> Optional[T]:
+        with self._lock:
+            try:
+                self._items.move_to_end(value)
+            except KeyError:
+                return None
+            self._stats.hits += 1
+            return self._items[value]
+
+    def __call__(self, value: str) -> T:
+        result = self.get(value)
+        if result is not None:
+            return result
+
+        result = self._parser(value)
+        with self._lock:
+            self._stats.misses += 1
+            self._items[value] = result
+            while len(self._items) > self._max_size:
+                self._items.popitem(last=False)
+        return result
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def stats(self) -> ParseCacheStats:
+        self._stats.size = len(self._items)
+        return self._stats
+
+
+def _detect_device(user_agent: str) -> DeviceDetector:
+    return DeviceDetector(user_agent, skip_bot_detection=False).parse()
+
+
+class UserAgentCache:
+    """
+    Process-wide cache of parsed user agents (user_agents) and detected devices (device_detector) shared by
+    the collector and plugins. User agent strings repeat a lot, so most requests are served without parsing.
+
+    If shared is set, user agents parsed for the first time are counted in redis. A new process parses the
+    most frequent ones in background on first use, so it starts with a warm cache.
+    """
+
+    def __init__(self, max_size: int, shared: bool = False, warm_up_size: int = 1000, shared_max_size: int = 10000):
+        self.user_agents: ParseCache[UserAgent] = ParseCache(parse, max_size)
+        self.devices: ParseCache[DeviceDetector] = ParseCache(_detect_device, max_size)
+        self.shared = shared
+        self.warm_up_size = min(warm_up_size, max_size)
+        self.shared_max_size = shared_max_size
+        self._new: List[str] = []
+        self._share_task: Optional[asyncio.Task] = None
+        self._warm_up_task: Optional[asyncio.Task] = None
+
+    def parse(self, user_agent: str) -> UserAgent:
+        if self.shared:
+            self._share(user_agent)
+        return self.user_agents(user_agent)
+
+    def detect_device(self, user_agent: str) -> DeviceDetector:
+        return self.devices(user_agent)
+
+    async def detect_device_async(self, user_agent: str) -> DeviceDetector:
+        """
+        Detects device without blocking the event loop. Parsing of new user agents runs in thread pool.
+        """
+        device = self.devices.get(user_agent)
+        if device is not None:
+            return device
+        return await asyncio.get_running_loop().run_in_executor(None, self.devices, user_agent)
+
+    def _share(self, user_agent: str):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        if self._warm_up_task is None:
+            self._warm_up_task = loop.create_task(self.warm_up())
+
+        if user_agent in self.user_agents:
+            return
+
+        self._new.append(user_agent)
+        if self._share_task is None or self._share_task.done():
+            self._share_task = loop.create_task(self._save_new())
+
+    async def _save_new(self):
+        # Collect user agents parsed within a second and save them at once
+        await asyncio.sleep(1)
+        new, self._new = self._new, []
+        try:
+            redis = AsyncRedisClient().client
+            async with redis.pipeline(transaction=False) as pipe:
+                for user_agent in new:
+                    pipe.zincrby(Collection.user_agents, 1, user_agent)
+                pipe.zremrangebyrank(Collection.user_agents, 0, -self.shared_max_size - 1)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Could not save user agents for warm up. Details: {repr(e)}")
+
+    async def warm_up(self):
+        """
+        Parses the most frequent user agents saved by all processes.
+        """
+        try:
+            user_agents = await AsyncRedisClient().client.zrevrange(Collection.user_agents, 0, self.warm_up_size - 1)
+        except Exception as e:
+            logger.warning(f"Could not load user agents for warm up. Details: {repr(e)}")
+            return
+
+        def _parse_all():
+            for user_agent in user_agents:
+                if isinstance(user_agent, bytes):
+                    user_agent = user_agent.decode()
+                if user_agent not in self.user_agents:
+                    self.user_agents(user_agent)
+
+        await asyncio.get_running_loop().run_in_executor(None, _parse_all)
+        logger.debug(f"User agent cache warmed up with {len(user_agents)} user agents.")
+
+
+user_agent_cache = UserAgentCache(
+    max_size=memory_cache.user_agent_cache_size,
+    shared=memory_cache.user_agent_cache_shared,
+    warm_up_size=memory_cache.user_agent_cache_warm_up_size
+)
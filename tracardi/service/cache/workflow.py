@@ -0,0 +1,15 @@
+from typing import Optional
+
+from tracardi.domain.flow import Flow, FlowRecord
+from tracardi.service.storage.mysql.mapping.workflow_mapping import map_to_workflow_record
+from tracardi.service.storage.mysql.service.workflow_service import WorkflowService
+from tracardi.service.wf.service.flow_cache import compiled_flow_cache
+
+
+async def _load_flow_record(flow_id: str) -> Optional[FlowRecord]:
+    ws = WorkflowService()
+    return (await ws.load_by_id(flow_id)).map_to_object(map_to_workflow_record)
+
+
+async def load_flow_via_cache(flow_id: str) -> Optional[Flow]:
+    return await compiled_flow_cache.load_flow(flow_id, loader=_load_flow_record)
@@ -0,0 +1,119 @@
+from typing import Optional, List, Tuple, Any
+
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+from tracardi.domain.profile import Profile
+from tracardi.service.change_monitoring.field_change_logger import FieldChangeLogger
+
+# Parts of profile that are changed without being logged (e.g. in Profile.mark_for_update). They are small
+# and always saved.
+_always_saved = [
+    ('ids',),
+    ('active',),
+    ('stats',),
+    ('segments',),
+    ('data', 'anonymous'),
+    ('metadata', 'time'),
+    ('metadata', 'aux'),
+    ('metadata', 'status'),
+    ('metadata', 'system'),
+]
+
+# Applies changes to stored profile: {"path": [...], "value": ...} replaces value, {"path": [...]} removes it.
+apply_profile_changes_script = """
+for (change in params.changes) {
+  def node = ctx._source;
+  def path = change.path;
+  boolean found = true;
+  for (int i = 0; i < path.size() - 1; i++) {
+    def key = path[i];
+    if (!(node[key] instanceof Map)) {
+      if (!change.containsKey('value')) { found = false; break; }
+      node[key] = new HashMap();
+    }
+    node = node[key];
+  }
+  if (!found) { continue; }
+  def last = path[path.size() - 1];
+  if (change.containsKey('value')) { node[last] = change.value; } else { node.remove(last); }
+}
+"""
+
+_missing = object()
+
+
+def _resolve(profile: Profile, path: List[str]) -> Tuple[List[str], Any]:
+    """
+    Returns the path cut at the first list (lists are saved as a whole) and its value or _missing.
+    """
+    value = profile
+    for position, key in enumerate(path):
+        if isinstance(value, list):
+            return path[:position], value
+        if isinstance(value, BaseModel):
+            if key in type(value).model_fields:
+                value = getattr(value, key)
+            elif value.model_extra and key in value.model_extra:
+                value = value.model_extra[key]
+            else:
+                return path, _missing
+        elif isinstance(value, dict):
+            if key not in value:
+                return path, _missing
+            value = value[key]
+        else:
+            return path, _missing
+    return path, value
+
+
+def _is_covered(path: Tuple[str, ...], saved: List[Tuple[str, ...]]) -> bool:
+    return any(path[:len(prefix)] == prefix for prefix in saved)
+
+
+def get_profile_changes(profile: Profile, field_change_logger: FieldChangeLogger) -> Optional[List[dict]]:
+    """
+    Turns logged field changes into a list of changes of the stored profile document (see
+    apply_profile_changes_script). Returns None if the profile must be indexed as a whole: it is new,
+    merged, not loaded from storage or nothing was logged.
+    """
+
+    if profile.is_new() or profile.needs_merging() or not profile.has_meta_data():
+        return None
+
+    if field_change_logger.empty():
+        return None
+
+    saved: List[Tuple[str, ...]] = []
+    changes = []
+
+    paths = [field.split('.') for field in field_change_logger.get_log()]
+    for path in _always_saved + sorted(paths, key=len):
+        if path[0] == 'operation':
+            continue
+        if path[0] == 'id':
+            return None
+
+        path, value = _resolve(profile, list(path))
+        if not path:
+            return None
+
+        path = tuple(path)
+        if _is_covered(path, saved):
+            continue
+        saved.append(path)
+
+        if value is _missing:
+            changes.append({"path": list(path)})
+        else:
+            changes.append({"path": list(path), "value": to_jsonable_python(value)})
+
+    # Timestamps of changed fields. Keys of metadata.fields are flat field names.
+    for field in field_change_logger.get_log():
+        if field in profile.metadata.fields:
+            changes.append({
+                "path": ['metadata', 'fields', field],
+                "value": to_jsonable_python(profile.metadata.fields[field])
+            })
+
+    return changes
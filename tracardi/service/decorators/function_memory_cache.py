@@ -1,13 +1,32 @@
 import asyncio
-from typing import Dict, Tuple, Any, Callable
+import json
+from time import time
+from typing import Dict, Tuple, Callable, Optional, Iterable, List
+from uuid import uuid4
 
 import functools
 
+from tracardi.config import memory_cache
 from tracardi.context import get_context
 from tracardi.event_server.utils.memory_cache import MemoryCache, CacheItem
+from tracardi.exceptions.exception import ExpiredException
+from tracardi.exceptions.log_handler import get_logger
+from tracardi.service.storage.redis.collections import Collection
+from tracardi.service.storage.redis.driver.async_redis_client import AsyncRedisClient
+
+logger = get_logger(__name__)
 
 cache: Dict[str, MemoryCache] = {}
 
+# Function key -> (tenant, mysql tables the cached function reads from)
+_cache_tables: Dict[str, Tuple[Optional[str], Tuple[str, ...]]] = {}
+
+# Single-flight loads: (function key, args key) -> loading task
+_loading: Dict[Tuple[str, str], asyncio.Task] = {}
+
+# Other caches that must be cleared when mysql tables change: (tables, callback(tenant))
+_invalidation_callbacks: List[Tuple[Tuple[str, ...], Callable[[Optional[str]], None]]] = []
+
 
 def _args_key(args, kwargs):
     key_parts = [args]
@@ -25,8 +44,8 @@ def _func_key(func, use_context: bool = True):
     return ':'.join(map(str, key_parts))
 
 
-def _run_function(func, args, kwargs, max_size, allow_null_values, key_func: Callable = None,
-                  use_context: bool = True) -> Tuple[Any, str, str]:
+def _get_cache(func, args, kwargs, max_size, allow_null_values, key_func: Callable = None,
+               use_context: bool = True, tables: Tuple[str, ...] = ()) -> Tuple[MemoryCache, str, str]:
     # Construct a unique cache key from the function's module name,
     # function name, args, and kwargs to avoid collisions.
 
@@ -45,28 +64,210 @@ def _run_function(func, args, kwargs, max_size, allow_null_values, key_func: Cal
             allow_null_values=allow_null_values,
             use_context=False  # It is already with context key
         )
+        _cache_tables[func_key] = (get_context().tenant if use_context else None, tables)
 
-    # Check cache
-    if args_key in cache[func_key]:
-        return cache[func_key][args_key].data, func_key, args_key
+    return cache[func_key], func_key, args_key
 
-    result = func(*args, **kwargs)
 
-    return result, func_key, args_key
+def _get_item(memory: MemoryCache, args_key: str) -> Optional[CacheItem]:
+    try:
+        return memory[args_key]
+    except ExpiredException:
+        return None
 
 
-def async_cache_for(ttl, max_size=1000, allow_null_values=False, key_func: Callable = None, use_context: bool = True):
-    def decorator(func):
-        @functools.wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            result, func_key, args_key = _run_function(func, args, kwargs, max_size, allow_null_values, key_func,
-                                                       use_context)
+def _log_load_error(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Could not load cached value. Details: {repr(task.exception())}")
+
+
+def _load(memory: MemoryCache, func_key: str, args_key: str, func, args, kwargs, ttl: float,
+          stale_ttl: float) -> asyncio.Task:
+    """
+    Loads the value once for all concurrent callers (single-flight). The result is not cached if the
+    cache was invalidated while the value was loading.
+    """
+
+    key = (func_key, args_key)
+    loop = asyncio.get_running_loop()
+
+    task = _loading.get(key, None)
+    if task is not None and not task.done() and task.get_loop() is loop:
+        return task
+
+    async def _run():
+        try:
+            result = func(*args, **kwargs)
             if asyncio.iscoroutine(result):
                 result = await result
 
-            # Update cache
-            cache[func_key][args_key] = CacheItem(data=result, ttl=ttl)
+            if _loading.get(key, None) is task:
+                memory[args_key] = CacheItem(data=result, ttl=ttl + stale_ttl, refresh=ttl if stale_ttl else None)
+
             return result
+        finally:
+            if _loading.get(key, None) is task:
+                del _loading[key]
+
+    task = loop.create_task(_run())
+    task.add_done_callback(_log_load_error)
+    _loading[key] = task
+    return task
+
+
+def invalidate_cache(tables: Iterable[str], tenant: Optional[str] = None):
+    """
+    Clears cached values of functions that read from any of the tables. If tenant is given only its
+    caches (production and test) are cleared.
+    """
+
+    tables = set(tables)
+    for func_key, (owner, func_tables) in list(_cache_tables.items()):
+        if tables.isdisjoint(func_tables):
+            continue
+        if tenant is not None and owner is not None and owner != tenant:
+            continue
+        cache[func_key].clear()
+        for key in [key for key in _loading if key[0] == func_key]:
+            del _loading[key]
+
+    for callback_tables, callback in _invalidation_callbacks:
+        if not tables.isdisjoint(callback_tables):
+            callback(tenant)
+
+
+def on_cache_invalidation(tables: Tuple[str, ...], callback: Callable[[Optional[str]], None]):
+    """
+    Registers callback that is called with tenant (None for all tenants) when any of the tables changes.
+    """
+    _invalidation_callbacks.append((tables, callback))
+
+
+class _CacheInvalidationListener:
+    """
+    Receives names of changed mysql tables published by other processes and clears cached values
+    loaded from these tables. One pub/sub connection per process. If redis is not available, cache
+    falls back to ttl and the listener is started again after retry_after seconds.
+    """
+
+    def __init__(self, retry_after: float = 5):
+        self.origin = uuid4().hex
+        self.retry_after = retry_after
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._retry_at = 0.0
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            if (self._task is not None and not self._task.done()) or time() < self._retry_at:
+                return
+        self._loop = loop
+        self._task = loop.create_task(self._listen())
+
+    def receive(self, data):
+        try:
+            message = json.loads(data)
+        except (ValueError, TypeError):
+            return
+
+        if message.get('origin', None) == self.origin:
+            # Already invalidated when published
+            return
+
+        invalidate_cache(message.get('tables', []), message.get('tenant', None))
+
+    async def _listen(self):
+        pubsub = AsyncRedisClient().pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(Collection.config_cache_invalidation)
+            if self._retry_at:
+                # Invalidations could be missed while disconnected
+                invalidate_cache({table for _, tables in _cache_tables.values() for table in tables} |
+                                 {table for tables, _ in _invalidation_callbacks for table in tables})
+            async for message in pubsub.listen():
+                self.receive(message['data'])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._retry_at = time() + self.retry_after
+            logger.warning(f"Cache invalidation listener stopped. Cache falls back to ttl. Details: {repr(e)}")
+        finally:
+            await pubsub.aclose()
+
+
+_invalidation_listener = _CacheInvalidationListener()
+
+
+def listen_for_cache_invalidation():
+    if memory_cache.config_cache_invalidation:
+        _invalidation_listener.start()
+
+
+async def load_table_version(table: str) -> Optional[int]:
+    """
+    Returns the tenant's change counter of mysql table or None if it is not available.
+    """
+
+    if not memory_cache.config_cache_invalidation:
+        return None
+
+    try:
+        version = await AsyncRedisClient().get(f"{Collection.config_cache_version}{table}")
+        return int(version) if version is not None else 0
+    except Exception as e:
+        logger.warning(f"Could not load version of table {table}. Details: {repr(e)}")
+        return None
+
+
+async def publish_cache_invalidation(*tables: str):
+    """
+    Clears cached values read from the mysql tables in this process and in all other processes of
+    the tenant, and increments tables' change counters. Call it after the tables are changed.
+    """
+
+    tenant = get_context().tenant
+    invalidate_cache(tables, tenant)
+
+    if not memory_cache.config_cache_invalidation:
+        return
+
+    try:
+        redis = AsyncRedisClient()
+        for table in tables:
+            await redis.incr(f"{Collection.config_cache_version}{table}")
+        await redis.publish(
+            Collection.config_cache_invalidation,
+            json.dumps({"origin": _invalidation_listener.origin, "tenant": tenant, "tables": list(tables)})
+        )
+    except Exception as e:
+        logger.warning(f"Could not publish cache invalidation of tables {tables}. Details: {repr(e)}")
+
+
+def async_cache_for(ttl, max_size=1000, allow_null_values=False, key_func: Callable = None, use_context: bool = True,
+                    stale_ttl: float = 0, tables: Tuple[str, ...] = ()):
+    """
+    Caches results of coroutine in memory. Concurrent calls with the same arguments share one load.
+    If stale_ttl is set, the value is served for stale_ttl seconds after ttl while it is reloaded in background.
+    Values are invalidated when any of the mysql tables is changed (see publish_cache_invalidation).
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            memory, func_key, args_key = _get_cache(func, args, kwargs, max_size, allow_null_values, key_func,
+                                                    use_context, tables)
+
+            if tables:
+                listen_for_cache_invalidation()
+
+            item = _get_item(memory, args_key)
+            if item is not None:
+                if item.needs_refresh():
+                    _load(memory, func_key, args_key, func, args, kwargs, ttl, stale_ttl)
+                return item.data
+
+            return await asyncio.shield(_load(memory, func_key, args_key, func, args, kwargs, ttl, stale_ttl))
 
         return async_wrapper
 
@@ -77,11 +278,18 @@ def cache_for(ttl, max_size=1000, allow_null_values=False, key_func: Callable =
     def decorator(func):
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
-            result, func_key, args_key = _run_function(func, args, kwargs, max_size, allow_null_values, key_func,
-                                                       use_context)
+            memory, func_key, args_key = _get_cache(func, args, kwargs, max_size, allow_null_values, key_func,
+                                                    use_context)
+
+            # Check cache
+            item = _get_item(memory, args_key)
+            if item is not None:
+                return item.data
+
+            result = func(*args, **kwargs)
 
             # Update cache
-            cache[func_key][args_key] = CacheItem(data=result, ttl=ttl)
+            memory[args_key] = CacheItem(data=result, ttl=ttl)
             return result
 
         return sync_wrapper
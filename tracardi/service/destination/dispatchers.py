@@ -1,20 +1,104 @@
-from typing import Optional, List
+import asyncio
+from collections import defaultdict
+from typing import Optional, List, Dict, Tuple, Any
 
+from tracardi.config import tracardi
 from tracardi.domain import ExtraInfo
 from tracardi.domain.event import Event
 from tracardi.domain.profile import Profile
 from tracardi.domain.session import Session
 from tracardi.exceptions.exception_service import get_traceback
 from tracardi.exceptions.log_handler import get_logger
+from tracardi.process_engine.destination.destination_interface import DestinationInterface
 from tracardi.service.cache.destinations import load_profile_destinations, load_event_destinations
 from tracardi.domain.destination import Destination
 from tracardi.service.destination.utils import get_dispatch_destination_and_data
+from tracardi.service.latency import stage
 from tracardi.service.notation.dot_accessor import DotAccessor
 from tracardi.service.utils.getters import get_entity_id
 
 logger = get_logger(__name__)
 
 
+class DestinationLimiter:
+    """
+    Limits the number of concurrent dispatches to one destination. Semaphores are bound to the event loop,
+    they are recreated if the limiter is used from a different event loop.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get(self, destination_id: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphores = {}
+            self._loop = loop
+
+        semaphore = self._semaphores.get(destination_id, None)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.limit)
+            self._semaphores[destination_id] = semaphore
+        return semaphore
+
+
+destination_limiter = DestinationLimiter(tracardi.destination_concurrency)
+
+
+def _log_dispatch_error(e: Exception, profile: Optional[Profile], event: Optional[Event] = None):
+    logger.error(
+        str(e),
+        extra=ExtraInfo.exact(
+            flow_id=None,
+            node_id=None,
+            event_id=get_entity_id(event),
+            profile_id=get_entity_id(profile),
+            origin='profile-destination',
+            package=__name__,
+            traceback=get_traceback(e)
+        )
+    )
+
+
+async def _dispatch_events_to_destination(destination_instance: DestinationInterface,
+                                          batch: List[Tuple[Any, Event]],
+                                          profile: Optional[Profile],
+                                          session: Optional[Session],
+                                          metadata):
+    semaphore = destination_limiter.get(destination_instance.destination.id)
+
+    async def _dispatch_event(data, event: Event):
+        async with semaphore:
+            try:
+                with stage("destination.event", label=type(destination_instance).__name__):
+                    await destination_instance.dispatch_event(data,
+                                                              profile=profile,
+                                                              session=session,
+                                                              event=event,
+                                                              metadata=metadata)
+            except Exception as e:
+                _log_dispatch_error(e, profile, event)
+
+    async def _dispatch_batch(chunk: List[Tuple[Any, Event]]):
+        async with semaphore:
+            try:
+                with stage("destination.events", label=type(destination_instance).__name__):
+                    await destination_instance.dispatch_events(chunk,
+                                                               profile=profile,
+                                                               session=session,
+                                                               metadata=metadata)
+            except Exception as e:
+                _log_dispatch_error(e, profile, chunk[0][1])
+
+    batch_size = destination_instance.get_batch_size() if len(batch) > 1 else 1
+    if batch_size > 1:
+        await asyncio.gather(*[_dispatch_batch(batch[i:i + batch_size]) for i in range(0, len(batch), batch_size)])
+    else:
+        await asyncio.gather(*[_dispatch_event(data, event) for data, event in batch])
+
+
 async def event_destination_dispatch(profile: Optional[Profile],
                                      session: Optional[Session],
                                      events: List[Event],
@@ -22,6 +106,13 @@ async def event_destination_dispatch(profile: Optional[Profile],
                                      metadata=None
                                      ):
     dot = DotAccessor(profile, session)
+
+    # Data is reshaped per event first (dot changes with every event), then dispatched concurrently:
+    # destinations in parallel, events to one destination up to the destination concurrency limit
+    # or in batches if the destination accepts arrays of events.
+
+    instances: Dict[str, DestinationInterface] = {}
+    batches: Dict[str, List[Tuple[Any, Event]]] = defaultdict(list)
     for event in events:
         try:
             # Reads from cache
@@ -35,25 +126,16 @@ async def event_destination_dispatch(profile: Optional[Profile],
             async for destination_instance, reshaped_data in get_dispatch_destination_and_data(
                     dot,
                     destinations,
-                    debug):
-                await destination_instance.dispatch_event(reshaped_data,
-                                                          profile=profile,
-                                                          session=session,
-                                                          event=event,
-                                                          metadata=metadata)
+                    debug,
+                    instances):
+                batches[destination_instance.destination.id].append((reshaped_data, event))
         except Exception as e:
-            logger.error(
-                str(e),
-                extra=ExtraInfo.exact(
-                    flow_id=None,
-                    node_id=None,
-                    event_id=get_entity_id(event),
-                    profile_id=get_entity_id(profile),
-                    origin='profile-destination',
-                    package=__name__,
-                    traceback=get_traceback(e)
-                )
-            )
+            _log_dispatch_error(e, profile, event)
+
+    await asyncio.gather(*[
+        _dispatch_events_to_destination(instances[destination_id], batch, profile, session, metadata)
+        for destination_id, batch in batches.items()
+    ])
 
 
 async def profile_destination_dispatch(profile: Optional[Profile],
@@ -65,26 +147,23 @@ async def profile_destination_dispatch(profile: Optional[Profile],
     dot = DotAccessor(profile, session)
     destinations: List[Destination] = await load_profile_destinations()
 
-    async for destination_instance, reshaped_data in get_dispatch_destination_and_data(dot, destinations, debug):
-        try:
-            logger.info(f"Dispatching {destination_instance}. Profile id: {get_entity_id(profile)}.")
-            await destination_instance.dispatch_profile(
-                reshaped_data,
-                profile=profile,
-                session=session,
-                changed_fields=changed_fields,
-                metadata=metadata
-            )
-        except Exception as e:
-            logger.error(
-                str(e),
-                extra=ExtraInfo.exact(
-                    flow_id=None,
-                    node_id=None,
-                    event_id=None,
-                    profile_id=get_entity_id(profile),
-                    origin='profile-destination',
-                    package=__name__,
-                    traceback=get_traceback(e)
-                )
-            )
+    async def _dispatch_profile(destination_instance: DestinationInterface, reshaped_data):
+        async with destination_limiter.get(destination_instance.destination.id):
+            try:
+                logger.info(f"Dispatching {destination_instance}. Profile id: {get_entity_id(profile)}.")
+                with stage("destination.profile", label=type(destination_instance).__name__):
+                    await destination_instance.dispatch_profile(
+                        reshaped_data,
+                        profile=profile,
+                        session=session,
+                        changed_fields=changed_fields,
+                        metadata=metadata
+                    )
+            except Exception as e:
+                _log_dispatch_error(e, profile)
+
+    # Destinations are dispatched concurrently
+    await asyncio.gather(*[
+        _dispatch_profile(destination_instance, reshaped_data)
+        async for destination_instance, reshaped_data in get_dispatch_destination_and_data(dot, destinations, debug)
+    ])
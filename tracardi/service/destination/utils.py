@@ -1,4 +1,5 @@
-from typing import List, Any
+from functools import lru_cache
+from typing import List, Any, Optional, Dict
 
 from tracardi.domain import ExtraInfo
 from tracardi.domain.destination import Destination
@@ -22,12 +23,18 @@ def _get_class_and_module(package):
     return ".".join(parts[:-1]), parts[-1]
 
 
-def _get_destination_class(destination: Destination):
-    module, class_name = _get_class_and_module(destination.destination.package)
+@lru_cache(maxsize=None)
+def _load_destination_class(package: str):
+    module, class_name = _get_class_and_module(package)
     module = import_package(module)
     return load_callable(module, class_name)
 
 
+def _get_destination_class(destination: Destination):
+    # Destination classes are imported once per package
+    return _load_destination_class(destination.destination.package)
+
+
 async def _get_destination_dispatchers(destinations: List[Destination], dot, template):
     for destination in destinations:
 
@@ -45,32 +52,39 @@ async def _get_destination_dispatchers(destinations: List[Destination], dot, tem
             logger.error(f"Destination `{destination.name}` not triggered. Reason: {str(e)}", exc_info=ExtraInfo.exact('resource-loading', package=__name__))
             continue
 
-        data = template.reshape(reshape_template=destination.mapping)
-
         if destination.condition:
             condition = Condition()
             condition_result = await condition.evaluate(destination.condition, dot)
-            if condition_result:
-                yield destination, resource, data
-        else:
-            yield destination, resource, data
+            if not condition_result:
+                continue
+
+        # Data is reshaped only for destinations that will be dispatched
+        yield destination, resource, template.reshape(reshape_template=destination.mapping)
 
 
 async def get_dispatch_destination_and_data(
         dot: DotAccessor,
         destinations: List[Destination],
-        debug: bool):
+        debug: bool,
+        instances: Optional[Dict[str, DestinationInterface]] = None):
+    """
+    Yields destination instances and reshaped data for destinations that should be dispatched.
+    Pass instances dict to reuse destination instances between calls (keyed by destination id).
+    """
 
     template = DictTraverser(dot, default=None)
 
     async for destination, resource, data in _get_destination_dispatchers(destinations,
                                                                           dot,
                                                                           template):  # type: Destination, Resource, Any
-        destination_class = _get_destination_class(destination)
-        destination_instance = destination_class(debug, resource, destination)  # type: DestinationInterface
-        reshaped_data = template.reshape(reshape_template=destination.mapping)
-
-        yield destination_instance, reshaped_data
+        destination_instance = instances.get(destination.id, None) if instances is not None else None
+        if destination_instance is None:
+            destination_class = _get_destination_class(destination)
+            destination_instance = destination_class(debug, resource, destination)  # type: DestinationInterface
+            if instances is not None:
+                instances[destination.id] = destination_instance
+
+        yield destination_instance, data
 
 
 def get_destination_types():
@@ -7,7 +7,7 @@ from tracardi.domain.profile import Profile
 from tracardi.domain.session import Session
 from tracardi.service.singleton import Singleton
 from tracardi.service.storage.redis.collections import Collection
-from tracardi.service.storage.redis.driver.redis_client import RedisClient
+from tracardi.service.storage.redis.driver.async_redis_client import AsyncRedisClient
 
 batch = 3
 i = 0
@@ -28,14 +28,14 @@ class FieldMapper(metaclass=Singleton):
     def __init__(self):
         self.i = 0
         self.batch = 5
-        self.redis = RedisClient()
+        self.redis = AsyncRedisClient()
 
-    def get_field_mapping(self, type: str) -> Set[str]:
+    async def get_field_mapping(self, type: str) -> Set[str]:
         if type in redis_collections:
-            return {item.decode() for item in self.redis.smembers(redis_collections[type])}
+            return {item.decode() for item in await self.redis.smembers(redis_collections[type])}
         return set()
 
-    def add_field_mappings(self, type, entities: List[Entity]) -> bool:
+    async def add_field_mappings(self, type, entities: List[Entity]) -> bool:
         new_props = set()
         for entity in entities:
             self.i += 1
@@ -51,22 +51,25 @@ class FieldMapper(metaclass=Singleton):
         field_mappings[type].update(new_props)
 
         if self.i > self.batch:
-            self.save_cache()
+            await self.save_cache()
 
         return True
 
-    def save_cache(self):
+    async def save_cache(self):
         self.i = 0
-        for type, field_maps in field_mappings.items():
-            if len(field_maps) > 0 and type in redis_collections:
-                self.redis.sadd(redis_collections[type], *list(field_maps))
+        async with self.redis.pipeline() as pipe:
+            for type, field_maps in field_mappings.items():
+                if len(field_maps) > 0 and type in redis_collections:
+                    pipe.sadd(redis_collections[type], *list(field_maps))
+            if len(pipe) > 0:
+                await pipe.execute()
 
 
-def add_new_field_mappings(profile: Optional[Profile], session: Optional[Session]):
+async def add_new_field_mappings(profile: Optional[Profile], session: Optional[Session]):
     # Add mappings
     if tracardi.expose_gui_api is True:
         if profile:
-            FieldMapper().add_field_mappings('profile', [profile])
+            await FieldMapper().add_field_mappings('profile', [profile])
 
         if session:
-            FieldMapper().add_field_mappings('session', [session])
\ No newline at end of file
+            await FieldMapper().add_field_mappings('session', [session])
\ No newline at end of file
@@ -0,0 +1,270 @@
+from collections import deque
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter, time
+from typing import Dict, List, Optional, Tuple, Deque
+
+from tracardi.config import tracardi
+from tracardi.context import get_context
+from tracardi.exceptions.log_handler import get_logger
+
+logger = get_logger(__name__)
+
+_current: ContextVar[Optional['Span']] = ContextVar("latency_span", default=None)
+
+quantiles = (0.5, 0.9, 0.99, 0.999)
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of latencies in microseconds, as in HDR histogram. Values below 2^bits are counted
+    exactly, above that every power of two is split into 2^bits buckets, so quantiles are precise to about
+    1/2^bits of the value. Only buckets with counts are stored.
+    """
+
+    __slots__ = ('bits', 'size', 'counts', 'count', 'sum', 'max')
+
+    def __init__(self, bits: int = 5):
+        self.bits = bits
+        self.size = 1 << bits
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def _index(self, value: int) -> int:
+        if value < self.size:
+            return value
+        shift = value.bit_length() - self.bits - 1
+        return self.size * shift + (value >> shift)
+
+    def _upper_bound(self, index: int) -> int:
+        if index < self.size:
+            return index + 1
+        shift = index // self.size - 1
+        return (index - self.size * shift + 1) << shift
+
+    def record(self, seconds: float):
+        index = self._index(int(seconds * 1000000))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, counts: Dict[int, int], seconds: float):
+        """
+        Adds bucket counts of other histogram with the same bits, e.g. loaded from storage. Max of merged
+        values is not known and is taken as the upper bound of their highest bucket.
+        """
+        for index, count in counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+            self.count += count
+        self.sum += seconds
+        if counts:
+            self.max = max(self.max, self._upper_bound(max(counts)) / 1000000)
+
+    def quantile(self, q: float) -> float:
+        """
+        Returns upper bound of the bucket of the q quantile in seconds, not more than the max value.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        total = 0
+        for index in sorted(self.counts):
+            total += self.counts[index]
+            if total >= rank:
+                return min(self._upper_bound(index) / 1000000, self.max)
+        return self.max
+
+
+class Span:
+    """
+    Timed stage of a request. Spans opened in a span are its children. Spans are recorded in histograms of
+    their trace when closed.
+    """
+
+    __slots__ = ('name', 'label', 'trace', 'start', 'duration', 'children', '_token')
+
+    def __init__(self, name: str, trace: 'RequestTrace', label: Optional[str] = None):
+        self.name = name
+        self.label = label
+        self.trace = trace
+        self.start = 0.0
+        self.duration = None
+        self.children: List['Span'] = []
+
+    def __enter__(self):
+        self.start = perf_counter()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.duration = perf_counter() - self.start
+        _current.reset(self._token)
+        self.trace.close(self)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "label": self.label,
+            "start": round(self.start - self.trace.root.start, 6),
+            "duration": round(self.duration, 6) if self.duration is not None else None,
+            "children": [child.to_dict() for child in self.children]
+        }
+
+
+class _NoSpan:
+    # Returned when latency is not measured.
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+_no_span = _NoSpan()
+
+
+class RequestTrace:
+
+    def __init__(self, latency: 'StageLatency', tenant: str, source: str):
+        self.latency = latency
+        self.tenant = tenant
+        self.source = source
+        self.keep_tree = latency.slow_request_threshold > 0
+        self.root = Span('request', self)
+
+    def close(self, span: Span):
+        self.latency.record(span.name, self.tenant, self.source, span.duration)
+        if span is self.root and self.keep_tree and span.duration * 1000 >= self.latency.slow_request_threshold:
+            self.latency.sample(self)
+
+
+class StageLatency:
+    """
+    Latency histograms of collector stages per tenant and source, and samples of slow requests with their
+    span trees. Stages are measured only within a traced request, see `trace_request` and `stage`.
+    """
+
+    def __init__(self, enabled: bool, slow_request_threshold: int, slow_request_samples: int):
+        self.enabled = enabled
+        # Ms, 0 is off
+        self.slow_request_threshold = slow_request_threshold
+        self.histograms: Dict[Tuple[str, str, str], LatencyHistogram] = {}
+        self.slow_requests: Deque[dict] = deque(maxlen=slow_request_samples)
+
+    def record(self, stage: str, tenant: str, source: str, seconds: float):
+        key = (stage, tenant, source)
+        histogram = self.histograms.get(key, None)
+        if histogram is None:
+            histogram = self.histograms[key] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def sample(self, trace: RequestTrace):
+        sample = {
+            "time": time(),
+            "tenant": trace.tenant,
+            "source": trace.source,
+            "duration": trace.root.duration,
+            "span": trace.root.to_dict()
+        }
+        self.slow_requests.append(sample)
+        logger.warning(f"Slow request of source {trace.source} took {trace.root.duration * 1000:.1f}ms. "
+                       f"Spans: {_format_span(sample['span'])}")
+
+    def stats(self) -> List[dict]:
+        return [
+            {
+                "stage": stage,
+                "tenant": tenant,
+                "source": source,
+                "count": histogram.count,
+                "sum": histogram.sum,
+                "max": histogram.max,
+                "quantiles": {q: histogram.quantile(q) for q in quantiles}
+            }
+            for (stage, tenant, source), histogram in sorted(self.histograms.items())
+        ]
+
+    def export_prometheus(self) -> str:
+        """
+        Returns histograms in Prometheus text format as summary with quantiles.
+        """
+        lines = [
+            "# HELP tracardi_stage_latency_seconds Latency of collector stages.",
+            "# TYPE tracardi_stage_latency_seconds summary"
+        ]
+        for (stage, tenant, source), histogram in sorted(self.histograms.items()):
+            labels = f'stage="{_escape(stage)}",tenant="{_escape(tenant)}",source="{_escape(source)}"'
+            for q in quantiles:
+                lines.append(f'tracardi_stage_latency_seconds{{{labels},quantile="{q}"}} {histogram.quantile(q)}')
+            lines.append(f'tracardi_stage_latency_seconds_sum{{{labels}}} {histogram.sum}')
+            lines.append(f'tracardi_stage_latency_seconds_count{{{labels}}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        self.histograms.clear()
+        self.slow_requests.clear()
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_span(span: dict, depth: int = 0) -> str:
+    label = f"({span['label']})" if span['label'] else ""
+    duration = f"{span['duration'] * 1000:.1f}ms" if span['duration'] is not None else "running"
+    lines = [f"\n{'  ' * depth}{span['name']}{label} +{span['start'] * 1000:.1f}ms {duration}"]
+    for child in span['children']:
+        lines.append(_format_span(child, depth + 1))
+    return "".join(lines)
+
+
+stage_latency = StageLatency(
+    enabled=tracardi.latency_metrics,
+    slow_request_threshold=tracardi.slow_request_threshold,
+    slow_request_samples=tracardi.slow_request_samples
+)
+
+
+def trace_request(source_id: Optional[str]):
+    """
+    Returns root span of a request. Stages of the request are measured while the root span is open.
+    """
+    if not stage_latency.enabled:
+        return _no_span
+    return RequestTrace(stage_latency, get_context().tenant, source_id or "").root
+
+
+def stage(name: str, label: Optional[str] = None):
+    """
+    Returns span of a stage if it runs within a traced request. Usage: `with stage("compute_data"): ...`
+    """
+    parent = _current.get()
+    if parent is None:
+        return _no_span
+    span = Span(name, parent.trace, label)
+    if parent.trace.keep_tree:
+        parent.children.append(span)
+    return span
+
+
+def timed(name: str):
+    """
+    Measures async function as stage.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return await func(*args, **kwargs)
+            with stage(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
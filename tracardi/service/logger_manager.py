@@ -1,4 +1,8 @@
-from tracardi.context import get_context
+import asyncio
+from typing import Optional
+
+from tracardi.config import tracardi
+from tracardi.context import Context, ServerContext
 from tracardi.exceptions.log_handler import log_handler, get_installation_logger
 from tracardi.cluster_config import is_save_logs_on
 from tracardi.service.license import License
@@ -15,25 +19,75 @@ def logger_guard(logs):
     return bool(logs)
 
 
-async def save_logs():
-    if log_handler.has_logs():
+async def _save_context_logs(context: Context):
+    if not await is_save_logs_on():
+        log_handler.reset(context)
+        return None
+
+    # Saving logs is on
+
+    if not License.has_license() and not await installation_status.has_logs_index(context):
+        log_handler.reset(context)
+        logger.warning(
+            "Logs index is not available. Probably system is not installed or being installed or the index went missing.")
+        return None
+
+    batch_size = max(1, tracardi.log_save_batch_size)
+    for _ in range(len(log_handler) // batch_size + 1):
+        logs = log_handler.pop_batch(context, batch_size)
+        if not logs:
+            break
+        if License.has_license():
+            # Runs only if there are logs (see logger_guard) and it is deferred.
+            await log_saver_worker(logs)
+        else:
+            await log_db.save(logs)
+
+
+async def save_logs() -> bool:
+    """
+    Saves logs buffered in log handler in batches of max LOG_SAVE_BATCH_SIZE, each in the context (mode and
+    tenant) it was logged in. Logs buffered while saving wait for the next save. Returns False if saving logs of
+    any context failed.
+    """
+    saved = True
+    for context in log_handler.contexts():
+        try:
+            with ServerContext(context):
+                await _save_context_logs(context)
+        except Exception as e:
+            saved = False
+            logger.warning(f"Could not save logs of {context}. Details: {repr(e)}")
+    return saved
+
+
+class LogSaver:
+    """
+    Saves logs in background interval after a log is buffered, as long as there are logs. Stops after a
+    failed save, the next buffered log schedules it again.
+    """
 
+    def __init__(self, interval: float):
+        # Seconds
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def schedule(self):
         try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Logged outside of event loop, logs wait for the next schedule.
+            return
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._task = loop.create_task(self._save())
+
+    async def _save(self):
+        while log_handler.has_logs():
+            await asyncio.sleep(self.interval)
+            if not await save_logs():
+                return
+
 
-            if not await is_save_logs_on():
-                return None
-
-            # Saving logs is on
-
-            logs = log_handler.collection
-            if License.has_license():
-                # Runs only if there are logs (see logger_guard) and it is deferred.
-                await log_saver_worker(logs)
-            else:
-                if await installation_status.has_logs_index(get_context()):
-                    return await log_db.save(logs)
-                else:
-                    logger.warning(
-                        "Logs index is not available. Probably system is not installed or being installed or the index went missing.")
-        finally:
-            log_handler.reset()
+log_saver = LogSaver(interval=tracardi.log_save_interval / 1000)
+log_handler.on_log = log_saver.schedule
@@ -0,0 +1,126 @@
+import asyncio
+from typing import List, Iterable, Set, Tuple
+
+from tracardi.config import tracardi
+from tracardi.context import get_context, ServerContext, Context
+from tracardi.exceptions.log_handler import get_logger
+from tracardi.service.storage.elastic.interface import raw as raw_db
+from tracardi.service.storage.elastic.profile_alias import profile_alias_table
+
+logger = get_logger(__name__)
+
+
+class MergeExecutor:
+    """
+    Moves events and sessions of duplicate profiles to the merged profile. All duplicate ids are moved with
+    one update by query per index that runs in elastic as a sliced task. Tasks are watched in background,
+    until they end reads of duplicate ids are answered through the profile alias table.
+
+    Documents written while the task runs are skipped as version conflicts. The update is started again for
+    them, at most conflict retries times. Aliases are removed only when all documents were moved.
+    """
+
+    def __init__(self, indices: Tuple[str, ...], slices, check_interval: float, alias_ttl: int,
+                 conflict_retries: int = 3):
+        self.indices = indices
+        self.slices = slices
+        self.check_interval = check_interval
+        self.alias_ttl = alias_ttl
+        self.conflict_retries = conflict_retries
+        self._watchers: Set[asyncio.Task] = set()
+
+    async def move(self, merged_profile_id: str, duplicate_profile_ids: Iterable[str]) -> List[str]:
+        """
+        Starts moving documents of duplicate profiles and returns elastic task ids. Does not wait for tasks.
+        """
+        old_profile_ids = [profile_id for profile_id in dict.fromkeys(duplicate_profile_ids)
+                           if profile_id != merged_profile_id]
+        if not old_profile_ids:
+            return []
+
+        # Documents of profiles merged into duplicates before may not be moved yet.
+        for profile_id in list(old_profile_ids):
+            old_profile_ids += [alias for alias in await profile_alias_table.aliases(profile_id)
+                                if alias not in old_profile_ids and alias != merged_profile_id]
+
+        await profile_alias_table.add(merged_profile_id, old_profile_ids, ttl=self.alias_ttl)
+
+        task_ids = [await raw_db.start_profile_ids_update(index, old_profile_ids, merged_profile_id, self.slices)
+                    for index in self.indices]
+
+        watcher = asyncio.create_task(self._watch(merged_profile_id, old_profile_ids,
+                                                  list(zip(self.indices, task_ids)), get_context()))
+        self._watchers.add(watcher)
+        watcher.add_done_callback(self._watchers.discard)
+
+        return task_ids
+
+    async def wait_for(self, task_id: str) -> dict:
+        while True:
+            status = await raw_db.get_task(task_id)
+            if status.get('completed', False):
+                return status
+            await asyncio.sleep(self.check_interval)
+
+    async def _wait_for_move(self, index: str, task_id: str, merged_profile_id: str,
+                             old_profile_ids: List[str]) -> bool:
+        """
+        Waits for the task and starts it again while documents are skipped because of version conflicts.
+        Returns True if all documents of the index were moved.
+        """
+        for attempt in range(self.conflict_retries + 1):
+            status = await self.wait_for(task_id)
+            response = status.get('response', {})
+            if status.get('error') or response.get('failures'):
+                logger.error(f"Moving events and sessions to merged profile {merged_profile_id} failed "
+                             f"in task {task_id}. Details: {status.get('error') or response.get('failures')}")
+                return False
+
+            logger.info(f"Task {task_id} moved {response.get('updated', 0)} documents to merged "
+                        f"profile {merged_profile_id}.")
+
+            conflicts = response.get('version_conflicts', 0)
+            if not conflicts:
+                return True
+
+            if attempt < self.conflict_retries:
+                logger.info(f"Task {task_id} skipped {conflicts} {index} documents changed while it ran. "
+                            f"Moving them again.")
+                task_id = await raw_db.start_profile_ids_update(index, old_profile_ids, merged_profile_id,
+                                                                self.slices)
+
+        logger.error(f"Could not move all {index} documents to merged profile {merged_profile_id}, "
+                     f"{conflicts} documents still conflict after {self.conflict_retries} retries.")
+        return False
+
+    async def _watch(self, merged_profile_id: str, old_profile_ids: List[str], tasks: List[Tuple[str, str]],
+                     context: Context):
+        with ServerContext(context):
+            try:
+                moved = True
+                for index, task_id in tasks:
+                    if not await self._wait_for_move(index, task_id, merged_profile_id, old_profile_ids):
+                        moved = False
+
+                # Aliases of failed or incomplete moves are kept until they expire.
+                if moved:
+                    await profile_alias_table.remove(merged_profile_id, old_profile_ids)
+
+            except Exception as e:
+                logger.error(f"Could not watch merge tasks {[task_id for _, task_id in tasks]} of profile "
+                             f"{merged_profile_id}. Details: {repr(e)}")
+
+    async def join(self):
+        """
+        Waits for all watched tasks.
+        """
+        await asyncio.gather(*self._watchers, return_exceptions=True)
+
+
+merge_executor = MergeExecutor(
+    indices=('event', 'session'),
+    slices=tracardi.merge_task_slices,
+    check_interval=tracardi.merge_task_check_interval / 1000,
+    alias_ttl=tracardi.merge_alias_ttl,
+    conflict_retries=tracardi.merge_task_conflict_retries
+)
@@ -1,8 +1,139 @@
-from typing import List, Dict, Union
+import json
+from collections import OrderedDict
+from threading import Lock
+from typing import List, Dict, Union, Tuple, Any, NamedTuple
 
 from dotty_dict import Dotty
+from dotty_dict.dotty_dict import DottyEncoder
+
 from .dot_accessor import DotAccessor
 
+_separator = "∞"
+_scalar_types = (str, int, float, bool, type(None))
+
+
+def _traverse(value, key=None, path="root"):
+    if key is None and isinstance(value, list) and len(value) == 0:
+        raise ValueError("Can not traverse empty list.")
+
+    if isinstance(value, dict):
+        for k, v in value.items():
+            yield from _traverse(v, k, path + _separator + k)
+    elif isinstance(value, list):
+        # Return empty lists as they are.
+        if not value:
+            yield key, [], path
+        for n, v in enumerate(value):
+            k = str(n)
+            yield from _traverse(v, k, path + _separator + k)
+    else:
+        yield key, value, path
+
+
+class ReshapeInstruction(NamedTuple):
+    path: Tuple[Union[str, int], ...]  # Output path, list indices are ints
+    source: Any  # Dot notation or value
+    optional: bool
+    constant: bool  # Source is a value, not a reference to data
+
+
+class ReshapeTemplate:
+    """
+    Reshape template compiled to a flat list of instructions: where to put the value in the output and
+    where to read it from.
+    """
+
+    def __init__(self, template: Union[Dict, List]):
+        splitter = Dotty({}, _separator, esc_char='\\', no_list=False)
+        self.instructions: List[ReshapeInstruction] = []
+        for key, value, path in _traverse(template):
+            if key is not None:
+                path = path[:-len(key) - 1]
+
+            optional = False
+            if len(key) > 0 and key[-1] == '?':
+                key = key[:-1]
+                optional = True
+
+            if len(path) > 0 and path[-1] == '?':
+                path = path[:-1]
+                optional = True
+
+            out_path = tuple(int(item) if item.isdigit() else item
+                             for item in splitter._split(f"{path}{_separator}{key}"))
+            constant = not isinstance(value, str) or (
+                    not (value.startswith("`") and value.endswith("`")) and DotAccessor.source(value) is None)
+            self.instructions.append(ReshapeInstruction(out_path, value, optional, constant))
+
+
+class _ReshapeTemplateCache:
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._templates: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, template: Union[Dict, List]) -> ReshapeTemplate:
+        try:
+            key = json.dumps(template)
+        except (TypeError, ValueError):
+            return ReshapeTemplate(template)
+
+        with self._lock:
+            compiled = self._templates.get(key, None)
+            if compiled is not None:
+                self._templates.move_to_end(key)
+                return compiled
+
+        compiled = ReshapeTemplate(template)
+        with self._lock:
+            self._templates[key] = compiled
+            while len(self._templates) > self.max_size:
+                self._templates.popitem(last=False)
+        return compiled
+
+    def __len__(self):
+        return len(self._templates)
+
+
+_compiled_templates = _ReshapeTemplateCache()
+
+
+def compile_reshape_template(template: Union[Dict, List]) -> ReshapeTemplate:
+    """
+    Returns compiled reshape template. Compiled templates are cached by template content.
+    """
+    return _compiled_templates.get(template)
+
+
+def _set_list_index(data: list, index: int, value):
+    for _ in range(len(data), index + 1):
+        data.append(None)
+    data[index] = value
+
+
+def _set(data, path: Tuple[Union[str, int], ...], value):
+    # Same as setting value in Dotty with no_list=False
+    last = len(path) - 1
+    for position in range(last):
+        item = path[position]
+        next_item = [] if isinstance(path[position + 1], int) else {}
+        if isinstance(item, int):
+            try:
+                if not data[item]:
+                    data[item] = next_item
+            except IndexError:
+                _set_list_index(data, item, next_item)
+        elif not data.get(item):
+            data[item] = next_item
+        data = data[item]
+
+    item = path[last]
+    if isinstance(item, int):
+        _set_list_index(data, item, value)
+    else:
+        data[item] = value
+
 
 class DictTraverser:
 
@@ -14,7 +145,7 @@ class DictTraverser:
             self.throw_error = False
         else:
             self.throw_error = True
-        self.separator = "\u221E"
+        self.separator = _separator
 
     def _get_value(self, path, optional):
         if self.throw_error is True:
@@ -32,21 +163,7 @@ class DictTraverser:
         return value
 
     def traverse(self, value, key=None, path="root"):
-        if key is None and isinstance(value, list) and len(value) == 0:
-            raise ValueError("Can not traverse empty list.")
-
-        if isinstance(value, dict):
-            for k, v in value.items():
-                yield from self.traverse(v, k, path + self.separator + k)
-        elif isinstance(value, list):
-            # Return empty lists as they are.
-            if not value:
-                yield key, [], path
-            for n, v in enumerate(value):
-                k = str(n)
-                yield from self.traverse(v, k, path + self.separator + k)
-        else:
-            yield key, value, path
+        yield from _traverse(value, key, path)
 
     def reshape(self, reshape_template: Union[Dict, List, str]):
 
@@ -62,31 +179,24 @@ class DictTraverser:
         if isinstance(reshape_template, list) and len(reshape_template) == 0:
             return []
 
-        out_dot = Dotty({}, self.separator, esc_char='\\', no_list=False)
-        for key, value, path in self.traverse(reshape_template):
-            if key is not None:
-                path = path[:-len(key)-1]
+        result = {}
+        copy = False
+        for path, source, optional, constant in compile_reshape_template(reshape_template).instructions:
+            value = source if constant else self._get_value(source, optional)
 
-            optional = False
-            if len(key) > 0 and key[-1] == '?':
-                key = key[:-1]
-                optional = True
+            if value is None and self.include_none is False:
+                continue
 
-            if len(path) > 0 and path[-1] == '?':
-                path = path[:-1]
-                optional = True
+            if not value and optional:
+                continue
 
-            value = self._get_value(value, optional)
+            if type(value) not in _scalar_types:
+                copy = True
 
-            if value is None and self.include_none is False:
-                continue
+            _set(result, path, value)
 
-            in_key = f"{path}{self.separator}{key}"
-            if not value:
-                if not optional:
-                    out_dot[in_key] = value
-            else:
-                out_dot[in_key] = value
+        if copy:
+            # Output must not share objects with the source data
+            result = json.loads(json.dumps(result, cls=DottyEncoder))
 
-        result = out_dot.to_dict()
         return result['root'] if 'root' in result else {}
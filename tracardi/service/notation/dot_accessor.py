@@ -1,7 +1,8 @@
 import re
-from typing import Union
+from functools import lru_cache
+from typing import Union, Tuple, Any
 
-from dotty_dict import dotty
+from dotty_dict import dotty, Dotty
 from pydantic import BaseModel
 
 dot_notation_regex = re.compile(
@@ -12,7 +13,69 @@ class NotDotNotation:
     pass
 
 
+_namespaces = ('profile', 'event', 'payload', 'session', 'flow', 'memory')
+_scalar_types = (str, int, float, bool, type(None))
+
+
+@lru_cache(maxsize=None)
+def _is_plain_model(model_class) -> bool:
+    """
+    Plain model dumps its fields as they are. Values of such models can be read without model_dump.
+    """
+    decorators = model_class.__pydantic_decorators__
+    if decorators.field_serializers or decorators.model_serializers:
+        return False
+    return not any(field.exclude for field in model_class.model_fields.values())
+
+
+def _resolve_in_model(data: BaseModel, path: str) -> Tuple[bool, Any]:
+    """
+    Resolves dotted path directly on pydantic model. Returns (found, value). Only scalar values that
+    look the same as in model_dump(mode="json") are returned, anything else is reported as not found
+    and must be read from the dumped data.
+    """
+    if '\\' in path or '[' in path:
+        return False, None
+
+    value = data
+    for key in path.split('.'):
+        if isinstance(value, BaseModel):
+            if not _is_plain_model(type(value)):
+                return False, None
+            if key in type(value).model_fields:
+                value = getattr(value, key)
+            elif value.model_extra and key in value.model_extra:
+                value = value.model_extra[key]
+            else:
+                return False, None
+        elif isinstance(value, dict):
+            if key not in value:
+                return False, None
+            value = value[key]
+        elif isinstance(value, list) and key.isdigit():
+            index = int(key)
+            if index >= len(value):
+                return False, None
+            value = value[index]
+        else:
+            return False, None
+
+    if type(value) in _scalar_types:
+        return True, value
+
+    return False, None
+
+
 class DotAccessor:
+    """
+    Dot notation access to profile, session, event, payload, flow and memory.
+
+    Data is converted to dotty dicts lazily. Dotty data (e.g. flat profile or event) is used as it is. Reads
+    of scalar values from pydantic models resolve the path on the model and do not dump it. A namespace is
+    dumped (materialized) the first time it is read as a whole, written, or read at a path that cannot be
+    resolved on the model. From then on the dumped data is used. set_storage replaces the data and drops
+    the dumped version.
+    """
 
     @staticmethod
     def validate(dot_notation: str) -> bool:
@@ -21,6 +84,8 @@ class DotAccessor:
     def _convert(self, data, label):
         if data is None:
             return {}
+        elif isinstance(data, Dotty):
+            return data
         elif isinstance(data, dict):
             return dotty(data)
         elif isinstance(data, BaseModel):
@@ -30,6 +95,50 @@ class DotAccessor:
                 label, type(data)
             ))
 
+    def _materialize(self, name):
+        if name not in self._materialized:
+            self._materialized[name] = self._convert(self._data[name], name)
+        return self._materialized[name]
+
+    def _set_data(self, name, data):
+        if data is not None and not isinstance(data, (dict, Dotty, BaseModel)):
+            raise ValueError("Could not convert {} to dict. Expected: None, dict, Dotty or BaseModel got {}.".format(
+                name, type(data)
+            ))
+        self._data[name] = data
+        self._materialized.pop(name, None)
+
+    def is_materialized(self, name) -> bool:
+        return name in self._materialized
+
+    @property
+    def profile(self):
+        return self._materialize('profile')
+
+    @property
+    def session(self):
+        return self._materialize('session')
+
+    @property
+    def event(self):
+        return self._materialize('event')
+
+    @property
+    def payload(self):
+        return self._materialize('payload')
+
+    @property
+    def flow(self):
+        return self._materialize('flow')
+
+    @property
+    def memory(self):
+        return self._materialize('memory')
+
+    @property
+    def storage(self) -> dict:
+        return {f"{name}@": self._materialize(name) for name in _namespaces}
+
     def convert_to_dict(self, object: Union[dict, dotty]) -> dict:
         if isinstance(object, dict):
             return object
@@ -52,77 +161,47 @@ class DotAccessor:
 
         return None
 
-    def _get_value(self, dot_notation, prefix):
-        if dot_notation.startswith(prefix):
-            value = dot_notation[len(prefix):]
-            try:
-                if isinstance(value, str):
-                    if value in self.storage[prefix]:
-                        return self.storage[prefix][value]
-                    else:
-                        raise KeyError(f"No key {value} in {prefix}")
-                return value
-            except KeyError as e:
-                raise KeyError(
-                    f"Invalid data reference. Dot notation `{prefix}{value}` could not access data. "
-                    f"The reason for this may be that there is no data in {value} in `{prefix.strip('@')}. "
-                    f"Error details: {str(e)}")
-            except TypeError as e:
-                raise KeyError("Invalid dot notation. You are trying to access {} "
-                               "when it its value is not a dictionary `{}`.".format(value, str(e)))
-
-        return NotDotNotation()
+    def _get_value(self, dot_notation, name):
+        prefix = f"{name}@"
+        value = dot_notation[len(prefix):]
+
+        data = self._data[name]
+        if name not in self._materialized and isinstance(data, BaseModel):
+            found, result = _resolve_in_model(data, value)
+            if found:
+                return result
+
+        storage = self._materialize(name)
+        try:
+            if value in storage:
+                return storage[value]
+            else:
+                raise KeyError(f"No key {value} in {prefix}")
+        except KeyError as e:
+            raise KeyError(
+                f"Invalid data reference. Dot notation `{prefix}{value}` could not access data. "
+                f"The reason for this may be that there is no data in {value} in `{prefix.strip('@')}. "
+                f"Error details: {str(e)}")
+        except TypeError as e:
+            raise KeyError("Invalid dot notation. You are trying to access {} "
+                           "when it its value is not a dictionary `{}`.".format(value, str(e)))
 
     def __init__(self, profile=None, session=None, payload=None, event=None, flow=None, memory=None):
-        self.flow = self._convert(flow, 'flow')
-        self.event = self._convert(event, 'event')
-        self.payload = self._convert(payload, 'payload')
-        self.session = self._convert(session, 'session')
-        self.profile = self._convert(profile, 'profile')
-        self.memory = self._convert(memory, 'memory')
-
-        self.storage = {
-            'profile@': self.profile,
-            'event@': self.event,
-            'payload@': self.payload,
-            'session@': self.session,
-            'flow@': self.flow,
-            'memory@': self.memory,
-        }
+        self._data = {}
+        self._materialized = {}
+        self._set_data('flow', flow)
+        self._set_data('event', event)
+        self._set_data('payload', payload)
+        self._set_data('session', session)
+        self._set_data('profile', profile)
+        self._set_data('memory', memory)
 
     def set_storage(self, name, data):
 
-        storage = f"{name}@"
-        if storage not in self.storage.keys():
+        if name not in _namespaces:
             raise ValueError("Unknown storage")
 
-        if name == 'profile':
-            self.profile = data
-        elif name == 'event':
-            self.event = data
-        elif name == 'session':
-            self.session = data
-        elif name == 'flow':
-            self.flow = data
-        elif name == 'payload':
-            self.payload = data
-        elif name == 'memory':
-            self.memory = data
-
-        self.storage[storage] = self._convert(data, name)
-
-        if name == 'profile':
-            self.profile = self.storage[storage]
-        elif name == 'event':
-            self.event = self.storage[storage]
-        elif name == 'session':
-            self.session = self.storage[storage]
-        elif name == 'flow':
-            self.flow = self.storage[storage]
-        elif name == 'payload':
-            self.payload = self.storage[storage]
-        elif name == 'memory':
-            self.memory = self.storage[storage]
+        self._set_data(name, data)
 
     @staticmethod
     def source(key):
@@ -207,12 +286,12 @@ class DotAccessor:
             if all_data is not None:
                 return all_data
 
-            for prefix in self.storage.keys():
-                value = self._get_value(dot_notation, prefix)
-                if not isinstance(value, NotDotNotation):
-                    if value is None:
-                        return None
-                    return self.cast(value) if cast else value
+            name = self.source(dot_notation)
+            if name is not None:
+                value = self._get_value(dot_notation, name)
+                if value is None:
+                    return None
+                return self.cast(value) if cast else value
 
         return self.cast(dot_notation) if cast else dot_notation
 
@@ -44,6 +44,11 @@ class ActionRunner:
     ux: list = None
     join = None
 
+    # Reusable plugins are set up once per workflow version and pooled. Set it to True only if set_up does not
+    # depend on the request context (event, profile, session, etc.) and the plugin does not keep per-request
+    # state outside of the context attributes. close() of a reusable plugin is called when the workflow changes.
+    reusable: bool = False
+
     @final
     def __init__(self):
         pass
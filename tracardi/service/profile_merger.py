@@ -3,15 +3,13 @@ from dotty_dict import Dotty
 from tracardi.service.storage.elastic.interface.collector.mutation import profile as mutation_profile_db
 
 from tracardi.domain.profile_data import ProfileData
-from .storage.elastic.interface.event import refresh_event_db
 from .storage.elastic.interface.merging import delete_multiple_profiles
-from tracardi.service.storage.elastic.interface.collector.load.session import refresh_session_db
+from tracardi.service.merging.merge_executor import merge_executor
 
 from ..context import get_context
 from ..domain import ExtraInfo
 from ..domain.storage_record import RecordMetadata
 from tracardi.service.storage.elastic.interface import profile as profile_db
-from tracardi.service.storage.elastic.interface import raw as raw_db
 from datetime import datetime
 from typing import Optional, List, Dict, Tuple
 from pydantic.v1.utils import deep_update
@@ -42,12 +40,7 @@ async def _copy_duplicated_profiles_ids_to_merged_profile_ids(merged_profile: Pr
 
 
 async def _move_profile_events_and_sessions(duplicate_profiles: List[Profile], merged_profile: Profile):
-    for old_profile in duplicate_profiles:
-        if old_profile.id != merged_profile.id:
-            await raw_db.update_profile_ids('event', old_profile.id, merged_profile.id)
-            await refresh_event_db()
-            await raw_db.update_profile_ids('session', old_profile.id, merged_profile.id)
-            await refresh_session_db()
+    await merge_executor.move(merged_profile.id, [profile.id for profile in duplicate_profiles])
 
 
 class ProfileMerger:
@@ -0,0 +1,28 @@
+import asyncio
+
+from tracardi.exceptions.log_handler import get_logger
+from tracardi.process_engine.destination.http_session_pool import http_session_pool
+from tracardi.service.storage.elastic.write_behind import write_behind_buffer
+from tracardi.service.storage.redis.driver.async_redis_client import AsyncRedisClient
+
+logger = get_logger(__name__)
+
+
+async def _close(name: str, close):
+    try:
+        await close()
+    except Exception as e:
+        logger.error(f"Could not close {name} on shutdown. Details: {repr(e)}")
+
+
+async def close_all():
+    """
+    Saves buffered data and closes connections kept by the process. Call it on shutdown of API and worker, in
+    the event loop that handled requests or jobs.
+    """
+    await asyncio.gather(
+        _close("write-behind buffer", write_behind_buffer.close),
+        _close("destination http sessions", http_session_pool.close)
+    )
+    # Closed last, saving buffered data may still use redis.
+    await _close("async redis client", AsyncRedisClient().close)
@@ -9,6 +9,8 @@ from tracardi.domain.storage_record import StorageRecords, StorageRecord
 from tracardi.exceptions.log_handler import get_logger
 from tracardi.service.storage.elastic.driver.elastic_storage import ElasticFiledSort
 from tracardi.service.storage.elastic.driver.factory import storage_manager, StorageForBulk
+from tracardi.service.storage.elastic import write_behind
+from tracardi.service.storage.elastic.profile_alias import profile_alias_table
 from typing import List, Optional, Dict, Tuple, Union, Set
 from tracardi.service.storage.elastic.interface import raw as raw_db
 from tracardi.service.storage.mysql.interface import event_source_dao
@@ -24,6 +26,10 @@ async def save(events: Union[List[Event], Set[Event]], exclude=None):
     return await storage_manager("event").upsert(events, exclude=exclude)
 
 
+async def save_behind(events: Union[List[Event], Set[Event]], exclude=None):
+    await write_behind.save_behind('event', events, exclude=exclude)
+
+
 async def delete_by_id(id: str) -> dict:
     sm = storage_manager("event")
     # Delete in all indices
@@ -65,11 +71,7 @@ async def count_events_by_type(profile_id: str, event_type: str, time_span: int)
                             "type": event_type
                         }
                     },
-                    {
-                        "term": {
-                            "profile.id": profile_id
-                        }
-                    }
+                    await profile_alias_table.profile_id_query(profile_id)
                 ]
             }
         }
@@ -102,11 +104,7 @@ async def aggregate_event_by_field_within_time(profile_id,
                                 "lte": "now"}
                         }
                     },
-                    {
-                        "term": {
-                            "profile.id": profile_id
-                        }
-                    }
+                    await profile_alias_table.profile_id_query(profile_id)
                 ]
             }
         },
@@ -178,11 +176,7 @@ async def aggregate_profile_events(profile_id: str, aggregate_query: dict) -> St
         "query": {
             "bool": {
                 "must": [
-                    {
-                        "term": {
-                            "profile.id": profile_id
-                        }
-                    }
+                    await profile_alias_table.profile_id_query(profile_id)
                 ]
             }
         },
@@ -516,14 +510,15 @@ async def flush():
 
 
 async def get_nth_last_event(event_type: str, n: int, profile_id: Optional[str] = None):
-    profile_term = {"profile.id": profile_id} if profile_id is not None else {"metadata.profile_less": True}
+    profile_query = await profile_alias_table.profile_id_query(profile_id) if profile_id is not None \
+        else {"term": {"metadata.profile_less": True}}
 
     result = (await storage_manager("event").query({
         "query": {
             "bool": {
                 "must": [
                     {"term": {"type": event_type}},
-                    {"term": profile_term}
+                    profile_query
                 ]
             }
         },
@@ -556,11 +551,7 @@ async def get_events_by_session(session_id: str, limit: int = 100) -> StorageRec
 async def get_events_by_profile(profile_id: str, limit: int = 100) -> StorageRecords:
 
     query = {
-        "query": {
-            "term": {
-                "profile.id": profile_id
-            }
-        },
+        "query": await profile_alias_table.profile_id_query(profile_id),
         "size": limit,
         "sort": [
             {
@@ -690,7 +681,7 @@ async def get_events_by_session_and_profile(profile_id: str, session_id: str, li
         "query": {
             "bool": {
                 "must": [
-                    {"term": {"profile.id": profile_id}},
+                    await profile_alias_table.profile_id_query(profile_id),
                     {"term": {"session.id": session_id}}
                 ]
             }
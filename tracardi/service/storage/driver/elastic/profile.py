@@ -1,11 +1,17 @@
+from collections import defaultdict
 from typing import Union, Tuple
 
 from tracardi.domain.profile import *
 from tracardi.domain.storage_record import StorageRecord, StorageRecords
+from tracardi.domain.value_object.bulk_insert_result import BulkInsertResult
 from tracardi.exceptions.log_handler import get_logger
+from tracardi.service.change_monitoring.field_change_logger import FieldChangeLogger
+from tracardi.service.change_monitoring.profile_delta import get_profile_changes, apply_profile_changes_script
 from tracardi.service.storage.elastic.interface import raw as raw_db
 from tracardi.service.storage.elastic.driver.elastic_storage import ElasticFiledSort
 from tracardi.service.storage.elastic.driver.factory import storage_manager
+from tracardi.service.storage.elastic import write_behind
+from tracardi.service.storage.elastic.index_locator import index_locator
 
 logger = get_logger(__name__)
 
@@ -137,6 +143,20 @@ async def load_profiles_with_duplicated_ids(log_error=True):
 
 
 async def load_by_id(profile_id: str) -> Optional[StorageRecord]:
+    index = await index_locator.locate('profile', profile_id)
+    if index is not None:
+        profile_record = await load_from_index(profile_id, index)
+        if profile_record is not None:
+            return profile_record
+        await index_locator.forget('profile', profile_id)
+
+    profile_record = await _search_by_id(profile_id)
+    if profile_record is not None and profile_record.get('id', None) == profile_id:
+        await index_locator.record_ids('profile', {profile_record.get_meta_data().index: [profile_id]})
+    return profile_record
+
+
+async def _search_by_id(profile_id: str) -> Optional[StorageRecord]:
     query = {
         "size": 2,
         "query": {
@@ -177,6 +197,10 @@ async def load_by_id(profile_id: str) -> Optional[StorageRecord]:
     return profile_records.first()
 
 
+async def load_from_index(profile_id: str, index: str) -> Optional[StorageRecord]:
+    return await storage_manager('profile').load_from_index(profile_id, index)
+
+
 def load_by_ids(profile_ids: List[str], batch):
     query = {
         "query": {
@@ -249,13 +273,71 @@ async def save(profile: Union[Profile, List[Profile], Set[Profile]], refresh_aft
     elif isinstance(profile, Profile):
         profile.mark_for_update()
     result = await storage_manager('profile').upsert(profile, exclude={"operation": ...})
+    await index_locator.record('profile', profile if isinstance(profile, (list, set)) else [profile])
     if refresh_after_save:
         await storage_manager('profile').flush()
     return result
 
 
+async def save_changes(changes: List[Tuple[Profile, FieldChangeLogger]]) -> BulkInsertResult:
+    """
+    Saves only logged changes of profiles with partial bulk updates. Profiles that are new, merged or whose
+    changes can not be applied are indexed as a whole.
+    """
+
+    full_save = []
+    updates = defaultdict(list)
+    profiles = {}
+    for profile, field_change_logger in changes:
+        profile.mark_for_update()
+        profile_changes = get_profile_changes(profile, field_change_logger)
+        index = profile.get_meta_data().index if profile.has_meta_data() else None
+        if profile_changes is None or index is None:
+            full_save.append(profile)
+            continue
+
+        profiles[profile.id] = profile
+        updates[index].append((profile.id, {
+            "script": {
+                "source": apply_profile_changes_script,
+                "lang": "painless",
+                "params": {"changes": profile_changes}
+            }
+        }))
+
+    result = BulkInsertResult()
+    for index, _updates in updates.items():
+        update_result = await storage_manager('profile').update_bulk(index, _updates)
+        failed = set()
+        for error in update_result.errors:
+            failed.add(error.get('update', {}).get('_id', None))
+        if failed:
+            logger.warning(f"Partial update of {len(failed)} profile(s) failed. Profiles will be saved as a whole.")
+            full_save += [profile for id, profile in profiles.items() if id in failed]
+        result.saved += update_result.saved
+        result.ids += [id for id, _ in _updates if id not in failed]
+
+    # Bulk index can target only one index
+    by_index = defaultdict(list)
+    for profile in full_save:
+        by_index[profile.get_meta_data().index if profile.has_meta_data() else None].append(profile)
+    for _profiles in by_index.values():
+        result += await save(_profiles)
+
+    return result
+
+
+async def save_behind(profiles: Union[List[Profile], Set[Profile]]):
+    for profile in profiles:
+        profile.mark_for_update()
+    await write_behind.save_behind('profile', profiles, exclude={"operation": ...})
+    await index_locator.record('profile', profiles)
+
+
 async def save_all(profiles: List[Profile]):
-    return await storage_manager("profile").upsert(profiles, exclude={"operation": ...})
+    result = await storage_manager("profile").upsert(profiles, exclude={"operation": ...})
+    await index_locator.record('profile', profiles)
+    return result
 
 
 async def refresh():
@@ -268,7 +350,9 @@ async def flush():
 
 async def delete_by_id(id: str, index: str):
     sm = storage_manager('profile')
-    return await sm.delete(id, index)
+    result = await sm.delete(id, index)
+    await index_locator.forget('profile', id, stale=False)
+    return result
 
 
 async def bulk_delete_by_id(ids: List[str]):
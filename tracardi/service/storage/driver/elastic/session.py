@@ -6,16 +6,28 @@ from tracardi.domain.storage_record import StorageRecord
 from tracardi.domain.value_object.bulk_insert_result import BulkInsertResult
 from tracardi.exceptions.log_handler import get_logger
 from tracardi.service.storage.elastic.driver.factory import storage_manager
+from tracardi.service.storage.elastic import write_behind
+from tracardi.service.storage.elastic.index_locator import index_locator
+from tracardi.service.storage.elastic.profile_alias import profile_alias_table
 
 logger = get_logger(__name__)
 
 
 async def save_sessions(sessions: List[Session]) -> BulkInsertResult:
-    return await storage_manager("session").upsert(sessions, exclude={"operation": ...})
+    result = await storage_manager("session").upsert(sessions, exclude={"operation": ...})
+    await index_locator.record('session', sessions)
+    return result
 
 
 async def save(session: Union[Session, List[Session], Set[Session]]) -> BulkInsertResult:
-    return await storage_manager('session').upsert(session, exclude={"operation": ...})
+    result = await storage_manager('session').upsert(session, exclude={"operation": ...})
+    await index_locator.record('session', session if isinstance(session, (list, set)) else [session])
+    return result
+
+
+async def save_behind(sessions: Union[List[Session], Set[Session]]):
+    await write_behind.save_behind('session', sessions, exclude={"operation": ...})
+    await index_locator.record('session', sessions)
 
 
 async def exist(id: str) -> bool:
@@ -23,9 +35,19 @@ async def exist(id: str) -> bool:
 
 
 async def load_by_id(id: str) -> Optional[Session]:
-    session_record = await storage_manager("session").load(id)
+    session_record = None
+    index = await index_locator.locate('session', id)
+    if index is not None:
+        session_record = await storage_manager("session").load_from_index(id, index)
+        if session_record is None:
+            await index_locator.forget('session', id)
+
     if session_record is None:
-        return None
+        session_record = await storage_manager("session").load(id)
+        if session_record is None:
+            return None
+        if session_record.has_meta_data():
+            await index_locator.record_ids('session', {session_record.get_meta_data().index: [id]})
 
     session = session_record.to_entity(Session)  # 10rq/s
 
@@ -47,7 +69,9 @@ async def load_duplicates(id: str):
 
 async def delete_by_id(id: str, index: str):
     sm = storage_manager('session')
-    return await sm.delete(id, index)
+    result = await sm.delete(id, index)
+    await index_locator.forget('session', id, stale=False)
+    return result
 
 
 async def refresh():
@@ -60,9 +84,7 @@ async def flush():
 
 async def get_nth_last_session(profile_id: str, n: int) -> Optional[StorageRecord]:
     query = {
-        "query": {
-            "term": {"profile.id": profile_id}
-        },
+        "query": await profile_alias_table.profile_id_query(profile_id),
         "size": 11,
         "sort": [
             {"metadata.time.insert": "desc"}
@@ -10,6 +10,7 @@ from tracardi import config
 from tracardi.domain import ExtraInfo
 from tracardi.domain.value_object.bulk_insert_result import BulkInsertResult
 from tracardi.exceptions.log_handler import get_logger
+from tracardi.service.latency import timed
 
 _singleton = None
 logger = logging.getLogger('elasticsearch')
@@ -28,11 +29,13 @@ class ElasticClient:
     async def close(self):
         await self._client.close()
 
+    @timed("elastic.get")
     async def get(self, index, id):
         # WARNING this method does not work on aliases
         return await self._client.get(index=index, doc_type='_doc', id=id)
 
     # todo error handling move to service
+    @timed("elastic.delete")
     async def delete(self, index, id):
         # WARNING this method does not work on aliases
         try:
@@ -76,9 +79,11 @@ class ElasticClient:
         except NotFoundError:
             return False
 
+    @timed("elastic.search")
     async def search(self, index, query, scroll=None):
         return await self._client.search(index=index, body=query, scroll=scroll)
 
+    @timed("elastic.scroll")
     async def scroll(self, *args, **kwargs):
         return await self._client.scroll(*args, **kwargs)
 
@@ -97,6 +102,7 @@ class ElasticClient:
     def cluster(self):
         return self._client.cluster
 
+    @timed("elastic.delete_bulk")
     async def delete_bulk(self, index, record_ids, repeats: int = 3) -> BulkInsertResult:
 
         if not isinstance(record_ids, list):
@@ -126,7 +132,12 @@ class ElasticClient:
 
             repeats -= 1
 
-    async def insert(self, index, records, repeats: int = 3) -> BulkInsertResult:
+    @timed("elastic.insert")
+    async def insert(self, index, records, repeats: int = 3, raise_on_error: bool = True) -> BulkInsertResult:
+        """
+        Saves records in one bulk request, repeated if it fails. With raise_on_error=False errors of single
+        documents do not fail the bulk, they are returned in result errors and the bulk is not repeated.
+        """
 
         if not isinstance(records, list):
             raise ValueError("Insert expects payload to be list.")
@@ -155,7 +166,7 @@ class ElasticClient:
         last_exception = None
         while repeats > 0:
             try:
-                success, errors = await helpers.async_bulk(self._client, bulk)
+                success, errors = await helpers.async_bulk(self._client, bulk, raise_on_error=raise_on_error)
                 return BulkInsertResult(
                     saved=success,
                     errors=errors,
@@ -179,6 +190,37 @@ class ElasticClient:
             index=index
         )
 
+    @timed("elastic.update_bulk")
+    async def update_bulk(self, index, updates, retry_on_conflict=3) -> BulkInsertResult:
+        """
+        Partially updates many documents in one bulk request. Updates are (id, body) pairs where body
+        is an update request body with "doc" or "script". Failed updates are returned as errors.
+        """
+
+        if not isinstance(updates, list):
+            raise ValueError("Bulk update expects payload to be list.")
+
+        bulk = []
+        ids = []
+        for _id, body in updates:
+            ids.append(_id)
+            bulk.append({
+                "_op_type": "update",
+                "_index": index,
+                "_id": _id,
+                "retry_on_conflict": retry_on_conflict,
+                **body
+            })
+
+        success, errors = await helpers.async_bulk(self._client, bulk, raise_on_error=False)
+        return BulkInsertResult(
+            saved=success,
+            errors=errors,
+            ids=ids,
+            index=index
+        )
+
+    @timed("elastic.update")
     async def update(self, index, id, record, retry_on_conflict=3):
         return await self._client.update(index, body=record, id=id, retry_on_conflict=retry_on_conflict)
 
@@ -229,14 +271,22 @@ class ElasticClient:
     async def flush(self, index, params=None, headers=None):
         return await self._client.indices.flush(index=index, params=params, headers=headers)
 
-    async def update_by_query(self, index, query, conflicts: str = 'abort', wait_for_completion=None):
+    @timed("elastic.update_by_query")
+    async def update_by_query(self, index, query, conflicts: str = 'abort', wait_for_completion=None,
+                              slices=None, refresh=None):
         return await self._client.update_by_query(
             index=index,
             body=query,
             conflicts=conflicts,
-            wait_for_completion=wait_for_completion
+            wait_for_completion=wait_for_completion,
+            slices=slices,
+            refresh=refresh
         )
 
+    async def get_task(self, task_id: str):
+        return await self._client.tasks.get(task_id=task_id)
+
+    @timed("elastic.count")
     async def count(self, index, query: Optional[dict] = None):
         return await self._client.count(index=index, body=query)
 
@@ -91,6 +91,17 @@ class ElasticStorage:
         except elasticsearch.exceptions.NotFoundError:
             return None
 
+    async def load_from_index(self, id, index) -> Optional[StorageRecord]:
+        # Realtime get. Returns the document even if the index was not refreshed yet. Works only on
+        # concrete index, not alias.
+        try:
+            result = await self.storage.get(index, id)
+            output = StorageRecord.build_from_elastic(result)
+            output['id'] = result['_id']
+            return output
+        except elasticsearch.exceptions.NotFoundError:
+            return None
+
     @staticmethod
     def _get_storage_record(record, replace_id, exclude=None) -> StorageRecord:
         if isinstance(record, StorageRecord):
@@ -125,6 +136,15 @@ class ElasticStorage:
             index = self.index.get_write_index()
         return index
 
+    def get_records_by_index(self, data: Union[list, set], replace_id: bool = True,
+                             exclude=None) -> Dict[str, List[StorageRecord]]:
+        records_by_index = defaultdict(list)
+        for row in data:
+            index = self.get_storage_index(row)
+            record = self._get_storage_record(row, exclude=exclude, replace_id=replace_id)
+            records_by_index[index].append(record)
+        return records_by_index
+
     async def create(self, data: Union[StorageRecord, Entity, BaseModel, dict, list],
                      replace_id: bool = True, exclude=None) -> Union[BulkInsertResult, List[BulkInsertResult]]:
         if isinstance(data, (list, set)):
@@ -132,11 +152,7 @@ class ElasticStorage:
             if len(data) == 0:
                 return BulkInsertResult()
 
-            records_by_index = defaultdict(list)
-            for row in data:
-                index = self.get_storage_index(row)
-                record = self._get_storage_record(row, exclude=exclude, replace_id=replace_id)
-                records_by_index[index].append(record)
+            records_by_index = self.get_records_by_index(data, replace_id=replace_id, exclude=exclude)
 
             if len(records_by_index) > 1:
                 raise ValueError(f"Can not save set of records with mixed target indices. Got the following "
@@ -291,12 +307,15 @@ class ElasticStorage:
     async def flush(self, params, headers):
         return await self.storage.flush(self.index.get_write_index(), params, headers)
 
-    async def update_by_query(self, query, conflicts: str = 'abort', wait_for_completion: bool = None):
+    async def update_by_query(self, query, conflicts: str = 'abort', wait_for_completion: bool = None,
+                              slices=None, refresh: bool = None):
         return await self.storage.update_by_query(
             index=self.index.get_index_alias(),
             query=query,
             conflicts=conflicts,
-            wait_for_completion=wait_for_completion
+            wait_for_completion=wait_for_completion,
+            slices=slices,
+            refresh=refresh
         )
 
     async def update(self, id, record, index, retry_on_conflict=3):
@@ -305,6 +324,11 @@ class ElasticStorage:
                                          id=id,
                                          retry_on_conflict=retry_on_conflict)
 
+    async def update_bulk(self, index, updates, retry_on_conflict=3) -> BulkInsertResult:
+        return await self.storage.update_bulk(index=index,
+                                              updates=updates,
+                                              retry_on_conflict=retry_on_conflict)
+
     async def delete_by_query(self, query):
         return await self.storage.delete_by_query(index=self.index.get_index_alias(), body=query)
 
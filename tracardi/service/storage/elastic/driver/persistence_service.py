@@ -9,7 +9,8 @@ from tracardi.domain.entity import Entity
 from tracardi.domain.storage.index_mapping import IndexMapping
 from tracardi.domain.storage_aggregate_result import StorageAggregateResult
 from tracardi.domain.value_object.bulk_insert_result import BulkInsertResult
-from datetime import datetime, timedelta
+from collections import Counter
+from datetime import datetime, timedelta, timezone
 from typing import Tuple, Optional
 from tracardi.domain.storage_record import StorageRecords, StorageRecord
 from tracardi.exceptions.log_handler import get_logger
@@ -21,6 +22,7 @@ from tracardi.exceptions.exception import StorageException
 from tracardi.process_engine.tql.parser import Parser
 from tracardi.process_engine.tql.transformer.filter_transformer import FilterTransformer
 from tracardi.service.storage.elastic.driver.elastic_storage import ElasticStorage
+from tracardi.service.storage.elastic.rollup import time_rollup
 
 _logger = get_logger(__name__)
 
@@ -47,6 +49,9 @@ def _timedelta_to_largest_unit(delta: timedelta):
         return int(total_seconds), 's', "%M"
 
 
+_unit_seconds = {'m': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
 def _interval(start_date: datetime, end_date: datetime):
     INTERVALS = 30
 
@@ -91,6 +96,11 @@ class SqlSearchQueryEngine:
             'log': 'date',
             'entity': 'metadata.time.insert',
         }
+        # Histograms without filter are served from rollup. Group by field -> rollup dimension.
+        self.rollup_dimensions = {
+            'event': {'type': 'type', 'source.id': 'source'},
+            'session': {}
+        }
         self.parser = SqlSearchQueryParser()
 
     @staticmethod
@@ -210,6 +220,59 @@ class SqlSearchQueryEngine:
 
         return QueryResult(**result.dict())
 
+    async def _histogram_from_rollup(self, min_date_time: datetime, max_date_time: datetime, interval: int, unit: str,
+                                     format: str, group_by: Optional[str]) -> Optional[QueryResult]:
+
+        if self.index not in self.rollup_dimensions or unit not in _unit_seconds:
+            return None
+
+        dimension = None
+        if group_by is not None:
+            dimension = self.rollup_dimensions[self.index].get(group_by, None)
+            if dimension is None:
+                return None
+
+        if min_date_time.tzinfo is None:
+            min_date_time = min_date_time.replace(tzinfo=timezone.utc)
+
+        histogram = await time_rollup.histogram(self.index, min_date_time, max_date_time,
+                                                interval * _unit_seconds[unit])
+        if histogram is None:
+            return None
+
+        total = sum(counters.get('count', 0) for _, counters in histogram)
+
+        def _row(timestamp: datetime, count: int) -> dict:
+            return {
+                "date": "{}".format(timestamp.strftime(format)),
+                'interval': "+{}{}".format(interval, unit),
+                "speed": f"{count / interval:.3f}/{unit}"
+            }
+
+        if dimension is None:
+            return QueryResult(total=total,
+                               result=[{**_row(timestamp, counters.get('count', 0)), "count": counters.get('count', 0)}
+                                       for timestamp, counters in histogram],
+                               buckets=['count'])
+
+        # Top 5 values, as terms aggregation
+        prefix = f"{dimension}:"
+        totals = Counter()
+        for _, counters in histogram:
+            totals.update({field: count for field, count in counters.items() if field.startswith(prefix)})
+        fields = [field for field, _ in totals.most_common(5)]
+        if not fields:
+            return QueryResult(total=total, result=[], buckets=[])
+
+        result = []
+        for timestamp, counters in histogram:
+            item = _row(timestamp, counters.get(fields[0], 0))
+            for field in fields:
+                item[field[len(prefix):].lower()] = counters.get(field, 0)
+            result.append(item)
+
+        return QueryResult(total=total, result=result, buckets=[field[len(prefix):].lower() for field in fields])
+
     async def histogram(self, query: DatetimeRangePayload, group_by: str = None) -> QueryResult:
 
         def __format_count(data, unit, interval, format):
@@ -256,6 +319,12 @@ class SqlSearchQueryEngine:
         time_field = self.time_field_map[self.index]
 
         interval, unit, format = _interval(min_date_time, max_date_time)
+
+        if not query.where:
+            result = await self._histogram_from_rollup(min_date_time, max_date_time, interval, unit, format, group_by)
+            if result is not None:
+                return result
+
         try:
             es_query = self._query(query, min_date_time, max_date_time, time_field, sorting, time_zone)
         except LarkError:
@@ -410,6 +479,16 @@ class PersistenceService:
                 raise StorageException(str(e), message=message, details=details)
             raise StorageException(str(e))
 
+    async def load_from_index(self, id: str, index: str) -> Optional[StorageRecord]:
+        try:
+            return await self.storage.load_from_index(id, index)
+        except elasticsearch.exceptions.ElasticsearchException as e:
+            _logger.error(str(e))
+            if len(e.args) == 2:
+                message, details = e.args
+                raise StorageException(str(e), message=message, details=details)
+            raise StorageException(str(e))
+
     def scan(self, query: dict = None, batch: int = 1000):
         try:
             return self.storage.scan(query, batch)
@@ -616,12 +695,15 @@ class PersistenceService:
         engine = SqlSearchQueryEngine(self)
         return await engine.histogram(query, group_by)
 
-    async def update_by_query(self, query: dict, conflicts: str = 'abort', wait_for_completion: bool = None):
+    async def update_by_query(self, query: dict, conflicts: str = 'abort', wait_for_completion: bool = None,
+                              slices=None, refresh: bool = None):
         try:
             return await self.storage.update_by_query(
                 query=query,
                 conflicts=conflicts,
-                wait_for_completion=wait_for_completion
+                wait_for_completion=wait_for_completion,
+                slices=slices,
+                refresh=refresh
             )
         except elasticsearch.exceptions.ElasticsearchException as e:
             if len(e.args) == 2:
@@ -638,6 +720,15 @@ class PersistenceService:
                 raise StorageException(str(e), message=message, details=details)
             raise StorageException(str(e), details=str(e))
 
+    async def update_bulk(self, index: str, updates: List[Tuple[str, dict]], retry_on_conflict=3) -> BulkInsertResult:
+        try:
+            return await self.storage.update_bulk(index, updates, retry_on_conflict=retry_on_conflict)
+        except elasticsearch.exceptions.ElasticsearchException as e:
+            if len(e.args) == 2:
+                message, details = e.args
+                raise StorageException(str(e), message=message, details=details)
+            raise StorageException(str(e), details=str(e))
+
     async def delete_by_query(self, query: dict):
         try:
             return await self.storage.delete_by_query(query=query)
@@ -0,0 +1,139 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Iterable, AsyncGenerator
+from zlib import crc32
+
+from pydantic import BaseModel
+
+from tracardi.config import elastic
+from tracardi.domain.entity import Entity
+from tracardi.exceptions.log_handler import get_logger
+from tracardi.service.storage.elastic.driver.elastic_client import ElasticClient
+from tracardi.service.storage.elastic.driver.factory import storage_manager
+from tracardi.service.storage.redis.collections import Collection
+from tracardi.service.storage.redis.driver.async_redis_client import AsyncRedisClient
+
+logger = get_logger(__name__)
+
+
+class IndexLocatorMetrics(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    errors: int = 0
+    recorded: int = 0
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
+
+
+class IndexLocator:
+    """
+    Remembers the physical index of saved documents of multi-index storage (e.g. monthly profile
+    indices), so documents can be loaded with GET from one index instead of a search over the whole alias.
+
+    Locations are kept in redis hashes, ids are spread over a fixed number of buckets per index key.
+    Small hashes use compact redis encoding. Locator is best effort: if the location is missing or stale
+    the caller falls back to search and records the found location (read repair).
+    """
+
+    def __init__(self, index_keys: Iterable[str], buckets: int = 1024, enabled: bool = True):
+        self.index_keys = set(index_keys)
+        self.buckets = buckets
+        self.enabled = enabled
+        self.metrics: Dict[str, IndexLocatorMetrics] = {index_key: IndexLocatorMetrics() for index_key in self.index_keys}
+
+    def _key(self, index_key: str, id: str) -> str:
+        return f"{Collection.index_locator}{index_key}:{crc32(id.encode()) % self.buckets}"
+
+    def _is_used(self, index_key: str) -> bool:
+        return self.enabled and index_key in self.index_keys
+
+    async def record_ids(self, index_key: str, ids_by_index: Dict[str, List[str]]):
+        if not self._is_used(index_key) or not ids_by_index:
+            return
+
+        try:
+            async with AsyncRedisClient().pipeline() as pipe:
+                for index, ids in ids_by_index.items():
+                    for id in ids:
+                        pipe.hset(self._key(index_key, id), id, index)
+                await pipe.execute()
+            self.metrics[index_key].recorded += sum(len(ids) for ids in ids_by_index.values())
+        except Exception as e:
+            self.metrics[index_key].errors += 1
+            logger.warning(f"Could not record {index_key} index location. Details: {repr(e)}")
+
+    async def record(self, index_key: str, entities: Iterable[Entity]):
+        """
+        Records indices of saved entities. Entities without storage metadata are skipped.
+        """
+        ids_by_index = defaultdict(list)
+        for entity in entities:
+            if isinstance(entity, Entity) and entity.has_meta_data() and entity.get_meta_data().index:
+                ids_by_index[entity.get_meta_data().index].append(entity.id)
+        await self.record_ids(index_key, ids_by_index)
+
+    async def locate(self, index_key: str, id: str) -> Optional[str]:
+        """
+        Returns index where the document was saved or None if it is not known.
+        """
+        if not self._is_used(index_key):
+            return None
+
+        try:
+            index = await AsyncRedisClient().hget(self._key(index_key, id), id)
+        except Exception as e:
+            self.metrics[index_key].errors += 1
+            logger.warning(f"Could not locate {index_key} {id}. Details: {repr(e)}")
+            return None
+
+        if index is None:
+            self.metrics[index_key].misses += 1
+            return None
+
+        self.metrics[index_key].hits += 1
+        return index.decode() if isinstance(index, bytes) else index
+
+    async def forget(self, index_key: str, id: str, stale: bool = True):
+        """
+        Removes location of deleted document or stale location (document was not found in the located index).
+        """
+        if not self._is_used(index_key):
+            return
+
+        if stale:
+            self.metrics[index_key].stale += 1
+        try:
+            await AsyncRedisClient().hdel(self._key(index_key, id), id)
+        except Exception as e:
+            self.metrics[index_key].errors += 1
+            logger.warning(f"Could not remove location of {index_key} {id}. Details: {repr(e)}")
+
+    async def rebuild(self, index_key: str, batch: int = 1000) -> AsyncGenerator[int, None]:
+        """
+        Scans all indices of index key and records locations of all documents. Yields number of
+        recorded documents after each batch.
+        """
+        if not self._is_used(index_key):
+            return
+
+        alias = storage_manager(index_key).get_multi_storage_alias()
+        query = {"query": {"match_all": {}}, "_source": False}
+
+        recorded = 0
+        ids_by_index = defaultdict(list)
+        async for row in ElasticClient.instance().scan(alias, query, size=batch):
+            ids_by_index[row['_index']].append(row['_id'])
+            recorded += 1
+            if recorded % batch == 0:
+                await self.record_ids(index_key, ids_by_index)
+                ids_by_index = defaultdict(list)
+                yield recorded
+
+        if ids_by_index:
+            await self.record_ids(index_key, ids_by_index)
+            yield recorded
+
+
+index_locator = IndexLocator(('profile', 'session'), enabled=elastic.index_locator)
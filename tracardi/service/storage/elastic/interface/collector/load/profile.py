@@ -4,6 +4,8 @@ from tracardi.service.tracking.cache.profile_cache import load_profile_cache, sa
 from tracardi.context import Context, get_context
 from tracardi.domain.profile import Profile
 from tracardi.service.storage.elastic.interface import profile as profile_db
+from tracardi.service.storage.elastic.profile_alias import profile_alias_table
+from tracardi.service.storage.elastic.refresh_scheduler import refresh_scheduler
 
 
 async def load_profile(profile_id: str, context: Optional[Context] = None, fallback_to_db: bool = True) -> Optional[
@@ -11,7 +13,7 @@ async def load_profile(profile_id: str, context: Optional[Context] = None, fallb
     if context is None:
         context = get_context()
 
-    cached_profile = load_profile_cache(profile_id, context)
+    cached_profile = await load_profile_cache(profile_id, context)
 
     if cached_profile is not None and cached_profile.has_meta_data():
         return cached_profile
@@ -19,9 +21,24 @@ async def load_profile(profile_id: str, context: Optional[Context] = None, fallb
     if not fallback_to_db:
         return None
 
-    # This load is acceptable
-    profile = await profile_db.load_by_id(profile_id)
-    save_profile_cache(profile, context)
+    # Profile may be merged and its events still moving to merged profile
+    merged_profile_id = await profile_alias_table.resolve(profile_id)
+    if merged_profile_id != profile_id:
+        profile_id = merged_profile_id
+        cached_profile = await load_profile_cache(profile_id, context)
+        if cached_profile is not None and cached_profile.has_meta_data():
+            return cached_profile
+
+    # Profile saved recently may not be visible for search yet
+    profile = None
+    index = await refresh_scheduler.find_dirty_index(profile_id)
+    if index is not None:
+        profile = await profile_db.load_from_index(profile_id, index)
+
+    if profile is None:
+        # This load is acceptable
+        profile = await profile_db.load_by_id(profile_id)
+    await save_profile_cache(profile, context)
 
     return profile
 
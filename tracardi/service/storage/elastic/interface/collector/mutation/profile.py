@@ -1,9 +1,12 @@
-from typing import Union, List, Set, Optional
+from typing import Union, List, Set, Optional, Tuple
 
 from tracardi.context import Context, get_context
 from tracardi.domain.profile import Profile
+from tracardi.service.change_monitoring.field_change_logger import FieldChangeLogger
 from tracardi.service.storage.driver.elastic import profile as profile_db
 from tracardi.service.storage.elastic.driver.factory import storage_manager
+from tracardi.service.storage.elastic.index_locator import index_locator
+from tracardi.service.storage.elastic.refresh_scheduler import refresh_scheduler
 from tracardi.service.tracking.cache.profile_cache import save_profile_cache, delete_profile_cache
 
 
@@ -11,10 +14,23 @@ async def save_profiles_in_db(profiles: Union[Profile, List[Profile], Set[Profil
     return await profile_db.save(profiles, refresh_after_save)
 
 
+def _as_list(profiles: Union[Profile, List[Profile], Set[Profile]]) -> List[Profile]:
+    return [profiles] if isinstance(profiles, Profile) else list(profiles)
+
+
+async def _make_visible(profiles: List[Profile], refresh: bool):
+    if refresh:
+        await refresh_scheduler.refresh(storage_manager('profile').get_multi_storage_alias())
+    else:
+        # Read-your-writes until the index is refreshed in background
+        await refresh_scheduler.mark_saved(profiles)
+
+
 async def save_profile_in_db_and_cache(profile: Profile):
-    save_profile_cache(profile)
+    await save_profile_cache(profile)
     # Save to database - do not defer
-    await save_profiles_in_db(profile, refresh_after_save=True)
+    await save_profiles_in_db(profile)
+    await _make_visible([profile], refresh=False)
 
 
 async def save_profile(profiles: Union[Profile, List[Profile], Set[Profile]],
@@ -24,15 +40,50 @@ async def save_profile(profiles: Union[Profile, List[Profile], Set[Profile]],
     if context is None:
         context = get_context()
 
-    await save_profiles_in_db(profiles, refresh_after_save=refresh)
+    await save_profiles_in_db(profiles)
+    await _make_visible(_as_list(profiles), refresh)
+
+    if cache:
+        await save_profile_cache(profiles, context)
+
+
+async def save_profile_changes(changes: List[Tuple[Profile, FieldChangeLogger]],
+                               context: Optional[Context] = None,
+                               refresh: bool = False,
+                               cache: bool = True) -> None:
+    """
+    Saves only logged changes of profiles in the database (partial update) and whole profiles in cache.
+    """
+    if context is None:
+        context = get_context()
+
+    await profile_db.save_changes(changes)
+    await _make_visible([profile for profile, _ in changes], refresh)
 
     if cache:
-        save_profile_cache(profiles, context)
+        await save_profile_cache([profile for profile, _ in changes], context)
+
+
+async def save_profile_behind(profiles: Union[Profile, List[Profile], Set[Profile]],
+                              context: Optional[Context] = None) -> None:
+    """
+    Saves profiles in cache and queues them for bulk save in the database (write-behind).
+    """
+    if context is None:
+        context = get_context()
+
+    if isinstance(profiles, Profile):
+        profiles = [profiles]
+
+    await profile_db.save_behind(profiles)
+    await save_profile_cache(profiles, context)
 
 
 async def delete_by_id(id: str, index: str):
     sm = storage_manager('profile')
-    return await sm.delete(id, index)
+    result = await sm.delete(id, index)
+    await index_locator.forget('profile', id, stale=False)
+    return result
 
 
 async def delete_profile(id: str,
@@ -45,6 +96,6 @@ async def delete_profile(id: str,
     result = await delete_by_id(id, index)
     await profile_db.refresh()
     if cache:
-        delete_profile_cache(profile_id=id, context=context)
+        await delete_profile_cache(profile_id=id, context=context)
 
     return result
@@ -10,7 +10,7 @@ from tracardi.service.tracking.cache.session_cache import save_session_cache
 T = TypeVar("T")
 
 
-def _split_by_index(entities: List[T]) -> Dict[str, List[T]]:
+def split_by_index(entities: List[T]) -> Dict[str, List[T]]:
     entities_by_index = defaultdict(list)
     for entity in entities:
         if entity.has_meta_data():
@@ -27,10 +27,16 @@ async def save_session_to_db(session: Union[Session, List[Session], Set[Session]
 
 async def save_session_to_db_and_cache(session: Union[Session, List[Session], Set[Session]]):
     context = get_context()
-    save_session_cache(session, context)
+    await save_session_cache(session, context)
     await save_session_to_db(session)
 
 
+async def save_session_to_db_behind(sessions: Union[Session, List[Session], Set[Session]]):
+    if isinstance(sessions, Session):
+        sessions = [sessions]
+    await session_db.save_behind(sessions)
+
+
 async def save_sessions_in_db(sessions: List[Session]) -> BulkInsertResult:
     return await session_db.save_sessions(sessions)
 
@@ -38,7 +44,7 @@ async def save_sessions_in_db(sessions: List[Session]) -> BulkInsertResult:
 async def store_bulk_session(sessions: List[Session], context: Context):
     with ServerContext(context):
         # Group sessions by index and iterate
-        for index, sessions in _split_by_index(sessions).items():
+        for index, sessions in split_by_index(sessions).items():
             # Save sessions in Elastic
             await session_db.save(sessions)
 
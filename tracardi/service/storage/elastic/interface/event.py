@@ -3,6 +3,7 @@ from typing import Optional, List, Dict
 from tracardi.domain.event import Event
 from tracardi.domain.value_object.bulk_insert_result import BulkInsertResult
 from tracardi.service.storage.driver.elastic import event as event_db
+from tracardi.service.storage.elastic.rollup import time_rollup
 
 
 async def refresh_event_db():
@@ -42,6 +43,10 @@ async def load_unique_field_value(search_query, limit):
 
 
 async def load_events_avg_requests():
+    count = await time_rollup.count_last('event', 5 * 60)
+    if count is not None:
+        return count / (5 * 60)
+
     result = await count_events_in_db(query={
         "query": {
             "range": {
@@ -56,7 +61,14 @@ async def load_events_avg_requests():
 
 
 async def save_events_in_db(events) -> BulkInsertResult:
-    return await event_db.save(events, exclude={"operation": ...})
+    result = await event_db.save(events, exclude={"operation": ...})
+    await time_rollup.record_events(events)
+    return result
+
+
+async def save_events_behind(events):
+    await event_db.save_behind(events, exclude={"operation": ...})
+    await time_rollup.record_events(events)
 
 
 async def load_events_by_session_and_profile(profile_id: str, session_id: str, limit: int):
@@ -0,0 +1,24 @@
+from typing import List, Optional
+
+from tracardi.context import get_context
+from tracardi.service.storage.elastic.index_locator import index_locator
+from tracardi.worker.worker import run_index_locator_rebuild_job
+
+
+def rebuild_index_locator(index_keys: Optional[List[str]] = None) -> List[str]:
+    """
+    Starts rebuild of index locator in worker. Existing indices of the index keys (all located index keys
+    by default) are scanned and locations of their documents recorded. Returns rebuilt index keys.
+    """
+    if index_keys is None:
+        index_keys = sorted(index_locator.index_keys)
+    else:
+        unknown = set(index_keys) - index_locator.index_keys
+        if unknown:
+            raise ValueError(f"Index locator is not used for {', '.join(sorted(unknown))}.")
+
+    if not index_keys or not index_locator.enabled:
+        return []
+
+    run_index_locator_rebuild_job(index_keys, get_context())
+    return index_keys
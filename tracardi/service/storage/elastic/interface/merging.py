@@ -4,9 +4,7 @@ from typing import List, Tuple, Optional, Set
 from tracardi.domain.profile import FlatProfile, Profile
 from tracardi.domain.storage_record import RecordMetadata, StorageRecords
 from tracardi.service.storage.elastic.driver.factory import storage_manager
-from tracardi.service.storage.elastic.interface import raw as raw_db
-from tracardi.service.storage.driver.elastic import event as event_db
-from tracardi.service.storage.driver.elastic import session as session_db
+from tracardi.service.merging.merge_executor import merge_executor
 from tracardi.service.storage.elastic.interface.collector.mutation import profile as mutation_profile_db
 
 
@@ -75,13 +73,8 @@ async def delete_multiple_profiles(profile_tuples: List[Tuple[str, RecordMetadat
 
 
 async def move_profile_events_and_sessions(duplicate_profile_ids: Set[str], merged_profile_id: str):
-    # Changes ids of old events and sessions to match merged profile
-    for old_id in duplicate_profile_ids:
-        if old_id != merged_profile_id:
-            await raw_db.update_profile_ids('event', old_id, merged_profile_id)
-            await event_db.refresh()
-            await raw_db.update_profile_ids('session', old_id, merged_profile_id)
-            await session_db.refresh()
+    # Changes ids of old events and sessions to match merged profile. Runs in background.
+    await merge_executor.move(merged_profile_id, duplicate_profile_ids)
 
 
 async def delete_duplicated_profiles(
@@ -148,6 +148,16 @@ async def refresh():
     return await storage_manager('profile').refresh()
 
 
+async def load_from_index(profile_id: str, index: str) -> Optional[Profile]:
+    profile_record = await profile_db.load_from_index(profile_id, index)
+
+    profile = None
+    if profile_record is not None:
+        profile = Profile.create(profile_record)
+
+    return profile
+
+
 async def load_by_id(profile_id: str) -> Optional[Profile]:
     profile_record = await profile_db.load_by_id(profile_id)
 
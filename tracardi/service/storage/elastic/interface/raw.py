@@ -91,6 +91,38 @@ async def update_profile_ids(index: str, old_profile_id: str, merged_profile_id)
     return await storage_manager(index=index).update_by_query(query=query)
 
 
+async def start_profile_ids_update(index: str, old_profile_ids: List[str], merged_profile_id: str,
+                                   slices='auto') -> str:
+    """
+    Starts update of all old profile ids to merged profile id as elastic task. Returns task id. Documents
+    changed while the task runs are skipped and counted as version conflicts in the task response.
+    """
+    query = {
+        "script": {
+            "source": "ctx._source.profile.id = params.merged_profile_id",
+            "lang": "painless",
+            "params": {
+                "merged_profile_id": f"{merged_profile_id}"
+            }
+        },
+        "query": {
+            "terms": {
+                "profile.id": old_profile_ids
+            }
+        }
+    }
+    result = await storage_manager(index=index).update_by_query(query=query,
+                                                               conflicts='proceed',
+                                                               wait_for_completion=False,
+                                                               slices=slices,
+                                                               refresh=True)
+    return result['task']
+
+
+async def get_task(task_id: str) -> dict:
+    return await ElasticClient.instance().get_task(task_id)
+
+
 async def count_by_query(index: str, query: str, time_span: int) -> StorageRecords:
     result = await storage_manager(index).storage.count_by_query_string(
         query,
@@ -245,5 +277,5 @@ async def get_unique_field_values(index, field, limit=100):
 async def get_mapping_fields(index: str) -> list:
     db_mappings = await load_fields(index)
     set_of_db_mappings = set(db_mappings)
-    set_of_db_mappings.update(FieldMapper().get_field_mapping(index))
+    set_of_db_mappings.update(await FieldMapper().get_field_mapping(index))
     return sorted(list(set_of_db_mappings))
@@ -0,0 +1,89 @@
+from typing import List, Iterable
+
+from tracardi.exceptions.log_handler import get_logger
+from tracardi.service.storage.redis.collections import Collection
+from tracardi.service.storage.redis.driver.async_redis_client import AsyncRedisClient
+
+logger = get_logger(__name__)
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class ProfileAliasTable:
+    """
+    Ids of merged duplicate profiles whose events and sessions are still being moved to the merged profile
+    by an elastic task. Reads by duplicate id are redirected to the merged profile, and reads of events and
+    sessions by merged profile id also match the not yet moved documents.
+
+    Aliases are removed when the task ends. Ttl removes aliases of tasks that nobody watched to the end.
+    """
+
+    def __init__(self, max_hops: int = 8):
+        self.max_hops = max_hops
+
+    async def add(self, merged_profile_id: str, profile_ids: Iterable[str], ttl: int):
+        profile_ids = [profile_id for profile_id in profile_ids if profile_id != merged_profile_id]
+        if not profile_ids:
+            return
+
+        async with AsyncRedisClient().pipeline() as pipe:
+            for profile_id in profile_ids:
+                pipe.set(f"{Collection.profile_alias}{profile_id}", merged_profile_id, ex=ttl)
+            pipe.sadd(f"{Collection.profile_aliases}{merged_profile_id}", *profile_ids)
+            pipe.expire(f"{Collection.profile_aliases}{merged_profile_id}", ttl)
+            await pipe.execute()
+
+    async def remove(self, merged_profile_id: str, profile_ids: Iterable[str]):
+        profile_ids = list(profile_ids)
+        if not profile_ids:
+            return
+
+        redis = AsyncRedisClient()
+        values = await redis.mget([f"{Collection.profile_alias}{profile_id}" for profile_id in profile_ids])
+        async with redis.pipeline() as pipe:
+            for profile_id, value in zip(profile_ids, values):
+                # Duplicate may have been merged again in the meantime
+                if _decode(value) == merged_profile_id:
+                    pipe.delete(f"{Collection.profile_alias}{profile_id}")
+            pipe.srem(f"{Collection.profile_aliases}{merged_profile_id}", *profile_ids)
+            await pipe.execute()
+
+    async def resolve(self, profile_id: str) -> str:
+        """
+        Returns id of the profile that the profile was merged into, or the same id.
+        """
+        try:
+            for _ in range(self.max_hops):
+                merged_profile_id = await AsyncRedisClient().get(f"{Collection.profile_alias}{profile_id}")
+                if merged_profile_id is None:
+                    break
+                profile_id = _decode(merged_profile_id)
+        except Exception as e:
+            logger.warning(f"Could not resolve profile alias of {profile_id}. Details: {repr(e)}")
+        return profile_id
+
+    async def aliases(self, profile_id: str) -> List[str]:
+        """
+        Returns ids of duplicates merged into the profile whose documents may not be moved yet.
+        """
+        try:
+            return sorted(_decode(alias) for alias in
+                          await AsyncRedisClient().smembers(f"{Collection.profile_aliases}{profile_id}"))
+        except Exception as e:
+            logger.warning(f"Could not load profile aliases of {profile_id}. Details: {repr(e)}")
+            return []
+
+    async def profile_id_query(self, profile_id: str) -> dict:
+        """
+        Returns query that matches documents of profile, including documents of its duplicates that are not
+        moved yet.
+        """
+        aliases = await self.aliases(profile_id)
+        if not aliases:
+            return {"term": {"profile.id": profile_id}}
+        return {"terms": {"profile.id": [profile_id] + aliases}}
+
+
+profile_alias_table = ProfileAliasTable()
@@ -0,0 +1,143 @@
+import asyncio
+from collections import defaultdict
+from time import time
+from typing import Dict, List, Optional, Iterable
+
+from tracardi.config import elastic
+from tracardi.context import Context, ServerContext, get_context
+from tracardi.domain.entity import Entity
+from tracardi.exceptions.log_handler import get_logger
+from tracardi.service.storage.elastic.driver.elastic_client import ElasticClient
+from tracardi.service.storage.redis.collections import Collection
+from tracardi.service.storage.redis.driver.async_redis_client import AsyncRedisClient
+
+logger = get_logger(__name__)
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class IndexRefreshScheduler:
+    """
+    Makes saved documents readable without forcing elastic refresh after each save.
+
+    Ids of saved documents are marked as dirty in redis, one sorted set per index scored by save time.
+    Until the index is refreshed, a document that is not in cache can be read by id with realtime GET
+    from the dirty index (read-your-writes). Dirty indices are refreshed in background every `interval`
+    seconds, then marks saved before the refresh are removed. Marks expire after mark_ttl seconds if
+    the process that set them stops.
+
+    Code that needs search visibility calls refresh. Calls for the same index made within
+    coalesce_time are sent to elastic as one refresh.
+    """
+
+    def __init__(self, interval: float, coalesce_time: float, mark_ttl: int = 60):
+        self.interval = interval
+        self.coalesce_time = coalesce_time
+        self.mark_ttl = mark_ttl
+        self._dirty: Dict[str, Context] = {}
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _start(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._task is not None and not self._task.done():
+            return
+        self._loop = loop
+        self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        while self._dirty:
+            await asyncio.sleep(self.interval)
+            dirty, self._dirty = self._dirty, {}
+            for index, context in dirty.items():
+                started = time()
+                try:
+                    await self.refresh(index)
+                    with ServerContext(context):
+                        await AsyncRedisClient().zremrangebyscore(f"{Collection.dirty_ids}{index}", 0, started)
+                except Exception as e:
+                    logger.warning(f"Could not refresh index {index}. Details: {repr(e)}")
+                    self._dirty.setdefault(index, context)
+
+    async def _refresh(self, index: str):
+        try:
+            await asyncio.sleep(self.coalesce_time)
+        finally:
+            # Calls made from now on may have saved data after the refresh started.
+            if self._pending.get(index, None) is asyncio.current_task():
+                del self._pending[index]
+        await ElasticClient.instance().refresh(index)
+
+    async def refresh(self, index: str):
+        """
+        Refreshes elastic index (or alias). Waits until the data saved before the call is visible for search.
+        """
+        loop = asyncio.get_running_loop()
+        task = self._pending.get(index, None)
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(self._refresh(index))
+            self._pending[index] = task
+        await asyncio.shield(task)
+
+    async def mark_dirty(self, ids_by_index: Dict[str, List[str]]):
+        """
+        Marks saved documents as not yet visible for search.
+        """
+        if not ids_by_index:
+            return
+
+        now = time()
+        try:
+            async with AsyncRedisClient().pipeline() as pipe:
+                for index, ids in ids_by_index.items():
+                    key = f"{Collection.dirty_ids}{index}"
+                    pipe.zadd(key, {id: now for id in ids}).expire(key, self.mark_ttl)
+                pipe.sadd(Collection.dirty_indices, *ids_by_index).expire(Collection.dirty_indices, self.mark_ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Could not mark saved documents for refresh. Details: {repr(e)}")
+
+        context = get_context()
+        for index in ids_by_index:
+            self._dirty[index] = context
+        self._start()
+
+    async def mark_saved(self, entities: Iterable[Entity]):
+        """
+        Marks saved entities as not yet visible for search. Entities without storage metadata are skipped.
+        """
+        ids_by_index = defaultdict(list)
+        for entity in entities:
+            if entity.has_meta_data() and entity.get_meta_data().index:
+                ids_by_index[entity.get_meta_data().index].append(entity.id)
+        await self.mark_dirty(ids_by_index)
+
+    async def find_dirty_index(self, id: str) -> Optional[str]:
+        """
+        Returns index where document with the id was last saved if it may not be visible for search yet.
+        """
+        try:
+            redis = AsyncRedisClient()
+            indices = [_decode(index) for index in await redis.smembers(Collection.dirty_indices)]
+            if not indices:
+                return None
+
+            async with redis.pipeline() as pipe:
+                for index in indices:
+                    pipe.zscore(f"{Collection.dirty_ids}{index}", id)
+                scores = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Could not check if document {id} is visible for search. Details: {repr(e)}")
+            return None
+
+        found = [(score, index) for score, index in zip(scores, indices) if score is not None]
+        return max(found)[1] if found else None
+
+
+refresh_scheduler = IndexRefreshScheduler(
+    interval=elastic.refresh_interval / 1000,
+    coalesce_time=elastic.refresh_coalesce_time / 1000
+)
@@ -0,0 +1,186 @@
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from time import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from tracardi.config import elastic
+from tracardi.context import get_context
+from tracardi.domain.event import Event
+from tracardi.domain.session import Session
+from tracardi.exceptions.log_handler import get_logger
+from tracardi.service.storage.redis.collections import Collection
+from tracardi.service.storage.redis.driver.async_redis_client import AsyncRedisClient
+
+logger = get_logger(__name__)
+
+_minute = 60
+_hour = 60 * 60
+
+
+def _timestamp(date: Optional[datetime]) -> float:
+    if date is None:
+        return time()
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date.timestamp()
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class TimeRollup:
+    """
+    Counters of saved documents per minute and per hour, kept in redis hashes per index. Each hash has the
+    total count and counts per dimension value (field `<dimension>:<value>`), e.g. events by type and source.
+
+    Counters are updated at ingest, so histograms and rates of recent data do not aggregate the raw index.
+    Rollup answers only if it was running for the whole requested time range, otherwise callers fall back
+    to the raw index.
+    """
+
+    def __init__(self, enabled: bool, minute_ttl: int, hour_ttl: int, max_buckets: int = 10000):
+        self.enabled = enabled
+        self.resolutions = ((_minute, minute_ttl), (_hour, hour_ttl))
+        self.max_buckets = max_buckets
+
+    @staticmethod
+    def _prefix() -> str:
+        return "prod" if get_context().production else "test"
+
+    def _key(self, index: str, resolution: int, bucket: int) -> str:
+        return f"{Collection.rollup}{self._prefix()}:{index}:{resolution}:{bucket}"
+
+    def _start_key(self, index: str) -> str:
+        return f"{Collection.rollup_start}{self._prefix()}:{index}"
+
+    async def record(self, index: str, items: Iterable[Tuple[Optional[datetime], Dict[str, Optional[str]]]]):
+        """
+        Counts documents by time and dimensions.
+        """
+        if not self.enabled:
+            return
+
+        counters: Dict[Tuple[int, int], Counter] = defaultdict(Counter)
+        for date, dimensions in items:
+            timestamp = _timestamp(date)
+            for resolution, _ in self.resolutions:
+                counter = counters[(resolution, int(timestamp // resolution) * resolution)]
+                counter['count'] += 1
+                for dimension, value in dimensions.items():
+                    if value:
+                        counter[f"{dimension}:{value}"] += 1
+
+        if not counters:
+            return
+
+        ttls = dict(self.resolutions)
+        try:
+            async with AsyncRedisClient().pipeline() as pipe:
+                for (resolution, bucket), counter in counters.items():
+                    key = self._key(index, resolution, bucket)
+                    for field, count in counter.items():
+                        pipe.hincrby(key, field, count)
+                    pipe.expire(key, ttls[resolution])
+                pipe.set(self._start_key(index), int(time()), nx=True)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Could not update {index} rollup. Details: {repr(e)}")
+
+    async def record_events(self, events: Iterable[Event]):
+        await self.record('event', [
+            (event.metadata.time.insert, {"type": event.type, "source": event.source.id if event.source else None})
+            for event in events
+        ])
+
+    async def record_sessions(self, sessions: Iterable[Session]):
+        # Sessions are counted when created
+        await self.record('session', [
+            (session.metadata.time.insert, {}) for session in sessions if session.is_new()
+        ])
+
+    async def _started(self, index: str) -> Optional[float]:
+        started = await AsyncRedisClient().get(self._start_key(index))
+        return float(_decode(started)) if started is not None else None
+
+    async def _load(self, index: str, resolution: int, buckets: List[int]) -> List[Dict[str, int]]:
+        async with AsyncRedisClient().pipeline() as pipe:
+            for bucket in buckets:
+                pipe.hgetall(self._key(index, resolution, bucket))
+            result = await pipe.execute()
+        return [{_decode(field): int(value) for field, value in counters.items()} for counters in result]
+
+    def _resolution(self, since: float, interval: int, offset: int) -> Optional[int]:
+        now = time()
+        for resolution, ttl in self.resolutions:
+            if interval % resolution == 0 and offset % resolution == 0 and since >= now - ttl + resolution:
+                return resolution
+        return None
+
+    async def histogram(self, index: str, min_date: datetime, max_date: datetime,
+                        interval: int) -> Optional[List[Tuple[datetime, Dict[str, int]]]]:
+        """
+        Returns counters summed in buckets of interval seconds between min and max date, like elastic date
+        histogram with fixed interval and extended bounds. Buckets are aligned in the time zone of min date.
+        Returns None if rollup can not answer.
+        """
+        if not self.enabled:
+            return None
+
+        min_timestamp = _timestamp(min_date)
+        max_timestamp = _timestamp(max_date)
+        offset = int(min_date.utcoffset().total_seconds()) if min_date.tzinfo is not None else 0
+
+        resolution = self._resolution(min_timestamp, interval, offset)
+        if resolution is None or (max_timestamp - min_timestamp) / resolution > self.max_buckets:
+            return None
+
+        try:
+            started = await self._started(index)
+            if started is None or started > min_timestamp:
+                return None
+
+            buckets = list(range(int(min_timestamp // resolution) * resolution, int(max_timestamp) + 1, resolution))
+            counters = await self._load(index, resolution, buckets)
+        except Exception as e:
+            logger.warning(f"Could not load {index} rollup. Details: {repr(e)}")
+            return None
+
+        tz = min_date.tzinfo or timezone.utc
+        first = int((min_timestamp + offset) // interval) * interval - offset
+        last = int((max_timestamp + offset) // interval) * interval - offset
+        histogram = {start: Counter() for start in range(first, last + 1, interval)}
+        for bucket, counter in zip(buckets, counters):
+            histogram[int((bucket + offset) // interval) * interval - offset].update(counter)
+
+        return [(datetime.fromtimestamp(start, tz), dict(counter)) for start, counter in histogram.items()]
+
+    async def count_last(self, index: str, seconds: int) -> Optional[float]:
+        """
+        Returns number of documents saved in the last seconds, or None if rollup can not answer.
+        """
+        if not self.enabled:
+            return None
+
+        now = time()
+        since = now - seconds
+        try:
+            started = await self._started(index)
+            if started is None or started > since:
+                return None
+            buckets = list(range(int(since // _minute) * _minute, int(now) + 1, _minute))
+            counters = await self._load(index, _minute, buckets)
+        except Exception as e:
+            logger.warning(f"Could not load {index} rollup. Details: {repr(e)}")
+            return None
+
+        # Only part of the first minute is within range
+        part = (buckets[0] + _minute - since) / _minute
+        return counters[0].get('count', 0) * part + sum(counter.get('count', 0) for counter in counters[1:])
+
+
+time_rollup = TimeRollup(
+    enabled=elastic.rollup,
+    minute_ttl=elastic.rollup_minute_ttl,
+    hour_ttl=elastic.rollup_hour_ttl
+)
@@ -0,0 +1,258 @@
+import asyncio
+import atexit
+from collections import OrderedDict
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple, Union
+from uuid import uuid4
+
+from pydantic import BaseModel
+
+from tracardi.config import tracardi
+from tracardi.domain.storage_record import StorageRecord
+from tracardi.domain.value_object.bulk_insert_result import BulkInsertResult
+from tracardi.exceptions.log_handler import get_logger
+from tracardi.service.storage.elastic.driver.elastic_client import ElasticClient
+from tracardi.service.storage.elastic.driver.factory import storage_manager
+
+logger = get_logger(__name__)
+
+
+def _item_errors(result: BulkInsertResult) -> Optional[Dict[str, dict]]:
+    """
+    Returns errors of bulk items by document id, or None if the whole bulk failed.
+    """
+    errors = {}
+    for error in result.errors:
+        if not isinstance(error, dict):
+            return None
+        for item in error.values():
+            errors[item.get('_id', None)] = item
+    return errors
+
+
+def _is_retryable(item_error: dict) -> bool:
+    # Rejected documents (e.g. mapping errors) fail again, overload and server errors may pass.
+    status = item_error.get('status', None)
+    return status is None or status == 429 or status >= 500
+
+
+class WriteBehindMetrics(BaseModel):
+    queue_depth: int = 0
+    flushes: int = 0
+    flushed_records: int = 0
+    failed_records: int = 0
+    dropped_records: int = 0
+    backpressure_waits: int = 0
+    last_flush_size: int = 0
+    last_flush_latency: float = 0
+    total_flush_latency: float = 0
+
+    def avg_flush_size(self) -> float:
+        return self.flushed_records / self.flushes if self.flushes else 0
+
+    def avg_flush_latency(self) -> float:
+        return self.total_flush_latency / self.flushes if self.flushes else 0
+
+
+class WriteBehindBuffer:
+    """
+    In-process buffer of records waiting for bulk save in elastic. Records are queued per index and
+    flushed in the background with ElasticClient.insert when any index has a full batch or when flush
+    interval passes. Newer version of a queued document replaces the older one.
+
+    The buffer is bounded: add waits until there is space (backpressure). Only failed records of a batch are
+    queued again, until max_retries, then dropped. Records rejected by elastic (e.g. mapping errors) are
+    dropped at once. Call close on shutdown to flush what is left (see tracardi.service.shutdown.close_all).
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float, max_size: int, max_retries: int = 3,
+                 client: Optional[ElasticClient] = None):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_size = max(self.batch_size, max_size)
+        self.max_retries = max_retries
+        self._client = client
+        self._queues: Dict[str, OrderedDict] = {}
+        self._size = 0
+        self._metrics = WriteBehindMetrics()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._space: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._closing = False
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def client(self) -> ElasticClient:
+        return self._client or ElasticClient.instance()
+
+    @property
+    def metrics(self) -> WriteBehindMetrics:
+        self._metrics.queue_depth = self._size
+        return self._metrics
+
+    def _bind(self, loop: asyncio.AbstractEventLoop):
+        # Events and lock are bound to the loop that uses them. Flush task of other loop is dropped.
+        if self._loop is not loop:
+            self._loop = loop
+            self._wake = asyncio.Event()
+            self._space = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._task = None
+
+    def _start(self):
+        loop = asyncio.get_running_loop()
+        self._bind(loop)
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._task = loop.create_task(self._run())
+
+    def _put(self, index: str, record: StorageRecord, attempts: int, replace: bool = True):
+        queue = self._queues.setdefault(index, OrderedDict())
+        key = record.get('_id', None) or str(uuid4())
+        if key in queue:
+            if not replace:
+                # Newer version is already queued
+                return
+            del queue[key]
+        else:
+            self._size += 1
+        queue[key] = (record, attempts)
+
+    async def add(self, index: str, records: List[StorageRecord]):
+        self._start()
+        for record in records:
+            while self._size >= self.max_size:
+                self._metrics.backpressure_waits += 1
+                self._space.clear()
+                self._wake.set()
+                await self._space.wait()
+            self._put(index, record, 0)
+            if len(self._queues[index]) >= self.batch_size:
+                self._wake.set()
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Write-behind flush failed: {str(e)}")
+
+    def _take_batches(self) -> List[Tuple[str, List[Tuple[str, Tuple[StorageRecord, int]]]]]:
+        batches = []
+        for index, queue in self._queues.items():
+            while queue:
+                batches.append((index, [queue.popitem(last=False) for _ in range(min(self.batch_size, len(queue)))]))
+        self._size = 0
+        return batches
+
+    async def _flush_batch(self, index: str, batch: List[Tuple[str, Tuple[StorageRecord, int]]]):
+        start = perf_counter()
+        # Insert removes _id from records, they are copied so they can be queued again.
+        result = await self.client.insert(index, [StorageRecord(record) for _, (record, _) in batch],
+                                          raise_on_error=False)
+        latency = perf_counter() - start
+
+        self._metrics.flushes += 1
+        self._metrics.last_flush_size = len(batch)
+        self._metrics.last_flush_latency = latency
+        self._metrics.total_flush_latency += latency
+
+        errors = _item_errors(result)
+        if errors is None:
+            failed = [(record, attempts, True) for _, (record, attempts) in batch]
+        else:
+            # Ids are returned in order of records
+            failed = [(record, attempts, _is_retryable(errors[_id]))
+                      for _id, (_, (record, attempts)) in zip(result.ids, batch) if _id in errors]
+
+        self._metrics.flushed_records += len(batch) - len(failed)
+        if not failed:
+            return
+
+        self._metrics.failed_records += len(failed)
+        retry = [(record, attempts + 1) for record, attempts, retryable in failed
+                 if retryable and attempts + 1 < self.max_retries]
+        dropped = len(failed) - len(retry)
+        if dropped:
+            self._metrics.dropped_records += dropped
+            logger.error(f"Write-behind dropped {dropped} records for index {index}. Rejected records are not "
+                         f"retried, others after {self.max_retries} attempts. Errors: {result.errors[:3]}")
+        for record, attempts in retry:
+            self._put(index, record, attempts, replace=False)
+
+    async def flush(self):
+        """
+        Saves all queued records. Failed records are queued again, rejected records are dropped.
+        """
+        if self._flush_lock is None:
+            return
+
+        async with self._flush_lock:
+            batches = self._take_batches()
+            self._space.set()
+            if batches:
+                await asyncio.gather(*[self._flush_batch(index, batch) for index, batch in batches])
+
+    async def close(self):
+        """
+        Stops background flushing and saves what is left in the buffer. Records queued in an event loop that
+        already ended are saved in the current one.
+        """
+        self._bind(asyncio.get_running_loop())
+        if self._task is not None:
+            # Flush in progress is not interrupted
+            self._closing = True
+            self._wake.set()
+            await self._task
+            self._task = None
+
+        # Failed records are retried until they are saved or dropped.
+        while self._size > 0:
+            await self.flush()
+
+
+write_behind_buffer = WriteBehindBuffer(
+    batch_size=tracardi.write_behind_batch_size,
+    flush_interval=tracardi.write_behind_flush_interval / 1000,
+    max_size=tracardi.write_behind_max_size,
+    max_retries=tracardi.write_behind_max_retries
+)
+
+
+def flush_at_exit(buffer: WriteBehindBuffer = write_behind_buffer):
+    """
+    Best effort save of records left in the buffer when the process exits without close. Records are
+    saved in a new event loop, so it works only if the elastic client can connect again.
+    """
+    if not len(buffer):
+        return
+    try:
+        asyncio.run(buffer.close())
+    except Exception as e:
+        logger.error(f"Write-behind could not save {len(buffer)} records on exit, they are lost. "
+                     f"Details: {repr(e)}")
+
+
+atexit.register(flush_at_exit)
+
+
+async def save_behind(index: str, data: Union[list, set], exclude=None):
+    """
+    Queues entities for bulk save in elastic. Entities are converted to storage records at once so later
+    changes to entities do not leak into the queued version.
+    """
+    if not data:
+        return
+
+    storage = storage_manager(index).storage
+    for _index, records in storage.get_records_by_index(data, exclude=exclude).items():
+        await write_behind_buffer.add(_index, records)
@@ -123,6 +123,7 @@ class WorkflowTriggerTable(Base):
 
     __table_args__ = (
         PrimaryKeyConstraint('id', 'tenant', 'production'),
+        Index('ix_trigger_routing', 'tenant', 'production', 'source_id', 'event_type_id', 'enabled'),
     )
 
     running: bool = False
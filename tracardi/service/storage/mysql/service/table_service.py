@@ -3,6 +3,7 @@ from typing import Optional, Type, Callable, Tuple, TypeVar
 from sqlalchemy.dialects.mysql import insert
 
 from tracardi.exceptions.log_handler import get_logger
+from tracardi.service.decorators.function_memory_cache import publish_cache_invalidation
 from tracardi.service.license import License, LICENSE
 from tracardi.service.singleton import Singleton
 from tracardi.service.storage.mysql.engine import AsyncMySqlEngine
@@ -89,7 +90,9 @@ class TableService(metaclass=Singleton):
             async with session.begin():
                 resource = MysqlQueryInDeploymentMode(session)
                 deleted, record = await resource.delete_by_id(table, primary_id)
-                return deleted, record.map_to_object(mapper)
+
+        await publish_cache_invalidation(table.__tablename__)
+        return deleted, record.map_to_object(mapper)
 
     async def _load_all_in_deployment_mode(self, table,
                                            search: Optional[str] = None,
@@ -215,7 +218,9 @@ class TableService(metaclass=Singleton):
             async with session.begin():
                 session.add(table)
                 await session.commit()
-                return table.id
+
+        await publish_cache_invalidation(table.__tablename__)
+        return table.id
 
     async def _update_by_id(self, table: Type[Base], primary_id: str, new_data: dict, server_context: bool = True) -> \
             Optional[str]:
@@ -231,7 +236,9 @@ class TableService(metaclass=Singleton):
                 )
                 await session.execute(stmt)
                 await session.commit()
-                return primary_id
+
+        await publish_cache_invalidation(table.__tablename__)
+        return primary_id
 
     async def _update_query(self, table: Type[Base], where, new_data: dict):
         local_session = self.client.get_session(self.engine)
@@ -240,7 +247,9 @@ class TableService(metaclass=Singleton):
                 resource = MysqlQuery(session)
                 await resource.update(table, new_data, where)
                 await session.commit()
-                return None
+
+        await publish_cache_invalidation(table.__tablename__)
+        return None
 
     async def _replace(self, table: Type[Base], instance: Base) -> Optional[str]:
         local_session = self.client.get_session(self.engine)
@@ -256,8 +265,10 @@ class TableService(metaclass=Singleton):
                 await session.execute(upsert_stmt)
                 await session.commit()
 
-                # Assuming the primary key field is named 'id'
-                return getattr(instance, 'id', None)
+        await publish_cache_invalidation(table.__tablename__)
+
+        # Assuming the primary key field is named 'id'
+        return getattr(instance, 'id', None)
 
     async def _insert_if_none(self, table: Type[Base], data, server_context: bool = True) -> Optional[str]:
 
@@ -271,17 +282,19 @@ class TableService(metaclass=Singleton):
                     table=table,
                     where=where)
 
-                if result.empty():
-                    # Add the new object to the session
-                    resource.insert(data)
+                if not result.empty():
+                    return None
+
+                # Add the new object to the session
+                resource.insert(data)
 
-                    # The actual commit happens here
-                    await session.commit()
+                # The actual commit happens here
+                await session.commit()
 
-                    # Return the id of the new record
-                    return data.id
+        await publish_cache_invalidation(table.__tablename__)
 
-                return None
+        # Return the id of the new record
+        return data.id
 
     async def _delete_by_id(self,
                             table: Type[Base],
@@ -296,6 +309,7 @@ class TableService(metaclass=Singleton):
                 resource = MysqlQuery(session)
                 await resource.delete(table, where)
 
+        await publish_cache_invalidation(table.__tablename__)
         return True, None
 
     async def _delete_query(self, table: Type[Base], where):
@@ -305,3 +319,5 @@ class TableService(metaclass=Singleton):
             async with session.begin():
                 resource = MysqlQuery(session)
                 await resource.delete(table, where)
+
+        await publish_cache_invalidation(table.__tablename__)
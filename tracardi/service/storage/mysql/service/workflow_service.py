@@ -9,6 +9,7 @@ from tracardi.service.storage.mysql.schema.table import WorkflowTable
 from tracardi.service.storage.mysql.utils.select_result import SelectResult
 from tracardi.service.storage.mysql.service.table_service import TableService
 from tracardi.service.storage.mysql.service.table_filtering import where_tenant_and_mode_context
+from tracardi.service.wf.service.flow_cache import compiled_flow_cache
 
 logger = logging.getLogger(__name__)
 logger.setLevel(tracardi.logging_level)
@@ -27,15 +28,21 @@ class WorkflowService(TableService):
         return await self._load_by_id_in_deployment_mode(WorkflowTable, primary_id=workflow_id)
 
     async def update_by_id(self, workflow_id: str, new_data: dict) -> Optional[str]:
-        return await self._update_by_id(WorkflowTable, primary_id=workflow_id, new_data=new_data)
+        result = await self._update_by_id(WorkflowTable, primary_id=workflow_id, new_data=new_data)
+        compiled_flow_cache.invalidate(workflow_id)
+        return result
 
     async def delete_by_id(self, workflow_id: str) -> Tuple[bool, Optional[FlowRecord]]:
-        return await self._delete_by_id_in_deployment_mode(WorkflowTable,
-                                                           map_to_workflow_record,
-                                                           primary_id=workflow_id)
+        result = await self._delete_by_id_in_deployment_mode(WorkflowTable,
+                                                             map_to_workflow_record,
+                                                             primary_id=workflow_id)
+        compiled_flow_cache.invalidate(workflow_id)
+        return result
 
     async def insert(self, workflow: FlowRecord):
-        return await self._replace(WorkflowTable, map_to_workflow_table(workflow))
+        result = await self._replace(WorkflowTable, map_to_workflow_table(workflow))
+        compiled_flow_cache.invalidate(workflow.id)
+        return result
 
     async def load_all_by_type(self, wf_type: str, search: str = None, columns=None, limit: int = None,
                                offset: int = None) -> SelectResult:
@@ -4,7 +4,7 @@ from tracardi.domain.entity import Entity
 from tracardi.domain.event import Event
 from tracardi.domain.rule import Rule
 from tracardi.exceptions.log_handler import get_logger
-from tracardi.service.cache.trigger import load_trigger_rule
+from tracardi.service.cache.trigger import trigger_routing_table
 from tracardi.service.storage.mysql.mapping.workflow_trigger_mapping import map_to_workflow_trigger_table, \
     map_to_workflow_trigger_rule
 from tracardi.service.storage.mysql.schema.table import WorkflowTriggerTable
@@ -67,6 +67,17 @@ class WorkflowTriggerService(TableService):
             where=where
         )
 
+    async def load_enabled(self) -> SelectResult:
+        where = where_tenant_and_mode_context(
+            WorkflowTriggerTable,
+            WorkflowTriggerTable.enabled == True
+        )
+
+        return await self._select_in_deployment_mode(
+            WorkflowTriggerTable,
+            where=where
+        )
+
     @staticmethod
     def _get_cache_key(source_id, event_type):
         return f"rules-{source_id}-{event_type}"
@@ -78,24 +89,15 @@ class WorkflowTriggerService(TableService):
 
         event_types = {event.type for event in events if event.metadata.valid}
 
-        # Cache rules per event types
+        # Rules are read from in-memory routing table of all enabled triggers
+
+        routing = await trigger_routing_table.get_routes(self)
 
         event_type_rules = {}
         has_routes = False
         for event_type in event_types:
 
-            routes: List[Rule] = await load_trigger_rule(self, event_type, source.id)
-
-            # TODO remove 01-04-2024
-            # cache_key = self._get_cache_key(source.id, event_type)
-            # if cache_key not in memory_cache:
-            #     logger.debug("Loading routing rules for cache key {}".format(cache_key))
-            #     rules: List[Rule] = await load_trigger_rule(event_type, source.id)
-            #
-            #     memory_cache[cache_key] = CacheItem(data=rules,
-            #                                         ttl=memory_cache_config.trigger_rule_cache_ttl)
-            #
-            # routes = list(memory_cache[cache_key].data)
+            routes: List[Rule] = routing.get(source.id, event_type)
 
             if not has_routes and routes:
                 has_routes = True
@@ -1,5 +1,6 @@
-from typing import Optional, Any
+from typing import Optional, Any, List, Tuple
 
+from tracardi.service.storage.redis.driver.async_redis_client import AsyncRedisClient
 from tracardi.service.storage.redis.driver.redis_client import RedisClient
 import msgpack
 
@@ -44,3 +45,54 @@ class RedisCache:
 
     def get_ttl(self, key:str, collection:str):
         return self._redis.ttl(f"{collection}{key}")
+
+
+class AsyncRedisCache:
+
+    def __init__(self, ttl):
+        self._redis = AsyncRedisClient()
+        self.ttl = ttl
+
+    async def set(self, key: str, value: Any, collection: str):
+        await self._redis.set(
+            f"{collection}{key}",
+            msgpack.packb(value),
+            ex=self.ttl
+        )
+
+    async def set_many(self, items: List[Tuple[str, Any, str]]):
+        """
+        Saves list of (key, value, collection) in one round trip.
+        """
+        if not items:
+            return
+        async with self._redis.pipeline() as pipe:
+            for key, value, collection in items:
+                pipe.set(f"{collection}{key}", msgpack.packb(value), ex=self.ttl)
+            await pipe.execute()
+
+    async def get(self, key: str, collection: str) -> Optional[Any]:
+        value = await self._redis.get(f"{collection}{key}")
+        if value is None:
+            return None
+
+        return msgpack.unpackb(value)
+
+    async def mget(self, keys: List[Tuple[str, str]]) -> List[Optional[Any]]:
+        """
+        Reads list of (key, collection) in one round trip. Missing keys are returned as None.
+        """
+        values = await self._redis.mget([f"{collection}{key}" for key, collection in keys])
+        return [msgpack.unpackb(value) if value is not None else None for value in values]
+
+    async def delete(self, key: str, collection: str):
+        await self._redis.delete(f"{collection}{key}")
+
+    async def has(self, key, collection):
+        return await self._redis.exists(f"{collection}{key}")
+
+    async def refresh(self, key, collection):
+        await self._redis.expire(f"{collection}{key}", self.ttl)
+
+    async def get_ttl(self, key: str, collection: str):
+        return await self._redis.ttl(f"{collection}{key}")
@@ -17,6 +17,20 @@ class Collection:
     profile: str = "profile:"  # HASH
     session: str = "session:"  # HASH
     lock_tracker: str = "lock:tracker:"  # HASH
+    lock_fence: str = "lock:fence"  # Fencing token counter for all locks
+    lock_release: str = "lock:release:"  # PUB/SUB channel prefix, notifies lock waiters
+    config_cache_invalidation: str = "config-cache:invalidate"  # PUB/SUB channel, changed mysql tables
+    config_cache_version: str = "config-cache:version:"  # Counter of changes per mysql table
+    dirty_indices: str = "elastic:dirty-indices"  # SET, indices with documents not yet visible for search
+    dirty_ids: str = "elastic:dirty:"  # ZSET per index, ids of not yet visible documents scored by save time
+    index_locator: str = "elastic:locator:"  # HASH per index key and bucket, document id -> physical index
+    profile_alias: str = "profile:alias:"  # Id of merged profile by id of its duplicate, while events are moved
+    profile_aliases: str = "profile:aliases:"  # SET, ids of duplicates by id of merged profile, while events are moved
+    rollup: str = "rollup:"  # HASH per index, resolution and time bucket, counters of saved documents
+    rollup_start: str = "rollup:start:"  # Time when rollup of index started
+    node_profile: str = "node-profile:"  # HASH per flow, counters of workflow node calls, errors and time
+    node_profile_flows: str = "node-profile:flows:"  # SET, ids of profiled flows
+    user_agents: str = "user-agents"  # ZSET, not tenant-prefixed, user agents by frequency for cache warm up
 
     session_lock: str = "session:lock:"  # HASH
     profile_fields: str = "profile:fields"  # SET, Cache profile fields, properties for auto completion
@@ -0,0 +1,276 @@
+import asyncio
+from functools import partial
+from typing import Optional, Union, List, Dict, Any
+
+import redis.asyncio as aioredis
+from redis.commands.core import AsyncScript
+
+from tracardi.context import get_context
+from tracardi.exceptions.log_handler import get_logger
+from tracardi.service.latency import timed
+from tracardi.service.singleton import Singleton
+from tracardi.config import redis_config
+from tracardi.service.storage.redis.driver.redis_connection_pool import get_async_redis_connection_pool
+from tracardi.service.utils.loop import close_in_loop
+
+logger = get_logger(__name__)
+
+
+def _get_tenant_prefix(name) -> str:
+    return f"{get_context().tenant}:{name}"
+
+
+class AsyncRedisPipeline:
+    """
+    Tenant-aware pipeline. Commands are queued and sent to redis in one round trip on execute.
+    Results are returned in the order the commands were queued.
+    """
+
+    def __init__(self, pipeline: aioredis.client.Pipeline):
+        self._pipeline = pipeline
+
+    async def __aenter__(self) -> 'AsyncRedisPipeline':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self._pipeline.reset()
+
+    def __len__(self):
+        return len(self._pipeline)
+
+    def get(self, name) -> 'AsyncRedisPipeline':
+        self._pipeline.get(_get_tenant_prefix(name))
+        return self
+
+    def set(self, name, value, ex=None, px=None, nx: bool = False, xx: bool = False) -> 'AsyncRedisPipeline':
+        self._pipeline.set(_get_tenant_prefix(name), value, ex=ex, px=px, nx=nx, xx=xx)
+        return self
+
+    def exists(self, name) -> 'AsyncRedisPipeline':
+        self._pipeline.exists(_get_tenant_prefix(name))
+        return self
+
+    def delete(self, name) -> 'AsyncRedisPipeline':
+        self._pipeline.delete(_get_tenant_prefix(name))
+        return self
+
+    def incr(self, name, amount: int = 1) -> 'AsyncRedisPipeline':
+        self._pipeline.incr(_get_tenant_prefix(name), amount)
+        return self
+
+    def expire(self, name, time, nx: bool = False, xx: bool = False, gt: bool = False,
+               lt: bool = False) -> 'AsyncRedisPipeline':
+        self._pipeline.expire(_get_tenant_prefix(name), time, nx, xx, gt, lt)
+        return self
+
+    def ttl(self, name) -> 'AsyncRedisPipeline':
+        self._pipeline.ttl(_get_tenant_prefix(name))
+        return self
+
+    def hget(self, name: str, key: str) -> 'AsyncRedisPipeline':
+        self._pipeline.hget(_get_tenant_prefix(name), key)
+        return self
+
+    def hset(self, name: str, key: Optional[str] = None, value: Optional[str] = None,
+             mapping: Optional[dict] = None) -> 'AsyncRedisPipeline':
+        self._pipeline.hset(_get_tenant_prefix(name), key, value, mapping)
+        return self
+
+    def hincrby(self, name: str, key: str, amount: int = 1) -> 'AsyncRedisPipeline':
+        self._pipeline.hincrby(_get_tenant_prefix(name), key, amount)
+        return self
+
+    def hgetall(self, name: str) -> 'AsyncRedisPipeline':
+        self._pipeline.hgetall(_get_tenant_prefix(name))
+        return self
+
+    def sadd(self, name: str, *values) -> 'AsyncRedisPipeline':
+        self._pipeline.sadd(_get_tenant_prefix(name), *values)
+        return self
+
+    def smembers(self, name: str) -> 'AsyncRedisPipeline':
+        self._pipeline.smembers(_get_tenant_prefix(name))
+        return self
+
+    def srem(self, name: str, *values) -> 'AsyncRedisPipeline':
+        self._pipeline.srem(_get_tenant_prefix(name), *values)
+        return self
+
+    def zadd(self, name: str, mapping: Dict[str, float]) -> 'AsyncRedisPipeline':
+        self._pipeline.zadd(_get_tenant_prefix(name), mapping)
+        return self
+
+    def zscore(self, name: str, value: str) -> 'AsyncRedisPipeline':
+        self._pipeline.zscore(_get_tenant_prefix(name), value)
+        return self
+
+    @timed("redis.pipeline")
+    async def execute(self, raise_on_error: bool = True) -> List[Any]:
+        return await self._pipeline.execute(raise_on_error=raise_on_error)
+
+
+class AsyncRedisClient(metaclass=Singleton):
+    """
+    Asyncio-native counterpart of RedisClient with the same tenant-prefixing API. Use it inside coroutines
+    so the event loop is not blocked for the time of the network round trip.
+
+    Redis asyncio connections are bound to the event loop that opened them. The client keeps one connection
+    pool per process and opens a new one if it is used from a different event loop, the old one is closed.
+    Call close on shutdown (see tracardi.service.shutdown.close_all).
+    """
+
+    def __init__(self):
+        self._client: Optional[aioredis.Redis] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._scripts: Dict[str, AsyncScript] = {}
+
+    @property
+    def client(self) -> aioredis.Redis:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._release()
+            logger.debug(f"Connecting async redis via pool at {redis_config.get_redis_with_password()}")
+            self._client = aioredis.Redis(connection_pool=get_async_redis_connection_pool(redis_config))
+            self._loop = loop
+            self._scripts = {}
+        return self._client
+
+    def _release(self):
+        # Connections of other event loop are closed in that loop.
+        client, loop = self._client, self._loop
+        self._client = None
+        self._loop = None
+        self._scripts = {}
+        if client is not None and not close_in_loop(partial(client.aclose, close_connection_pool=True), loop):
+            # Loop ended, its connections can not be closed anymore. Pool is dropped with them.
+            logger.debug("Dropped async redis connection pool of ended event loop.")
+
+    async def close(self):
+        """
+        Closes connection pool. Call it in the event loop that used the client.
+        """
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            client = self._client
+            self._client = None
+            self._loop = None
+            self._scripts = {}
+            await client.aclose(close_connection_pool=True)
+        else:
+            self._release()
+
+    @staticmethod
+    def get_tenant_prefix(name):
+        return _get_tenant_prefix(name)
+
+    def pipeline(self, transaction: bool = False) -> AsyncRedisPipeline:
+        return AsyncRedisPipeline(self.client.pipeline(transaction=transaction))
+
+    @timed("redis.eval_script")
+    async def eval_script(self, script: str, keys: List[str], args: Optional[list] = None):
+        """
+        Runs lua script (EVALSHA with fallback to SCRIPT LOAD). Keys are tenant-prefixed, args are not.
+        """
+        client = self.client
+        if script not in self._scripts:
+            self._scripts[script] = client.register_script(script)
+        return await self._scripts[script](keys=[self.get_tenant_prefix(key) for key in keys], args=args or [])
+
+    async def hexists(self, name: str, key: str) -> bool:
+        return await self.client.hexists(self.get_tenant_prefix(name), key)
+
+    @timed("redis.hget")
+    async def hget(self, name: str, key: str):
+        return await self.client.hget(self.get_tenant_prefix(name), key)
+
+    @timed("redis.hset")
+    async def hset(self,
+                   name: str,
+                   key: Optional[str] = None,
+                   value: Optional[str] = None,
+                   mapping: Optional[dict] = None,
+                   items: Optional[list] = None) -> int:
+        return await self.client.hset(self.get_tenant_prefix(name), key, value, mapping, items)
+
+    async def hsetnx(self, name: str, key: str, value: str) -> bool:
+        return await self.client.hsetnx(self.get_tenant_prefix(name), key, value)
+
+    async def hdel(self, name: str, *keys: List) -> int:
+        return await self.client.hdel(self.get_tenant_prefix(name), *keys)
+
+    async def sadd(self, name: str, *values) -> int:
+        return await self.client.sadd(self.get_tenant_prefix(name), *values)
+
+    async def smembers(self, name: str) -> set:
+        return await self.client.smembers(self.get_tenant_prefix(name))
+
+    async def srem(self, name: str, *values) -> int:
+        return await self.client.srem(self.get_tenant_prefix(name), *values)
+
+    async def zremrangebyscore(self, name: str, min: float, max: float) -> int:
+        return await self.client.zremrangebyscore(self.get_tenant_prefix(name), min, max)
+
+    async def ttl(self, name):
+        return await self.client.ttl(self.get_tenant_prefix(name))
+
+    async def exists(self, name):
+        return await self.client.exists(self.get_tenant_prefix(name))
+
+    @timed("redis.get")
+    async def get(self, name):
+        return await self.client.get(self.get_tenant_prefix(name))
+
+    @timed("redis.mget")
+    async def mget(self, names: List[str]) -> List[Optional[bytes]]:
+        if not names:
+            return []
+        return await self.client.mget([self.get_tenant_prefix(name) for name in names])
+
+    @timed("redis.set")
+    async def set(
+            self,
+            name,
+            value,
+            ex=None,
+            px=None,
+            nx: bool = False,
+            xx: bool = False,
+            keepttl: bool = False,
+            get: bool = False,
+            exat=None,
+            pxat=None,
+    ):
+        return await self.client.set(self.get_tenant_prefix(name), value, ex, px, nx, xx, keepttl, get, exat, pxat)
+
+    @timed("redis.mset")
+    async def mset(self, mapping: Dict[str, Union[bytes, str]]):
+        return await self.client.mset({self.get_tenant_prefix(name): value for name, value in mapping.items()})
+
+    @timed("redis.delete")
+    async def delete(self, *names):
+        return await self.client.delete(*[self.get_tenant_prefix(name) for name in names])
+
+    async def incr(self, name, amount: int = 1):
+        return await self.client.incr(self.get_tenant_prefix(name), amount)
+
+    async def expire(
+            self,
+            name,
+            time,
+            nx: bool = False,
+            xx: bool = False,
+            gt: bool = False,
+            lt: bool = False,
+    ):
+        return await self.client.expire(self.get_tenant_prefix(name), time, nx, xx, gt, lt)
+
+    async def persist(self, name):
+        return await self.client.persist(self.get_tenant_prefix(name))
+
+    async def ping(self, **kwargs):
+        return await self.client.ping(**kwargs)
+
+    def pubsub(self, **kwargs):
+        return self.client.pubsub(**kwargs)
+
+    async def publish(self, *args, **kwargs):
+        return await self.client.publish(*args, **kwargs)
@@ -40,6 +40,9 @@ class RedisClient(metaclass=Singleton):
              items: Optional[list] = None) -> Union[Awaitable[int], int]:
         return self.client.hset(self.get_tenant_prefix(name), key, value, mapping, items)
 
+    def hsetnx(self, name: str, key: str, value: str) -> Union[Awaitable[bool], bool]:
+        return self.client.hsetnx(self.get_tenant_prefix(name), key, value)
+
     def hdel(self, name: str, *keys: List) -> Union[Awaitable[int], int]:
         return self.client.hdel(self.get_tenant_prefix(name), *keys)
 
@@ -1,5 +1,6 @@
 from tracardi.config import RedisConfig
 from redis import ConnectionPool
+from redis.asyncio import BlockingConnectionPool as AsyncBlockingConnectionPool
 
 from tracardi.exceptions.log_handler import get_logger
 
@@ -11,10 +12,25 @@ def get_redis_connection_pool(redis_config: RedisConfig) -> ConnectionPool:
         pool = ConnectionPool(host=redis_config.host,
                               port=redis_config.port,
                               password=redis_config.redis_password,
-                              max_connections=20)
+                              max_connections=redis_config.max_connections)
     else:
         pool = ConnectionPool(host=redis_config.host,
                               port=redis_config.port,
-                              max_connections=20)
+                              max_connections=redis_config.max_connections)
+
+    return pool
+
+
+def get_async_redis_connection_pool(redis_config: RedisConfig) -> AsyncBlockingConnectionPool:
+    # Coroutines wait for a free connection instead of failing when all connections are in use.
+    if redis_config.redis_password:
+        pool = AsyncBlockingConnectionPool(host=redis_config.host,
+                                           port=redis_config.port,
+                                           password=redis_config.redis_password,
+                                           max_connections=redis_config.max_connections)
+    else:
+        pool = AsyncBlockingConnectionPool(host=redis_config.host,
+                                           port=redis_config.port,
+                                           max_connections=redis_config.max_connections)
 
     return pool
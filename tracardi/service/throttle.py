@@ -1,7 +1,7 @@
 from typing import Tuple
 
 from tracardi.service.storage.redis.collections import Collection
-from tracardi.service.storage.redis.driver.redis_client import RedisClient
+from tracardi.service.storage.redis.driver.async_redis_client import AsyncRedisClient
 
 
 class Limiter:
@@ -9,17 +9,17 @@ class Limiter:
     def __init__(self, limit: int, ttl: int):
         self._ttl = ttl
         self._limit = limit
-        self._redis = RedisClient()
+        self._redis = AsyncRedisClient()
 
-    def limit(self, key: str) -> Tuple[bool, int]:
+    async def limit(self, key: str) -> Tuple[bool, int]:
 
         key = f"{Collection.throttle}:{key}"
 
-        req = self._redis.incr(key)
+        req = await self._redis.incr(key)
         if req == 1:
-            self._redis.expire(key, self._ttl)
+            await self._redis.expire(key, self._ttl)
             ttl = self._ttl
         else:
-            ttl = self._redis.ttl(key)
+            ttl = await self._redis.ttl(key)
 
         return req <= self._limit, ttl
@@ -2,7 +2,7 @@ import time
 from tracardi.domain.payload.tracker_payload import TrackerPayload
 from tracardi.service.tracker import Tracker
 from tracardi.service.tracker_config import TrackerConfig
-from typing import List
+from typing import List, Optional
 
 
 async def track_event(tracker_payload: TrackerPayload,
@@ -24,3 +24,24 @@ async def track_event(tracker_payload: TrackerPayload,
     )
 
     return await tr.track_event(tracker_payload, tracking_start)
+
+
+async def track_events(tracker_payloads: List[TrackerPayload],
+                       ip: str,
+                       allowed_bridges: List[str],
+                       internal_source=None,
+                       run_async: bool = False,
+                       static_profile_id: bool = False
+                       ) -> List[Optional[dict]]:
+    tracking_start = time.time()
+    tr = Tracker(
+        TrackerConfig(
+            ip=ip,
+            allowed_bridges=allowed_bridges,
+            internal_source=internal_source,
+            run_async=run_async,
+            static_profile_id=static_profile_id
+        )
+    )
+
+    return await tr.track_events(tracker_payloads, tracking_start)
@@ -1,4 +1,5 @@
-from typing import Optional
+import asyncio
+from typing import Optional, List, Tuple
 
 from tracardi.domain.bridges.configurable_bridges import WebHookBridge, RestApiBridge, ConfigurableBridge
 from tracardi.exceptions.exception import BlockedException
@@ -10,11 +11,13 @@ from tracardi.service.tracker_config import TrackerConfig
 from tracardi.config import tracardi
 from tracardi.domain.event_source import EventSource
 from tracardi.exceptions.log_handler import get_logger
+from tracardi.service.tracking.batch_tracker import group_tracker_payloads, get_error_response
 
 if License.has_license():
     from com_tracardi.service.tracking.tracker import com_tracker
 else:
     from tracardi.service.tracking.tracker import os_tracker
+    from tracardi.service.tracking.batch_tracker import os_batch_tracker, TrackerBatchItem
 
 logger = get_logger(__name__)
 
@@ -45,12 +48,13 @@ class Tracker:
 
         return None
 
-    async def track_event(self, tracker_payload: TrackerPayload, tracking_start: float):
+    async def _prepare(self, tracker_payload: TrackerPayload) -> Tuple[
+        EventSource, TrackerPayload, TrackerConfig]:
 
         if tracardi.disallow_bot_traffic and tracker_payload.is_bot():
             raise BlockedException(f"Traffic from bot is not allowed.")
 
-            # Trim ids - spaces are frequent issues
+        # Trim ids - spaces are frequent issues
 
         if tracker_payload.source:
             tracker_payload.source.id = str(tracker_payload.source.id).strip()
@@ -70,17 +74,24 @@ class Tracker:
 
         # If there is a configurable bridge get it and set up tracker_payload and tracker_config
 
+        tracker_config = self.tracker_config
         configurable_bridge = self.get_bridge(tracker_payload)
         if configurable_bridge:
-            tracker_payload, self.tracker_config = await configurable_bridge.configure(
+            tracker_payload, tracker_config = await configurable_bridge.configure(
                 tracker_payload,
-                self.tracker_config
+                tracker_config
             )
 
         # Is source ephemeral
         if tracker_payload.source.transitional is True:
             tracker_payload.set_ephemeral()
 
+        return source, tracker_payload, tracker_config
+
+    async def track_event(self, tracker_payload: TrackerPayload, tracking_start: float):
+
+        source, tracker_payload, self.tracker_config = await self._prepare(tracker_payload)
+
         field_change_logger = FieldChangeLogger()
 
         if License.has_license():
@@ -105,3 +116,58 @@ class Tracker:
         #     result['warnings'] += self.console_log.get_warnings()
 
         return result
+
+    async def track_events(self, tracker_payloads: List[TrackerPayload], tracking_start: float) -> List[
+        Optional[dict]]:
+        """
+        Tracks many payloads at once. Storage I/O is grouped for the whole batch. Returns one response per
+        payload in the order of payloads. Errors of a single payload are returned in its response.
+        """
+
+        items = []
+        results: List[Optional[dict]] = [None] * len(tracker_payloads)
+        positions = []
+        for position, tracker_payload in enumerate(tracker_payloads):
+            try:
+                source, tracker_payload, tracker_config = await self._prepare(tracker_payload)
+            except Exception as e:
+                logger.warning(f"Tracker payload {position} in batch rejected: {str(e)}")
+                results[position] = get_error_response(tracker_payload, e)
+                continue
+            items.append((FieldChangeLogger(), source, tracker_payload, tracker_config))
+            positions.append(position)
+
+        if License.has_license():
+            batch_results = await self._track_each(items, tracking_start)
+        else:
+            batch_results = await os_batch_tracker([TrackerBatchItem(*item) for item in items], tracking_start)
+
+        for position, result in zip(positions, batch_results):
+            results[position] = result
+
+        return results
+
+    @staticmethod
+    async def _track_each(items: List[tuple], tracking_start: float) -> List[Optional[dict]]:
+        # Commercial tracker has no batch mode. Payloads of the same profile or session run one after another.
+
+        results: List[Optional[dict]] = [None] * len(items)
+
+        async def _track_group(group: List[int]):
+            for position in group:
+                field_change_logger, source, tracker_payload, tracker_config = items[position]
+                try:
+                    results[position] = await com_tracker(
+                        field_change_logger,
+                        source,
+                        tracker_payload,
+                        tracker_config,
+                        tracking_start
+                    )
+                except Exception as e:
+                    logger.error(f"Batch tracking of payload {position} failed: {str(e)}")
+                    results[position] = get_error_response(tracker_payload, e)
+
+        await asyncio.gather(*[_track_group(group) for group in group_tracker_payloads([item[2] for item in items])])
+
+        return results
@@ -0,0 +1,240 @@
+import asyncio
+import time
+from typing import List, Optional, Dict, Tuple, NamedTuple
+
+from tracardi.context import get_context
+from tracardi.domain.event import Event
+from tracardi.domain.event_source import EventSource
+from tracardi.domain.payload.tracker_payload import TrackerPayload
+from tracardi.domain.profile import Profile
+from tracardi.domain.session import Session
+from tracardi.exceptions.log_handler import get_logger
+from tracardi.service.change_monitoring.field_change_logger import FieldChangeLogger
+from tracardi.service.latency import stage, trace_request
+from tracardi.service.storage.elastic.interface.collector.mutation import profile as mutation_profile_db
+from tracardi.service.storage.elastic.interface.collector.mutation.session import split_by_index
+from tracardi.config import tracardi
+from tracardi.service.storage.elastic.interface.event import save_events_in_db, save_events_behind
+from tracardi.service.tracker_config import TrackerConfig
+from tracardi.service.tracking.cache.prefetch import set_prefetched, put_prefetched
+from tracardi.service.tracking.cache.profile_cache import get_profile_cache_key
+from tracardi.service.tracking.cache.session_cache import get_session_cache_key
+from tracardi.service.tracking.cache.tracker_cache import prefetch_tracker_cache_many
+from tracardi.service.tracking.storage.session_storage import save_session, save_session_behind
+from tracardi.service.tracking.tracker import compute_tracker_payload, finish_tracker_payload
+from tracardi.service.utils.getters import get_entity_id
+
+logger = get_logger(__name__)
+
+
+class TrackerBatchItem(NamedTuple):
+    field_change_logger: FieldChangeLogger
+    source: EventSource
+    tracker_payload: TrackerPayload
+    tracker_config: TrackerConfig
+
+
+def group_tracker_payloads(tracker_payloads: List[TrackerPayload]) -> List[List[int]]:
+    """
+    Groups positions of tracker payloads that share profile id or session id. Payloads of one group
+    must be processed one after another, groups are independent. Positions keep input order.
+    """
+
+    parents = list(range(len(tracker_payloads)))
+
+    def _root(position: int) -> int:
+        while parents[position] != position:
+            parents[position] = parents[parents[position]]
+            position = parents[position]
+        return position
+
+    owners: Dict[Tuple[str, str], int] = {}
+    for position, tracker_payload in enumerate(tracker_payloads):
+        for key in (("profile", get_entity_id(tracker_payload.profile)),
+                    ("session", get_entity_id(tracker_payload.session))):
+            if not key[1]:
+                continue
+            if key in owners:
+                parents[_root(position)] = _root(owners[key])
+            else:
+                owners[key] = position
+
+    groups: Dict[int, List[int]] = {}
+    for position in range(len(tracker_payloads)):
+        groups.setdefault(_root(position), []).append(position)
+
+    return sorted(groups.values(), key=lambda group: group[0])
+
+
+def get_error_response(tracker_payload: TrackerPayload, error: Exception) -> dict:
+    return {
+        "task": tracker_payload.get_id(),
+        "ux": None,
+        "response": None,
+        "events": [],
+        "profile": {
+            "id": get_entity_id(tracker_payload.profile)
+        },
+        "session": {
+            "id": get_entity_id(tracker_payload.session)
+        },
+        "errors": [str(error)],
+        "warnings": []
+    }
+
+
+async def _in_stage(name: str, coroutine):
+    with stage(name):
+        return await coroutine
+
+
+def _batch_source_id(items: List[TrackerBatchItem]) -> str:
+    source_ids = {item.source.id for item in items}
+    return source_ids.pop() if len(source_ids) == 1 else "*"
+
+
+async def os_batch_tracker(items: List[TrackerBatchItem], tracking_start: float) -> List[Optional[dict]]:
+    """
+    Tracks many payloads with grouped storage I/O:
+
+    1. Cached profiles and sessions of all payloads are read in one round trip.
+    2. Payloads are grouped by profile and session. Groups are computed concurrently, payloads within a
+       group one after another. Copies of computed profile and session are handed to the next payload of
+       the group in memory.
+    3. Changed profiles, sessions and all events are saved with one bulk request per entity type
+       (and one cache pipeline for profiles and sessions).
+    4. Destinations and workflows are run per payload, in group order.
+
+    Returns responses in the order of items. Payload that failed has its error in response errors.
+    Latency of the batch is measured for its source, or source `*` if payloads have different sources.
+    """
+
+    with trace_request(_batch_source_id(items)):
+        return await _track_batch(items, tracking_start)
+
+
+async def _track_batch(items: List[TrackerBatchItem], tracking_start: float) -> List[Optional[dict]]:
+    try:
+        context = get_context()
+        results: List[Optional[dict]] = [None] * len(items)
+        computed: Dict[int, Tuple[Optional[Profile], Optional[Session], List[Event], TrackerPayload]] = {}
+
+        profiles: Dict[str, Profile] = {}
+        profile_changes: Dict[str, FieldChangeLogger] = {}
+        sessions: Dict[str, Session] = {}
+        events: List[Event] = []
+
+        async def _compute_group(group: List[int]):
+            # Last profile and session computed in the group. Next payload gets their copy, so destinations
+            # and workflows of each payload see its own result.
+            last_profile: Optional[Profile] = None
+            last_session: Optional[Session] = None
+            for position in group:
+                item = items[position]
+                if not item.tracker_payload.events:
+                    logger.warning(f"No events have been sent in tracker payload.")
+                    continue
+
+                try:
+                    profile, session, _events, tracker_payload = await compute_tracker_payload(
+                        item.field_change_logger,
+                        item.source,
+                        item.tracker_payload,
+                        item.tracker_config,
+                        prefetch=False
+                    )
+                except Exception as e:
+                    logger.error(f"Batch tracking of payload {position} failed: {str(e)}")
+                    results[position] = get_error_response(item.tracker_payload, e)
+                    # Failed payload took and may have changed the handed over copies, next payload gets
+                    # new ones.
+                    if last_profile:
+                        put_prefetched(get_profile_cache_key(last_profile.id, context),
+                                       last_profile.model_copy(deep=True))
+                    if last_session:
+                        put_prefetched(get_session_cache_key(last_session.id, context),
+                                       last_session.model_copy(deep=True))
+                    continue
+
+                computed[position] = profile, session, _events, tracker_payload
+
+                # Next payload of the group gets a copy of the computed profile and session
+                if profile:
+                    last_profile = profile
+                    put_prefetched(get_profile_cache_key(profile.id, context), profile.model_copy(deep=True))
+                    if profile.has_not_saved_changes():
+                        profiles[profile.id] = profile
+                        profile_changes.setdefault(profile.id, FieldChangeLogger()).merge(item.field_change_logger)
+                if session:
+                    last_session = session
+                    put_prefetched(get_session_cache_key(session.id, context), session.model_copy(deep=True))
+                    if session.has_not_saved_changes():
+                        sessions[session.id] = session
+                events.extend(_events)
+
+        groups = group_tracker_payloads([item.tracker_payload for item in items])
+
+        with stage("tracker_prefetch"):
+            await prefetch_tracker_cache_many(
+                [(get_entity_id(item.tracker_payload.profile), get_entity_id(item.tracker_payload.session))
+                 for item in items],
+                context
+            )
+
+        try:
+            await asyncio.gather(*[_compute_group(group) for group in groups])
+        finally:
+            set_prefetched({})
+
+        if tracardi.write_behind:
+            # Cache is saved at once, database save is queued and done in bulk in background
+            with stage("save_profile"):
+                await mutation_profile_db.save_profile_behind(list(profiles.values()), context)
+            with stage("save_session"):
+                await save_session_behind(list(sessions.values()), context)
+            with stage("save_events"):
+                await save_events_behind(events)
+
+        else:
+            # Bulk save. One bulk request can target only one index.
+            storage = []
+            if tracardi.profile_delta_save:
+                storage.append(_in_stage("save_profile", mutation_profile_db.save_profile_changes(
+                    [(profile, profile_changes[profile.id]) for profile in profiles.values()], context)))
+            else:
+                for _profiles in split_by_index(list(profiles.values())).values():
+                    storage.append(_in_stage("save_profile", mutation_profile_db.save_profile(_profiles, context)))
+            for _sessions in split_by_index(list(sessions.values())).values():
+                storage.append(_in_stage("save_session", save_session(_sessions, context)))
+            for _events in split_by_index(events).values():
+                storage.append(_in_stage("save_events", save_events_in_db(_events)))
+            await asyncio.gather(*storage)
+
+        # Destinations and workflows
+
+        async def _finish_group(group: List[int]):
+            for position in group:
+                if position not in computed:
+                    continue
+
+                item = items[position]
+                profile, session, _events, tracker_payload = computed[position]
+                try:
+                    results[position] = await finish_tracker_payload(
+                        item.field_change_logger,
+                        item.source,
+                        tracker_payload,
+                        profile,
+                        session,
+                        _events
+                    )
+                except Exception as e:
+                    logger.error(f"Batch tracking of payload {position} failed: {str(e)}")
+                    results[position] = get_error_response(tracker_payload, e)
+
+        await asyncio.gather(*[_finish_group(group) for group in groups])
+
+        return results
+
+    finally:
+        logger.debug(f"Batch of {len(items)} processed in {time.time() - tracking_start}")
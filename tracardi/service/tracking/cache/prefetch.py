@@ -0,0 +1,36 @@
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, Tuple
+
+# Cache values read ahead in one round trip for the current request (or task). Keys are full cache keys,
+# value None means that the key was checked and there was no value in cache.
+_prefetched: ContextVar[Optional[Dict[str, Any]]] = ContextVar("prefetched_cache", default=None)
+
+
+def set_prefetched(values: Dict[str, Any]):
+    _prefetched.set(values)
+
+
+def pop_prefetched(key: str) -> Tuple[bool, Any]:
+    """
+    Returns (found, value). Prefetched value can be used only once, next reads go to cache.
+    """
+    values = _prefetched.get()
+    if not values or key not in values:
+        return False, None
+    return True, values.pop(key)
+
+
+def forget_prefetched(key: str):
+    values = _prefetched.get()
+    if values:
+        values.pop(key, None)
+
+
+def put_prefetched(key: str, value: Any):
+    """
+    Hands a value to the next loader of the key. Used by batch tracking to pass computed profile and session
+    to the next payload of the same profile without saving them first. Value may be a decoded entity.
+    """
+    values = _prefetched.get()
+    if values is not None:
+        values[key] = value
@@ -1,4 +1,4 @@
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Tuple
 
 from tracardi.config import tracardi
 from tracardi.context import Context
@@ -6,13 +6,12 @@ from tracardi.domain import ExtraInfo
 from tracardi.domain.session import Session
 from tracardi.domain.storage_record import RecordMetadata
 from tracardi.exceptions.log_handler import get_logger
-from tracardi.service.storage.redis.cache import RedisCache
+from tracardi.service.storage.redis.cache import AsyncRedisCache
 from tracardi.service.storage.redis.collections import Collection
-from tracardi.service.storage.redis.driver.redis_client import RedisClient
+from tracardi.service.tracking.cache.prefetch import pop_prefetched, forget_prefetched
 from tracardi.service.tracking.cache.prefix import get_cache_prefix
 
-redis_cache = RedisCache(ttl=tracardi.keep_session_in_cache_for)
-_redis = RedisClient()
+redis_cache = AsyncRedisCache(ttl=tracardi.keep_session_in_cache_for)
 logger = get_logger(__name__)
 
 
@@ -20,18 +19,19 @@ def get_session_key_namespace(session_id: str, context: Context) -> str:
     return f"{Collection.session}{context.context_abrv()}:{get_cache_prefix(session_id[0:2])}:"
 
 
-def load_session_cache(session_id: str, context: Context):
-    if tracardi.keep_session_in_cache_for == 0:
-        return None
+def get_session_cache_key(session_id: str, context: Context) -> str:
+    return f"{get_session_key_namespace(session_id, context)}{session_id}"
 
-    key_namespace = get_session_key_namespace(session_id, context)
 
-    if not redis_cache.has(session_id, key_namespace):
+def decode_session_cache(_data) -> Optional[Session]:
+    if _data is None:
         return None
 
-    context, session, changes, session_metadata = redis_cache.get(
-        session_id,
-        key_namespace)
+    if isinstance(_data, Session):
+        # Handed over by batch tracking
+        return _data
+
+    context, session, changes, session_metadata = _data
 
     session = Session(**session)
     if session_metadata:
@@ -40,36 +40,65 @@ def load_session_cache(session_id: str, context: Context):
     return session
 
 
-def _save_single_session(session, context):
+async def load_session_cache(session_id: str, context: Context):
+    found, _data = pop_prefetched(get_session_cache_key(session_id, context))
+    if found:
+        return decode_session_cache(_data)
+
+    if tracardi.keep_session_in_cache_for == 0:
+        return None
+
+    key_namespace = get_session_key_namespace(session_id, context)
+
+    # Missing key is returned as None, no need to check if it exists.
+    _data = await redis_cache.get(
+        session_id,
+        key_namespace)
+
+    return decode_session_cache(_data)
+
+
+def _get_session_cache_item(session: Session, context: Context) -> Optional[Tuple[str, tuple, str]]:
     index = session.get_meta_data()
 
     if index is None:
-        logger.warning("Empty session metadata. Index is not set. Cached session removed.",
-                       extra=ExtraInfo.exact(origin="cache", package=__name__))
-        redis_cache.delete(session.id, get_session_key_namespace(session.id, context))
-    else:
-        redis_cache.set(
-            session.id,
-            (
-                {
-                    "production": context.production,
-                    "tenant": context.tenant
-                },
-                session.model_dump(mode="json", exclude_defaults=True, exclude={"operation": ...}),
-                None,
-                index.model_dump(mode="json")
-            ),
-            get_session_key_namespace(session.id, context)
-        )
-
-
-def save_session_cache(session: Union[Optional[Session], List[Session]], context: Context):
+        return None
+
+    value = (
+        {
+            "production": context.production,
+            "tenant": context.tenant
+        },
+        session.model_dump(mode="json", exclude_defaults=not tracardi.cache_complete_entities,
+                           exclude={"operation": ...}),
+        None,
+        index.model_dump(mode="json")
+    )
+
+    return session.id, value, get_session_key_namespace(session.id, context)
+
+
+async def save_session_cache(session: Union[Optional[Session], List[Session]], context: Context):
     if session:
 
         if isinstance(session, Session):
-            _save_single_session(session, context)
+            sessions = [session]
         elif isinstance(session, list):
-            for _session in session:
-                _save_single_session(_session, context)
+            sessions = session
         else:
             raise ValueError(f"Incorrect session value. Expected Session or list of Sessions. Got {type(session)}")
+
+        items = []
+        for _session in sessions:
+            item = _get_session_cache_item(_session, context)
+            if item is None:
+                logger.warning("Empty session metadata. Index is not set. Cached session removed.",
+                               extra=ExtraInfo.exact(origin="cache", package=__name__))
+                forget_prefetched(get_session_cache_key(_session.id, context))
+                await redis_cache.delete(_session.id, get_session_key_namespace(_session.id, context))
+            else:
+                forget_prefetched(get_session_cache_key(_session.id, context))
+                items.append(item)
+
+        # All sessions are saved in one round trip
+        await redis_cache.set_many(items)
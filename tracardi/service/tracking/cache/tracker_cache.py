@@ -0,0 +1,42 @@
+from typing import Optional, List, Tuple
+
+from tracardi.config import tracardi
+from tracardi.context import Context
+from tracardi.service.storage.redis.cache import AsyncRedisCache
+from tracardi.service.tracking.cache.prefetch import set_prefetched
+from tracardi.service.tracking.cache.profile_cache import get_profile_key_namespace
+from tracardi.service.tracking.cache.session_cache import get_session_key_namespace
+
+redis_cache = AsyncRedisCache(ttl=None)
+
+
+async def prefetch_tracker_cache(profile_id: Optional[str], session_id: Optional[str], context: Context):
+    """
+    Reads cached profile and session of the tracker request in one round trip. The following
+    load_profile_cache and load_session_cache calls use the prefetched values instead of calling redis.
+    """
+
+    await prefetch_tracker_cache_many([(profile_id, session_id)], context)
+
+
+async def prefetch_tracker_cache_many(ids: List[Tuple[Optional[str], Optional[str]]], context: Context):
+    """
+    Reads cached profiles and sessions for a list of (profile_id, session_id) pairs in one round trip.
+    """
+
+    keys = []
+    for profile_id, session_id in ids:
+        if profile_id and tracardi.keep_profile_in_cache_for > 0:
+            keys.append((profile_id, get_profile_key_namespace(profile_id, context)))
+        if session_id and tracardi.keep_session_in_cache_for > 0:
+            keys.append((session_id, get_session_key_namespace(session_id, context)))
+
+    if not keys:
+        set_prefetched({})
+        return
+
+    # Duplicated keys are read once
+    keys = list(dict.fromkeys(keys))
+
+    values = await redis_cache.mget(keys)
+    set_prefetched({f"{collection}{key}": value for (key, collection), value in zip(keys, values)})
@@ -1,5 +1,5 @@
 import asyncio
-from dotty_dict import dotty, Dotty
+from dotty_dict import Dotty
 
 from typing import List, Tuple, Optional, Set
 
@@ -7,7 +7,7 @@ from tracardi.domain import ExtraInfo
 from tracardi.exceptions.exception_service import get_traceback
 from tracardi.exceptions.log_handler import get_logger
 from tracardi.service.cache.event_mapping import load_event_mapping
-from tracardi.service.cache.event_to_profile_mapping import load_event_to_profile
+from tracardi.service.cache.event_to_profile_mapping import load_event_to_profile_plans
 from tracardi.service.change_monitoring.field_change_logger import FieldChangeLogger
 from tracardi.service.license import License
 from tracardi.service.tracking.profile_data_computation import map_event_to_profile
@@ -15,6 +15,7 @@ from tracardi.config import tracardi
 from tracardi.domain.event_source import EventSource
 from tracardi.domain.payload.event_payload import EventPayload
 from tracardi.domain.payload.tracker_payload import TrackerPayload
+from tracardi.domain.flat_model import FlatModel
 from tracardi.domain.profile import Profile, FlatProfile
 from tracardi.domain.session import Session
 from tracardi.domain.event import Event
@@ -40,6 +41,18 @@ def _remove_empty_dicts(dictionary):
         del dictionary[key]
 
 
+def _to_event(flat_event: Dotty, event: Event) -> Event:
+    # Event type is normalized in Event constructor, so event with changed type is created again.
+    if isinstance(flat_event, FlatModel) and flat_event.is_tracked() and 'type' not in flat_event.changed_fields:
+        changed_data = flat_event.changed_data()
+        _remove_empty_dicts(changed_data)
+        return flat_event.update_model(event, changed_data)
+
+    event_dict = flat_event.to_dict()
+    _remove_empty_dicts(event_dict)
+    return Event(**event_dict)
+
+
 def _auto_index_default_event_type(flat_event: Dotty, flat_profile: Optional[FlatProfile]) -> Dotty:
     event_mapping_schema = get_default_mappings_for(flat_event['type'], 'copy')
 
@@ -87,10 +100,10 @@ async def event_to_traits_and_profile_mapping(flat_event: Dotty,
 
     custom_event_mapping_coroutine = load_event_mapping(event_type_id=flat_event['type'])
 
-    custom_event_to_profile_mapping_coroutine = load_event_to_profile(event_type_id=flat_event['type'])
+    custom_event_to_profile_mapping_coroutine = load_event_to_profile_plans(event_type_id=flat_event['type'])
 
     # Run in parallel
-    custom_event_mapping, custom_event_to_profile_mapping_schemas = await asyncio.gather(
+    custom_event_mapping, custom_event_to_profile_mapping_plans = await asyncio.gather(
         custom_event_mapping_coroutine,
         custom_event_to_profile_mapping_coroutine
     )
@@ -109,7 +122,7 @@ async def event_to_traits_and_profile_mapping(flat_event: Dotty,
     # Map event data to profile
     if flat_profile:
         flat_profile, field_change_logger = await map_event_to_profile(
-            custom_event_to_profile_mapping_schemas,
+            custom_event_to_profile_mapping_plans,
             flat_event,
             flat_profile,
             session,
@@ -212,7 +225,7 @@ async def compute_events(events: List[EventPayload],
             profile_less
         )
 
-        flat_event = dotty(event.model_dump(exclude_unset=True))
+        flat_event = FlatModel(event.model_dump(exclude_unset=True))
 
         if flat_event.get('metadata.valid', True) is True:
             # Run mappings for valid event. Maps properties to traits, and adds traits
@@ -229,9 +242,7 @@ async def compute_events(events: List[EventPayload],
                 auto_merge_ids = auto_merge_ids.union(_auto_merge_ids)
 
         # Convert to event
-        event_dict = flat_event.to_dict()
-        _remove_empty_dicts(event_dict)
-        event = Event(**event_dict)
+        event = _to_event(flat_event, event)
 
         # Data that is not needed for any mapping or compliance
 
@@ -268,10 +279,15 @@ async def compute_events(events: List[EventPayload],
     if profile:
         try:
 
+            mapped_flat_profile = flat_profile
             if License.has_license():
                 flat_profile = check_profile_consistency(flat_profile)
 
-            profile = Profile(**flat_profile.to_dict())
+            # Only fields changed in flat profile of this profile are validated again
+            if flat_profile is mapped_flat_profile:
+                profile = flat_profile.to_profile(profile)
+            else:
+                profile = Profile(**flat_profile.to_dict())
             profile.set_meta_data(profile_metadata)
             if auto_merge_ids:
                 profile.metadata.system.set_auto_merge_fields(auto_merge_ids)
@@ -0,0 +1,175 @@
+from typing import Callable, List, Optional, Tuple
+
+from dotty_dict import Dotty
+
+from tracardi.domain import ExtraInfo
+from tracardi.domain.event_to_profile import EventToProfile
+from tracardi.domain.operations import APPEND, EQUALS_IF_NOT_EXISTS
+from tracardi.domain.profile import FlatProfile
+from tracardi.exceptions.exception_service import get_traceback
+from tracardi.exceptions.log_handler import get_logger
+from tracardi.process_engine.tql.condition import Condition
+from tracardi.process_engine.tql.transformer.expr_transformer import ExprTransformer
+from tracardi.service.notation.dot_accessor import DotAccessor
+
+logger = get_logger(__name__)
+
+allowed_profile_fields = (
+    "data",
+    "traits",
+    "ids",
+    "stats",
+    "segments",
+    "interests",
+    "consents",
+    "aux",
+    "misc",
+    "trash")
+
+
+def _equals(flat_profile: FlatProfile, profile_ref: str, value):
+    flat_profile[profile_ref] = value
+
+
+def _equals_if_not_exists(flat_profile: FlatProfile, profile_ref: str, value):
+    if profile_ref not in flat_profile:
+        flat_profile[profile_ref] = value
+    elif flat_profile[profile_ref] is None:
+        flat_profile[profile_ref] = value
+    elif isinstance(flat_profile[profile_ref], str):
+        if not flat_profile[profile_ref].strip():
+            flat_profile[profile_ref] = value
+    elif isinstance(flat_profile[profile_ref], (list, dict)):
+        if not flat_profile[profile_ref]:
+            flat_profile[profile_ref] = value
+
+
+def _append(flat_profile: FlatProfile, profile_ref: str, value):
+    if profile_ref not in flat_profile:
+        flat_profile[profile_ref] = [value]
+    elif isinstance(flat_profile[profile_ref], list):
+        flat_profile[profile_ref].append(value)
+    elif not isinstance(flat_profile[profile_ref], dict):
+        flat_profile[profile_ref] = [flat_profile[profile_ref], value]
+    else:
+        raise KeyError(f"Can not append data {value} to {flat_profile[profile_ref]} at profile@{profile_ref}")
+
+
+_operations = {
+    APPEND: _append,
+    EQUALS_IF_NOT_EXISTS: _equals_if_not_exists
+}
+
+
+class EventToProfilePlan:
+    """
+    Event to profile mapping schema compiled once when loaded. Profile references are validated, the
+    condition is parsed, and operations are resolved to functions, so mapping of an event only reads
+    and writes the flat event and flat profile.
+    """
+
+    __slots__ = ('name', 'condition', 'condition_tree', 'condition_error', 'fields')
+
+    def __init__(self, name: str, condition: Optional[str], condition_tree, condition_error: Optional[Exception],
+                 fields: List[Tuple[str, str, Callable]]):
+        self.name = name
+        self.condition = condition
+        self.condition_tree = condition_tree
+        self.condition_error = condition_error
+        self.fields = fields
+
+    def is_met(self, dot: DotAccessor) -> bool:
+        if self.condition_error is not None:
+            raise self.condition_error
+        if self.condition_tree is None:
+            return True
+        return ExprTransformer(dot=dot).transform(self.condition_tree) is not False
+
+    def copy(self, flat_event: Dotty, flat_profile: FlatProfile) -> bool:
+        """
+        Copies event data to profile. Returns True if profile was changed.
+        """
+        updated = False
+        for event_ref, profile_ref, operation in self.fields:
+            try:
+                value = flat_event[event_ref]
+                if not value:
+                    logger.warning(
+                        f"Value of event@{event_ref} is None or empty. "
+                        f"No data has been assigned to profile@{profile_ref}",
+                        extra=ExtraInfo.exact(
+                            flow_id=None,
+                            node_id=None,
+                            event_id=flat_event.get('id', None),
+                            profile_id=flat_profile.get('id', None),
+                            origin='profile-computation',
+                            package=__name__,
+                        )
+                    )
+                    continue
+
+                operation(flat_profile, profile_ref, value)
+                updated = True
+
+            except KeyError as e:
+                if event_ref.startswith(("properties", "traits")):
+                    message = f"Can not copy data from event `{event_ref}` to profile `{profile_ref}`. " \
+                              f"Data was not copied. Error message: {repr(e)} key."
+                else:
+                    message = f"Can not copy data from event `{event_ref}` to profile `{profile_ref}`. " \
+                              f"Maybe `properties.{event_ref}` or `traits.{event_ref}` could work. " \
+                              f"Data was not copied. Error message: {repr(e)} key."
+
+                logger.warning(
+                    message,
+                    extra=ExtraInfo.exact(
+                        flow_id=None,
+                        node_id=None,
+                        event_id=flat_event.get('id', None),
+                        profile_id=flat_profile.get('id', None),
+                        origin='event',
+                        class_name='map_event_to_profile',
+                        package=__name__,
+                        traceback=get_traceback(e)
+                    )
+                )
+
+        return updated
+
+
+def compile_event_to_profile(schema: EventToProfile) -> EventToProfilePlan:
+    condition = schema.config.get('condition', None) if schema.config else None
+    condition_tree = None
+    condition_error = None
+    if condition is not None:
+        try:
+            condition_tree = Condition().parse(condition)
+        except Exception as e:
+            # Reported every time the schema is used, as before compilation.
+            condition_error = e
+
+    fields = []
+    for event_ref, profile_ref, operation in schema.items():
+        if not profile_ref.startswith(allowed_profile_fields):
+            logger.warning(
+                f"You are trying to copy the data to unknown field in profile. "
+                f"Your profile reference `{profile_ref}` in event to profile mapping `{schema.name}` does not "
+                f"start with typical fields that are {allowed_profile_fields}. Please check if there isn't "
+                f"an error in your copy schema. Data will not be copied if it does not match Profile schema.",
+                extra=ExtraInfo.exact(
+                    origin='profile-computation',
+                    flow_id=None,
+                    node_id=None,
+                    package=__name__
+                )
+            )
+            continue
+        fields.append((event_ref, profile_ref, _operations.get(operation, _equals)))
+
+    return EventToProfilePlan(
+        name=schema.name,
+        condition=condition,
+        condition_tree=condition_tree,
+        condition_error=condition_error,
+        fields=fields
+    )
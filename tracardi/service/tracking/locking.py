@@ -2,11 +2,13 @@ import time
 import msgpack
 import asyncio
 
-from typing import Union, Tuple, Optional
+from collections import defaultdict
+from typing import Union, Tuple, Optional, Dict, Set
 
 from tracardi.domain.profile import Profile
 from tracardi.exceptions.log_handler import get_logger
 from tracardi.service.storage.redis.collections import Collection
+from tracardi.service.storage.redis.driver.async_redis_client import AsyncRedisClient
 from tracardi.service.storage.redis.driver.redis_client import RedisClient
 from tracardi.service.storage.elastic.interface.collector.load.profile import load_profile
 
@@ -130,6 +132,310 @@ class Lock:
         return self.state == EXPIRED
 
 
+# Atomic acquire. Fencing token is taken from one counter for all locks, so it grows monotonically for every lock.
+_ACQUIRE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return {0, redis.call('PTTL', KEYS[1]), redis.call('GET', KEYS[1])}
+end
+local token = redis.call('INCR', KEYS[2])
+redis.call('SET', KEYS[1], token .. ':' .. ARGV[2] .. ':' .. ARGV[3], 'NX', 'PX', ARGV[1])
+return {token, 0, false}
+"""
+
+# Compare-and-delete. Only the holder of the token can release the lock. Waiters are notified.
+_RELEASE_SCRIPT = """
+local value = redis.call('GET', KEYS[1])
+if value and string.sub(value, 1, string.len(ARGV[1]) + 1) == ARGV[1] .. ':' then
+    redis.call('DEL', KEYS[1])
+    redis.call('PUBLISH', ARGV[2], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+
+def _decode_lock_value(value) -> Optional[Tuple[int, float, str]]:
+    if not value:
+        return None
+    if isinstance(value, bytes):
+        value = value.decode()
+    token, lock_time, mutex_name = value.split(':', 2)
+    return int(token), float(lock_time), mutex_name
+
+
+class _LockReleaseListener:
+    """
+    Wakes up coroutines waiting for locks. One pub/sub connection per process receives release
+    notifications for all locks and resolves the futures of local waiters.
+    """
+
+    def __init__(self):
+        self._waiters: Dict[str, Set[asyncio.Future]] = defaultdict(set)
+        self._task: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _listen(self):
+        pubsub = AsyncRedisClient().pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.psubscribe(f"{Collection.lock_release}*")
+            self._ready.set()
+            async for message in pubsub.listen():
+                channel = message['channel']
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                for future in self._waiters.pop(channel, ()):
+                    if not future.done():
+                        future.set_result(True)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Waiters fall back to lock expiration time. Listener is restarted by the next waiter.
+            logger.warning(f"Lock release listener stopped. Details: {repr(e)}")
+        finally:
+            self._ready.set()
+            await pubsub.aclose()
+
+    async def _start(self):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._waiters = defaultdict(set)
+            self._ready = asyncio.Event()
+            self._task = loop.create_task(self._listen())
+        await self._ready.wait()
+
+    async def subscribe(self, channel: str) -> asyncio.Future:
+        await self._start()
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[channel].add(future)
+        return future
+
+    def unsubscribe(self, channel: str, future: asyncio.Future):
+        waiters = self._waiters.get(channel, None)
+        if waiters is not None:
+            waiters.discard(future)
+            if not waiters:
+                del self._waiters[channel]
+
+
+_lock_release_listener = _LockReleaseListener()
+
+
+class _LocalLockQueue:
+    """
+    Queues coroutines of this process that wait for the same lock, so only one of them at a time
+    contends for the lock in redis. Waiters are served in FIFO order.
+    """
+
+    def __init__(self):
+        self._locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def is_locked(self, key: str) -> bool:
+        return key in self._locks and self._locks[key][0].locked()
+
+    async def acquire(self, key: str, timeout: float) -> bool:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._locks = {}
+
+        lock, users = self._locks.get(key, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._locks[key] = (lock, users + 1)
+
+        try:
+            await asyncio.wait_for(lock.acquire(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            self._forget(key)
+            return False
+        except BaseException:
+            self._forget(key)
+            raise
+
+    def release(self, key: str):
+        lock, _ = self._locks[key]
+        lock.release()
+        self._forget(key)
+
+    def _forget(self, key: str):
+        lock, users = self._locks[key]
+        if users <= 1:
+            del self._locks[key]
+        else:
+            self._locks[key] = (lock, users - 1)
+
+
+_local_lock_queue = _LocalLockQueue()
+
+
+class AsyncLock:
+    """
+    Distributed lock acquired atomically with a fencing token. The token is unique and grows with every
+    acquisition, so the storage can reject writes of a holder whose lock has already expired. The lock is
+    released only by its holder (compare-and-delete). Waiters are woken up by a release notification
+    or when the lock expires.
+    """
+
+    def __init__(self, redis: AsyncRedisClient, key: Optional[str], default_lock_ttl: float):
+        self._redis = redis
+        self._key = key
+        self._lock_ttl = default_lock_ttl
+        self._token: Optional[int] = None
+        self._state = RELEASED
+        self._local = False
+
+    @property
+    def ttl(self):
+        return self._lock_ttl
+
+    @property
+    def key(self):
+        return self._key
+
+    @property
+    def token(self) -> Optional[int]:
+        return self._token
+
+    @property
+    def state(self):
+        return self._state
+
+    @property
+    def channel(self) -> str:
+        return f"{Collection.lock_release}{self._redis.get_tenant_prefix(self._key)}"
+
+    async def acquire(self, mutex_name: str) -> Tuple[bool, int, Optional[Tuple[int, float, str]]]:
+        """
+        Tries to take the lock once. Returns (acquired, time to lock expiration in ms, current lock holder).
+        """
+        token, pttl, value = await self._redis.eval_script(
+            _ACQUIRE_SCRIPT,
+            keys=[self._key, Collection.lock_fence],
+            args=[int(self._lock_ttl * 1000), time.time(), mutex_name])
+
+        if token:
+            logger.debug(f"Locking {self.key} with token {token}")
+            self._token = int(token)
+            self._state = LOCKED
+            return True, 0, None
+
+        return False, int(pttl), _decode_lock_value(value)
+
+    async def release(self) -> bool:
+        if self._token is None:
+            return False
+        logger.debug(f"UnLocking {self.key}")
+        try:
+            released = await self._redis.eval_script(
+                _RELEASE_SCRIPT,
+                keys=[self._key],
+                args=[self._token, self.channel])
+        finally:
+            self._token = None
+            self._state = RELEASED
+            if self._local:
+                self._local = False
+                _local_lock_queue.release(self.channel)
+        return bool(released)
+
+    async def get_lock_metadata(self) -> Optional[Tuple[int, float, str]]:
+        return _decode_lock_value(await self._redis.get(self._key))
+
+    async def is_locked(self) -> bool:
+        if self._key is None:
+            return False
+        return await self._redis.exists(self._key) != 0
+
+    async def is_held(self) -> bool:
+        """
+        Checks if the lock is still held with this instance token (e.g. it did not expire).
+        """
+        metadata = await self.get_lock_metadata()
+        return self._token is not None and metadata is not None and metadata[0] == self._token
+
+    def break_in(self):
+        self._state = BROKE
+
+    def is_broke(self) -> bool:
+        return self._state == BROKE
+
+    async def wait_and_acquire(self, mutex_name: str, break_after_time: float,
+                               raise_error_when_locked: bool = False) -> 'AsyncLock':
+        """
+        Takes the lock. If the lock is held by other process waits for its release or expiration. If the lock
+        was taken more than `break_after_time` seconds ago, waiting stops and the lock is marked as broke
+        (it is not held by this instance). Coroutines of this process wait in a local queue, so only one of them
+        contends for the lock in redis.
+        """
+
+        if raise_error_when_locked and _local_lock_queue.is_locked(self.channel):
+            raise BlockingIOError(
+                f"Resource {self.key} is locked. Currently locked in this process, "
+                f"Knocking consumer (Waiting process): {mutex_name}")
+
+        if not await _local_lock_queue.acquire(self.channel, timeout=break_after_time):
+            logger.info(f"Lock {self.key} breaks. Knocking consumer (Waiting process): {mutex_name}")
+            self.break_in()
+            return self
+
+        try:
+            await self._wait_and_acquire(mutex_name, break_after_time, raise_error_when_locked)
+        except BaseException:
+            _local_lock_queue.release(self.channel)
+            raise
+
+        if self._state == LOCKED:
+            # Local queue is released together with the lock
+            self._local = True
+        else:
+            _local_lock_queue.release(self.channel)
+
+        return self
+
+    async def _wait_and_acquire(self, mutex_name: str, break_after_time: float, raise_error_when_locked: bool):
+        released = None
+        try:
+            while True:
+                acquired, pttl, holder = await self.acquire(mutex_name)
+                if acquired:
+                    return
+
+                _, lock_time, locked_inside = holder if holder else (None, time.time(), None)
+
+                if raise_error_when_locked:
+                    raise BlockingIOError(
+                        f"Resource {self.key} is locked. Currently locked by (Running process): {locked_inside}, "
+                        f"Knocking consumer (Waiting process): {mutex_name}")
+
+                _time_to_break = lock_time + break_after_time - time.time()
+                if _time_to_break < 0:
+                    logger.info(
+                        f"Lock {self.key} breaks. Currently locked by (Running process): {locked_inside}, "
+                        f"Knocking consumer (Waiting process): {mutex_name}")
+                    self.break_in()
+                    return
+
+                logger.debug(
+                    f"Suppressing execution of {self.key}. Process {locked_inside} is using resource. "
+                    f"Expires in {pttl / 1000}s. Waiting no longer then {_time_to_break}s then skipping execution.")
+
+                if released is not None:
+                    # Wait for release notification. Lock expiration does not notify, so wait no longer than
+                    # the lock ttl.
+                    await asyncio.wait({released}, timeout=max(0.0, min(pttl / 1000, _time_to_break)))
+                    _lock_release_listener.unsubscribe(self.channel, released)
+
+                # Subscribe before the next try, so the release between the try and the wait is not missed.
+                released = await _lock_release_listener.subscribe(self.channel)
+        finally:
+            if released is not None:
+                _lock_release_listener.unsubscribe(self.channel, released)
+
+
 class _GlobalMutexLock:
 
     def __init__(self, lock: Lock, name: str, break_after_time: Union[int, float] = None):
@@ -154,22 +460,20 @@ class _GlobalMutexLock:
             return True, _time_to_act
         return False, _time_to_act
 
-    def _get_lock_time(self) -> float:
+    def _read_lock(self) -> Optional[Tuple[float, Optional[str]]]:
+        """
+        Returns lock time and name of the mutex holding the lock, read with one GET, or None if not locked.
+        """
         try:
             metadata = self._lock.get_lock_metadata()
             if metadata:
-                lock_time, _, _ = metadata
-                return float(lock_time)
+                lock_time, locked_inside, _ = metadata
+                return float(lock_time), locked_inside
         except Exception as e:
             logger.error(str(e))
+            # Unreadable lock is released, as in Lock.get_locked_inside
+            self._lock.unlock()
 
-        return 0.0
-
-    def _get_locked_inside(self) -> Optional[str]:
-        metadata = self._lock.get_locked_inside()
-        if metadata:
-            _, locker = metadata
-            return locker
         return None
 
     def _exit(self, exc_type):
@@ -185,25 +489,28 @@ class GlobalMutexLock(_GlobalMutexLock):
 
     def _keep_locked_for(self) -> 'Lock':
 
-        lock_time = 0.0
-        if self._lock.is_locked():
-            lock_time = self._get_lock_time()
+        lock_time = None
 
         while True:
             _now = time.time()
-            if self._lock.is_locked():  # Key exists, when expires it will be unlocked
+            _lock = self._read_lock()
+            if _lock is not None:  # Key exists, when expires it will be unlocked
+
+                if lock_time is None:
+                    lock_time, _ = _lock
+                _, locked_inside = _lock
 
                 # Check if there is a time to break the lock
                 _broke, _time_to_break = self._check_if_it_is_time(lock_time, grace_period=self._break_after_time)
                 if _broke:  # Time is up
                     # We are fed up waiting
                     logger.info(
-                        f"Lock {self._lock.key} breaks. Currently locked by (Running process): {self._lock.get_locked_inside()}, Knocking consumer (Waiting process): {self._name}")
+                        f"Lock {self._lock.key} breaks. Currently locked by (Running process): {locked_inside}, Knocking consumer (Waiting process): {self._name}")
                     self._lock.break_in()  # Still locked but break in marked BROKE
                     return self._lock
 
                 logger.debug(
-                    f"Suppressing execution of {self._lock.key}. Process {self._lock.get_locked_inside()} is using resource."
+                    f"Suppressing execution of {self._lock.key}. Process {locked_inside} is using resource."
                     f"Expires in {self._lock.ttl}s. Waiting no longer then {_time_to_break}s then skipping execution."
                 )
 
@@ -226,97 +533,39 @@ class GlobalMutexLock(_GlobalMutexLock):
 
 class AsyncGlobalMutexLock(_GlobalMutexLock):
 
-    async def _keep_locked_for(self) -> 'Lock':
-
-        while True:
-            _now = time.time()
-            if self._lock.is_locked():  # Key exists, when expires it will be unlocked
-
-                lock_time = self._get_lock_time()
-
-                # Check if there is a time to break the lock
-                _broke, _time_to_break = self._check_if_it_is_time(lock_time, grace_period=self._break_after_time)
-                if _broke:  # Time is up
-                    # We are fed up waiting
-                    logger.info(
-                        f"Lock {self._lock.key} breaks. Currently locked by (Running process): {self._lock.get_locked_inside()}, Knocking consumer (Waiting process): {self._name}")
-                    self._lock.break_in()  # Still locked but break in marked BROKE
-                    return self._lock
-
-                logger.info(
-                    f"Suppressing execution of {self._lock.key}. Process {self._lock.get_locked_inside()} is using resource."
-                    f"Expires in {self._lock.ttl}s. Waiting no longer then {_time_to_break}s then skipping execution."
-                )
-
-                await asyncio.sleep(self._wait)
-
-                continue
-            break
+    def __init__(self, lock: AsyncLock, name: str, break_after_time: Union[int, float] = None,
+                 raise_error_when_locked: bool = False):
+        super().__init__(lock, name, break_after_time)
+        self._raise_error_when_locked = raise_error_when_locked
 
-        self._lock.lock(self._name)
+    async def _keep_locked_for(self) -> AsyncLock:
+        return await self._lock.wait_and_acquire(self._name, self._break_after_time, self._raise_error_when_locked)
 
-    async def __aenter__(self):
+    async def __aenter__(self) -> AsyncLock:
         if self._lock.key is None:
             return self._lock
-        await self._keep_locked_for()
-        return self._lock
+        return await self._keep_locked_for()
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        self._exit(exc_type)
+        if exc_type is not None:
+            logger.info(f"Unlocking due to error.")
+        await self._lock.release()
 
 
-class AsyncProfileMutex(_GlobalMutexLock):
+class AsyncProfileMutex(AsyncGlobalMutexLock):
 
     def __init__(self, profile_id: str, name: str, break_after_time: Union[int, float] = None,
                  raise_error_when_locked: bool = False):
         self.profile_id = profile_id
         profile_key = Lock.get_key(Collection.lock_tracker, "profile", profile_id)
-        profile_lock = Lock(_redis, profile_key, default_lock_ttl=3)
-        if profile_lock.is_locked() and raise_error_when_locked:
-            raise BlockingIOError(
-                f"Profile {profile_lock.key} is locked. Currently locked by (Running process): "
-                f"{profile_lock.get_locked_inside()}, Knocking consumer (Waiting process): {name}")
-
-        super().__init__(profile_lock, name, break_after_time)
-
-    async def _keep_locked_for(self) -> 'Lock':
-
-        while True:
-            _now = time.time()
-            if self._lock.is_locked():  # Key exists, when expires it will be unlocked
-
-                lock_time = self._get_lock_time()
-
-                # Check if there is a time to break the lock
-                _broke, _time_to_break = self._check_if_it_is_time(lock_time, grace_period=self._break_after_time)
-                if _broke:  # Time is up
-                    # We are fed up waiting
-                    logger.info(
-                        f"Lock {self._lock.key} breaks. Currently locked by (Running process): {self._lock.get_locked_inside()}, Knocking consumer (Waiting process): {self._name}")
-                    self._lock.break_in()  # Still locked but break in marked BROKE
-                    return self._lock
-
-                logger.info(
-                    f"Suppressing execution of {self._lock.key}. Process {self._lock.get_locked_inside()} is using resource."
-                    f"Expires in {self._lock.ttl}s. Waiting no longer then {_time_to_break}s then skipping execution."
-                )
-
-                await asyncio.sleep(self._wait)
-
-                continue
-            break
-
-        self._lock.lock(self._name)
+        profile_lock = AsyncLock(AsyncRedisClient(), profile_key, default_lock_ttl=3)
+        super().__init__(profile_lock, name, break_after_time, raise_error_when_locked)
 
     async def __aenter__(self) -> Optional[Profile]:
-        if self._lock.key is None:
-            return await load_profile(self.profile_id)
-        await self._keep_locked_for()
+        if self._lock.key is not None:
+            await self._keep_locked_for()
         return await load_profile(self.profile_id)
 
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        self._exit(exc_type)
-
 
 def mutex(lock: Lock, name: str, break_after_time: Union[int, float] = None, raise_error_when_locked: bool = False):
     if lock.is_locked() and raise_error_when_locked:
@@ -325,12 +574,8 @@ def mutex(lock: Lock, name: str, break_after_time: Union[int, float] = None, rai
     return GlobalMutexLock(lock, name, break_after_time)
 
 
-def async_mutex(lock: Lock,
+def async_mutex(lock: AsyncLock,
                 name: str,
                 break_after_time: Union[int, float] = None,
                 raise_error_when_locked: bool = False):
-    if lock.is_locked() and raise_error_when_locked:
-        raise BlockingIOError(
-            f"Resource {lock.key} is locked. Currently locked by (Running process): {lock.get_locked_inside()}, Knocking consumer (Waiting process): {name}")
-    return AsyncGlobalMutexLock(lock, name, break_after_time)
-
+    return AsyncGlobalMutexLock(lock, name, break_after_time, raise_error_when_locked)
@@ -1,30 +1,50 @@
 from typing import Tuple, Optional
 
+from tracardi.context import get_context
 from tracardi.domain.profile import Profile
 from tracardi.domain.session import Session
+from tracardi.service.tracking.cache.prefetch import set_prefetched
+from tracardi.service.tracking.cache.tracker_cache import prefetch_tracker_cache
 from tracardi.service.tracking.profile_loading import load_profile_and_session
 from tracardi.service.tracking.session_loading import load_or_create_session
 
 from tracardi.domain.payload.tracker_payload import TrackerPayload
 
 from tracardi.service.tracker_config import TrackerConfig
+from tracardi.service.utils.getters import get_entity_id
 
 
 async def tracker_loading(tracker_payload: TrackerPayload,
-                          tracker_config: TrackerConfig) -> Tuple[Profile, Optional[Session]]:
+                          tracker_config: TrackerConfig,
+                          prefetch: bool = True) -> Tuple[Profile, Optional[Session]]:
 
-    # We need profile and session before async
+    # Read cached profile and session in one round trip. Loaders below use the prefetched values.
+    # Batch tracking prefetches values for the whole batch and manages them itself (prefetch=False).
 
-    session, tracker_payload = await load_or_create_session(tracker_payload)
+    if prefetch:
+        await prefetch_tracker_cache(get_entity_id(tracker_payload.profile),
+                                     get_entity_id(tracker_payload.session),
+                                     get_context())
 
-    # -----------------------------------
-    # Profile Loading
+    try:
 
-    profile, session = await load_profile_and_session(
-        session,
-        tracker_config,
-        tracker_payload
-    )
+        # We need profile and session before async
+
+        session, tracker_payload = await load_or_create_session(tracker_payload)
+
+        # -----------------------------------
+        # Profile Loading
+
+        profile, session = await load_profile_and_session(
+            session,
+            tracker_config,
+            tracker_payload
+        )
+
+    finally:
+        # Prefetched values are valid only for loading
+        if prefetch:
+            set_prefetched({})
 
     # TODO update finger print profile id
 
@@ -3,27 +3,21 @@ from typing import Tuple, List
 from dotty_dict import Dotty
 
 from tracardi.domain import ExtraInfo
-from tracardi.domain.event import Event
 from tracardi.domain.event_compute import EventCompute
-from tracardi.domain.event_to_profile import EventToProfile
 from tracardi.domain.profile import Profile, FlatProfile
 from tracardi.domain.session import Session
 from tracardi.exceptions.exception_service import get_traceback
 from tracardi.exceptions.log_handler import get_logger
-from tracardi.process_engine.tql.condition import Condition
 from tracardi.service.change_monitoring.field_change_logger import FieldChangeLogger
 from tracardi.service.events import get_default_mappings_for
 from tracardi.service.notation.dot_accessor import DotAccessor
+from tracardi.service.tracking.event_to_profile_plan import EventToProfilePlan
 from tracardi.service.tracking.utils.function_call import default_event_call_function
 from tracardi.service.tracking.utils.languages import get_continent
 from tracardi.service.utils.domains import free_email_domains
 from tracardi.service.events import copy_default_event_to_profile
 from tracardi.service.utils.languages import language_countries_dict
 
-EQUALS = 0
-EQUALS_IF_NOT_EXISTS = 1
-APPEND = 2
-
 logger = get_logger(__name__)
 
 
@@ -75,13 +69,8 @@ def update_profile_time(session: Session, profile: Profile, field_change_logger:
     return profile, field_change_logger
 
 
-async def _check_mapping_condition_if_met(if_statement, dot: DotAccessor):
-    condition = Condition()
-    return await condition.evaluate(if_statement, dot)
-
-
 async def map_event_to_profile(
-        custom_mapping_schemas: List[EventToProfile],
+        custom_mapping_plans: List[EventToProfilePlan],
         flat_event: Dotty,
         flat_profile: FlatProfile,
         session: Session,
@@ -102,143 +91,43 @@ async def map_event_to_profile(
             flat_event
         )
 
-    # Custom event types mappings, filtered by event type
-
-    if len(custom_mapping_schemas) > 0:
-
-        for custom_mapping_schema in custom_mapping_schemas:
-
-            # Check condition
-            if 'condition' in custom_mapping_schema.config:
-                if_statement = custom_mapping_schema.config['condition']
-                try:
-                    # Todo converting to Profile and event may be not performant, maybe extend dot accessor to take dotty
-                    dot = DotAccessor(event=Event(**flat_event.to_dict()), profile=Profile(**flat_profile.to_dict()), session=session)
-                    result = await _check_mapping_condition_if_met(if_statement, dot)
-                    if result is False:
-                        continue
-                except Exception as e:
-                    logger.error(
-                        f"Routing error. "
-                        f"An error occurred when coping data from event to profile. "
-                        f"There is error in the conditional trigger settings for event "
-                        f"`{flat_event['type']}`."
-                        f"Could not parse or access data for if statement: `{if_statement}`. "
-                        f"Data was not copied but the event was routed to the next step. ",
-                        extra=ExtraInfo.exact(
-                            flow_id=None,
-                            node_id=None,
-                            event_id=flat_event.get('id', None),
-                            profile_id=flat_profile.get('id', None),
-                            origin='profile-computation',
-                            package=__name__,
-                            traceback=get_traceback(e)
-                        )
-                    )
+    # Custom event types mappings, filtered by event type. Schemas are compiled when loaded.
+
+    dot = None
+    for plan in custom_mapping_plans:
+
+        # Check condition
+        if plan.condition is not None:
+            try:
+                # Conditions read flat event and profile directly, they reflect data copied by previous schemas.
+                if dot is None:
+                    dot = DotAccessor(event=flat_event, profile=flat_profile, session=session)
+                if not plan.is_met(dot):
                     continue
+            except Exception as e:
+                logger.error(
+                    f"Routing error. "
+                    f"An error occurred when coping data from event to profile. "
+                    f"There is error in the conditional trigger settings for event "
+                    f"`{flat_event['type']}`."
+                    f"Could not parse or access data for if statement: `{plan.condition}`. "
+                    f"Data was not copied but the event was routed to the next step. ",
+                    extra=ExtraInfo.exact(
+                        flow_id=None,
+                        node_id=None,
+                        event_id=flat_event.get('id', None),
+                        profile_id=flat_profile.get('id', None),
+                        origin='profile-computation',
+                        package=__name__,
+                        traceback=get_traceback(e)
+                    )
+                )
+                continue
+
+        # Custom Copy
 
-            # Custom Copy
-
-            if custom_mapping_schema.event_to_profile:
-                allowed_profile_fields = (
-                    "data",
-                    "traits",
-                    "ids",
-                    "stats",
-                    "segments",
-                    "interests",
-                    "consents",
-                    "aux",
-                    "misc",
-                    "trash")
-                for event_ref, profile_ref, operation in custom_mapping_schema.items():
-                    if not profile_ref.startswith(allowed_profile_fields):
-                        message = f"You are trying to copy the data to unknown field in profile. " \
-                                  f"Your profile reference `{profile_ref}` does not start with typical " \
-                                  f"fields that are {allowed_profile_fields}. Please check if there isn't " \
-                                  f"an error in your copy schema. Data will not be copied if it does not " \
-                                  f"match Profile schema."
-
-                        logger.warning(
-                            message,
-                            extra=ExtraInfo.exact(
-                                origin='profile-computation',
-                                flow_id=None,
-                                node_id=None,
-                                event_id=flat_event.get('id', None),
-                                profile_id=flat_profile.get('id', None),
-                                package=__name__
-                            )
-                        )
-                        continue
-
-                    try:
-                        if not flat_event[event_ref]:
-                            message = f"Value of event@{event_ref} is None or empty. " \
-                                      f"No data has been assigned to profile@{profile_ref}"
-                            logger.warning(
-                                message,
-                                extra=ExtraInfo.exact(
-                                    flow_id=None,
-                                    node_id=None,
-                                    event_id=flat_event.get('id', None),
-                                    profile_id=flat_profile.get('id', None),
-                                    origin='profile-computation',
-                                    package=__name__,
-                                )
-                            )
-                            continue
-
-                        if operation == APPEND:
-                            if profile_ref not in flat_profile:
-                                flat_profile[profile_ref] = [flat_event[event_ref]]
-                            elif isinstance(flat_profile[profile_ref], list):
-                                flat_profile[profile_ref].append(flat_event[event_ref])
-                            elif not isinstance(flat_profile[profile_ref], dict):
-                                flat_profile[profile_ref] = [flat_profile[profile_ref], flat_event[event_ref]]
-                            else:
-                                raise KeyError(
-                                    f"Can not append data {flat_event[event_ref]} to {flat_profile[profile_ref]} at profile@{profile_ref}")
-
-                        elif operation == EQUALS_IF_NOT_EXISTS:
-                            if profile_ref not in flat_profile:
-                                flat_profile[profile_ref] = flat_event[event_ref]
-                            elif flat_profile[profile_ref] is None:
-                                flat_profile[profile_ref] = flat_event[event_ref]
-                            elif isinstance(flat_profile[profile_ref], str) :
-                                __value = flat_profile[profile_ref].strip()
-                                if not __value:
-                                    flat_profile[profile_ref] = flat_event[event_ref]
-                            elif isinstance(flat_profile[profile_ref], (list, dict)):
-                                if not flat_profile[profile_ref]:
-                                    flat_profile[profile_ref] = flat_event[event_ref]
-                        else:
-                            flat_profile[profile_ref] = flat_event[event_ref]
-
-                        profile_updated_flag = True
-
-                    except KeyError as e:
-                        if event_ref.startswith(("properties", "traits")):
-                            message = f"Can not copy data from event `{event_ref}` to profile `{profile_ref}`. " \
-                                      f"Data was not copied. Error message: {repr(e)} key."
-                        else:
-                            message = f"Can not copy data from event `{event_ref}` to profile `{profile_ref}`. " \
-                                      f"Maybe `properties.{event_ref}` or `traits.{event_ref}` could work. " \
-                                      f"Data was not copied. Error message: {repr(e)} key."
-
-                        logger.warning(
-                            message,
-                            extra=ExtraInfo.exact(
-                                flow_id=None,
-                                node_id=None,
-                                event_id=flat_event.get('id', None),
-                                profile_id=flat_profile.get('id', None),
-                                origin='event',
-                                class_name='map_event_to_profile',
-                                package=__name__,
-                                traceback=get_traceback(e)
-                            )
-                        )
+        if plan.copy(flat_event, flat_profile):
+            profile_updated_flag = True
 
     compute_schema = get_default_mappings_for(flat_event['type'], "compute")
     if compute_schema:
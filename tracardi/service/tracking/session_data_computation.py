@@ -1,9 +1,9 @@
 from typing import Tuple, Optional
 
 from pydantic import ValidationError
-from user_agents import parse
 from user_agents.parsers import UserAgent
 
+from tracardi.service.cache.user_agent import user_agent_cache
 from tracardi.service.tracking.utils.languages import get_spoken_languages
 from tracardi.domain.event_source import EventSource
 from tracardi.domain.marketing import UTM
@@ -35,7 +35,7 @@ def _get_user_agent(session: Session, tracker_payload: TrackerPayload) -> Option
 
     _user_agent_string = _get_user_agent_string(session, tracker_payload)
     if _user_agent_string:
-        return parse(_user_agent_string)
+        return user_agent_cache.parse(_user_agent_string)
 
     return None
 
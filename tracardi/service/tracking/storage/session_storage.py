@@ -1,10 +1,16 @@
 from typing import Optional, Union, List, Set
 
 from tracardi.service.storage.elastic.interface.collector.load.session import load_session_from_db, refresh_session_db
-from tracardi.service.storage.elastic.interface.collector.mutation.session import save_session_to_db
+from tracardi.service.storage.elastic.interface.collector.mutation.session import save_session_to_db, \
+    save_session_to_db_behind
 from tracardi.service.tracking.cache.session_cache import load_session_cache, save_session_cache
 from tracardi.context import Context, get_context
 from tracardi.domain.session import Session
+from tracardi.service.storage.elastic.rollup import time_rollup
+
+
+def _as_list(sessions: Union[Session, List[Session], Set[Session]]) -> List[Session]:
+    return [sessions] if isinstance(sessions, Session) else list(sessions)
 
 
 async def load_session(session_id: str,
@@ -13,13 +19,13 @@ async def load_session(session_id: str,
     if context is None:
         context = get_context()
 
-    cached_session = load_session_cache(session_id, context)
+    cached_session = await load_session_cache(session_id, context)
     if cached_session is not None:
         return cached_session
 
     session = await load_session_from_db(session_id)
     if session:
-        save_session_cache(session, context)
+        await save_session_cache(session, context)
 
     return session
 
@@ -37,7 +43,22 @@ async def save_session(sessions: Union[Session, List[Session], Set[Session]],
         await refresh_session_db()
 
     if cache:
-        save_session_cache(sessions, context)
+        await save_session_cache(sessions, context)
+
+    await time_rollup.record_sessions(_as_list(sessions))
+
+
+async def save_session_behind(sessions: Union[Session, List[Session], Set[Session]],
+                              context: Optional[Context] = None):
+    """
+    Saves sessions in cache and queues them for bulk save in the database (write-behind).
+    """
+    if context is None:
+        context = get_context()
+
+    await save_session_to_db_behind(sessions)
+    await save_session_cache(sessions, context)
+    await time_rollup.record_sessions(_as_list(sessions))
 
 
 async def store_session(sessions: Union[Session, List[Session], Set[Session]],
@@ -57,4 +78,4 @@ async def store_session(sessions: Union[Session, List[Session], Set[Session]],
         await refresh_session_db()
 
     if cache:
-        save_session_cache(sessions, context)
+        await save_session_cache(sessions, context)
@@ -0,0 +1,14 @@
+import asyncio
+from typing import Awaitable, Callable
+
+
+def close_in_loop(close: Callable[[], Awaitable], loop: asyncio.AbstractEventLoop) -> bool:
+    """
+    Closes resource (e.g. connection pool) bound to other event loop. Connections can be closed only in the
+    loop that opened them, so close is scheduled in that loop if it still runs in other thread. Returns False
+    if the loop does not run, connections of an ended loop are released when garbage collected.
+    """
+    if loop.is_closed() or not loop.is_running():
+        return False
+    asyncio.run_coroutine_threadsafe(close(), loop)
+    return True
@@ -3,9 +3,9 @@ import inspect
 import json
 from collections import defaultdict
 
-from time import time
-from typing import List, Union, Tuple, Optional, Dict, AsyncIterable
-from pydantic import BaseModel, ValidationError
+from time import time, perf_counter
+from typing import List, Union, Tuple, Optional, Dict, AsyncIterable, Any
+from pydantic import BaseModel, ValidationError, Field
 
 from tracardi.domain import ExtraInfo
 from tracardi.domain.enum.event_status import PROCESSED
@@ -28,6 +28,8 @@ from .error_debug_info import ErrorDebugInfo
 from .input_params import InputParams
 from ..service.excetions import get_traceback
 import tracardi.service.wf.service.life_cycle as life_cycle
+from ..service.node_profiler import node_profiler
+from ..service.plugin_pool import PluginPool
 from ..utils.dag_error import DagError, DagExecError
 from .edge import Edge
 from .node import Node
@@ -78,6 +80,7 @@ class GraphInvoker(BaseModel):
     graph: List[Node]
     start_nodes: list
     debug: bool = False
+    plugin_pool: Optional[Any] = Field(default=None, exclude=True)  # PluginPool
 
     @staticmethod
     def _add_to_event_loop(tasks, coroutine, port, params, edge: Edge, active) -> list:
@@ -163,12 +166,12 @@ class GraphInvoker(BaseModel):
                         coroutine = self._void_return(node)
                         node.object.console.log(f"Node `{node.name}` stopped; Conditional value `{value}` have not changed.")
                     else:
-                        coroutine = life_cycle.plugin.execute(node, params)
+                        coroutine = life_cycle.plugin.execute(node, params, self.plugin_pool)
                         node.object.console.log(
                             f"Node `{node.name}` executed; Conditional value `{value}` have changed.")
 
                 else:
-                    coroutine = life_cycle.plugin.execute(node, params)
+                    coroutine = life_cycle.plugin.execute(node, params, self.plugin_pool)
             return self._add_to_event_loop(tasks,
                                            coroutine,
                                            port=_port,
@@ -472,7 +475,7 @@ class GraphInvoker(BaseModel):
                                        "microservice is not configured. See 'Remote microservice configuration' "
                                        "in node settings.")
 
-                node.object = await life_cycle.plugin.create_instance(node)
+                node.object = await life_cycle.plugin.create_instance(node, self.plugin_pool, self.debug)
 
                 node.object = life_cycle.plugin.set_context(
                     node,
@@ -525,7 +528,8 @@ class GraphInvoker(BaseModel):
     async def close(self):
         tasks = []
         for node in self.graph:
-            if isinstance(node.object, ActionRunner):
+            # Pooled plugins are closed when the plugin pool is discarded.
+            if isinstance(node.object, ActionRunner) and not PluginPool.is_pooled(node.object):
                 task = asyncio.create_task(node.object.close())
                 tasks.append(task)
         await asyncio.gather(*tasks)
@@ -553,14 +557,18 @@ class GraphInvoker(BaseModel):
 
         actions_results = ActionsResults()
         flow_start_time = debug_info.timestamp
+        # Debug runs are not profiled
+        profiled_nodes = node_profiler.sample(debug_info.flow.id) if not self.is_in_debug_mode(event) else None
 
         sequence_number = 0
         execution_number = 0
         for node in self.graph:  # type: Node
 
             task_start_time = time()
+            node_start_time = perf_counter()
             sequence_number += 1
             executed_node = False
+            node_error = False
 
             node_debug_info = DebugNodeInfo(
                 id=node.id,
@@ -676,6 +684,7 @@ class GraphInvoker(BaseModel):
 
             except (DagError, DagExecError) as e:
 
+                node_error = True
                 error_log = Log(
                     profile_id=get_entity_id(profile),
                     node_id=node.id,
@@ -741,6 +750,11 @@ class GraphInvoker(BaseModel):
                         # debug_info.nodes[node_debug_info.id] = node_debug_info
                         debug_info.add_node_info(node_debug_info)
 
+                if profiled_nodes is not None and (executed_node or node_error):
+                    profiled_nodes.record(node.id, node.className, perf_counter() - node_start_time,
+                                          error=node_error or (isinstance(node.object, ActionRunner)
+                                                               and bool(node.object.console.errors)))
+
                 # Collect console logs set inside plugins
                 if isinstance(node.object, ActionRunner):
 
@@ -753,6 +767,9 @@ class GraphInvoker(BaseModel):
                     for log in node.object.console.get_logs():  # type: Log
                         log_list.append(log)
 
+        if profiled_nodes is not None:
+            node_profiler.flush_if_due()
+
         event.metadata.status = PROCESSED
         # Sum up all process WF times
         event.metadata.time.process_time = event.metadata.time.process_time + (time() - flow_start_time)
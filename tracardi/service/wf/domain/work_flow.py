@@ -9,9 +9,8 @@ from tracardi.domain.payload.tracker_payload import TrackerPayload
 from .debug_info import DebugInfo, FlowDebugInfo
 from .flow_history import FlowHistory
 from .graph_invoker import GraphInvoker
+from ..service.flow_cache import compiled_flow_cache
 from ..utils.dag_error import DagGraphError
-from ..utils.dag_processor import DagProcessor
-from ..utils.flow_graph_converter import FlowGraphConverter
 
 logger = get_logger(__name__)
 
@@ -23,18 +22,13 @@ class WorkFlow:
         self.flow_history = flow_history
 
     def _make_dag(self, flow: Flow, debug: bool) -> GraphInvoker:
-        # Convert Editor graph to exec graph
-        converter = FlowGraphConverter(flow.flowGraph.model_dump())
-        dag_graph = converter.convert_to_dag_graph()
-        dag = DagProcessor(dag_graph)
-
         try:
             # If scheduled event find node with defined id
             if self.scheduled_event_config is not None and self.scheduled_event_config.is_scheduled():
                 # It must be equal to scheduled node id
                 node_id = self.scheduled_event_config.node_id
-                return dag.make_execution_dag(start_nodes=dag.find_scheduled_nodes(node_ids=[node_id]), debug=debug)
-            return dag.make_execution_dag(start_nodes=dag.find_start_nodes(), debug=debug)
+                return compiled_flow_cache.make_execution_dag(flow, scheduled_node_id=node_id, debug=debug)
+            return compiled_flow_cache.make_execution_dag(flow, scheduled_node_id=None, debug=debug)
         except DagGraphError as e:
             message = "Flow `{}` returned the following error: `{}`".format(flow.id, str(e))
             logger.error(message)
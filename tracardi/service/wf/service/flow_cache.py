@@ -0,0 +1,261 @@
+import asyncio
+from collections import OrderedDict
+from copy import deepcopy
+from time import time
+from typing import Optional, Dict, List, Tuple, Callable, Awaitable, Any, Set
+
+from tracardi.config import memory_cache
+from tracardi.context import get_context
+from tracardi.domain.flow import Flow, FlowRecord
+from tracardi.exceptions.log_handler import get_logger
+from tracardi.service.decorators.function_memory_cache import on_cache_invalidation, listen_for_cache_invalidation
+from tracardi.service.change_monitoring.field_change_logger import FieldChangeLogger
+from ..domain.flow_response import FlowResponse
+from ..domain.graph_invoker import GraphInvoker
+from ..domain.node import Node
+from ..utils.dag_processor import DagProcessor
+from ..utils.flow_graph_converter import FlowGraphConverter
+from .plugin_pool import PluginPool
+
+logger = get_logger(__name__)
+
+_workflow_table = 'workflow'
+
+
+class CompiledFlow:
+    """
+    Holds a validated Flow object together with its compiled execution graphs. Execution graphs are compiled
+    lazily, one per start mode: regular start nodes (key None) or a scheduled node id.
+
+    Compiled nodes are templates and must never be executed directly. Every invocation gets a shallow copy of
+    the node list with a clean per-request state (node.object) and its own copy of node configuration. Node graph
+    edges are shared as they are read-only during the workflow execution. Reusable plugins of this flow version are
+    kept in the plugin pool.
+    """
+
+    def __init__(self, flow: Flow, version: tuple):
+        self.flow = flow
+        self.version = version
+        self.checked = time()
+        self.plugin_pool = PluginPool()
+        self._dags: Dict[Optional[str], Tuple[List[Node], list]] = {}
+
+    def is_version_of(self, flow: Flow) -> bool:
+        return self.flow.id == flow.id \
+            and self.flow.timestamp == flow.timestamp \
+            and self.flow.deploy_timestamp == flow.deploy_timestamp
+
+    def needs_revalidation(self, ttl: float) -> bool:
+        return time() - self.checked > ttl
+
+    def copy_flow(self) -> Flow:
+        """
+        Returns flow copy with clean per-invocation state (response and field change log).
+        """
+        flow = self.flow.model_copy()
+        flow.response = FlowResponse(deepcopy(self.flow.response)) if self.flow.response else FlowResponse()
+        flow._field_change_logger = FieldChangeLogger()
+        flow._updated_in_workflow = {}
+        return flow
+
+    def has_dag(self, scheduled_node_id: Optional[str]) -> bool:
+        return scheduled_node_id in self._dags
+
+    def set_dag(self, scheduled_node_id: Optional[str], exec_dag: GraphInvoker):
+        self._dags[scheduled_node_id] = (exec_dag.graph, exec_dag.start_nodes)
+
+    def make_invoker(self, scheduled_node_id: Optional[str], debug: bool) -> GraphInvoker:
+        nodes, start_nodes = self._dags[scheduled_node_id]
+        return GraphInvoker(
+            graph=[node.model_copy(update={"object": None, "init": deepcopy(node.init)}) for node in nodes],
+            start_nodes=list(start_nodes),
+            debug=debug,
+            plugin_pool=self.plugin_pool
+        )
+
+
+class CompiledFlowCache:
+    """
+    Process-wide, tenant-aware LRU cache of validated flows and their compiled execution graphs.
+
+    Entries are keyed by context (mode and tenant) and flow id. Each entry is versioned with the flow
+    record timestamps. Entries are revalidated against the database every `ttl` seconds and recompiled
+    only if the version changed. Saving or deleting a flow invalidates the entry in the current process,
+    and change of the workflow table drops flows of the tenant in all processes (cache invalidation).
+    Plugin pools of replaced, invalidated or evicted entries are closed in the background.
+    """
+
+    def __init__(self, ttl: float = memory_cache.workflow_cache_ttl,
+                 max_size: int = memory_cache.workflow_cache_max_size):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[Tuple[bool, str, str], CompiledFlow] = OrderedDict()
+        self._stats = self._empty_stats()
+        self._closing: Set[asyncio.Task] = set()
+        on_cache_invalidation((_workflow_table,), self.invalidate_tenant)
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, Any]:
+        return {
+            "hits": 0,
+            "misses": 0,
+            "revalidations": 0,
+            "invalidations": 0,
+            "evictions": 0,
+            "compilations": 0,
+            "compile_time": 0.0,
+            "max_compile_time": 0.0
+        }
+
+    @staticmethod
+    def _key(flow_id: str) -> Tuple[bool, str, str]:
+        context = get_context()
+        return context.production, context.tenant, flow_id
+
+    @staticmethod
+    def _record_version(record: FlowRecord) -> tuple:
+        return record.timestamp, record.deploy_timestamp
+
+    def _get(self, flow_id: str) -> Optional[CompiledFlow]:
+        key = self._key(flow_id)
+        entry = self._entries.get(key, None)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _dispose(self, entry: CompiledFlow):
+        if len(entry.plugin_pool) == 0:
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(entry.plugin_pool.close())
+        except RuntimeError:
+            logger.warning(f"Could not close pooled plugins of flow {entry.flow.id}. No running event loop.")
+            return
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _set(self, flow_id: str, entry: CompiledFlow):
+        key = self._key(flow_id)
+        previous_entry = self._entries.get(key, None)
+        if previous_entry is not None:
+            self._dispose(previous_entry)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            _, evicted_entry = self._entries.popitem(last=False)
+            self._dispose(evicted_entry)
+            self._stats['evictions'] += 1
+
+    async def load_flow(self, flow_id: str,
+                        loader: Callable[[str], Awaitable[Optional[FlowRecord]]]) -> Optional[Flow]:
+        """
+        Returns per-invocation copy of the flow. Loader is called only on cache miss or when the entry
+        must be revalidated.
+        """
+
+        listen_for_cache_invalidation()
+
+        entry = self._get(flow_id)
+
+        if entry is not None and not entry.needs_revalidation(self.ttl):
+            self._stats['hits'] += 1
+            return entry.copy_flow()
+
+        flow_record = await loader(flow_id)
+
+        if not flow_record:
+            self.invalidate(flow_id)
+            return None
+
+        version = self._record_version(flow_record)
+
+        if entry is not None:
+            self._stats['revalidations'] += 1
+            if entry.version == version:
+                entry.checked = time()
+                self._stats['hits'] += 1
+                return entry.copy_flow()
+
+        self._stats['misses'] += 1
+        entry = CompiledFlow(Flow.from_workflow_record(flow_record), version)
+        self._set(flow_id, entry)
+
+        return entry.copy_flow()
+
+    def _compile(self, flow: Flow, scheduled_node_id: Optional[str], debug: bool) -> GraphInvoker:
+        start_time = time()
+
+        # Convert Editor graph to exec graph
+        converter = FlowGraphConverter(flow.flowGraph.model_dump())
+        dag_graph = converter.convert_to_dag_graph()
+        dag = DagProcessor(dag_graph)
+
+        if scheduled_node_id is not None:
+            # It must be equal to scheduled node id
+            exec_dag = dag.make_execution_dag(start_nodes=dag.find_scheduled_nodes(node_ids=[scheduled_node_id]),
+                                              debug=debug)
+        else:
+            exec_dag = dag.make_execution_dag(start_nodes=dag.find_start_nodes(), debug=debug)
+
+        compile_time = time() - start_time
+        self._stats['compilations'] += 1
+        self._stats['compile_time'] += compile_time
+        self._stats['max_compile_time'] = max(self._stats['max_compile_time'], compile_time)
+
+        return exec_dag
+
+    def make_execution_dag(self, flow: Flow, scheduled_node_id: Optional[str], debug: bool) -> GraphInvoker:
+        """
+        Returns execution graph for the flow. The graph is compiled once per flow version and cloned for every
+        invocation. Flows that are not cached (e.g. debugged drafts) are compiled without caching.
+        """
+
+        entry = self._get(flow.id)
+
+        if entry is None or not entry.is_version_of(flow):
+            return self._compile(flow, scheduled_node_id, debug)
+
+        if not entry.has_dag(scheduled_node_id):
+            entry.set_dag(scheduled_node_id, self._compile(flow, scheduled_node_id, debug))
+
+        return entry.make_invoker(scheduled_node_id, debug)
+
+    def invalidate(self, flow_id: str):
+        key = self._key(flow_id)
+        if key in self._entries:
+            self._dispose(self._entries.pop(key))
+            self._stats['invalidations'] += 1
+            logger.debug(f"Compiled workflow {flow_id} invalidated.")
+
+    def invalidate_tenant(self, tenant: Optional[str] = None):
+        """
+        Drops flows of the tenant (all tenants if None) in both modes.
+        """
+        for key in [key for key in self._entries if tenant is None or key[1] == tenant]:
+            self._dispose(self._entries.pop(key))
+            self._stats['invalidations'] += 1
+
+    def clear(self):
+        for entry in self._entries.values():
+            self._dispose(entry)
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        requests = self._stats['hits'] + self._stats['misses']
+        return {
+            **self._stats,
+            "size": len(self._entries),
+            "pooled_plugins": sum(len(entry.plugin_pool) for entry in self._entries.values()),
+            "hit_rate": self._stats['hits'] / requests if requests else 0.0,
+            "avg_compile_time": self._stats['compile_time'] / self._stats['compilations']
+            if self._stats['compilations'] else 0.0
+        }
+
+    def reset_stats(self):
+        self._stats = self._empty_stats()
+
+
+compiled_flow_cache = CompiledFlowCache()
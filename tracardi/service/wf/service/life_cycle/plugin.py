@@ -11,13 +11,19 @@ from tracardi.service.plugin.domain.result import Result
 from tracardi.service.plugin.runner import ActionRunner
 from tracardi.service.utils.getters import get_entity_id
 from tracardi.service.wf.domain.node import Node
+from tracardi.service.wf.service.plugin_pool import PluginPool
 
 
-async def create_instance(node: Node) -> ActionRunner:
+async def create_instance(node: Node, plugin_pool: Optional[PluginPool] = None, debug: bool = False) -> ActionRunner:
     """
-    Creates plugin instance
+    Creates plugin instance or takes it from the plugin pool if the plugin is reusable and was already set up.
     """
 
+    if plugin_pool is not None:
+        action = plugin_pool.get(node.id, debug)
+        if action is not None:
+            return action
+
     module = importlib.import_module(node.module)
     plugin_class = getattr(module, node.className)
 
@@ -44,8 +50,7 @@ def set_context(node: Node,
 
     # node.object.node = node.copy(exclude={"object": ..., "className": ..., "module": ..., "init": ...})
 
-    data = node.model_dump(exclude={"object": ...}, mode='json')
-    node.object.node = Node(**data)
+    node.object.node = node.model_copy(update={"object": None})
 
     node.object.debug = debug
     node.object.event = event
@@ -64,7 +69,11 @@ def set_context(node: Node,
     return node.object
 
 
-async def execute(node: Node, params: dict) -> Optional[Result]:
+async def set_up(node: Node, plugin_pool: Optional[PluginPool] = None):
+    # Reusable plugins are set up only once per flow version.
+    if plugin_pool is not None and node.object.reusable and PluginPool.is_pooled(node.object):
+        return
+
     # todo __debug__ may be removed because it is in node.
 
     # set up with configuration
@@ -75,5 +84,12 @@ async def execute(node: Node, params: dict) -> Optional[Result]:
 
     await node.object.set_up(init)
 
+    if plugin_pool is not None and node.object.reusable:
+        plugin_pool.put(node.id, node.object.debug, node.object)
+
+
+async def execute(node: Node, params: dict, plugin_pool: Optional[PluginPool] = None) -> Optional[Result]:
+    await set_up(node, plugin_pool)
+
     # params has payload and in_edge
     return await node.object.run(**params)
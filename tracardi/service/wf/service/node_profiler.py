@@ -0,0 +1,191 @@
+import asyncio
+from random import random
+from time import time
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from tracardi.config import tracardi
+from tracardi.context import get_context, Context, ServerContext
+from tracardi.exceptions.log_handler import get_logger
+from tracardi.service.latency import LatencyHistogram, quantiles
+from tracardi.service.storage.redis.collections import Collection
+from tracardi.service.storage.redis.driver.async_redis_client import AsyncRedisClient
+
+logger = get_logger(__name__)
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class NodeStats:
+    __slots__ = ('errors', 'histogram')
+
+    def __init__(self):
+        self.errors = 0
+        self.histogram = LatencyHistogram()
+
+
+class FlowNodeStats:
+    """
+    Stats of nodes of one flow, keyed by node id and plugin class.
+    """
+
+    def __init__(self):
+        self.nodes: Dict[Tuple[str, str], NodeStats] = {}
+
+    def record(self, node_id: str, plugin: str, seconds: float, error: bool):
+        key = (node_id, plugin)
+        stats = self.nodes.get(key, None)
+        if stats is None:
+            stats = self.nodes[key] = NodeStats()
+        stats.histogram.record(seconds)
+        if error:
+            stats.errors += 1
+
+
+class NodeProfile(BaseModel):
+    flow_id: str
+    node_id: str
+    plugin: str
+    calls: int
+    errors: int
+    error_rate: float
+    avg_time: float
+    max_time: float
+    quantiles: Dict[str, float]
+
+
+class NodeProfiler:
+    """
+    Aggregates execution time, errors and number of calls of workflow nodes per flow, node and plugin class.
+    Workflow runs are sampled with sample rate (%), debug runs are not profiled.
+
+    Stats are kept in-process per tenant and mode and added to redis hashes (one per flow) when flush
+    interval passes, so `load` returns stats of all processes. Node time is kept as log-linear histogram,
+    see LatencyHistogram, so quantiles can be read after merge.
+    """
+
+    def __init__(self, enabled: bool, sample_rate: int, flush_interval: float, ttl: int):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        # Seconds
+        self.flush_interval = flush_interval
+        self.ttl = ttl
+        self._stats: Dict[Context, Dict[str, FlowNodeStats]] = {}
+        self._last_flush = time()
+        self._task: Optional[asyncio.Task] = None
+
+    def sample(self, flow_id: str) -> Optional[FlowNodeStats]:
+        """
+        Returns stats of the flow in current context if the run is sampled, otherwise None.
+        """
+        if not self.enabled or (self.sample_rate < 100 and random() * 100 >= self.sample_rate):
+            return None
+
+        context = get_context()
+        flows = self._stats.get(context, None)
+        if flows is None:
+            flows = self._stats[context.get_user_less_context_copy()] = {}
+        stats = flows.get(flow_id, None)
+        if stats is None:
+            stats = flows[flow_id] = FlowNodeStats()
+        return stats
+
+    def flush_if_due(self):
+        """
+        Starts flush in background if flush interval passed.
+        """
+        if time() - self._last_flush < self.flush_interval:
+            return
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._last_flush = time()
+        self._task = loop.create_task(self.flush())
+
+    @staticmethod
+    def _mode(context: Context) -> str:
+        return "prod" if context.production else "test"
+
+    def _key(self, context: Context, flow_id: str) -> str:
+        return f"{Collection.node_profile}{self._mode(context)}:{flow_id}"
+
+    def _flows_key(self, context: Context) -> str:
+        return f"{Collection.node_profile_flows}{self._mode(context)}"
+
+    async def flush(self):
+        stats, self._stats = self._stats, {}
+        for context, flows in stats.items():
+            try:
+                with ServerContext(context):
+                    await self._save(context, flows)
+            except Exception as e:
+                logger.warning(f"Could not save workflow node profile. Details: {repr(e)}")
+
+    async def _save(self, context: Context, flows: Dict[str, FlowNodeStats]):
+        async with AsyncRedisClient().pipeline() as pipe:
+            for flow_id, flow_stats in flows.items():
+                key = self._key(context, flow_id)
+                for (node_id, plugin), node in flow_stats.nodes.items():
+                    field = f"{node_id}|{plugin}|"
+                    pipe.hincrby(key, f"{field}calls", node.histogram.count)
+                    pipe.hincrby(key, f"{field}errors", node.errors)
+                    pipe.hincrby(key, f"{field}time", int(node.histogram.sum * 1000000))
+                    for index, count in node.histogram.counts.items():
+                        pipe.hincrby(key, f"{field}{index}", count)
+                pipe.expire(key, self.ttl)
+            if flows:
+                pipe.sadd(self._flows_key(context), *flows)
+                pipe.expire(self._flows_key(context), self.ttl)
+            await pipe.execute()
+
+    async def load_flows(self) -> List[str]:
+        """
+        Returns ids of profiled flows in current context.
+        """
+        flows = await AsyncRedisClient().smembers(self._flows_key(get_context()))
+        return sorted(_decode(flow_id) for flow_id in flows)
+
+    async def load(self, flow_id: str) -> List[NodeProfile]:
+        """
+        Returns flushed stats of nodes of the flow in current context, nodes with the most total time first.
+        """
+        async with AsyncRedisClient().pipeline() as pipe:
+            pipe.hgetall(self._key(get_context(), flow_id))
+            data, = await pipe.execute()
+
+        nodes: Dict[Tuple[str, str], Dict[str, int]] = {}
+        for field, value in data.items():
+            node_id, plugin, metric = _decode(field).rsplit("|", 2)
+            nodes.setdefault((node_id, plugin), {})[metric] = int(value)
+
+        result = []
+        for (node_id, plugin), metrics in nodes.items():
+            calls = metrics.pop('calls', 0)
+            errors = metrics.pop('errors', 0)
+            seconds = metrics.pop('time', 0) / 1000000
+            histogram = LatencyHistogram()
+            histogram.merge({int(index): count for index, count in metrics.items()}, seconds)
+            result.append(NodeProfile(
+                flow_id=flow_id,
+                node_id=node_id,
+                plugin=plugin,
+                calls=calls,
+                errors=errors,
+                error_rate=errors / calls if calls else 0,
+                avg_time=seconds / calls if calls else 0,
+                max_time=histogram.max,
+                quantiles={str(q): histogram.quantile(q) for q in quantiles}
+            ))
+
+        return sorted(result, key=lambda node: node.avg_time * node.calls, reverse=True)
+
+
+node_profiler = NodeProfiler(
+    enabled=tracardi.node_profiler,
+    sample_rate=tracardi.node_profiler_sample_rate,
+    flush_interval=tracardi.node_profiler_flush_interval / 1000,
+    ttl=tracardi.node_profiler_ttl
+)
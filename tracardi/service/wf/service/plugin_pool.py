@@ -0,0 +1,70 @@
+import asyncio
+from copy import copy
+from typing import Dict, Optional, Tuple
+
+from tracardi.exceptions.log_handler import get_logger
+from tracardi.service.plugin.runner import ActionRunner
+
+logger = get_logger(__name__)
+
+# Per-request context attributes. They are swapped in for every invocation and must not be kept in the pool.
+_REQUEST_CONTEXT = ('event', 'session', 'profile', 'flow', 'flow_history', 'console', 'node', 'metrics', 'memory',
+                    'ux', 'tracker_payload', 'execution_graph')
+
+
+class PluginPool:
+    """
+    Pool of set-up instances of reusable plugins (ActionRunner.reusable = True) for one flow version.
+
+    The pool keeps one prototype per node and debug mode. Each invocation gets a shallow copy of the prototype,
+    so the result of set_up (clients, parsed configuration, resources) is shared, while the per-request context
+    (event, profile, session, console, etc.) is set on the copy only. Pooled instances are not closed after
+    each invocation; they are closed all at once when the flow changes and the pool is discarded.
+    """
+
+    def __init__(self):
+        self._prototypes: Dict[Tuple[str, bool], ActionRunner] = {}
+
+    @staticmethod
+    def is_pooled(action: ActionRunner) -> bool:
+        return getattr(action, '_pooled', False) is True
+
+    def __len__(self):
+        return len(self._prototypes)
+
+    def has(self, node_id: str, debug: bool) -> bool:
+        return (node_id, debug) in self._prototypes
+
+    def get(self, node_id: str, debug: bool) -> Optional[ActionRunner]:
+        prototype = self._prototypes.get((node_id, debug), None)
+        if prototype is None:
+            return None
+        return copy(prototype)
+
+    def put(self, node_id: str, debug: bool, action: ActionRunner) -> bool:
+        """
+        Stores set-up action as a prototype. Returns False if there is already a prototype for the node,
+        in such a case the action is not pooled and must be closed by its owner.
+        """
+
+        key = (node_id, debug)
+        if key in self._prototypes:
+            return False
+
+        prototype = copy(action)
+        for attribute in _REQUEST_CONTEXT:
+            if attribute in prototype.__dict__:
+                delattr(prototype, attribute)
+        prototype._pooled = True
+        action._pooled = True
+
+        self._prototypes[key] = prototype
+        return True
+
+    async def close(self):
+        prototypes = list(self._prototypes.values())
+        self._prototypes = {}
+        results = await asyncio.gather(*[prototype.close() for prototype in prototypes], return_exceptions=True)
+        for prototype, result in zip(prototypes, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Could not close pooled plugin `{type(prototype).__name__}`. Details: {repr(result)}")
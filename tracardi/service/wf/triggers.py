@@ -57,7 +57,7 @@ async def trigger_workflows(profile: Profile,
 
     if is_wf_triggered:
         # Add new fields to field mapping. New fields can be created in workflow.
-        add_new_field_mappings(profile, session)
+        await add_new_field_mappings(profile, session)
 
     if auto_merge_ids:
         profile.metadata.system.set_auto_merge_fields(auto_merge_ids)
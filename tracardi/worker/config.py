@@ -74,5 +74,14 @@ class ElasticSearchConfig:
         return config
 
 
+class ImportWorkerConfig:
+
+    def __init__(self, env):
+        self.concurrency = int(env.get('IMPORT_CONCURRENCY', 16))
+        self.progress_interval = float(env.get('IMPORT_PROGRESS_INTERVAL', 5))
+        self.verify_ssl = env.get('IMPORT_VERIFY_SSL', 'no').lower() == 'yes'
+
+
 redis_config = RedisConfig(os.environ)
 elasticsearch_config = ElasticSearchConfig(os.environ)
+import_worker_config = ImportWorkerConfig(os.environ)
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+_json_scalars = (str, int, float, bool, type(None))
+
+
+def default_none_serializable_data(value):
+    if isinstance(value, datetime):
+        return str(value)
+    elif isinstance(value, set):
+        return list(value)
+    else:
+        return f"<<non-serializable: {type(value).__qualname__}>>"
+
+
+def _key(key):
+    if isinstance(key, str):
+        return key
+    if key is None or isinstance(key, bool):
+        return {None: "null", True: "true", False: "false"}[key]
+    return str(key)
+
+
+def to_json_data(value, default=default_none_serializable_data):
+    """
+    Returns value as it would be after json.dumps(value, default=default) and json.loads, without
+    serializing it to string.
+    """
+    if isinstance(value, _json_scalars):
+        return value
+    if isinstance(value, dict):
+        return {_key(key): to_json_data(item, default) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_data(item, default) for item in value]
+    return to_json_data(default(value), default)
@@ -1,18 +1,72 @@
-import requests
+import asyncio
+import time
+from typing import AsyncGenerator, Tuple
+
+import aiohttp
+
+from tracardi.exceptions.log_handler import get_logger
+from tracardi.worker.config import import_worker_config
+
+logger = get_logger(__name__)
 
 
 class ImportDispatcher:
+    """
+    Streams batches of records from the importer and sends them to the tracardi API. The next batch is read
+    from the source (in a thread) while the current one is sent. Records are sent over one pool of keep-alive
+    connections, at most `concurrency` requests at a time. Progress is yielded at most once per
+    `progress_interval` seconds.
+    """
 
-    def __init__(self, credentials, importer, webhook_url: str):
+    def __init__(self, credentials, importer, webhook_url: str,
+                 concurrency: int = import_worker_config.concurrency,
+                 progress_interval: float = import_worker_config.progress_interval):
         self.importer = importer
         self.webhook_url = webhook_url
         self.credentials = credentials
+        self.concurrency = concurrency
+        self.progress_interval = progress_interval
+
+    @staticmethod
+    async def _send(session: aiohttp.ClientSession, url: str, record: dict) -> bool:
+        async with session.post(url, json=record) as response:
+            await response.read()
+            return 200 <= response.status < 300
 
-    def run(self, tracardi_api_url):
+    async def run(self, tracardi_api_url) -> AsyncGenerator[Tuple[float, int], None]:
         if tracardi_api_url[-1] == '/':
             tracardi_api_url = tracardi_api_url[:-1]
-        for data, progress, batch in self.importer.data(self.credentials):
-            url = f"{tracardi_api_url}{self.webhook_url}"
-            response = requests.post(url, json=data, verify=False)
-            yield progress, batch
+        url = f"{tracardi_api_url}{self.webhook_url}"
+
+        batches = self.importer.batches(self.credentials)
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ssl=import_worker_config.verify_ssl)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            next_batch = asyncio.ensure_future(asyncio.to_thread(next, batches, None))
+            try:
+                sent = 0
+                batch_number = 0
+                reported = time.monotonic()
+                while True:
+                    item = await next_batch
+                    if item is None:
+                        break
+
+                    records, number_of_records = item
+                    batch_number += 1
+                    next_batch = asyncio.ensure_future(asyncio.to_thread(next, batches, None))
+
+                    results = await asyncio.gather(*[self._send(session, url, record) for record in records])
+                    failed = results.count(False)
+                    if failed:
+                        logger.warning(f"{failed} of {len(records)} records of batch {batch_number} "
+                                       f"were rejected by {url}.")
 
+                    sent += len(records)
+                    now = time.monotonic()
+                    if now - reported >= self.progress_interval:
+                        reported = now
+                        yield min(sent / number_of_records, 1) * 100, batch_number
+            finally:
+                # Generator can not be closed while it reads in the thread.
+                await asyncio.gather(next_batch, return_exceptions=True)
+                batches.close()
@@ -1,5 +1,6 @@
-from typing import Optional, Union, List
+from typing import Optional, Union, List, Generator, Tuple
 from elasticsearch import Elasticsearch
+from elasticsearch.helpers import scan
 from pydantic import BaseModel
 from ssl import create_default_context
 from tracardi.worker.domain.named_entity import NamedEntity
@@ -63,30 +64,30 @@ class ElasticImporter(BaseModel):
 
         return kwargs
 
-    def data(self, credentials: ElasticCredentials):
+    def batches(self, credentials: ElasticCredentials) -> Generator[Tuple[List[dict], int], None, None]:
+        """
+        Yields batches of documents and number of all documents. Documents are read with scroll, so deep
+        pages are as cheap as the first one.
+        """
 
         client = Elasticsearch(**self._get_elastic_config(credentials))
 
-        result = client.count(body={
-            "query": {
-                "match_all": {}
-            }
-        }, index=self.index.id)
-
-        number_of_records = result['count']
-        if number_of_records > 0:
-            for batch_number, start in enumerate(range(0, number_of_records, self.batch)):
-                query = {
-                    "query": {
-                        "match_all": {}
-                    },
-                    "from": start,
-                    "size": self.batch
+        try:
+            result = client.count(body={
+                "query": {
+                    "match_all": {}
                 }
-                result = client.search(body=query, index=self.index.id)
-                for record, data in enumerate(result['hits']['hits']):
-                    data = data['_source']
-                    progress = ((start + record + 1) / number_of_records) * 100
-                    yield data, progress, batch_number + 1
-
-        client.close()
+            }, index=self.index.id)
+
+            number_of_records = result['count']
+            if number_of_records > 0:
+                records = []
+                for hit in scan(client, query={"query": {"match_all": {}}}, index=self.index.id, size=self.batch):
+                    records.append(hit['_source'])
+                    if len(records) >= self.batch:
+                        yield records, number_of_records
+                        records = []
+                if records:
+                    yield records, number_of_records
+        finally:
+            client.close()
@@ -1,10 +1,10 @@
-import json
-from datetime import datetime
+from typing import Generator, List, Tuple
 
 import mysql.connector
 from pydantic import BaseModel
 
 from tracardi.worker.domain.named_entity import NamedEntity
+from tracardi.worker.misc.json_data import to_json_data
 
 
 class MysqlConnectionConfig(BaseModel):
@@ -19,20 +19,16 @@ class MySQLQueryImporter(BaseModel):
     query: str
     batch: int
 
-    def _default_none_serializable_data(self, value):
-        if isinstance(value, datetime):
-            return str(value)
-        elif isinstance(value, set):
-            return list(value)
-        else:
-            return f"<<non-serializable: {type(value).__qualname__}>>"
-
     def count(self, cursor):
         sql = f"SELECT COUNT(1) as `count` FROM ({self.query}) AS tracardi_import_temporary_table"
         cursor.execute(sql)
         return int(cursor.fetchone()['count'])
 
-    def data(self, credentials: MysqlConnectionConfig):
+    def batches(self, credentials: MysqlConnectionConfig) -> Generator[Tuple[List[dict], int], None, None]:
+        """
+        Yields batches of records and number of all records. Query is executed once and its result is
+        streamed from server.
+        """
         connection = mysql.connector.connect(
             host=credentials.host,
             user=credentials.user,
@@ -40,16 +36,20 @@ class MySQLQueryImporter(BaseModel):
             port=credentials.port,
             database=self.database_name.id
         )
-        cursor = connection.cursor(dictionary=True)
-        number_of_records = self.count(cursor)
-        if number_of_records > 0:
-            for batch_number, start in enumerate(range(0, number_of_records, self.batch)):
-                sql = f"{self.query} LIMIT {start}, {self.batch}"
-                cursor.execute(sql)
-                for record, data in enumerate(cursor):
-                    json_payload = json.dumps(data, default=self._default_none_serializable_data)
-                    data = json.loads(json_payload)
-                    progress = ((start + record + 1) / number_of_records) * 100
-                    yield data, progress, batch_number + 1
-        cursor.close()
-        connection.close()
+        try:
+            cursor = connection.cursor(dictionary=True)
+            number_of_records = self.count(cursor)
+            cursor.close()
+            if number_of_records > 0:
+                cursor = connection.cursor(dictionary=True, buffered=False)
+                try:
+                    cursor.execute(self.query)
+                    while True:
+                        records = cursor.fetchmany(self.batch)
+                        if not records:
+                            break
+                        yield [to_json_data(record) for record in records], number_of_records
+                finally:
+                    cursor.close()
+        finally:
+            connection.close()
@@ -1,10 +1,10 @@
-import json
-from datetime import datetime
+from typing import Generator, List, Optional, Tuple
 
 import mysql.connector
 from pydantic import BaseModel
 
 from tracardi.worker.domain.named_entity import NamedEntity
+from tracardi.worker.misc.json_data import to_json_data
 
 
 class MysqlConnectionConfig(BaseModel):
@@ -19,36 +19,66 @@ class MySQLImporter(BaseModel):
     table_name: NamedEntity
     batch: int
 
-    def _default_none_serializable_data(self, value):
-        if isinstance(value, datetime):
-            return str(value)
-        elif isinstance(value, set):
-            return list(value)
-        else:
-            return f"<<non-serializable: {type(value).__qualname__}>>"
+    def _table(self) -> str:
+        return f"`{self.database_name.id}`.`{self.table_name.id}`"
 
     def count(self, cursor):
-        sql = f"SELECT COUNT(1) as `count` FROM {self.database_name.id}.{self.table_name.id}"
+        sql = f"SELECT COUNT(1) as `count` FROM {self._table()}"
         cursor.execute(sql)
         return int(cursor.fetchone()['count'])
 
-    def data(self, credentials: MysqlConnectionConfig):
+    def primary_key(self, cursor) -> Optional[str]:
+        cursor.execute(f"SHOW KEYS FROM {self._table()} WHERE Key_name = 'PRIMARY'")
+        keys = cursor.fetchall()
+        # Keyset pagination only for single column keys
+        return keys[0]['Column_name'] if len(keys) == 1 else None
+
+    def _keyset_batches(self, cursor, key: str) -> Generator[List[dict], None, None]:
+        sql = f"SELECT * FROM {self._table()} ORDER BY `{key}` LIMIT %s"
+        cursor.execute(sql, (self.batch,))
+        while True:
+            records = cursor.fetchall()
+            if not records:
+                break
+            last_key = records[-1][key]
+            yield records
+            if len(records) < self.batch:
+                break
+            sql = f"SELECT * FROM {self._table()} WHERE `{key}` > %s ORDER BY `{key}` LIMIT %s"
+            cursor.execute(sql, (last_key, self.batch))
+
+    def _streamed_batches(self, connection) -> Generator[List[dict], None, None]:
+        # Unbuffered cursor streams rows from server instead of reading the whole table into memory.
+        cursor = connection.cursor(dictionary=True, buffered=False)
+        try:
+            cursor.execute(f"SELECT * FROM {self._table()}")
+            while True:
+                records = cursor.fetchmany(self.batch)
+                if not records:
+                    break
+                yield records
+        finally:
+            cursor.close()
+
+    def batches(self, credentials: MysqlConnectionConfig) -> Generator[Tuple[List[dict], int], None, None]:
+        """
+        Yields batches of records and number of all records. Tables with single column primary key are read
+        with keyset pagination, other tables with one streamed query.
+        """
         connection = mysql.connector.connect(
             host=credentials.host,
             user=credentials.user,
             password=credentials.password,
             port=credentials.port
         )
-        cursor = connection.cursor(dictionary=True)
-        number_of_records = self.count(cursor)
-        if number_of_records > 0:
-            for batch_number, start in enumerate(range(0, number_of_records, self.batch)):
-                sql = f"SELECT * FROM {self.database_name.id}.{self.table_name.id} LIMIT {start}, {self.batch}"
-                cursor.execute(sql)
-                for record, data in enumerate(cursor):
-                    json_payload = json.dumps(data, default=self._default_none_serializable_data)
-                    data = json.loads(json_payload)
-                    progress = ((start + record + 1) / number_of_records) * 100
-                    yield data, progress, batch_number + 1
-        cursor.close()
-        connection.close()
+        try:
+            cursor = connection.cursor(dictionary=True)
+            number_of_records = self.count(cursor)
+            if number_of_records > 0:
+                key = self.primary_key(cursor)
+                records = self._keyset_batches(cursor, key) if key else self._streamed_batches(connection)
+                for batch in records:
+                    yield [to_json_data(record) for record in batch], number_of_records
+            cursor.close()
+        finally:
+            connection.close()
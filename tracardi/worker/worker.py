@@ -12,6 +12,9 @@ import tracardi.worker.service.worker.migration_workers as migration_workers
 from tracardi.context import Context, ServerContext
 from tracardi.config import redis_config
 from tracardi.worker.service.async_job import run_async_task
+from tracardi.service.storage.elastic.driver.factory import storage_manager
+from tracardi.service.storage.elastic.index_locator import index_locator
+from tracardi.service.shutdown import close_all
 from tracardi.worker.service.worker.elastic_worker import ElasticImporter, ElasticCredentials
 from tracardi.worker.service.worker.mysql_worker import MysqlConnectionConfig, MySQLImporter
 from tracardi.worker.service.worker.mysql_query_worker import MysqlConnectionConfig as MysqlQueryConnConfig, MySQLQueryImporter
@@ -27,6 +30,14 @@ queue = RedisHuey('upgrade',
 
 logger = get_installation_logger(__name__, level=logging.INFO)
 
+
+@queue.on_shutdown()
+@run_async_task
+async def _close_on_shutdown():
+    # Runs in each worker thread, in the event loop its jobs used.
+    await close_all()
+
+
 @run_async_task
 async def import_mysql_table_data(task_name:str, import_config: dict, credentials, context: Context):
     with ServerContext(context):
@@ -44,8 +55,8 @@ async def import_mysql_table_data(task_name:str, import_config: dict, credential
                                     importer=MySQLImporter(**import_config.config),
                                     webhook_url=webhook_url)
 
-        for progress, batch in importer.run(import_config.api_url):
-            await task_progress(task_id, progress)
+        async for progress, batch in importer.run(import_config.api_url):
+            await task_progress(task_id, int(progress))
 
         await task_finish(task_id)
 
@@ -67,33 +78,34 @@ async def import_elastic_data(task_name:str, import_config, credentials, context
                                     importer=ElasticImporter(**import_config.config),
                                     webhook_url=webhook_url)
 
-        for progress, batch in importer.run(import_config.api_url):
-            await task_progress(task_id, progress)
+        async for progress, batch in importer.run(import_config.api_url):
+            await task_progress(task_id, int(progress))
 
         await task_finish(task_id)
 
 @run_async_task
 async def import_mysql_data_with_query(task_name:str, import_config, credentials, context: Context):
-    import_config = ImportConfig(**import_config)
+    with ServerContext(context):
+        import_config = ImportConfig(**import_config)
 
-    task_id = await task_create(
-        "import",
-        task_name if task_name else import_config.name,
-        import_config.model_dump(mode='json')
-    )
+        task_id = await task_create(
+            "import",
+            task_name if task_name else import_config.name,
+            import_config.model_dump(mode='json')
+        )
 
-    webhook_url = f"/collect/{import_config.event_type}/{import_config.event_source.id}"
+        webhook_url = f"/collect/{import_config.event_type}/{import_config.event_source.id}"
 
-    importer = ImportDispatcher(
-        MysqlQueryConnConfig(**credentials),
-        importer=MySQLQueryImporter(**import_config.config),
-        webhook_url=webhook_url
-    )
+        importer = ImportDispatcher(
+            MysqlQueryConnConfig(**credentials),
+            importer=MySQLQueryImporter(**import_config.config),
+            webhook_url=webhook_url
+        )
 
-    for progress, batch in importer.run(import_config.api_url):
-        await task_progress(task_id, progress)
+        async for progress, batch in importer.run(import_config.api_url):
+            await task_progress(task_id, int(progress))
 
-    await task_finish(task_id)
+        await task_finish(task_id)
 
 async def _run_migration_worker(worker_func, schema, elastic_host, context: Context):
     worker_function = getattr(migration_workers, worker_func, None)
@@ -151,6 +163,22 @@ async def _run_migration_job(schemas, elastic_host, context: Context):
         return await migrate_data(schemas, elastic_host, context)
 
 
+@run_async_task
+async def _rebuild_index_locator(index_keys, context: Context):
+    with ServerContext(context):
+        task_id = await task_create("upgrade", f"Rebuild of index locator for {', '.join(index_keys)}")
+
+        for index_key in index_keys:
+            total = (await storage_manager(index_key).count({"query": {"match_all": {}}})).get('count', 0)
+            async for recorded in index_locator.rebuild(index_key):
+                if total:
+                    await task_progress(task_id, int(min(recorded / total, 1) * 100))
+            logger.info(f"Index locator for {index_key} rebuilt. {index_locator.metrics[index_key].recorded} "
+                        f"locations recorded.")
+
+        await task_finish(task_id)
+
+
 @queue.task(retries=1)
 def run_mysql_import_job(task_name: str, import_config, credentials, context: Context):
     import_mysql_table_data(task_name, import_config, credentials, context)
@@ -162,8 +190,14 @@ def run_elastic_import_job(task_name: str, import_config, credentials, context:
 
 
 @queue.task(retries=1)
-def run_mysql_query_import_job(import_config, credentials):
-    import_mysql_data_with_query(import_config, credentials)
+def run_mysql_query_import_job(task_name: str, import_config, credentials, context: Context):
+    import_mysql_data_with_query(task_name, import_config, credentials, context)
+
+
+@queue.task(retries=1)
+def run_index_locator_rebuild_job(index_keys, context: Context):
+    _rebuild_index_locator(index_keys, context)
+
 
 """
 This is start job